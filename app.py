@@ -39,6 +39,7 @@ from modules.voorraad import open_voorraad
 from modules.bon_viewer import open_bon_viewer
 from modules.online_bestellingen import open_online_bestellingen
 from database import DatabaseContext, initialize_database
+from repositories.report_repository import ReportRepository
 from logging_config import setup_logging, get_logger
 from config import load_settings, save_settings, load_json_file, save_json_file
 from exceptions import ValidationError, OrderError, DatabaseError
@@ -1332,24 +1333,14 @@ info@pitapizzanapoli.be
             from datetime import date
             today = date.today().strftime('%Y-%m-%d')
             
-            with DatabaseContext() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT COUNT(*) as count, COALESCE(SUM(totaal), 0) as total
-                    FROM bestellingen
-                    WHERE datum = ?
-                """, (today,))
-                row = cursor.fetchone()
-                
-                if row:
-                    count = row['count'] or 0
-                    total = float(row['total'] or 0.0)
-                    average = round(total / count, 2) if count > 0 else 0.0
-                    return {
-                        'count': count,
-                        'total': round(total, 2),
-                        'average': average
-                    }
+            totalen = ReportRepository.get_totalen(today, today)
+            count = totalen['aantal']
+            total = totalen['omzet']
+            return {
+                'count': count,
+                'total': total,
+                'average': round(total / count, 2) if count > 0 else 0.0
+            }
         except Exception as e:
             logger.exception(f"Error fetching today's statistics: {e}")
         
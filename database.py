@@ -1,9 +1,11 @@
 import sqlite3
-import csv
 import os
 import json
 import datetime
 import threading
+import atexit
+import time
+import weakref
 from typing import Optional, Dict, Any, List
 from logging_config import setup_logging, get_logger
 from exceptions import DatabaseError
@@ -17,21 +19,73 @@ DB_FILE = "pizzeria.db"
 # Timeout for database operations (in seconds)
 DB_TIMEOUT = 20.0
 
-# Connection pool for SQLite (simple implementation)
-# Note: SQLite works best with separate connections per thread
-# This pool helps with connection reuse within the same thread
-_connection_pool = {}
-_pool_lock = threading.Lock()
+# Connection pool for SQLite (checkout/return)
+# Connections are opened once (PRAGMAs included) and handed back to the pool
+# on close(), so the page cache stays warm between DatabaseContext blocks.
+# Every connection is owned by exactly one caller at a time, which makes the
+# check_same_thread=False connections safe to reuse across threads.
+# A checked-out connection that is garbage-collected without close() gives its
+# slot back through a weakref finalizer, so a leak on an exception path can not
+# make every later checkout wait for _pool_wait_timeout.
+_connection_pool: Dict[str, List[sqlite3.Connection]] = {}  # db file -> idle connections (LIFO)
+# RLock: the finalizer of a leaked connection can run (gc) while this thread holds the lock
+_pool_lock = threading.RLock()
+_pool_available = threading.Condition(_pool_lock)
 _max_pool_size = 5
+# How long a caller waits for an idle connection before an overflow connection is opened
+_pool_wait_timeout = 1.0
+_pool_in_use: Dict[str, int] = {}
+_pool_stats = {"hits": 0, "misses": 0, "waits": 0, "overflow": 0, "discarded": 0, "leaked": 0}
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    SQLite connection that returns itself to the pool when closed.
+
+    Existing code calls ``conn.close()`` after ``get_db_connection()``; for pooled
+    connections that call is a release, not a real close.
+    """
+
+    _pool_key: Optional[str] = None
+    _overflow: bool = False
+    _checked_out: bool = False
+    _slot_finalizer: Optional[weakref.finalize] = None
+
+    def close(self) -> None:
+        if self._pool_key is None:
+            super().close()
+        elif self._checked_out:
+            _release_connection(self)
+
+    def _close_for_real(self) -> None:
+        self._pool_key = None
+        super().close()
+
+
+def _open_connection(db_file: str) -> PooledConnection:
+    """Open a new connection and apply the connection-level PRAGMAs once."""
+    conn = sqlite3.connect(db_file, timeout=DB_TIMEOUT, check_same_thread=False, factory=PooledConnection)
+    conn.row_factory = sqlite3.Row
+    # Enable WAL mode for better concurrency
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Optimize for read-heavy workloads
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
 
 
 def get_db_connection() -> sqlite3.Connection:
     """
-    Maakt een databaseconnectie aan en retourneert deze.
+    Haalt een databaseconnectie uit de pool (of maakt er een aan) en retourneert deze.
     
-    Uses timeout to prevent database locking issues.
-    For SQLite, we create a new connection per operation (not pooled) 
-    because SQLite connections should not be shared between threads.
+    Idle connections are reused (LIFO, so the most recently used page cache is
+    picked first). When all ``_max_pool_size`` connections are checked out the
+    caller waits up to ``_pool_wait_timeout`` seconds and then gets a one-off
+    overflow connection, so a connection that is never closed can not deadlock the app.
+    A checked-out connection that is garbage-collected without close() frees its
+    slot again (see ``_free_leaked_slot``).
+    Calling ``close()`` on the returned connection hands it back to the pool.
     
     Returns:
         SQLite database connection
@@ -39,57 +93,157 @@ def get_db_connection() -> sqlite3.Connection:
     Raises:
         DatabaseError: If connection cannot be established
     """
+    db_file = DB_FILE
+    overflow = False
+    with _pool_available:
+        idle = _connection_pool.setdefault(db_file, [])
+        if not idle and _pool_in_use.get(db_file, 0) >= _max_pool_size:
+            _pool_stats["waits"] += 1
+            _pool_available.wait_for(
+                lambda: idle or _pool_in_use.get(db_file, 0) < _max_pool_size,
+                timeout=_pool_wait_timeout
+            )
+        if idle:
+            conn = idle.pop()
+            conn._checked_out = True
+            _pool_in_use[db_file] = _pool_in_use.get(db_file, 0) + 1
+            _pool_stats["hits"] += 1
+            _track_checkout(conn, db_file)
+            return conn
+        _pool_stats["misses"] += 1
+        if _pool_in_use.get(db_file, 0) >= _max_pool_size:
+            overflow = True
+            _pool_stats["overflow"] += 1
+        else:
+            _pool_in_use[db_file] = _pool_in_use.get(db_file, 0) + 1
+
     try:
-        # Create new connection (SQLite connections should not be shared between threads)
-        # Each DatabaseContext will create and close its own connection
-        conn = sqlite3.connect(DB_FILE, timeout=DB_TIMEOUT, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        # Enable WAL mode for better concurrency
-        conn.execute("PRAGMA journal_mode=WAL")
-        # Optimize for read-heavy workloads
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
-        conn.execute("PRAGMA temp_store=MEMORY")
-        
-        return conn
+        conn = _open_connection(db_file)
     except sqlite3.Error as e:
+        if not overflow:
+            with _pool_available:
+                _pool_in_use[db_file] -= 1
+                _pool_available.notify()
         logger.exception(f"Database connection error: {e}")
         raise DatabaseError(f"Kon geen databaseverbinding maken: {e}") from e
 
+    conn._pool_key = db_file
+    conn._overflow = overflow
+    conn._checked_out = True
+    if not overflow:
+        _track_checkout(conn, db_file)
+    return conn
+
+
+def _track_checkout(conn: PooledConnection, db_file: str) -> None:
+    """Free the pool slot of ``conn`` when it is garbage-collected without close()."""
+    conn._slot_finalizer = weakref.finalize(conn, _free_leaked_slot, db_file)
+
+
+def _free_leaked_slot(db_file: str) -> None:
+    """Finalizer: a checked-out connection was dropped without close()."""
+    with _pool_available:
+        _pool_in_use[db_file] = max(0, _pool_in_use.get(db_file, 0) - 1)
+        _pool_stats["leaked"] += 1
+        _pool_available.notify()
+    logger.warning("Databaseconnectie niet gesloten; poolplaats vrijgegeven door garbage collector")
+
+
+def _release_connection(conn: PooledConnection) -> None:
+    """Return a checked-out connection to the pool (or close it if it cannot be reused)."""
+    db_file = conn._pool_key
+    conn._checked_out = False
+    if conn._slot_finalizer is not None:
+        conn._slot_finalizer.detach()
+        conn._slot_finalizer = None
+    reusable = not conn._overflow
+    try:
+        # Never hand out a connection with a half-finished transaction
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = sqlite3.Row
+    except sqlite3.Error:
+        reusable = False
+
+    if conn._overflow:
+        conn._close_for_real()
+        return
+
+    with _pool_available:
+        _pool_in_use[db_file] = max(0, _pool_in_use.get(db_file, 0) - 1)
+        idle = _connection_pool.setdefault(db_file, [])
+        if reusable and conn not in idle and len(idle) < _max_pool_size:
+            idle.append(conn)
+        else:
+            reusable = False
+            _pool_stats["discarded"] += 1
+        _pool_available.notify()
+
+    if not reusable:
+        try:
+            conn._close_for_real()
+        except sqlite3.Error:
+            pass
+
 
 def close_connection_pool():
     """Close all connections in the pool (useful for cleanup)."""
     with _pool_lock:
-        for thread_id, conn in list(_connection_pool.items()):
-            try:
-                conn.close()
-            except:
-                pass
+        for db_file, idle in list(_connection_pool.items()):
+            for conn in idle:
+                try:
+                    conn._close_for_real()
+                except:
+                    pass
         _connection_pool.clear()
 
 
+atexit.register(close_connection_pool)
+
+
 def get_connection_pool_stats() -> Dict[str, Any]:
     """
     Get statistics about the connection pool.
     
     Returns:
-        Dictionary with pool statistics
+        Dictionary with pool statistics (idle/in-use counts, hits, misses,
+        waits, overflow, discarded and leaked connections)
     """
     with _pool_lock:
+        total_requests = _pool_stats["hits"] + _pool_stats["misses"]
+        hit_rate = (_pool_stats["hits"] / total_requests * 100) if total_requests > 0 else 0.0
         return {
-            "pool_size": len(_connection_pool),
+            "pool_size": sum(len(idle) for idle in _connection_pool.values()),
+            "in_use": sum(_pool_in_use.values()),
             "max_pool_size": _max_pool_size,
-            "thread_ids": list(_connection_pool.keys())
+            "databases": list(_connection_pool.keys()),
+            "hit_rate": f"{hit_rate:.2f}%",
+            **_pool_stats
         }
 
 
+def reset_connection_pool_stats() -> None:
+    """Reset the hit/miss/wait counters (the pooled connections stay open)."""
+    with _pool_lock:
+        for key in _pool_stats:
+            _pool_stats[key] = 0
+
+
 class DatabaseContext:
-    """Context manager for database connections."""
+    """
+    Context manager for database connections (borrowed from and returned to the pool).
     
-    def __init__(self):
+    When a UnitOfWork is passed, its connection is reused and the commit/rollback
+    is left to the unit of work, so several repository calls share one transaction.
+    """
+    
+    def __init__(self, uow: Optional["UnitOfWork"] = None):
         self.conn = None
+        self.uow = uow
     
     def __enter__(self):
+        if self.uow is not None:
+            return self.uow.conn
         self.conn = get_db_connection()
         return self.conn
     
@@ -111,416 +265,474 @@ class DatabaseContext:
         return False  # Don't suppress exceptions
 
 
-def create_tables():
-    """Maakt de databasetabellen aan als ze nog niet bestaan en voegt ontbrekende kolommen toe."""
-    with DatabaseContext() as conn:
-        cursor = conn.cursor()
+class UnitOfWork:
+    """
+    One connection and one write transaction shared by several repository calls.
+    
+    The transaction is started with BEGIN IMMEDIATE so the write lock is taken
+    up front (no lock upgrade halfway through an order) and is committed once
+    when the block exits, or rolled back completely on error.
+    
+    Example:
+        with UnitOfWork() as uow:
+            bestelling_id = OrderRepository.create(..., uow=uow)
+            OrderRepository.add_order_items(bestelling_id, items, uow=uow)
+    """
+    
+    def __init__(self):
+        self.conn: Optional[sqlite3.Connection] = None
+        self._after_commit: List[Any] = []
+    
+    def __enter__(self) -> "UnitOfWork":
+        self._after_commit = []
+        self.conn = get_db_connection()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            self.conn.close()
+            self.conn = None
+            raise DatabaseError(f"Kon transactie niet starten: {e}") from e
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        committed = False
+        try:
+            if exc_type:
+                self.conn.rollback()
+            else:
+                self.conn.commit()
+                committed = True
+        finally:
+            self.conn.close()
+            self.conn = None
+        if committed:
+            for callback in self._after_commit:
+                callback()
+        self._after_commit = []
+        return False  # Don't suppress exceptions
+    
+    def cursor(self) -> sqlite3.Cursor:
+        """Return a cursor on the shared connection."""
+        return self.conn.cursor()
+    
+    def after_commit(self, callback) -> None:
+        """Run callback once the transaction has been committed (never after a rollback)."""
+        self._after_commit.append(callback)
 
-        # Klanten tabel (uitgebreid voor CRM)
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS klanten
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       telefoon
-                       TEXT
-                       UNIQUE
-                       NOT
-                       NULL,
-                       straat
-                       TEXT,
-                       huisnummer
-                       TEXT,
-                       plaats
-                       TEXT,
-                       naam
-                       TEXT,
-                       notities
-                       TEXT,
-                       voorkeur_levering
-                       TEXT,
-                       laatste_bestelling
-                       TEXT,
-                       totaal_bestellingen
-                       INTEGER
-                       DEFAULT
-                       0,
-                       totaal_besteed
-                       REAL
-                       DEFAULT
-                       0.0,
-                       volle_kaart
-                       INTEGER
-                       DEFAULT
-                       0
-                   )
-                   ''')
-
-        # Zorg dat nieuwe kolommen bestaan in bestaande DB's
-        cursor.execute("PRAGMA table_info(klanten)")
-        kcols = [row[1] for row in cursor.fetchall()]
-        if 'notities' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN notities TEXT")
-        if 'voorkeur_levering' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN voorkeur_levering TEXT")
-        if 'laatste_bestelling' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN laatste_bestelling TEXT")
-        if 'totaal_bestellingen' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN totaal_bestellingen INTEGER DEFAULT 0")
-        if 'totaal_besteed' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN totaal_besteed REAL DEFAULT 0.0")
-        if 'volle_kaart' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN volle_kaart INTEGER DEFAULT 0")
-        # Professional improvements
-        if 'created_at' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN created_at TEXT")
-            # Set default value for existing records
-            default_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute("UPDATE klanten SET created_at = ? WHERE created_at IS NULL", (default_time,))
-        if 'updated_at' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN updated_at TEXT")
-            # Set default value for existing records
-            default_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute("UPDATE klanten SET updated_at = ? WHERE updated_at IS NULL", (default_time,))
-        if 'email' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN email TEXT")
-        if 'postcode' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN postcode TEXT")
-        if 'is_actief' not in kcols:
-            cursor.execute("ALTER TABLE klanten ADD COLUMN is_actief INTEGER DEFAULT 1")
-
-        # Koeriers tabel
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS koeriers
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       naam
-                       TEXT
-                       UNIQUE
-                       NOT
-                       NULL
-                   )
-                   ''')
 
-        # Bestellingen tabel
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS bestellingen
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       klant_id
-                       INTEGER,
-                       koerier_id
-                       INTEGER,
-                       datum
-                       TEXT
-                       NOT
-                       NULL,
-                       tijd
-                       TEXT
-                       NOT
-                       NULL,
-                       totaal
-                       REAL
-                       NOT
-                       NULL,
-                       opmerking
-                       TEXT,
-                       bonnummer
-                       TEXT,
-                       FOREIGN
-                       KEY
-                   (
-                       klant_id
-                   ) REFERENCES klanten
-                   (
-                       id
-                   ),
-                       FOREIGN KEY
-                   (
-                       koerier_id
-                   ) REFERENCES koeriers
-                   (
-                       id
-                   )
-                       )
-                   ''')
-        # Backwards compat kolommen
-        cursor.execute("PRAGMA table_info(bestellingen)")
-        bcols = [row[1] for row in cursor.fetchall()]
-        if 'koerier_id' not in bcols:
-            cursor.execute("ALTER TABLE bestellingen ADD COLUMN koerier_id INTEGER REFERENCES koeriers(id)")
-        if 'bonnummer' not in bcols:
-            cursor.execute("ALTER TABLE bestellingen ADD COLUMN bonnummer TEXT")
-        if 'levertijd' not in bcols:
-            cursor.execute("ALTER TABLE bestellingen ADD COLUMN levertijd TEXT")
-        if 'afhaal' not in bcols:
-            cursor.execute("ALTER TABLE bestellingen ADD COLUMN afhaal INTEGER DEFAULT 0")
-            logger.info("Added afhaal column to bestellingen table")
-        if 'status' not in bcols:
-            cursor.execute("ALTER TABLE bestellingen ADD COLUMN status TEXT DEFAULT 'Nieuw'")
-            logger.info("Added status column to bestellingen table")
-
-        # Bestelregels tabel
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS bestelregels
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       bestelling_id
-                       INTEGER
-                       NOT
-                       NULL,
-                       categorie
-                       TEXT,
-                       product
-                       TEXT,
-                       aantal
-                       INTEGER,
-                       prijs
-                       REAL,
-                       extras
-                       TEXT,
-                       FOREIGN
-                       KEY
-                   (
-                       bestelling_id
-                   ) REFERENCES bestellingen
-                   (
-                       id
+def create_tables():
+    """
+    Maakt de databasetabellen aan als ze nog niet bestaan en voegt ontbrekende kolommen toe.
+    
+    Delegates to run_migrations(): on an up-to-date database this is a single
+    PRAGMA user_version read.
+    """
+    run_migrations()
+
+
+def _migratie_001_basisschema(cursor: sqlite3.Cursor) -> None:
+    """Basisschema: alle tabellen plus de kolommen die oudere databases nog missen."""
+    # Klanten tabel (uitgebreid voor CRM)
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS klanten
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   telefoon
+                   TEXT
+                   UNIQUE
+                   NOT
+                   NULL,
+                   straat
+                   TEXT,
+                   huisnummer
+                   TEXT,
+                   plaats
+                   TEXT,
+                   naam
+                   TEXT,
+                   notities
+                   TEXT,
+                   voorkeur_levering
+                   TEXT,
+                   laatste_bestelling
+                   TEXT,
+                   totaal_bestellingen
+                   INTEGER
+                   DEFAULT
+                   0,
+                   totaal_besteed
+                   REAL
+                   DEFAULT
+                   0.0,
+                   volle_kaart
+                   INTEGER
+                   DEFAULT
+                   0
+               )
+               ''')
+
+    # Zorg dat nieuwe kolommen bestaan in bestaande DB's
+    cursor.execute("PRAGMA table_info(klanten)")
+    kcols = [row[1] for row in cursor.fetchall()]
+    if 'notities' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN notities TEXT")
+    if 'voorkeur_levering' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN voorkeur_levering TEXT")
+    if 'laatste_bestelling' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN laatste_bestelling TEXT")
+    if 'totaal_bestellingen' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN totaal_bestellingen INTEGER DEFAULT 0")
+    if 'totaal_besteed' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN totaal_besteed REAL DEFAULT 0.0")
+    if 'volle_kaart' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN volle_kaart INTEGER DEFAULT 0")
+    # Professional improvements
+    if 'created_at' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN created_at TEXT")
+        # Set default value for existing records
+        default_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        cursor.execute("UPDATE klanten SET created_at = ? WHERE created_at IS NULL", (default_time,))
+    if 'updated_at' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN updated_at TEXT")
+        # Set default value for existing records
+        default_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        cursor.execute("UPDATE klanten SET updated_at = ? WHERE updated_at IS NULL", (default_time,))
+    if 'email' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN email TEXT")
+    if 'postcode' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN postcode TEXT")
+    if 'is_actief' not in kcols:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN is_actief INTEGER DEFAULT 1")
+
+    # Koeriers tabel
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS koeriers
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   naam
+                   TEXT
+                   UNIQUE
+                   NOT
+                   NULL
+               )
+               ''')
+
+    # Bestellingen tabel
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS bestellingen
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   klant_id
+                   INTEGER,
+                   koerier_id
+                   INTEGER,
+                   datum
+                   TEXT
+                   NOT
+                   NULL,
+                   tijd
+                   TEXT
+                   NOT
+                   NULL,
+                   totaal
+                   REAL
+                   NOT
+                   NULL,
+                   opmerking
+                   TEXT,
+                   bonnummer
+                   TEXT,
+                   FOREIGN
+                   KEY
+               (
+                   klant_id
+               ) REFERENCES klanten
+               (
+                   id
+               ),
+                   FOREIGN KEY
+               (
+                   koerier_id
+               ) REFERENCES koeriers
+               (
+                   id
+               )
                    )
-                       )
-                   ''')
-
-        # Controleer het schema van bon_teller en herstel het indien nodig.
-        # Dit is nodig voor oudere databases waar de 'dag' kolom nog niet bestond.
-        cursor.execute("PRAGMA table_info(bon_teller)")
-        bon_teller_cols = [row[1] for row in cursor.fetchall()]
-        if bon_teller_cols and 'dag' not in bon_teller_cols:
-            logger.warning("Verouderde 'bon_teller' tabel gedetecteerd. Tabel wordt opnieuw aangemaakt om het schema te corrigeren.")
-            cursor.execute("DROP TABLE IF EXISTS bon_teller")
-
-        # Bon-teller tabel
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS bon_teller
-                   (
-                       jaar
-                       INTEGER
-                       NOT
-                       NULL,
-                       dag
-                       INTEGER
-                       NOT
-                       NULL,
-                       laatste_nummer
-                       INTEGER
-                       NOT
-                       NULL,
-                       PRIMARY
-                       KEY
-                   (
-                       jaar,
-                       dag
+               ''')
+    # Backwards compat kolommen
+    cursor.execute("PRAGMA table_info(bestellingen)")
+    bcols = [row[1] for row in cursor.fetchall()]
+    if 'koerier_id' not in bcols:
+        cursor.execute("ALTER TABLE bestellingen ADD COLUMN koerier_id INTEGER REFERENCES koeriers(id)")
+    if 'bonnummer' not in bcols:
+        cursor.execute("ALTER TABLE bestellingen ADD COLUMN bonnummer TEXT")
+    if 'levertijd' not in bcols:
+        cursor.execute("ALTER TABLE bestellingen ADD COLUMN levertijd TEXT")
+    if 'afhaal' not in bcols:
+        cursor.execute("ALTER TABLE bestellingen ADD COLUMN afhaal INTEGER DEFAULT 0")
+        logger.info("Added afhaal column to bestellingen table")
+    if 'status' not in bcols:
+        cursor.execute("ALTER TABLE bestellingen ADD COLUMN status TEXT DEFAULT 'Nieuw'")
+        logger.info("Added status column to bestellingen table")
+
+    # Bestelregels tabel
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS bestelregels
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   bestelling_id
+                   INTEGER
+                   NOT
+                   NULL,
+                   categorie
+                   TEXT,
+                   product
+                   TEXT,
+                   aantal
+                   INTEGER,
+                   prijs
+                   REAL,
+                   extras
+                   TEXT,
+                   FOREIGN
+                   KEY
+               (
+                   bestelling_id
+               ) REFERENCES bestellingen
+               (
+                   id
+               )
                    )
-                       )
-                   ''')
-
-        # Favoriete bestellingen (per klant)
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS favoriete_bestellingen
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       klant_id
-                       INTEGER
-                       NOT
-                       NULL,
-                       naam
-                       TEXT
-                       NOT
-                       NULL,
-                       bestelregels_json
-                       TEXT
-                       NOT
-                       NULL,
-                       totaal_prijs
-                       REAL,
-                       aangemaakt_op
-                       TEXT
-                       NOT
-                       NULL,
-                       laatst_gebruikt
-                       TEXT,
-                       gebruik_count
-                       INTEGER
-                       DEFAULT
-                       0,
-                       FOREIGN
-                       KEY
-                   (
-                       klant_id
-                   ) REFERENCES klanten
-                   (
-                       id
+               ''')
+
+    # Controleer het schema van bon_teller en herstel het indien nodig.
+    # Dit is nodig voor oudere databases waar de 'dag' kolom nog niet bestond.
+    cursor.execute("PRAGMA table_info(bon_teller)")
+    bon_teller_cols = [row[1] for row in cursor.fetchall()]
+    if bon_teller_cols and 'dag' not in bon_teller_cols:
+        logger.warning("Verouderde 'bon_teller' tabel gedetecteerd. Tabel wordt opnieuw aangemaakt om het schema te corrigeren.")
+        cursor.execute("DROP TABLE IF EXISTS bon_teller")
+
+    # Bon-teller tabel
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS bon_teller
+               (
+                   jaar
+                   INTEGER
+                   NOT
+                   NULL,
+                   dag
+                   INTEGER
+                   NOT
+                   NULL,
+                   laatste_nummer
+                   INTEGER
+                   NOT
+                   NULL,
+                   PRIMARY
+                   KEY
+               (
+                   jaar,
+                   dag
+               )
                    )
-                       )
-                   ''')
-
-        # Klant notities (geschiedenis)
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS klant_notities
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       klant_id
-                       INTEGER
-                       NOT
-                       NULL,
-                       notitie
-                       TEXT
-                       NOT
-                       NULL,
-                       aangemaakt_op
-                       TEXT
-                       NOT
-                       NULL,
-                       medewerker
-                       TEXT,
-                       FOREIGN
-                       KEY
-                   (
-                       klant_id
-                   ) REFERENCES klanten
-                   (
-                       id
+               ''')
+
+    # Favoriete bestellingen (per klant)
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS favoriete_bestellingen
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   klant_id
+                   INTEGER
+                   NOT
+                   NULL,
+                   naam
+                   TEXT
+                   NOT
+                   NULL,
+                   bestelregels_json
+                   TEXT
+                   NOT
+                   NULL,
+                   totaal_prijs
+                   REAL,
+                   aangemaakt_op
+                   TEXT
+                   NOT
+                   NULL,
+                   laatst_gebruikt
+                   TEXT,
+                   gebruik_count
+                   INTEGER
+                   DEFAULT
+                   0,
+                   FOREIGN
+                   KEY
+               (
+                   klant_id
+               ) REFERENCES klanten
+               (
+                   id
+               )
                    )
-                       )
-                   ''')
-
-        # Voorraad tabellen
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS ingredienten
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       naam
-                       TEXT
-                       UNIQUE
-                       NOT
-                       NULL,
-                       eenheid
-                       TEXT
-                       NOT
-                       NULL, -- bv. 'kg','st','l'
-                       minimum
-                       REAL
-                       DEFAULT
-                       0,    -- drempel voor waarschuwing
-                       huidige_voorraad
-                       REAL
-                       DEFAULT
-                       0
+               ''')
+
+    # Klant notities (geschiedenis)
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS klant_notities
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   klant_id
+                   INTEGER
+                   NOT
+                   NULL,
+                   notitie
+                   TEXT
+                   NOT
+                   NULL,
+                   aangemaakt_op
+                   TEXT
+                   NOT
+                   NULL,
+                   medewerker
+                   TEXT,
+                   FOREIGN
+                   KEY
+               (
+                   klant_id
+               ) REFERENCES klanten
+               (
+                   id
+               )
                    )
-                   ''')
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS recepturen
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       categorie
-                       TEXT
-                       NOT
-                       NULL,
-                       product
-                       TEXT
-                       NOT
-                       NULL,
-                       ingredient_id
-                       INTEGER
-                       NOT
-                       NULL,
-                       hoeveelheid_per_stuk
-                       REAL
-                       NOT
-                       NULL,
-                       UNIQUE
-                   (
-                       categorie,
-                       product,
-                       ingredient_id
-                   ),
-                       FOREIGN KEY
-                   (
-                       ingredient_id
-                   ) REFERENCES ingredienten
-                   (
-                       id
+               ''')
+
+    # Voorraad tabellen
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS ingredienten
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   naam
+                   TEXT
+                   UNIQUE
+                   NOT
+                   NULL,
+                   eenheid
+                   TEXT
+                   NOT
+                   NULL, -- bv. 'kg','st','l'
+                   minimum
+                   REAL
+                   DEFAULT
+                   0,    -- drempel voor waarschuwing
+                   huidige_voorraad
+                   REAL
+                   DEFAULT
+                   0
+               )
+               ''')
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS recepturen
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   categorie
+                   TEXT
+                   NOT
+                   NULL,
+                   product
+                   TEXT
+                   NOT
+                   NULL,
+                   ingredient_id
+                   INTEGER
+                   NOT
+                   NULL,
+                   hoeveelheid_per_stuk
+                   REAL
+                   NOT
+                   NULL,
+                   UNIQUE
+               (
+                   categorie,
+                   product,
+                   ingredient_id
+               ),
+                   FOREIGN KEY
+               (
+                   ingredient_id
+               ) REFERENCES ingredienten
+               (
+                   id
+               )
                    )
-                       )
-                   ''')
-        cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS voorraad_mutaties
-                   (
-                       id
-                       INTEGER
-                       PRIMARY
-                       KEY
-                       AUTOINCREMENT,
-                       ingredient_id
-                       INTEGER
-                       NOT
-                       NULL,
-                       mutatie
-                       REAL
-                       NOT
-                       NULL, -- + of - waarde
-                       reden
-                       TEXT,
-                       datumtijd
-                       TEXT
-                       NOT
-                       NULL, -- ISO timestamp
-                       FOREIGN
-                       KEY
-                   (
-                       ingredient_id
-                   ) REFERENCES ingredienten
-                   (
-                       id
+               ''')
+    cursor.execute('''
+               CREATE TABLE IF NOT EXISTS voorraad_mutaties
+               (
+                   id
+                   INTEGER
+                   PRIMARY
+                   KEY
+                   AUTOINCREMENT,
+                   ingredient_id
+                   INTEGER
+                   NOT
+                   NULL,
+                   mutatie
+                   REAL
+                   NOT
+                   NULL, -- + of - waarde
+                   reden
+                   TEXT,
+                   datumtijd
+                   TEXT
+                   NOT
+                   NULL, -- ISO timestamp
+                   FOREIGN
+                   KEY
+               (
+                   ingredient_id
+               ) REFERENCES ingredienten
+               (
+                   id
+               )
                    )
-                       )
-                   ''')
+               ''')
 
-        # Commit happens automatically in DatabaseContext.__exit__
-        logger.info("Tabellen zijn aangemaakt/bijgewerkt (indien nodig).")
-        
-        # Create indexes for query optimization
-        add_database_indexes(cursor)
+    logger.info("Tabellen zijn aangemaakt/bijgewerkt (indien nodig).")
 
 
 def add_database_indexes(cursor: sqlite3.Cursor) -> None:
@@ -574,106 +786,19 @@ def add_database_indexes(cursor: sqlite3.Cursor) -> None:
 
 
 def migrate_klanten_from_csv():
-    """Migreert klantgegevens van klanten.csv naar de SQLite database."""
-    if not os.path.exists("klanten.csv"):
-        logger.info("klanten.csv niet gevonden. Migratie overgeslagen.")
-        return
-
-    with DatabaseContext() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM klanten")
-        existing_count = cursor.fetchone()[0]
-        if existing_count > 0:
-            logger.info(f"Klantendatabase bevat al {existing_count} klanten. Migratie uit CSV wordt toch uitgevoerd (duplicaten worden overgeslagen).")
-
-    logger.info("Start migratie van klanten uit klanten.csv...")
+    """Migreert klantgegevens van klanten.csv naar de SQLite database (overgeslagen als het bestand ongewijzigd is)."""
+    from services.import_service import ImportService
     try:
-        with DatabaseContext() as conn:
-            cursor = conn.cursor()
-            with open("klanten.csv", 'r', encoding='latin-1', newline='') as f:
-                reader = csv.DictReader(f, delimiter=';')
-                klanten_to_insert = []
-                for row in reader:
-                    telefoon = row.get('Telefoonnummer', '').strip()
-                    if telefoon:
-                        klanten_to_insert.append((
-                            telefoon,
-                            row.get('Straat', '').strip(),
-                            row.get('Huisnummer', '').strip(),
-                            row.get('Plaats', '').strip(),
-                            row.get('Naam', '').strip()
-                        ))
-                if klanten_to_insert:
-                    cursor.executemany(
-                        "INSERT OR IGNORE INTO klanten (telefoon, straat, huisnummer, plaats, naam) VALUES (?, ?, ?, ?, ?)",
-                        klanten_to_insert
-                    )
-                    logger.info(f"{cursor.rowcount} unieke klanten gemigreerd uit klanten.csv.")
-                else:
-                    logger.warning("Geen klanten gevonden in klanten.csv om te migreren.")
+        ImportService.import_klanten_csv("klanten.csv")
     except Exception as e:
         logger.exception(f"Fout tijdens migratie van klanten uit CSV: {e}")
 
 
 def migrate_klanten_from_json():
-    """Migreert klantgegevens van klanten.json naar de SQLite database, indien nodig."""
-    if not os.path.exists("klanten.json"):
-        logger.info("klanten.json niet gevonden. Migratie overgeslagen.")
-        return
-
-    with DatabaseContext() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM klanten")
-        existing_count = cursor.fetchone()[0]
-        if existing_count > 0:
-            logger.info(f"Klantendatabase bevat al {existing_count} klanten. Migratie uit JSON wordt toch uitgevoerd (duplicaten worden overgeslagen).")
-
-    logger.info("Start migratie van klanten uit klanten.json...")
+    """Migreert klantgegevens van klanten.json naar de SQLite database (overgeslagen als het bestand ongewijzigd is)."""
+    from services.import_service import ImportService
     try:
-        import json
-        with DatabaseContext() as conn:
-            cursor = conn.cursor()
-            with open("klanten.json", 'r', encoding='utf-8') as f:
-                klanten_data = json.load(f)
-            
-            klanten_to_insert = []
-            
-            # Handle different JSON structures
-            if isinstance(klanten_data, list):
-                # If it's a list of customer objects
-                for klant in klanten_data:
-                    if isinstance(klant, dict):
-                        telefoon = klant.get('telefoon') or klant.get('Telefoonnummer') or klant.get('phone', '').strip()
-                        if telefoon:
-                            klanten_to_insert.append((
-                                str(telefoon).strip(),
-                                (klant.get('straat') or klant.get('Straat') or klant.get('adres') or klant.get('Adres') or '').strip(),
-                                (klant.get('huisnummer') or klant.get('Huisnummer') or klant.get('nr') or klant.get('Nr') or '').strip(),
-                                (klant.get('plaats') or klant.get('Plaats') or klant.get('postcode_gemeente') or klant.get('gemeente') or '').strip(),
-                                (klant.get('naam') or klant.get('Naam') or klant.get('name') or '').strip()
-                            ))
-            elif isinstance(klanten_data, dict):
-                # If it's a dictionary with customer objects
-                for key, klant in klanten_data.items():
-                    if isinstance(klant, dict):
-                        telefoon = klant.get('telefoon') or klant.get('Telefoonnummer') or klant.get('phone') or key
-                        if telefoon:
-                            klanten_to_insert.append((
-                                str(telefoon).strip(),
-                                (klant.get('straat') or klant.get('Straat') or klant.get('adres') or klant.get('Adres') or '').strip(),
-                                (klant.get('huisnummer') or klant.get('Huisnummer') or klant.get('nr') or klant.get('Nr') or '').strip(),
-                                (klant.get('plaats') or klant.get('Plaats') or klant.get('postcode_gemeente') or klant.get('gemeente') or '').strip(),
-                                (klant.get('naam') or klant.get('Naam') or klant.get('name') or '').strip()
-                            ))
-            
-            if klanten_to_insert:
-                cursor.executemany(
-                    "INSERT OR IGNORE INTO klanten (telefoon, straat, huisnummer, plaats, naam) VALUES (?, ?, ?, ?, ?)",
-                    klanten_to_insert
-                )
-                logger.info(f"{cursor.rowcount} unieke klanten gemigreerd uit klanten.json.")
-            else:
-                logger.warning("Geen klanten gevonden in klanten.json om te migreren.")
+        ImportService.import_klanten_json("klanten.json")
     except Exception as e:
         logger.exception(f"Fout tijdens migratie van klanten uit JSON: {e}")
 
@@ -691,50 +816,9 @@ def migrate_bestellingen_from_csv():
             logger.info("Database 'bestellingen' is niet leeg. Migratie overgeslagen.")
             return
 
-    logger.info("Start migratie van bestellingen uit bestellingen.csv...")
+    from services.import_service import ImportService
     try:
-        with DatabaseContext() as conn:
-            cursor = conn.cursor()
-            with open("bestellingen.csv", 'r', encoding='utf-8', newline='') as f:
-                reader = csv.reader(f, delimiter=';')
-                for row in reader:
-                    if len(row) < 8:
-                        continue  # Onvolledige rij
-
-                    order_datum, order_tijd, tel, straat, nr, plaats, totaal_str, bestelregels_json, *rest = row
-                    opmerking = rest[0] if rest else ""
-
-                    cursor.execute("SELECT id FROM klanten WHERE telefoon = ?", (tel.strip(),))
-                    klant_row = cursor.fetchone()
-                    klant_id = klant_row[0] if klant_row else None
-
-                    if not klant_id:
-                        continue  # Klant bestaat niet in database
-
-                    cursor.execute(
-                        "INSERT INTO bestellingen (klant_id, datum, tijd, totaal, opmerking) VALUES (?, ?, ?, ?, ?)",
-                        (klant_id, order_datum, order_tijd, float(totaal_str), opmerking)
-                    )
-                    bestelling_id = cursor.lastrowid
-
-                    try:
-                        bestelregels_data = json.loads(bestelregels_json)
-                    except Exception:
-                        bestelregels_data = []
-
-                    for regel in bestelregels_data:
-                        cursor.execute(
-                            "INSERT INTO bestelregels (bestelling_id, categorie, product, aantal, prijs, extras) VALUES (?, ?, ?, ?, ?, ?)",
-                            (
-                                bestelling_id,
-                                regel.get('categorie', ''),
-                                regel.get('product', ''),
-                                int(regel.get('aantal', 1)),
-                                float(regel.get('prijs', 0)),
-                                json.dumps(regel.get('extras', {}))
-                            )
-                        )
-            logger.info("Migratie van bestellingen voltooid.")
+        if ImportService.import_bestellingen_csv("bestellingen.csv") is not None:
             os.rename("bestellingen.csv", "bestellingen.csv.migrated")
             logger.info("bestellingen.csv is hernoemd naar bestellingen.csv.migrated.")
     except Exception as e:
@@ -752,9 +836,415 @@ def populate_koeriers_if_empty():
             cursor.executemany("INSERT INTO koeriers (naam) VALUES (?)", koeriers)
 
 
-def update_klant_statistieken(klant_id: int) -> None:
-    """Werk klantstatistieken (totaal bestellingen, besteed, laatste) bij."""
-    with DatabaseContext() as conn:
+# Triggers die de klantstatistieken met deltas bijhouden bij elke schrijfactie op
+# bestellingen (kassa én webshop), zodat het opslaan van een bestelling niet
+# trager wordt naarmate een klant meer bestellingen heeft.
+# laatste_bestelling wordt alleen herberekend als precies die bestelling wegvalt.
+KLANT_STATISTIEKEN_TRIGGERS = {
+    "trg_bestellingen_stats_insert": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_stats_insert
+        AFTER INSERT ON bestellingen
+        WHEN NEW.klant_id IS NOT NULL
+        BEGIN
+            UPDATE klanten
+            SET totaal_bestellingen = COALESCE(totaal_bestellingen, 0) + 1,
+                totaal_besteed      = COALESCE(totaal_besteed, 0) + COALESCE(NEW.totaal, 0),
+                laatste_bestelling  = CASE
+                    WHEN laatste_bestelling IS NULL OR laatste_bestelling < NEW.datum || ' ' || NEW.tijd
+                    THEN NEW.datum || ' ' || NEW.tijd
+                    ELSE laatste_bestelling END
+            WHERE id = NEW.klant_id;
+        END
+    """,
+    "trg_bestellingen_stats_delete": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_stats_delete
+        AFTER DELETE ON bestellingen
+        WHEN OLD.klant_id IS NOT NULL
+        BEGIN
+            UPDATE klanten
+            SET totaal_bestellingen = MAX(COALESCE(totaal_bestellingen, 0) - 1, 0),
+                totaal_besteed      = COALESCE(totaal_besteed, 0) - COALESCE(OLD.totaal, 0),
+                laatste_bestelling  = CASE
+                    WHEN laatste_bestelling = OLD.datum || ' ' || OLD.tijd
+                    THEN (SELECT MAX(datum || ' ' || tijd) FROM bestellingen WHERE klant_id = OLD.klant_id)
+                    ELSE laatste_bestelling END
+            WHERE id = OLD.klant_id;
+        END
+    """,
+    "trg_bestellingen_stats_update": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_stats_update
+        AFTER UPDATE OF klant_id, totaal, datum, tijd ON bestellingen
+        WHEN OLD.klant_id IS NOT NEW.klant_id OR OLD.totaal IS NOT NEW.totaal
+          OR OLD.datum IS NOT NEW.datum OR OLD.tijd IS NOT NEW.tijd
+        BEGIN
+            UPDATE klanten
+            SET totaal_bestellingen = MAX(COALESCE(totaal_bestellingen, 0) - 1, 0),
+                totaal_besteed      = COALESCE(totaal_besteed, 0) - COALESCE(OLD.totaal, 0),
+                laatste_bestelling  = (SELECT MAX(datum || ' ' || tijd) FROM bestellingen WHERE klant_id = OLD.klant_id)
+            WHERE id = OLD.klant_id;
+            UPDATE klanten
+            SET totaal_bestellingen = COALESCE(totaal_bestellingen, 0) + 1,
+                totaal_besteed      = COALESCE(totaal_besteed, 0) + COALESCE(NEW.totaal, 0),
+                laatste_bestelling  = (SELECT MAX(datum || ' ' || tijd) FROM bestellingen WHERE klant_id = NEW.klant_id)
+            WHERE id = NEW.klant_id;
+        END
+    """,
+}
+
+
+def create_klant_statistieken_triggers(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the triggers that keep klanten.totaal_bestellingen/totaal_besteed/
+    laatste_bestelling up to date incrementally.
+    
+    When the triggers did not exist yet, the existing statistics are rebuilt
+    once so the deltas start from correct values.
+    
+    Args:
+        cursor: Database cursor
+        
+    Returns:
+        True if the triggers were newly installed
+    """
+    cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({})".format(
+            ", ".join("?" * len(KLANT_STATISTIEKEN_TRIGGERS))
+        ),
+        tuple(KLANT_STATISTIEKEN_TRIGGERS)
+    )
+    already_installed = cursor.fetchone()[0] == len(KLANT_STATISTIEKEN_TRIGGERS)
+    for sql in KLANT_STATISTIEKEN_TRIGGERS.values():
+        cursor.execute(sql)
+    if already_installed:
+        return False
+    reconcile_klant_statistieken(cursor)
+    logger.info("Klantstatistieken-triggers geïnstalleerd")
+    return True
+
+
+def reconcile_klant_statistieken(cursor: Optional[sqlite3.Cursor] = None) -> int:
+    """
+    Rebuild the statistics of every customer in one set-based pass.
+    
+    Use this to repair statistics after manual edits or imports that bypassed
+    the triggers. The regular save/delete path does not need it.
+    
+    Args:
+        cursor: Optional cursor to run inside an existing transaction
+        
+    Returns:
+        Number of customer rows updated
+    """
+    if cursor is None:
+        with DatabaseContext() as conn:
+            return reconcile_klant_statistieken(conn.cursor())
+
+    cursor.execute("""
+                   UPDATE klanten
+                   SET totaal_bestellingen = s.aantal_bestellingen,
+                       totaal_besteed      = s.totaal_besteed,
+                       laatste_bestelling  = s.laatste_bestelling
+                   FROM (SELECT klant_id,
+                                COUNT(*)                  AS aantal_bestellingen,
+                                COALESCE(SUM(totaal), 0)  AS totaal_besteed,
+                                MAX(datum || ' ' || tijd) AS laatste_bestelling
+                         FROM bestellingen
+                         WHERE klant_id IS NOT NULL
+                         GROUP BY klant_id) AS s
+                   WHERE klanten.id = s.klant_id
+                   """)
+    updated = cursor.rowcount
+    # Klanten zonder (resterende) bestellingen
+    cursor.execute("""
+                   UPDATE klanten
+                   SET totaal_bestellingen = 0,
+                       totaal_besteed      = 0.0,
+                       laatste_bestelling  = NULL
+                   WHERE (COALESCE(totaal_bestellingen, 0) != 0
+                          OR COALESCE(totaal_besteed, 0) != 0
+                          OR laatste_bestelling IS NOT NULL)
+                     AND NOT EXISTS (SELECT 1 FROM bestellingen b WHERE b.klant_id = klanten.id)
+                   """)
+    updated += cursor.rowcount
+    logger.info(f"Klantstatistieken herberekend ({updated} klanten bijgewerkt)")
+    return updated
+
+
+# Tekens die uit een telefoonnummer verdwijnen voor de telefoon_norm sleutel
+TELEFOON_NORM_TEKENS = (" ", "\t", "\n", "\r", "-", "(", ")", ".")
+
+# Regels voor de telefoon_norm sleutel: (prefix, toegelaten lengtes of None,
+# aantal tekens vooraan te schrappen, nieuw prefix). De eerste passende regel
+# wint; een 0 gevolgd door 8 (vast) of 9 (gsm) cijfers is een Belgisch nationaal
+# nummer. normalize_phone_for_search en telefoon_norm_sql volgen allebei deze
+# tabel; de web backend (app/utils/phone_validator.py) heeft dezelfde kopie.
+TELEFOON_NORM_REGELS = (
+    ("+32", None, 0, ""),
+    ("0032", None, 4, "+32"),
+    ("32", (10, 11), 0, "+"),
+    ("0", (9, 10), 1, "+32"),
+)
+
+
+def telefoon_norm_sql(expr: str) -> str:
+    """
+    SQL expression that normalizes a phone number to the telefoon_norm key.
+    
+    Generated from TELEFOON_NORM_TEKENS / TELEFOON_NORM_REGELS, the same tables
+    repositories.customer_repository.normalize_phone_for_search uses, so the
+    triggers (which also fire for writes from the web backend) and the Python
+    lookups produce the same E.164 key.
+    """
+    cleaned = expr
+    for char in TELEFOON_NORM_TEKENS:
+        literal = f"'{char}'" if char.isprintable() else f"char({ord(char)})"
+        cleaned = f"replace({cleaned}, {literal}, '')"
+    whens = []
+    for prefix, lengtes, schrappen, nieuw in TELEFOON_NORM_REGELS:
+        conditie = f"substr({cleaned}, 1, {len(prefix)}) = '{prefix}'"
+        if lengtes:
+            conditie += f" AND length({cleaned}) IN ({', '.join(str(n) for n in lengtes)})"
+        waarde = f"substr({cleaned}, {schrappen + 1})" if schrappen else cleaned
+        if nieuw:
+            waarde = f"'{nieuw}' || {waarde}"
+        whens.append(f"WHEN {conditie} THEN {waarde}")
+    return "(CASE " + " ".join(whens) + f" ELSE {cleaned} END)"
+
+
+def add_telefoon_norm_column(cursor: sqlite3.Cursor) -> None:
+    """
+    Add klanten.telefoon_norm (canonical E.164 key) with a unique index and
+    triggers that keep it in sync with telefoon on every insert/update.
+    
+    Existing customers are backfilled once. When several customers share the same
+    normalized number only the oldest one gets the key; the others keep NULL and
+    are reported so they can be merged with scripts/merge_duplicate_customers.py.
+    
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute("PRAGMA table_info(klanten)")
+    if 'telefoon_norm' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE klanten ADD COLUMN telefoon_norm TEXT")
+
+    norm = telefoon_norm_sql("telefoon")
+    cursor.execute(f"""
+                   UPDATE klanten
+                   SET telefoon_norm = {norm}
+                   WHERE telefoon_norm IS NULL
+                     AND id IN (SELECT MIN(id) FROM klanten GROUP BY {norm})
+                     AND {norm} NOT IN (SELECT telefoon_norm FROM klanten WHERE telefoon_norm IS NOT NULL)
+                   """)
+    cursor.execute("SELECT COUNT(*) FROM klanten WHERE telefoon_norm IS NULL")
+    duplicaten = cursor.fetchone()[0]
+    if duplicaten:
+        logger.warning(
+            f"{duplicaten} klanten delen een telefoonnummer met een andere klant en kregen geen "
+            f"telefoon_norm; voeg ze samen met scripts/merge_duplicate_customers.py"
+        )
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_klanten_telefoon_norm ON klanten(telefoon_norm)")
+    cursor.execute(f"""
+                   CREATE TRIGGER IF NOT EXISTS trg_klanten_telefoon_norm_insert
+                   AFTER INSERT ON klanten
+                   BEGIN
+                       UPDATE klanten SET telefoon_norm = {telefoon_norm_sql("NEW.telefoon")} WHERE id = NEW.id;
+                   END
+                   """)
+    cursor.execute(f"""
+                   CREATE TRIGGER IF NOT EXISTS trg_klanten_telefoon_norm_update
+                   AFTER UPDATE OF telefoon ON klanten
+                   BEGIN
+                       UPDATE klanten SET telefoon_norm = {telefoon_norm_sql("NEW.telefoon")} WHERE id = NEW.id;
+                   END
+                   """)
+
+
+def create_klanten_zoekindex(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the FTS5 (trigram) search index over customer name, phone digits,
+    street and place, kept in sync with klanten by triggers.
+    
+    The phone column holds both the international digits (32471...) and the
+    national form (0471...), so partial numbers match in either notation.
+    When the SQLite build has no FTS5/trigram support the index is skipped and
+    searches fall back to LIKE.
+    
+    Args:
+        cursor: Database cursor
+        
+    Returns:
+        True if the index exists after this call
+    """
+    try:
+        cursor.execute("""
+                       CREATE VIRTUAL TABLE IF NOT EXISTS klanten_fts
+                       USING fts5(naam, telefoon, straat, plaats, tokenize = 'trigram')
+                       """)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 trigram-index niet beschikbaar, klanten zoeken valt terug op LIKE: {e}")
+        return False
+
+    def telefoon_cijfers(expr: str) -> str:
+        return f"""(SELECT replace(n, '+', '') || ' ' || CASE WHEN substr(n, 1, 3) = '+32' THEN '0' || substr(n, 4) ELSE '' END
+                    FROM (SELECT {telefoon_norm_sql(expr)} AS n))"""
+
+    cursor.execute(f"""
+                   CREATE TRIGGER IF NOT EXISTS trg_klanten_fts_insert
+                   AFTER INSERT ON klanten
+                   BEGIN
+                       INSERT INTO klanten_fts (rowid, naam, telefoon, straat, plaats)
+                       VALUES (NEW.id, NEW.naam, {telefoon_cijfers("NEW.telefoon")}, NEW.straat, NEW.plaats);
+                   END
+                   """)
+    cursor.execute("""
+                   CREATE TRIGGER IF NOT EXISTS trg_klanten_fts_delete
+                   AFTER DELETE ON klanten
+                   BEGIN
+                       DELETE FROM klanten_fts WHERE rowid = OLD.id;
+                   END
+                   """)
+    cursor.execute(f"""
+                   CREATE TRIGGER IF NOT EXISTS trg_klanten_fts_update
+                   AFTER UPDATE OF naam, telefoon, straat, plaats ON klanten
+                   BEGIN
+                       UPDATE klanten_fts
+                       SET naam = NEW.naam, telefoon = {telefoon_cijfers("NEW.telefoon")},
+                           straat = NEW.straat, plaats = NEW.plaats
+                       WHERE rowid = NEW.id;
+                   END
+                   """)
+    # (Her)vul de index met de bestaande klanten
+    cursor.execute("DELETE FROM klanten_fts")
+    cursor.execute(f"""
+                   INSERT INTO klanten_fts (rowid, naam, telefoon, straat, plaats)
+                   SELECT id, naam, {telefoon_cijfers("telefoon")}, straat, plaats FROM klanten
+                   """)
+    return True
+
+
+def _rollup_uur_sql(expr: str) -> str:
+    """SQL expression for the hour (0-23) of a tijd value ('HH:MM' from the kassa, 'HH:MM:SS' from the web)."""
+    return f"COALESCE(CAST(strftime('%H', {expr}) AS INTEGER), 0)"
+
+
+# Omzet per dag, uur en koerier (koerier_id 0 = niet toegewezen), bijgewerkt door
+# triggers in dezelfde transactie als de bestelling zelf.
+VERKOOP_ROLLUP_TABLE = """
+    CREATE TABLE IF NOT EXISTS verkoop_rollup (
+        datum      TEXT    NOT NULL,
+        uur        INTEGER NOT NULL,
+        koerier_id INTEGER NOT NULL DEFAULT 0,
+        aantal     INTEGER NOT NULL DEFAULT 0,
+        omzet      REAL    NOT NULL DEFAULT 0,
+        PRIMARY KEY (datum, uur, koerier_id)
+    ) WITHOUT ROWID
+"""
+
+_ROLLUP_PLUS = f"""
+            INSERT INTO verkoop_rollup (datum, uur, koerier_id, aantal, omzet)
+            VALUES (NEW.datum, {_rollup_uur_sql("NEW.tijd")}, COALESCE(NEW.koerier_id, 0), 1, COALESCE(NEW.totaal, 0))
+            ON CONFLICT (datum, uur, koerier_id)
+            DO UPDATE SET aantal = aantal + 1, omzet = omzet + excluded.omzet;"""
+
+_ROLLUP_MIN = f"""
+            UPDATE verkoop_rollup
+            SET aantal = aantal - 1, omzet = omzet - COALESCE(OLD.totaal, 0)
+            WHERE datum = OLD.datum AND uur = {_rollup_uur_sql("OLD.tijd")} AND koerier_id = COALESCE(OLD.koerier_id, 0);
+            DELETE FROM verkoop_rollup
+            WHERE datum = OLD.datum AND uur = {_rollup_uur_sql("OLD.tijd")} AND koerier_id = COALESCE(OLD.koerier_id, 0)
+              AND aantal <= 0;"""
+
+VERKOOP_ROLLUP_TRIGGERS = {
+    "trg_bestellingen_rollup_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_rollup_insert
+        AFTER INSERT ON bestellingen
+        BEGIN{_ROLLUP_PLUS}
+        END
+    """,
+    "trg_bestellingen_rollup_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_rollup_delete
+        AFTER DELETE ON bestellingen
+        BEGIN{_ROLLUP_MIN}
+        END
+    """,
+    "trg_bestellingen_rollup_update": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_rollup_update
+        AFTER UPDATE OF datum, tijd, koerier_id, totaal ON bestellingen
+        WHEN OLD.datum IS NOT NEW.datum OR OLD.tijd IS NOT NEW.tijd
+          OR OLD.koerier_id IS NOT NEW.koerier_id OR OLD.totaal IS NOT NEW.totaal
+        BEGIN{_ROLLUP_MIN}{_ROLLUP_PLUS}
+        END
+    """,
+}
+
+
+def create_verkoop_rollup(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the verkoop_rollup table and the triggers that maintain it.
+    
+    When the triggers did not exist yet, the rollup is rebuilt once from
+    bestellingen so the deltas start from correct values.
+    
+    Args:
+        cursor: Database cursor
+        
+    Returns:
+        True if the triggers were newly installed
+    """
+    cursor.execute(VERKOOP_ROLLUP_TABLE)
+    cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({})".format(
+            ", ".join("?" * len(VERKOOP_ROLLUP_TRIGGERS))
+        ),
+        tuple(VERKOOP_ROLLUP_TRIGGERS)
+    )
+    already_installed = cursor.fetchone()[0] == len(VERKOOP_ROLLUP_TRIGGERS)
+    for sql in VERKOOP_ROLLUP_TRIGGERS.values():
+        cursor.execute(sql)
+    if already_installed:
+        return False
+    rebuild_verkoop_rollup(cursor)
+    logger.info("Verkoop-rollup en triggers geïnstalleerd")
+    return True
+
+
+def rebuild_verkoop_rollup(cursor: Optional[sqlite3.Cursor] = None) -> int:
+    """
+    Rebuild verkoop_rollup from scratch out of bestellingen.
+    
+    Use this after imports or manual edits that bypassed the triggers.
+    
+    Args:
+        cursor: Optional cursor to run inside an existing transaction
+        
+    Returns:
+        Number of rollup rows written
+    """
+    if cursor is None:
+        with DatabaseContext() as conn:
+            return rebuild_verkoop_rollup(conn.cursor())
+
+    cursor.execute("DELETE FROM verkoop_rollup")
+    cursor.execute(f"""
+                   INSERT INTO verkoop_rollup (datum, uur, koerier_id, aantal, omzet)
+                   SELECT datum, {_rollup_uur_sql("tijd")}, COALESCE(koerier_id, 0), COUNT(*), COALESCE(SUM(totaal), 0)
+                   FROM bestellingen
+                   GROUP BY 1, 2, 3
+                   """)
+    written = cursor.rowcount
+    logger.info(f"Verkoop-rollup herberekend ({written} rijen)")
+    return written
+
+
+def update_klant_statistieken(klant_id: int, uow: Optional[UnitOfWork] = None) -> None:
+    """
+    Herbereken de klantstatistieken (totaal bestellingen, besteed, laatste) van één klant.
+    
+    Bestellingen opslaan/verwijderen houdt de statistieken al bij via triggers;
+    deze volledige herberekening is alleen nog nodig als reparatie.
+    """
+    with DatabaseContext(uow) as conn:
         cursor = conn.cursor()
         cursor.execute("""
                        SELECT COUNT(*)                  AS aantal_bestellingen,
@@ -774,9 +1264,71 @@ def update_klant_statistieken(klant_id: int) -> None:
                        (stats['aantal_bestellingen'], stats['totaal_besteed'], stats['laatste_bestelling'], klant_id))
 
 
-def boek_voorraad_verbruik(bestelling_id: int) -> None:
-    """Boekt voorraadverbruik voor alle bestelregels via recepturen."""
-    with DatabaseContext() as conn:
+# In-memory receptenindex: (categorie, product) genormaliseerd -> [(ingredient_id, hoeveelheid_per_stuk)]
+# Wordt één keer opgebouwd en ongeldig gemaakt wanneer recepturen wijzigen
+# (zie invalidate_recepturen_cache), zodat voorraadboeking geen query per bestelregel kost.
+_recepturen_cache: Optional[Dict[tuple, List[tuple]]] = None
+_recepturen_cache_lock = threading.Lock()
+
+
+def _receptuur_key(categorie: Optional[str], product: Optional[str]) -> tuple:
+    """Normalized lookup key for a recipe (case- and whitespace-insensitive)."""
+    return ((categorie or "").strip().casefold(), (product or "").strip().casefold())
+
+
+def get_recepturen_index(cursor: Optional[sqlite3.Cursor] = None) -> Dict[tuple, List[tuple]]:
+    """
+    Return the cached recipe index, building it from 'recepturen' if needed.
+    
+    Args:
+        cursor: Optional cursor to build the index with (e.g. inside a unit of work)
+        
+    Returns:
+        Dict mapping normalized (categorie, product) to (ingredient_id, hoeveelheid_per_stuk) tuples
+    """
+    global _recepturen_cache
+    index = _recepturen_cache
+    if index is not None:
+        return index
+
+    with _recepturen_cache_lock:
+        if _recepturen_cache is not None:
+            return _recepturen_cache
+        if cursor is None:
+            with DatabaseContext() as conn:
+                rows = conn.execute(
+                    "SELECT categorie, product, ingredient_id, hoeveelheid_per_stuk FROM recepturen"
+                ).fetchall()
+        else:
+            rows = cursor.execute(
+                "SELECT categorie, product, ingredient_id, hoeveelheid_per_stuk FROM recepturen"
+            ).fetchall()
+        index = {}
+        for row in rows:
+            index.setdefault(_receptuur_key(row["categorie"], row["product"]), []).append(
+                (row["ingredient_id"], float(row["hoeveelheid_per_stuk"]))
+            )
+        _recepturen_cache = index
+        logger.debug(f"Receptenindex opgebouwd ({len(rows)} regels, {len(index)} producten)")
+        return index
+
+
+def invalidate_recepturen_cache() -> None:
+    """Drop the cached recipe index; call this after every change to 'recepturen'."""
+    global _recepturen_cache
+    with _recepturen_cache_lock:
+        _recepturen_cache = None
+
+
+def boek_voorraad_verbruik(bestelling_id: int, uow: Optional[UnitOfWork] = None) -> None:
+    """
+    Boekt voorraadverbruik voor alle bestelregels via recepturen.
+    
+    Recepten komen uit de in-memory receptenindex; de mutaties worden met één
+    executemany geschreven en de voorraad met één UPDATE ... FROM bijgewerkt,
+    ongeacht het aantal bestelregels.
+    """
+    with DatabaseContext(uow) as conn:
         cur = conn.cursor()
         # Haal regels op
         cur.execute("""
@@ -786,83 +1338,358 @@ def boek_voorraad_verbruik(bestelling_id: int) -> None:
                     """, (bestelling_id,))
         regels = cur.fetchall()
 
+        recepturen = get_recepturen_index(cur)
         verbruik = {}  # ingredient_id -> totale verbruik
 
         for r in regels:
-            categorie = (r["categorie"] or "").strip()
-            product = (r["product"] or "").strip()
             aantal = int(r["aantal"] or 0)
-
             if aantal <= 0:
                 continue
 
-            # Receptuurregels ophalen
-            cur.execute("""
-                        SELECT ingredient_id, hoeveelheid_per_stuk
-                        FROM recepturen
-                        WHERE LOWER(categorie) = LOWER(?)
-                          AND product = ?
-                        """, (categorie, product))
-            recs = cur.fetchall()
-            for rec in recs:
-                ingredient_id = rec["ingredient_id"]
-                qty = float(rec["hoeveelheid_per_stuk"]) * aantal
-                verbruik[ingredient_id] = verbruik.get(ingredient_id, 0.0) + qty
-
-        # Boek verbruik
+            for ingredient_id, per_stuk in recepturen.get(_receptuur_key(r["categorie"], r["product"]), ()):
+                verbruik[ingredient_id] = verbruik.get(ingredient_id, 0.0) + per_stuk * aantal
+
+        if not verbruik:
+            return
+
+        # Boek verbruik: alle mutaties in één keer
         now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        for ingr_id, qty in verbruik.items():
-            # Mutatie opslaan
-            cur.execute("""
+        reden = f"Bestelling #{bestelling_id}"
+        cur.executemany("""
                         INSERT INTO voorraad_mutaties (ingredient_id, mutatie, reden, datumtijd)
                         VALUES (?, ?, ?, ?)
-                        """, (ingr_id, -qty, f"Bestelling #{bestelling_id}", now_str))
-            # Voorraad updaten
-            cur.execute("""
-                        UPDATE ingredienten
-                        SET huidige_voorraad = COALESCE(huidige_voorraad, 0) - ?
-                        WHERE id = ?
-                        """, (qty, ingr_id))
+                        """, [(ingr_id, -qty, reden, now_str) for ingr_id, qty in verbruik.items()])
+        # Voorraad updaten in één statement
+        values_sql = ", ".join(["(?, ?)"] * len(verbruik))
+        params = [value for item in verbruik.items() for value in item]
+        cur.execute(f"""
+                    UPDATE ingredienten
+                    SET huidige_voorraad = COALESCE(huidige_voorraad, 0) - v.column2
+                    FROM (VALUES {values_sql}) AS v
+                    WHERE ingredienten.id = v.column1
+                    """, params)
+
+
+# Bonnummers reserveren per blok: (DB_FILE, jaar, dag) -> [volgende, laatste] van het blok dat
+# dit proces al heeft gereserveerd. Grootte 1 = geen reservering (doorlopende nummers zonder gaten).
+_bon_block_size = 1
+_bon_blocks: Dict[tuple, List[int]] = {}
+_bon_blocks_lock = threading.Lock()
+
+
+def set_bonnummer_block_size(size: int) -> None:
+    """
+    Reserve receipt numbers per block of `size` in this process.
+    
+    With a block, most numbers are handed out from memory without taking the
+    database write lock. Numbers from different terminals then interleave and
+    the unused rest of a block at the end of the day is skipped (gaps).
+    """
+    global _bon_block_size
+    if size < 1:
+        raise ValueError("Blokgrootte moet minstens 1 zijn")
+    with _bon_blocks_lock:
+        _bon_block_size = size
+        _bon_blocks.clear()
 
 
-def get_next_bonnummer(peek_only: bool = False) -> str:
-    """Get next receipt number, optionally just peeking without incrementing."""
+def allocate_bonnummers(cursor: sqlite3.Cursor, jaar: int, dag: int, aantal: int = 1) -> int:
+    """
+    Atomically reserve `aantal` receipt numbers for a day in one statement.
+    
+    The upsert both creates the day's counter and increments it, and RETURNING
+    gives the new value, so no reader can see the old value in between.
+    The backend (app/api/orders.py) runs the same statement.
+    
+    Args:
+        cursor: Cursor inside a write transaction (BEGIN IMMEDIATE)
+        jaar: Year
+        dag: Day of the year (1-366)
+        aantal: Number of receipt numbers to reserve
+        
+    Returns:
+        The last reserved number; the block is [result - aantal + 1, result]
+    """
+    cursor.execute("""
+                   INSERT INTO bon_teller (jaar, dag, laatste_nummer)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT (jaar, dag) DO UPDATE SET laatste_nummer = laatste_nummer + excluded.laatste_nummer
+                   RETURNING laatste_nummer
+                   """, (jaar, dag, aantal))
+    # fetchall: het statement moet volledig afgelopen zijn vóór de commit
+    return cursor.fetchall()[0][0]
+
+
+def get_next_bonnummer(peek_only: bool = False, uow: Optional[UnitOfWork] = None) -> str:
+    """
+    Get next receipt number, optionally just peeking without incrementing.
+    
+    Without a unit of work the number is allocated in its own short
+    BEGIN IMMEDIATE transaction. Inside a unit of work it is allocated in that
+    transaction, so a rolled-back order does not use up a number; a reserved
+    block only becomes usable for later orders once the order is committed.
+    """
     # Note: datetime is already imported at module level
     now = datetime.datetime.now()
     jaar = now.year
     dag_in_jaar = now.timetuple().tm_yday  # dagnummer in jaar (1-366)
+    block_key = (DB_FILE, jaar, dag_in_jaar)
+
+    with _bon_blocks_lock:
+        block = _bon_blocks.get(block_key)
+        if block and block[0] <= block[1]:
+            next_number = block[0]
+            if not peek_only:
+                block[0] += 1
+            # Bonnummer structuur: YYYYNNNN (dag telt alleen voor reset, niet zichtbaar in bonnummer)
+            return f"{jaar}{next_number:04d}"
+        block_size = _bon_block_size
+
+    if peek_only:
+        with DatabaseContext(uow) as conn:
+            row = conn.execute(
+                "SELECT laatste_nummer FROM bon_teller WHERE jaar = ? AND dag = ?",
+                (jaar, dag_in_jaar)
+            ).fetchone()
+        next_number = (row['laatste_nummer'] if row else 0) + 1
+        return f"{jaar}{next_number:04d}"
 
-    with DatabaseContext() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR IGNORE INTO bon_teller (jaar, dag, laatste_nummer) VALUES (?, ?, 0)",
-            (jaar, dag_in_jaar)
-        )
-        cursor.execute(
-            "SELECT laatste_nummer FROM bon_teller WHERE jaar = ? AND dag = ?",
-            (jaar, dag_in_jaar)
-        )
-        result = cursor.fetchone()
-        current_last_number = result['laatste_nummer'] if result else 0
-        next_number = current_last_number + 1
+    if uow is not None:
+        last = allocate_bonnummers(uow.cursor(), jaar, dag_in_jaar, block_size)
+    else:
+        with UnitOfWork() as own_uow:
+            last = allocate_bonnummers(own_uow.cursor(), jaar, dag_in_jaar, block_size)
+    next_number = last - block_size + 1
+
+    if block_size > 1:
+        def install_block():
+            with _bon_blocks_lock:
+                # Blokken van vorige dagen zijn niet meer bruikbaar
+                for key in [k for k in _bon_blocks if k[0] == DB_FILE and k != block_key]:
+                    del _bon_blocks[key]
+                _bon_blocks[block_key] = [next_number + 1, last]
+
+        if uow is not None:
+            uow.after_commit(install_block)
+        else:
+            install_block()
+
+    return f"{jaar}{next_number:04d}"
+
+
+def create_import_register(cursor: sqlite3.Cursor) -> None:
+    """Create import_bestanden: fingerprint (size, mtime, sha256) of every imported legacy file."""
+    cursor.execute("""
+                   CREATE TABLE IF NOT EXISTS import_bestanden
+                   (
+                       pad             TEXT PRIMARY KEY,
+                       grootte         INTEGER NOT NULL,
+                       mtime           REAL    NOT NULL,
+                       sha256          TEXT    NOT NULL,
+                       rijen           INTEGER NOT NULL DEFAULT 0,
+                       geimporteerd_op TEXT
+                   )
+                   """)
+
+
+# Wijzigingslog van online bestellingen: elke insert/update/delete van een online
+# bestelling of haar bestelregels krijgt een oplopend volgnummer (seq). Clients
+# vragen alleen de wijzigingen na hun laatste seq op (GET /orders/online/pending?since=).
+BESTELLING_WIJZIGINGEN_TABLE = """
+    CREATE TABLE IF NOT EXISTS bestelling_wijzigingen (
+        seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+        bestelling_id INTEGER NOT NULL,
+        actie         TEXT    NOT NULL  -- 'I' nieuw, 'U' gewijzigd, 'D' verwijderd
+    )
+"""
+
+# Aantal logregels dat bewaard blijft; een client met een oudere cursor krijgt een volledige sync.
+BESTELLING_WIJZIGINGEN_BEWAREN = 10000
+
+_ONLINE_REGEL = "EXISTS (SELECT 1 FROM bestellingen WHERE id = {}.bestelling_id AND online_bestelling = 1)"
+
+BESTELLING_WIJZIGINGEN_TRIGGERS = {
+    "trg_bestellingen_log_insert": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_log_insert
+        AFTER INSERT ON bestellingen
+        WHEN NEW.online_bestelling = 1
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.id, 'I');
+        END
+    """,
+    "trg_bestellingen_log_update": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_log_update
+        AFTER UPDATE ON bestellingen
+        WHEN NEW.online_bestelling = 1 OR OLD.online_bestelling = 1
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.id, 'U');
+        END
+    """,
+    "trg_bestellingen_log_delete": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_log_delete
+        AFTER DELETE ON bestellingen
+        WHEN OLD.online_bestelling = 1
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (OLD.id, 'D');
+        END
+    """,
+    "trg_bestelregels_log_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelregels_log_insert
+        AFTER INSERT ON bestelregels
+        WHEN {_ONLINE_REGEL.format("NEW")}
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.bestelling_id, 'U');
+        END
+    """,
+    "trg_bestelregels_log_update": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelregels_log_update
+        AFTER UPDATE ON bestelregels
+        WHEN {_ONLINE_REGEL.format("NEW")}
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.bestelling_id, 'U');
+        END
+    """,
+    "trg_bestelregels_log_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelregels_log_delete
+        AFTER DELETE ON bestelregels
+        WHEN {_ONLINE_REGEL.format("OLD")}
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (OLD.bestelling_id, 'U');
+        END
+    """,
+    # Log begrenzen: om de 1000 regels alles ouder dan de laatste BEWAREN regels wissen
+    "trg_bestelling_wijzigingen_opruimen": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelling_wijzigingen_opruimen
+        AFTER INSERT ON bestelling_wijzigingen
+        WHEN NEW.seq % 1000 = 0
+        BEGIN
+            DELETE FROM bestelling_wijzigingen WHERE seq <= NEW.seq - {BESTELLING_WIJZIGINGEN_BEWAREN};
+        END
+    """,
+}
+
+
+def create_bestelling_wijzigingen(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the bestelling_wijzigingen change log and the triggers that fill it.
+    
+    Adds bestellingen.online_bestelling first when the web backend has not
+    created it yet (the triggers only log online orders).
+    
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute("PRAGMA table_info(bestellingen)")
+    if 'online_bestelling' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE bestellingen ADD COLUMN online_bestelling INTEGER DEFAULT 0")
+    cursor.execute(BESTELLING_WIJZIGINGEN_TABLE)
+    for sql in BESTELLING_WIJZIGINGEN_TRIGGERS.values():
+        cursor.execute(sql)
 
-        if not peek_only:
-            cursor.execute(
-                "UPDATE bon_teller SET laatste_nummer = ? WHERE jaar = ? AND dag = ?",
-                (next_number, jaar, dag_in_jaar)
-            )
 
-        # Bonnummer structuur: YYYYNNNN (dag telt alleen voor reset, niet zichtbaar in bonnummer)
-        return f"{jaar}{next_number:04d}"
+def add_bonnummer_index(cursor: sqlite3.Cursor) -> None:
+    """Index bestellingen.bonnummer for order tracking by receipt number (web backend)."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bestellingen_bonnummer ON bestellingen(bonnummer)")
+
+
+def refresh_telefoon_norm(cursor: sqlite3.Cursor) -> None:
+    """
+    Re-key klanten.telefoon_norm after a change of TELEFOON_NORM_REGELS.
+    
+    The telefoon_norm and klanten_fts triggers embed telefoon_norm_sql, so they
+    are dropped and recreated. Keys that differ from the new rules are cleared
+    and backfilled like in add_telefoon_norm_column; a customer whose new key
+    is already taken keeps NULL and is reported as a duplicate.
+    
+    Args:
+        cursor: Database cursor
+    """
+    for trigger in ("trg_klanten_telefoon_norm_insert", "trg_klanten_telefoon_norm_update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute(f"""
+                   UPDATE klanten
+                   SET telefoon_norm = NULL
+                   WHERE telefoon_norm IS NOT {telefoon_norm_sql("telefoon")}
+                   """)
+    add_telefoon_norm_column(cursor)
+
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'klanten_fts'")
+    if cursor.fetchone():
+        for trigger in ("trg_klanten_fts_insert", "trg_klanten_fts_update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        create_klanten_zoekindex(cursor)
+
+
+# Schema-migraties: (versie, omschrijving, functie). De huidige versie staat in
+# PRAGMA user_version; alleen migraties met een hoger nummer worden uitgevoerd.
+# Nieuwe migraties altijd achteraan toevoegen met het volgende nummer.
+MIGRATIONS = [
+    (1, "Basisschema", _migratie_001_basisschema),
+    (2, "Indexen", add_database_indexes),
+    (3, "Klantstatistieken-triggers", create_klant_statistieken_triggers),
+    (4, "Genormaliseerd telefoonnummer", add_telefoon_norm_column),
+    (5, "Zoekindex klanten (FTS5)", create_klanten_zoekindex),
+    (6, "Verkoop-rollup", create_verkoop_rollup),
+    (7, "Importregister", create_import_register),
+    (8, "Wijzigingslog online bestellingen", create_bestelling_wijzigingen),
+    (9, "Index op bonnummer", add_bonnummer_index),
+    (10, "Telefoon_norm voor vaste nummers", refresh_telefoon_norm),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version stored in PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations() -> List[int]:
+    """
+    Voert alle openstaande schema-migraties uit.
+    
+    Each migration runs in its own BEGIN IMMEDIATE transaction together with
+    the user_version bump, so a failed migration leaves the database at the
+    previous version. Every migration is timed and logged.
+    
+    Returns:
+        List of applied migration versions (empty if the schema was up to date)
+        
+    Raises:
+        DatabaseError: If a migration fails
+    """
+    with DatabaseContext() as conn:
+        current = get_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    total_start = time.perf_counter()
+    for versie, omschrijving, migratie in MIGRATIONS:
+        if versie <= current:
+            continue
+        start = time.perf_counter()
+        try:
+            with UnitOfWork() as uow:
+                migratie(uow.cursor())
+                # PRAGMA accepteert geen parameters; versie is altijd een int uit MIGRATIONS
+                uow.conn.execute(f"PRAGMA user_version = {int(versie)}")
+        except Exception as e:
+            logger.exception(f"Migratie {versie} ({omschrijving}) mislukt: {e}")
+            raise DatabaseError(f"Databasemigratie {versie} ({omschrijving}) mislukt: {e}") from e
+        duur_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Migratie {versie} ({omschrijving}) uitgevoerd in {duur_ms:.1f} ms")
+        applied.append(versie)
+
+    logger.info(
+        f"Databaseschema bijgewerkt van versie {current} naar {SCHEMA_VERSION} "
+        f"in {(time.perf_counter() - total_start) * 1000:.1f} ms"
+    )
+    return applied
 
 
 def initialize_database():
-    """Initialiseert de database: maakt tabellen aan en migreert data."""
+    """Initialiseert de database: voert openstaande migraties uit en migreert data."""
     create_tables()
-    # Ensure indexes exist (in case tables were created before index function was added)
-    with DatabaseContext() as conn:
-        cursor = conn.cursor()
-        add_database_indexes(cursor)
     populate_koeriers_if_empty()
     migrate_klanten_from_csv()
     migrate_klanten_from_json()  # Also migrate from JSON if it exists
@@ -527,12 +527,8 @@ class HistoryManager:
         bestelling_id = int(selected_item_id)
         
         try:
-            klant_id = self.service.delete_order(bestelling_id)
-            
-            # Update customer statistics if needed
-            if klant_id:
-                from database import update_klant_statistieken
-                update_klant_statistieken(klant_id)
+            # Customer statistics are corrected by the bestellingen delete trigger
+            self.service.delete_order(bestelling_id)
             
             messagebox.showinfo("Succes", "Bestelling succesvol verwijderd.", parent=self.parent)
             self.refresh_data(force=True)
@@ -554,16 +550,8 @@ class HistoryManager:
         
         # User confirmed - delete all orders immediately
         try:
-            klant_ids = self.service.delete_all_orders()
-            
-            # Update customer statistics if needed
-            if klant_ids:
-                from database import update_klant_statistieken
-                for klant_id in klant_ids:
-                    try:
-                        update_klant_statistieken(klant_id)
-                    except Exception as e:
-                        logger.warning(f"Error updating statistics for customer {klant_id}: {e}")
+            # Customer statistics are corrected by the bestellingen delete trigger
+            self.service.delete_all_orders()
             
             messagebox.showinfo("Succes", "Alle bestellingen zijn succesvol verwijderd.", parent=self.parent)
             self.refresh_data(force=True)
@@ -9,6 +9,7 @@ from datetime import date, datetime
 from database import DatabaseContext
 from exceptions import DatabaseError
 from logging_config import get_logger
+from repositories.customer_repository import build_zoek_query, has_zoekindex, zoek_like_filter
 import json
 
 logger = get_logger("pizzeria.history_service")
@@ -59,9 +60,19 @@ class HistoryService:
                 conditions = []
                 
                 if search_term and search_term.strip():
-                    search = f"%{search_term.strip()}%"
-                    conditions.append("(k.naam LIKE ? OR k.telefoon LIKE ? OR k.straat LIKE ?)")
-                    params.extend([search, search, search])
+                    match, kort = build_zoek_query(search_term)
+                    if match and has_zoekindex(conn):
+                        # Klanten via de FTS-index, niet per bestelling een LIKE-scan
+                        like_sql, like_params = zoek_like_filter(kort, ("k.naam", "k.telefoon", "k.straat"))
+                        conditions.append(
+                            f"b.klant_id IN (SELECT rowid FROM klanten_fts WHERE klanten_fts MATCH ?){like_sql}"
+                        )
+                        params.append(match)
+                        params.extend(like_params)
+                    else:
+                        search = f"%{search_term.strip()}%"
+                        conditions.append("(k.naam LIKE ? OR k.telefoon LIKE ? OR k.straat LIKE ?)")
+                        params.extend([search, search, search])
                 
                 if date_filter and date_filter.strip():
                     conditions.append("b.datum = ?")
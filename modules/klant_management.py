@@ -4,6 +4,7 @@ import json
 import datetime
 import database
 from database import DatabaseContext
+from repositories.customer_repository import CustomerRepository
 
 
 def open_klant_management(root):
@@ -108,30 +109,13 @@ def open_klant_management(root):
             klanten_tree.delete(*klanten_tree.get_children())
 
             try:
-                with DatabaseContext() as conn:
-                    cursor = conn.cursor()
-
-                    if zoekterm:
-                        # Zoek op telefoon, naam, adres
-                        cursor.execute("""
-                                       SELECT id,
-                                              telefoon,
-                                              naam,
-                                              straat,
-                                              huisnummer,
-                                              plaats,
-                                              laatste_bestelling,
-                                              totaal_bestellingen,
-                                              totaal_besteed
-                                       FROM klanten
-                                       WHERE telefoon LIKE ?
-                                          OR naam LIKE ?
-                                          OR straat LIKE ?
-                                       ORDER BY naam
-                                       """, (f"%{zoekterm}%", f"%{zoekterm}%", f"%{zoekterm}%"))
-                    else:
+                if zoekterm:
+                    # Zoek op telefoon, naam, adres (FTS-index, beste match eerst)
+                    klanten = CustomerRepository.search(zoekterm, limit=500)
+                else:
+                    with DatabaseContext() as conn:
                         # Toon alle klanten, alfabetisch gesorteerd op naam
-                        cursor.execute("""
+                        klanten = conn.execute("""
                                        SELECT id,
                                               telefoon,
                                               naam,
@@ -143,26 +127,26 @@ def open_klant_management(root):
                                               totaal_besteed
                                        FROM klanten
                                        ORDER BY naam
-                                       """)
-
-                    for klant in cursor.fetchall():
-                        adres = f"{klant['straat'] or ''} {klant['huisnummer'] or ''}".strip()
-                        laatste_bestelling = klant['laatste_bestelling'] or 'Nooit'
-                        if laatste_bestelling != 'Nooit' and ' ' in laatste_bestelling:
-                            # Format datum
-                            try:
-                                datum_deel = laatste_bestelling.split(' ')[0]
-                                laatste_bestelling = datetime.datetime.strptime(datum_deel, '%Y-%m-%d').strftime('%d/%m/%Y')
-                            except:
-                                pass
-
-                        klanten_tree.insert("", tk.END, iid=klant['id'], values=(
-                            klant['telefoon'],
-                            klant['naam'] or '',
-                            adres,
-                            laatste_bestelling,
-                            klant['totaal_bestellingen'] or 0
-                        ))
+                                       """).fetchall()
+
+                for klant in klanten:
+                    adres = f"{klant['straat'] or ''} {klant['huisnummer'] or ''}".strip()
+                    laatste_bestelling = klant['laatste_bestelling'] or 'Nooit'
+                    if laatste_bestelling != 'Nooit' and ' ' in laatste_bestelling:
+                        # Format datum
+                        try:
+                            datum_deel = laatste_bestelling.split(' ')[0]
+                            laatste_bestelling = datetime.datetime.strptime(datum_deel, '%Y-%m-%d').strftime('%d/%m/%Y')
+                        except:
+                            pass
+
+                    klanten_tree.insert("", tk.END, iid=klant['id'], values=(
+                        klant['telefoon'],
+                        klant['naam'] or '',
+                        adres,
+                        laatste_bestelling,
+                        klant['totaal_bestellingen'] or 0
+                    ))
             except Exception as e:
                 messagebox.showerror("Fout", f"Fout bij zoeken: {e}")
         
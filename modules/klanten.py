@@ -3,6 +3,7 @@ from tkinter import ttk, Entry, StringVar
 from typing import List
 import database
 from database import DatabaseContext
+from repositories.customer_repository import CustomerRepository
 import threading
 from queue import Queue
 
@@ -62,26 +63,23 @@ def open_klanten_zoeken(
             """Background thread worker for database search."""
             nonlocal searching
             try:
-                with DatabaseContext() as conn:
-                    if term:
-                        # Search with term
-                        cur = conn.execute(
-                            "SELECT id, telefoon, naam, straat, huisnummer FROM klanten WHERE telefoon LIKE ? ORDER BY naam",
-                            (f"%{term}%",)
-                        )
-                    else:
-                        # Show all customers when search is empty
-                        cur = conn.execute(
+                if term:
+                    # Search with term (FTS index on phone, name, street and place)
+                    rows = CustomerRepository.search(term, limit=500)
+                else:
+                    # Show all customers when search is empty
+                    with DatabaseContext() as conn:
+                        rows = conn.execute(
                             "SELECT id, telefoon, naam, straat, huisnummer FROM klanten ORDER BY naam LIMIT 500"
-                        )
-                    
-                    results = []
-                    for r in cur.fetchall():
-                        adres = f"{r['straat'] or ''} {r['huisnummer'] or ''}".strip()
-                        results.append((str(r['id']), r['telefoon'], r['naam'] or "", adres))
-                    
-                    # Put results in queue for main thread
-                    search_queue.put(("success", results))
+                        ).fetchall()
+                
+                results = []
+                for r in rows:
+                    adres = f"{r['straat'] or ''} {r['huisnummer'] or ''}".strip()
+                    results.append((str(r['id']), r['telefoon'], r['naam'] or "", adres))
+                
+                # Put results in queue for main thread
+                search_queue.put(("success", results))
             except Exception as e:
                 search_queue.put(("error", str(e)))
             finally:
@@ -1867,8 +1867,22 @@ class CourierManager:
             logger.debug(f"Error authenticating with API: {e}")
             return False
     
+    def _patch_order_statuses(self, updates: List[Dict], timeout: float = 5) -> requests.Response:
+        """
+        Send status/courier updates for several online orders in one request
+        (PATCH /orders/status:batch, one transaction on the backend).
+        Re-authenticates once if the token expired.
+        """
+        url = f"{self.api_base_url}/orders/status:batch"
+        response = self.api_session.patch(url, json={"updates": updates}, timeout=timeout)
+        if response.status_code == 401:
+            logger.warning("Authentication expired, re-authenticating...")
+            if self.authenticate_api():
+                response = self.api_session.patch(url, json={"updates": updates}, timeout=timeout)
+        return response
+    
     def assign_online_orders(self, order_ids: List[int], koerier_id: int) -> None:
-        """Assign online orders to a courier via API."""
+        """Assign online orders to a courier via API (one batch request)."""
         try:
             # Ensure we're authenticated
             if not self.api_token:
@@ -1877,53 +1891,30 @@ class CourierManager:
                     messagebox.showerror("Fout", "Kon niet authenticeren met de backend API. Controleer of de backend draait.")
                     return
             
-            for order_id in order_ids:
-                try:
-                    response = self.api_session.put(
-                        f"{self.api_base_url}/orders/{order_id}/status",
-                        json={
-                            "new_status": "Onderweg",  # Set status to Onderweg when assigning courier
-                            "koerier_id": koerier_id
-                        },
-                        timeout=5
-                    )
-                    
-                    if response.status_code == 200:
-                        logger.info(f"Successfully assigned courier {koerier_id} to online order {order_id}")
-                    elif response.status_code == 401:
-                        # Re-authenticate and retry once
-                        logger.warning(f"Authentication expired, re-authenticating...")
-                        if self.authenticate_api():
-                            response = self.api_session.put(
-                                f"{self.api_base_url}/orders/{order_id}/status",
-                                json={
-                                    "new_status": "Onderweg",
-                                    "koerier_id": koerier_id
-                                },
-                                timeout=5
-                            )
-                            if response.status_code == 200:
-                                logger.info(f"Successfully assigned courier {koerier_id} to online order {order_id} after re-auth")
-                            else:
-                                logger.error(f"Failed to assign courier to online order {order_id} after re-auth: {response.status_code} - {response.text}")
-                                messagebox.showerror("Fout", f"Kon koerier niet toewijzen aan bestelling {order_id}: {response.text}")
-                        else:
-                            logger.error(f"Re-authentication failed for order {order_id}")
-                            messagebox.showerror("Fout", "Kon niet authenticeren met de backend API.")
-                    else:
-                        error_msg = response.text if hasattr(response, 'text') else f"Status {response.status_code}"
-                        logger.error(f"Failed to assign courier to online order {order_id}: {response.status_code} - {error_msg}")
-                        messagebox.showerror("Fout", f"Kon koerier niet toewijzen aan bestelling {order_id}: {error_msg}")
-                except requests.exceptions.Timeout:
-                    logger.error(f"Timeout assigning courier to online order {order_id}")
-                    messagebox.showerror("Fout", f"Timeout bij toewijzen koerier aan bestelling {order_id}. Controleer de backend verbinding.")
-                except requests.exceptions.ConnectionError:
-                    logger.error(f"Connection error assigning courier to online order {order_id}")
-                    messagebox.showerror("Fout", "Kon niet verbinden met de backend API. Controleer of de backend draait.")
-                    break  # Don't try more if connection failed
-                except Exception as e:
-                    logger.exception(f"Error assigning courier to online order {order_id}: {e}")
-                    messagebox.showerror("Fout", f"Fout bij toewijzen koerier aan bestelling {order_id}: {e}")
+            updates = [
+                {"id": order_id, "new_status": "Onderweg", "koerier_id": koerier_id}  # Onderweg when assigning courier
+                for order_id in order_ids
+            ]
+            response = self._patch_order_statuses(updates)
+            
+            if response.status_code == 200:
+                missing = response.json().get("missing", [])
+                logger.info(f"Assigned courier {koerier_id} to {len(order_ids) - len(missing)} online orders")
+                if missing:
+                    logger.warning(f"Online orders not found while assigning courier: {missing}")
+            elif response.status_code == 401:
+                logger.error("Re-authentication failed while assigning online orders")
+                messagebox.showerror("Fout", "Kon niet authenticeren met de backend API.")
+            else:
+                error_msg = response.text if hasattr(response, 'text') else f"Status {response.status_code}"
+                logger.error(f"Failed to assign courier to online orders {order_ids}: {response.status_code} - {error_msg}")
+                messagebox.showerror("Fout", f"Kon koerier niet toewijzen aan de online bestellingen: {error_msg}")
+        except requests.exceptions.Timeout:
+            logger.error(f"Timeout assigning courier to online orders {order_ids}")
+            messagebox.showerror("Fout", "Timeout bij toewijzen koerier. Controleer de backend verbinding.")
+        except requests.exceptions.ConnectionError:
+            logger.error(f"Connection error assigning courier to online orders {order_ids}")
+            messagebox.showerror("Fout", "Kon niet verbinden met de backend API. Controleer of de backend draait.")
         except Exception as e:
             logger.exception(f"Error assigning online orders: {e}")
             messagebox.showerror("Fout", f"Fout bij toewijzen koeriers: {e}")
@@ -1994,25 +1985,25 @@ class CourierManager:
         return "break" if event else None
     
     def _remove_online_assignments_async(self, order_ids: List[int]) -> None:
-        """Remove courier assignment from online orders asynchronously."""
+        """Remove courier assignment from online orders asynchronously (one batch request)."""
         try:
-            for order_id in order_ids:
-                # Remove courier via API
-                if self.api_token:
-                    response = self.api_session.put(
-                        f"{self.api_base_url}/orders/{order_id}/status",
-                        json={"koerier_id": None},
-                        timeout=2
-                    )
-                    if response.status_code == 200:
-                        # Update UI
-                        item_id = f"online_{order_id}"
-                        if self.tree.exists(item_id):
-                            values = list(self.tree.item(item_id, "values"))
-                            if len(values) >= 10:
-                                values[9] = ""
-                                tags = ("row_a", "unassigned", "online")
-                                self.tree.item(item_id, values=tuple(values), tags=tags)
+            if not self.api_token:
+                return
+            response = self._patch_order_statuses(
+                [{"id": order_id, "koerier_id": None} for order_id in order_ids], timeout=2
+            )
+            if response.status_code != 200:
+                logger.debug(f"Could not remove online assignments: {response.status_code}")
+                return
+            # Update UI
+            for order in response.json().get("updated", []):
+                item_id = f"online_{order['id']}"
+                if self.tree.exists(item_id):
+                    values = list(self.tree.item(item_id, "values"))
+                    if len(values) >= 10:
+                        values[9] = ""
+                        tags = ("row_a", "unassigned", "online")
+                        self.tree.item(item_id, values=tuple(values), tags=tags)
         except Exception as e:
             logger.debug(f"Error removing online assignment: {e}")
     
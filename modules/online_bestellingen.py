@@ -64,6 +64,12 @@ class OnlineBestellingenManager:
         self.polling_thread = None
         self.poll_interval = 7  # seconds
         
+        # Delta sync: pending orders as last received, server cursor and ETag
+        self.pending_orders: Dict[int, Dict[str, Any]] = {}
+        self.sync_cursor = 0  # 0 = full sync
+        self.sync_etag: Optional[str] = None
+        self.orders_changed = True  # False when the last poll brought no changes
+        
         # Order tracking
         self.orders: Dict[int, Dict[str, Any]] = {}
         self.confirmed_orders: set = set()  # Orders that have been confirmed (stop sound)
@@ -287,16 +293,54 @@ class OnlineBestellingenManager:
             logger.debug(f"Error authenticating with API: {e}")
             return False
     
+    def _get_pending(self) -> requests.Response:
+        """GET /orders/online/pending?since=<cursor> with the last ETag."""
+        headers = {"If-None-Match": self.sync_etag} if self.sync_etag else {}
+        return self.api_session.get(
+            f"{API_BASE_URL}/orders/online/pending",
+            params={"since": self.sync_cursor},
+            headers=headers,
+            timeout=2  # Short timeout to avoid hanging
+        )
+    
+    def apply_order_delta(self, delta: Dict[str, Any], etag: Optional[str] = None) -> bool:
+        """
+        Apply a delta response to pending_orders.
+        
+        Args:
+            delta: {"cursor", "full", "created", "changed", "removed"} from the API
+            etag: ETag header of the response
+            
+        Returns:
+            True if the set of pending orders changed
+        """
+        if delta.get('full'):
+            self.pending_orders = {}
+        for order in delta.get('created', []) + delta.get('changed', []):
+            self.pending_orders[order['id']] = order
+        for order_id in delta.get('removed', []):
+            self.pending_orders.pop(order_id, None)
+        self.sync_cursor = delta.get('cursor', 0)
+        self.sync_etag = etag
+        return bool(delta.get('full') or delta.get('created') or delta.get('changed') or delta.get('removed'))
+    
+    def _reset_sync(self) -> None:
+        """Forget the cursor so the next poll does a full sync."""
+        self.sync_cursor = 0
+        self.sync_etag = None
+        self.orders_changed = True
+    
     def fetch_orders(self) -> List[Dict[str, Any]]:
-        """Fetch pending online orders from API."""
+        """
+        Fetch pending online orders from API.
+        
+        Only the changes since the previous poll are transferred (304 when
+        nothing changed); they are applied to pending_orders, which is returned
+        as a list. orders_changed tells whether the display needs a redraw.
+        """
         try:
-            response = self.api_session.get(
-                f"{API_BASE_URL}/orders/online/pending",
-                timeout=2  # Short timeout to avoid hanging
-            )
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 401:
+            response = self._get_pending()
+            if response.status_code == 401:
                 # Token expired or invalid, try to re-authenticate
                 import time
                 current_time = time.time()
@@ -308,34 +352,40 @@ class OnlineBestellingenManager:
                         # Reset backoff on success
                         self.auth_backoff = 0
                         # Retry the request
-                        response = self.api_session.get(
-                            f"{API_BASE_URL}/orders/online/pending",
-                            timeout=2
-                        )
-                        if response.status_code == 200:
-                            return response.json()
+                        response = self._get_pending()
                     else:
                         # Increase backoff on failure (max 60 seconds)
                         self.auth_backoff = min(self.auth_backoff * 2 + 5, 60)
                         logger.warning(f"Re-authentication failed, backing off for {self.auth_backoff}s")
-                return []
-            else:
+            
+            if response.status_code == 304:
+                self.orders_changed = False
+                return list(self.pending_orders.values())
+            if response.status_code == 200:
+                self.orders_changed = self.apply_order_delta(response.json(), response.headers.get('ETag'))
+                return list(self.pending_orders.values())
+            if response.status_code != 401:
                 logger.debug(f"Failed to fetch orders: {response.status_code} - {response.text}")
-                return []
+            self._reset_sync()
+            return []
         except requests.exceptions.ConnectionError:
             # Backend not available - only log once per session
             if not hasattr(self, '_api_connection_logged'):
                 logger.debug("Backend API not available (connection refused)")
                 self._api_connection_logged = True
+            self._reset_sync()
             return []
         except requests.exceptions.Timeout:
+            self._reset_sync()
             return []  # Silent timeout
         except Exception as e:
             logger.debug(f"Error fetching orders: {e}")
+            self._reset_sync()
             return []
     
     def refresh_orders(self) -> None:
-        """Manually refresh orders."""
+        """Manually refresh orders (full sync)."""
+        self._reset_sync()
         orders = self.fetch_orders()
         self.update_orders_display(orders)
     
@@ -402,8 +452,9 @@ class OnlineBestellingenManager:
                         if order.get('levertijd'):
                             self.orders_with_levertijd.add(order['id'])
                     
-                    # Update display
-                    self.parent.after(0, lambda: self.update_orders_display(orders))
+                    # Update display (only when the poll brought changes)
+                    if self.orders_changed:
+                        self.parent.after(0, lambda: self.update_orders_display(orders))
                     
                     # Update status
                     self.parent.after(0, lambda: self.update_status(f"{len(orders)} bestellingen"))
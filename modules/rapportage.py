@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
 import database
+from repositories.report_repository import ReportRepository
 import json
 from collections import defaultdict
 
@@ -110,52 +111,33 @@ def open_rapportage(root):
         today = datetime.date.today()
         today_str = today.strftime("%Y-%m-%d")
         
-        conn = database.get_db_connection()
-        cur = conn.cursor()
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            
+            # Eerste/laatste bon van vandaag (index op datum, tijd)
+            cur.execute("""
+                SELECT 
+                    MIN(tijd) AS eerste_bon,
+                    MAX(tijd) AS laatste_bon
+                FROM bestellingen
+                WHERE datum = ?
+            """, (today_str,))
+            
+            bon_tijden = cur.fetchone()
         
-        # Haal alle bestellingen van vandaag op
-        cur.execute("""
-            SELECT 
-                COUNT(*) AS totaal_bonnen,
-                COALESCE(SUM(totaal), 0) AS totaal_omzet,
-                MIN(tijd) AS eerste_bon,
-                MAX(tijd) AS laatste_bon
-            FROM bestellingen
-            WHERE datum = ?
-        """, (today_str,))
-        
-        summary = cur.fetchone()
-        
-        # Haal overzicht per uur op
-        cur.execute("""
-            SELECT 
-                strftime('%H:00', tijd) AS uur,
-                COUNT(*) AS aantal,
-                COALESCE(SUM(totaal), 0) AS omzet
-            FROM bestellingen
-            WHERE datum = ?
-            GROUP BY uur
-            ORDER BY uur
-        """, (today_str,))
-        
-        per_uur = cur.fetchall()
-        
-        # Haal overzicht per koerier op
-        cur.execute("""
-            SELECT 
-                COALESCE(ko.naam, 'Niet toegewezen') AS koerier,
-                COUNT(*) AS aantal,
-                COALESCE(SUM(b.totaal), 0) AS omzet
-            FROM bestellingen b
-            LEFT JOIN koeriers ko ON ko.id = b.koerier_id
-            WHERE b.datum = ?
-            GROUP BY koerier
-            ORDER BY omzet DESC
-        """, (today_str,))
-        
-        per_koerier = cur.fetchall()
-        
-        conn.close()
+        # Totalen, per uur en per koerier uit de verkoop-rollup
+        totalen = ReportRepository.get_totalen(today_str, today_str)
+        summary = {
+            'totaal_bonnen': totalen['aantal'],
+            'totaal_omzet': totalen['omzet'],
+            'eerste_bon': bon_tijden['eerste_bon'],
+            'laatste_bon': bon_tijden['laatste_bon'],
+        }
+        per_uur = [
+            {'uur': f"{row['uur']:02d}:00", 'aantal': row['aantal'], 'omzet': row['omzet']}
+            for row in ReportRepository.get_omzet_per_uur(today_str)
+        ]
+        per_koerier = ReportRepository.get_omzet_per_koerier(today_str)
         
         # Maak Z-rapport venster
         z_win = tk.Toplevel(win)
@@ -338,16 +320,8 @@ def open_rapportage(root):
 
     def load_omzet(d1: datetime.date, d2: datetime.date):
         omzet_tree.delete(*omzet_tree.get_children())
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-                    SELECT datum, COUNT(*) AS orders, COALESCE(SUM(totaal), 0) AS omzet
-                    FROM bestellingen
-                    WHERE datum BETWEEN ? AND ?
-                    GROUP BY datum
-                    ORDER BY datum
-                    """, (d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")))
-        rows = cur.fetchall()
+        van, tot = d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")
+        rows = ReportRepository.get_omzet_per_periode(van, tot, "dag")
 
         total_orders = 0
         total_omzet = 0.0
@@ -357,39 +331,24 @@ def open_rapportage(root):
             total_orders += orders
             total_omzet += omzet
             gem = (omzet / orders) if orders else 0.0
-            periode_str = datetime.datetime.strptime(r["datum"], "%Y-%m-%d").strftime("%d/%m/%Y")
+            periode_str = datetime.datetime.strptime(r["periode"], "%Y-%m-%d").strftime("%d/%m/%Y")
             omzet_tree.insert("", tk.END, values=(periode_str, orders, f"{omzet:.2f}", f"{gem:.2f}"))
 
-        cur.execute("""
-                    SELECT strftime('%Y-%W', datum) AS week, COUNT(*) AS orders, COALESCE(SUM(totaal), 0) AS omzet
-                    FROM bestellingen
-                    WHERE datum BETWEEN ? AND ?
-                    GROUP BY week
-                    ORDER BY week
-                    """, (d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")))
-        week_rows = cur.fetchall()
-        cur.execute("""
-                    SELECT strftime('%Y-%m', datum) AS maand, COUNT(*) AS orders, COALESCE(SUM(totaal), 0) AS omzet
-                    FROM bestellingen
-                    WHERE datum BETWEEN ? AND ?
-                    GROUP BY maand
-                    ORDER BY maand
-                    """, (d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")))
-        maand_rows = cur.fetchall()
-        conn.close()
+        week_rows = ReportRepository.get_omzet_per_periode(van, tot, "week")
+        maand_rows = ReportRepository.get_omzet_per_periode(van, tot, "maand")
 
         omzet_tree.insert("", tk.END, values=("", "", "", ""))
         omzet_tree.insert("", tk.END, values=("Per week", "", "", ""))
         for r in week_rows:
             gem = (float(r["omzet"]) / r["orders"]) if r["orders"] else 0.0
             omzet_tree.insert("", tk.END,
-                              values=(f"Week {r['week']}", r["orders"], f"{float(r['omzet']):.2f}", f"{gem:.2f}"))
+                              values=(f"Week {r['periode']}", r["orders"], f"{float(r['omzet']):.2f}", f"{gem:.2f}"))
         omzet_tree.insert("", tk.END, values=("", "", "", ""))
         omzet_tree.insert("", tk.END, values=("Per maand", "", "", ""))
         for r in maand_rows:
             gem = (float(r["omzet"]) / r["orders"]) if r["orders"] else 0.0
             omzet_tree.insert("", tk.END,
-                              values=(f"Maand {r['maand']}", r["orders"], f"{float(r['omzet']):.2f}", f"{gem:.2f}"))
+                              values=(f"Maand {r['periode']}", r["orders"], f"{float(r['omzet']):.2f}", f"{gem:.2f}"))
 
         omzet_summary.config(
             text=f"Totaal orders: {total_orders}   |   Totale omzet: €{total_omzet:.2f}   |   Gemiddeld per order: €{(total_omzet / total_orders if total_orders else 0):.2f}")
@@ -399,21 +358,20 @@ def open_rapportage(root):
 
     def load_populair(d1: datetime.date, d2: datetime.date):
         pop_tree.delete(*pop_tree.get_children())
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-                    SELECT br.product,
-                           br.categorie,
-                           SUM(br.aantal)                         AS aantal,
-                           COALESCE(SUM(br.aantal * br.prijs), 0) AS omzet
-                    FROM bestelregels br
-                             JOIN bestellingen b ON b.id = br.bestelling_id
-                    WHERE b.datum BETWEEN ? AND ?
-                    GROUP BY br.product, br.categorie
-                    ORDER BY aantal DESC, omzet DESC LIMIT 200
-                    """, (d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")))
-        rows = cur.fetchall()
-        conn.close()
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                        SELECT br.product,
+                               br.categorie,
+                               SUM(br.aantal)                         AS aantal,
+                               COALESCE(SUM(br.aantal * br.prijs), 0) AS omzet
+                        FROM bestelregels br
+                                 JOIN bestellingen b ON b.id = br.bestelling_id
+                        WHERE b.datum BETWEEN ? AND ?
+                        GROUP BY br.product, br.categorie
+                        ORDER BY aantal DESC, omzet DESC LIMIT 200
+                        """, (d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")))
+            rows = cur.fetchall()
 
         data = []
         for r in rows:
@@ -424,20 +382,19 @@ def open_rapportage(root):
 
     def load_koeriers(d1: datetime.date, d2: datetime.date):
         koerier_tree.delete(*koerier_tree.get_children())
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-                    SELECT COALESCE(ko.naam, 'Niet toegewezen') AS koerier,
-                           COUNT(*)                             AS orders,
-                           COALESCE(SUM(b.totaal), 0)           AS omzet
-                    FROM bestellingen b
-                             LEFT JOIN koeriers ko ON ko.id = b.koerier_id
-                    WHERE b.datum BETWEEN ? AND ?
-                    GROUP BY koerier
-                    ORDER BY omzet DESC
-                    """, (d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")))
-        rows = cur.fetchall()
-        conn.close()
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                        SELECT COALESCE(ko.naam, 'Niet toegewezen') AS koerier,
+                               COUNT(*)                             AS orders,
+                               COALESCE(SUM(b.totaal), 0)           AS omzet
+                        FROM bestellingen b
+                                 LEFT JOIN koeriers ko ON ko.id = b.koerier_id
+                        WHERE b.datum BETWEEN ? AND ?
+                        GROUP BY koerier
+                        ORDER BY omzet DESC
+                        """, (d1.strftime("%Y-%m-%d"), d2.strftime("%Y-%m-%d")))
+            rows = cur.fetchall()
 
         data = []
         for r in rows:
@@ -95,17 +95,17 @@ def open_voorraad(root):
     # Loaders
     def laad_ingredienten():
         tree.delete(*tree.get_children())
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT id, naam, eenheid, huidige_voorraad, minimum FROM ingredienten ORDER BY naam")
-        for r in cur.fetchall():
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id, naam, eenheid, huidige_voorraad, minimum FROM ingredienten ORDER BY naam")
+            rows = cur.fetchall()
+        for r in rows:
             status = ""
             if r["huidige_voorraad"] is not None and r["minimum"] is not None and r["huidige_voorraad"] <= r["minimum"]:
                 status = "Onder minimum"
             tree.insert("", tk.END, iid=r["id"], values=(
                 r["naam"], r["eenheid"], f"{(r['huidige_voorraad'] or 0):.3f}", f"{(r['minimum'] or 0):.3f}", status
             ))
-        conn.close()
 
     def nieuw_ingredient():
         naam = simpledialog.askstring("Nieuw ingrediënt", "Naam:")
@@ -113,12 +113,10 @@ def open_voorraad(root):
         eenheid = simpledialog.askstring("Nieuw ingrediënt", "Eenheid (bv. kg, st, l):")
         if not eenheid: return
         try:
-            conn = database.get_db_connection()
-            cur = conn.cursor()
-            cur.execute("INSERT INTO ingredienten (naam, eenheid, minimum, huidige_voorraad) VALUES (?, ?, 0, 0)",
-                        (naam.strip(), eenheid.strip()))
-            conn.commit()
-            conn.close()
+            with database.DatabaseContext() as conn:
+                cur = conn.cursor()
+                cur.execute("INSERT INTO ingredienten (naam, eenheid, minimum, huidige_voorraad) VALUES (?, ?, 0, 0)",
+                            (naam.strip(), eenheid.strip()))
             laad_ingredienten()
         except Exception as e:
             messagebox.showerror("Fout", f"Invoegen mislukt: {e}")
@@ -133,18 +131,14 @@ def open_voorraad(root):
         except Exception:
             return
         ingr_id = int(sel[0])
-        conn = database.get_db_connection()
-        cur = conn.cursor()
         now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         mut = delta * sign
-        try:
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
             cur.execute("INSERT INTO voorraad_mutaties (ingredient_id, mutatie, reden, datumtijd) VALUES (?, ?, ?, ?)",
                         (ingr_id, mut, "Handmatige aanpassing", now_str))
             cur.execute("UPDATE ingredienten SET huidige_voorraad = COALESCE(huidige_voorraad,0) + ? WHERE id = ?",
                         (mut, ingr_id))
-            conn.commit()
-        finally:
-            conn.close()
         laad_ingredienten()
         laad_mutaties()
 
@@ -158,28 +152,26 @@ def open_voorraad(root):
         except Exception:
             return
         ingr_id = int(sel[0])
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("UPDATE ingredienten SET minimum = ? WHERE id = ?", (val, ingr_id))
-        conn.commit()
-        conn.close()
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            cur.execute("UPDATE ingredienten SET minimum = ? WHERE id = ?", (val, ingr_id))
         laad_ingredienten()
 
     def laad_recepturen():
         rec_tree.delete(*rec_tree.get_children())
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-                    SELECT r.id, r.categorie, r.product, i.naam AS ingredient, r.hoeveelheid_per_stuk, i.eenheid
-                    FROM recepturen r
-                             JOIN ingredienten i ON i.id = r.ingredient_id
-                    ORDER BY r.categorie, r.product, i.naam
-                    """)
-        for r in cur.fetchall():
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                        SELECT r.id, r.categorie, r.product, i.naam AS ingredient, r.hoeveelheid_per_stuk, i.eenheid
+                        FROM recepturen r
+                                 JOIN ingredienten i ON i.id = r.ingredient_id
+                        ORDER BY r.categorie, r.product, i.naam
+                        """)
+            rows = cur.fetchall()
+        for r in rows:
             rec_tree.insert("", tk.END, iid=r["id"], values=(
                 r["categorie"], r["product"], r["ingredient"], f"{r['hoeveelheid_per_stuk']:.3f}", r["eenheid"]
             ))
-        conn.close()
 
     # Add this function in your voorraad.py file, likely near other recipe-related functions
 
@@ -200,27 +192,26 @@ def open_voorraad(root):
             messagebox.showinfo("Selectie", "Selecteer een receptuurregel.")
             return
         rec_id = int(sel[0])
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("DELETE FROM recepturen WHERE id = ?", (rec_id,))
-        conn.commit()
-        conn.close()
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM recepturen WHERE id = ?", (rec_id,))
+        database.invalidate_recepturen_cache()
         laad_recepturen()
 
     def laad_mutaties():
         mut_tree.delete(*mut_tree.get_children())
-        conn = database.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-                    SELECT m.id, m.datumtijd, i.naam AS ingredient, m.mutatie, m.reden
-                    FROM voorraad_mutaties m
-                             JOIN ingredienten i ON i.id = m.ingredient_id
-                    ORDER BY m.datumtijd DESC LIMIT 500
-                    """)
-        for r in cur.fetchall():
+        with database.DatabaseContext() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                        SELECT m.id, m.datumtijd, i.naam AS ingredient, m.mutatie, m.reden
+                        FROM voorraad_mutaties m
+                                 JOIN ingredienten i ON i.id = m.ingredient_id
+                        ORDER BY m.datumtijd DESC LIMIT 500
+                        """)
+            rows = cur.fetchall()
+        for r in rows:
             mut_tree.insert("", tk.END, iid=r["id"],
                             values=(r["datumtijd"], r["ingredient"], f"{r['mutatie']:.3f}", r["reden"] or ""))
-        conn.close()
 
     # eerste load
     laad_ingredienten()
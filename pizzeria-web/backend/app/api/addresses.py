@@ -6,8 +6,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional, Dict
 from pydantic import BaseModel
 import json
-import os
 from app.core.database import get_db
+from app.services.config_files import streets_file
+from app.services.street_index import street_index
 from sqlalchemy import text
 import logging
 
@@ -50,47 +51,20 @@ class AddressSuggestion(BaseModel):
     gemeente: str
 
 
+def _streets_response(streets) -> Dict[str, List[str]]:
+    if streets is None:
+        return {"streets": []}
+    logger.info(f"Loaded {len(streets)} street names")
+    return {"streets": streets}
+
+
 @router.get("/addresses/streets")
 async def get_street_names():
     """
     Get all street names from straatnamen.json (public endpoint, no authentication required).
     """
     try:
-        # Get the project root (where straatnamen.json should be)
-        # __file__ is at: pizzeria-web/backend/app/api/addresses.py
-        # We need to go: backend -> pizzeria-web -> project root
-        current_file = os.path.abspath(__file__)
-        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))  # pizzeria-web
-        project_root = os.path.dirname(backend_dir)  # Project root (Deskcomputer)
-        
-        # Try multiple possible paths
-        possible_paths = [
-            os.path.join(project_root, "straatnamen.json"),  # Project root
-            os.path.join(os.path.dirname(project_root), "straatnamen.json"),  # One level up from project
-            "straatnamen.json",  # Current directory
-            os.path.join("..", "straatnamen.json"),  # Parent directory
-            os.path.join("..", "..", "straatnamen.json"),  # Two levels up
-            os.path.join("..", "..", "..", "straatnamen.json"),  # Three levels up
-        ]
-        
-        json_path = None
-        for path in possible_paths:
-            abs_path = os.path.abspath(path) if not os.path.isabs(path) else path
-            if os.path.exists(abs_path):
-                json_path = abs_path
-                break
-        
-        if not json_path:
-            logger.warning(f"straatnamen.json not found. Searched paths: {possible_paths}")
-            logger.warning(f"Current file location: {current_file}")
-            logger.warning(f"Project root: {project_root}")
-            return {"streets": []}
-        
-        with open(json_path, "r", encoding="utf-8") as f:
-            streets = json.load(f)
-        
-        logger.info(f"Loaded {len(streets)} street names from {json_path}")
-        return {"streets": streets}
+        return streets_file.json_response("streets", _streets_response)
     except Exception as e:
         logger.error(f"Error loading street names: {e}", exc_info=True)
         return {"streets": []}
@@ -168,30 +142,27 @@ async def get_postcodes():
 @router.get("/addresses/suggestions")
 async def get_address_suggestions(
     straat: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
     """
     Get address suggestions based on street name (public endpoint).
-    Returns list of addresses with straat, postcode, and gemeente.
+    Returns list of addresses with straat, postcode, and gemeente, best match
+    first (see app.services.street_index); postcode and gemeente are empty for
+    streets without a known address.
     """
     suggestions = []
     
     try:
         if straat and straat.strip():
-            # Query adressen table for matching streets
-            result = db.execute(
-                text("SELECT DISTINCT straat, postcode, gemeente FROM adressen WHERE straat LIKE :straat LIMIT 20"),
-                {"straat": f"%{straat.strip()}%"}
-            ).fetchall()
-            
-            suggestions = [
-                {
-                    "straat": row[0],
-                    "postcode": row[1],
-                    "gemeente": row[2]
-                }
-                for row in result
-            ]
+            for naam in street_index.get(db).suggest(straat, limit=limit):
+                for postcode, gemeente in street_index.places(naam) or [("", "")]:
+                    suggestions.append({
+                        "straat": naam,
+                        "postcode": postcode,
+                        "gemeente": gemeente
+                    })
+            suggestions = suggestions[:limit]
     except Exception as e:
         logger.warning(f"Error getting address suggestions: {e}")
     
@@ -212,28 +183,7 @@ async def add_street_name(straat: str = Query(..., description="Straatnaam om to
     straat_clean = straat.strip()
     
     try:
-        # Get the project root (where straatnamen.json should be)
-        current_file = os.path.abspath(__file__)
-        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))  # pizzeria-web
-        project_root = os.path.dirname(backend_dir)  # Project root (Deskcomputer)
-        
-        # Try multiple possible paths
-        possible_paths = [
-            os.path.join(project_root, "straatnamen.json"),  # Project root
-            os.path.join(os.path.dirname(project_root), "straatnamen.json"),  # One level up from project
-            "straatnamen.json",  # Current directory
-            os.path.join("..", "straatnamen.json"),  # Parent directory
-            os.path.join("..", "..", "straatnamen.json"),  # Two levels up
-            os.path.join("..", "..", "..", "straatnamen.json"),  # Three levels up
-        ]
-        
-        json_path = None
-        for path in possible_paths:
-            abs_path = os.path.abspath(path) if not os.path.isabs(path) else path
-            if os.path.exists(abs_path):
-                json_path = abs_path
-                break
-        
+        json_path = streets_file.path
         if not json_path:
             logger.error(f"straatnamen.json not found. Cannot add street name.")
             raise HTTPException(
@@ -241,14 +191,11 @@ async def add_street_name(straat: str = Query(..., description="Straatnaam om to
                 detail="Straatnamen bestand niet gevonden"
             )
         
-        # Read existing streets
-        with open(json_path, "r", encoding="utf-8") as f:
-            streets = json.load(f)
+        # Existing streets (copy: the cached list is shared)
+        streets = streets_file.data()
+        streets = list(streets) if isinstance(streets, list) else []
         
         # Check if street already exists (case-insensitive)
-        if not isinstance(streets, list):
-            streets = []
-        
         straat_lower = straat_clean.lower()
         if any(s.lower() == straat_lower for s in streets):
             # Street already exists
@@ -261,6 +208,8 @@ async def add_street_name(straat: str = Query(..., description="Straatnaam om to
         # Write back to file
         with open(json_path, "w", encoding="utf-8") as f:
             json.dump(streets, f, ensure_ascii=False, indent=2)
+        streets_file.invalidate()
+        street_index.add(straat_clean)
         
         logger.info(f"Added new street name: {straat_clean} to {json_path}")
         return {"message": "Straatnaam toegevoegd", "added": True, "street": straat_clean}
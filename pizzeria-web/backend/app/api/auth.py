@@ -9,13 +9,12 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.core.database import get_db
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token
-from app.core.dependencies import get_current_user
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token
+from app.core.dependencies import get_current_user, oauth2_scheme
 from fastapi import Request
+from app.services.config_files import settings_file
+from app.services.principal_cache import principal_cache
 import logging
-import json
-import os
-from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -24,44 +23,19 @@ limiter = Limiter(key_func=get_remote_address)
 
 
 def load_settings() -> dict:
-    """Load settings from settings.json file."""
-    # Try multiple paths to find settings.json
-    current_file = Path(__file__).resolve()
-    # From backend/app/api/auth.py -> go up 4 levels to project root
-    project_root = current_file.parent.parent.parent.parent
-    
-    possible_paths = [
-        project_root / "settings.json",  # Project root
-        project_root.parent / "settings.json",  # One level up
-        Path("settings.json"),  # Current working directory
-        Path("../settings.json"),  # Parent directory
-    ]
-    
-    for path in possible_paths:
-        try:
-            if not path.is_absolute():
-                path_resolved = path.resolve()
-            else:
-                path_resolved = path
-            
-            if path_resolved.exists() and path_resolved.is_file():
-                with open(path_resolved, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    logger.info(f"Successfully loaded settings from {path_resolved}")
-                    return data
-        except Exception as e:
-            logger.debug(f"Could not load settings from {path}: {e}")
-            continue
-    
-    logger.warning("settings.json not found, using default credentials")
-    return {}
+    """Load settings from settings.json file (cached, see app.services.config_files)."""
+    data = settings_file.data()
+    if not isinstance(data, dict):
+        logger.warning("settings.json not found, using default credentials")
+        return {}
+    return data
 
 
 # Lazy initialization to avoid bcrypt issues during module import
 _USERS = None
 
-def get_users():
-    """Load users from settings.json or use defaults."""
+async def get_users():
+    """Load users from settings.json or use defaults (passwords hashed on the password pool)."""
     global _USERS
     if _USERS is None:
         settings_data = load_settings()
@@ -74,12 +48,12 @@ def get_users():
         _USERS = {
             default_admin.get("username", "admin"): {
                 "username": default_admin.get("username", "admin"),
-                "hashed_password": get_password_hash(default_admin.get("password", "admin123")),
+                "hashed_password": await get_password_hash_async(default_admin.get("password", "admin123")),
                 "role": "admin"
             },
             default_kassa.get("username", "kassa"): {
                 "username": default_kassa.get("username", "kassa"),
-                "hashed_password": get_password_hash(default_kassa.get("password", "kassa123")),
+                "hashed_password": await get_password_hash_async(default_kassa.get("password", "kassa123")),
                 "role": "kassa"
             }
         }
@@ -87,7 +61,7 @@ def get_users():
     return _USERS
 
 
-def authenticate_user(username: str, password: str) -> dict:
+async def authenticate_user(username: str, password: str) -> dict:
     """
     Authenticate user and return user data if valid.
     
@@ -98,12 +72,12 @@ def authenticate_user(username: str, password: str) -> dict:
     Returns:
         User data dict or None if invalid
     """
-    users = get_users()
+    users = await get_users()
     user = users.get(username)
     if not user:
         return None
     
-    if not verify_password(password, user["hashed_password"]):
+    if not await verify_password_async(password, user["hashed_password"]):
         return None
     
     return {
@@ -122,7 +96,7 @@ async def login(
     """
     Login endpoint - returns JWT token.
     """
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if not user:
         logger.warning(f"Failed login attempt for {form_data.username}")
         raise HTTPException(
@@ -157,3 +131,16 @@ async def get_current_user_info(
     """
     return current_user
 
+
+@router.post("/auth/logout")
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Logout: drop the token from the principal cache.
+    The JWT stays valid until it expires; the client discards it.
+    """
+    principal_cache.invalidate_token(token)
+    logger.info(f"Logout for {current_user['username']}")
+    return {"message": "Uitgelogd"}
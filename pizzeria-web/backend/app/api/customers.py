@@ -7,7 +7,7 @@ from typing import List, Optional
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_current_customer
+from app.core.dependencies import get_current_user, get_current_customer, get_customer_token
 from app.models.customer import Customer
 from app.schemas.customer import (
     CustomerCreate, CustomerUpdate, CustomerResponse,
@@ -15,10 +15,13 @@ from app.schemas.customer import (
     ForgotPasswordRequest, ResetPasswordRequest
 )
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password, create_access_token, decode_access_token
+from app.core.security import get_password_hash_async, verify_password_async, create_access_token, decode_access_token
 from app.services.email_verification import email_verification_service
 from app.services.password_reset import password_reset_service
+from app.services.principal_cache import principal_cache
 from app.utils.password_validator import validate_password_strength
+from app.utils.phone_validator import normalize_phone_key
+from app.utils.customer_search import search_customers
 from datetime import timedelta
 import logging
 
@@ -45,7 +48,7 @@ async def create_customer_public(
     Used during checkout.
     """
     # Check if customer with phone already exists
-    existing = db.query(Customer).filter(Customer.telefoon == customer.telefoon).first()
+    existing = db.query(Customer).filter(Customer.telefoon_norm == normalize_phone_key(customer.telefoon)).first()
     if existing:
         # If customer exists, update their address instead of creating new one
         logger.info(f"Customer with phone {customer.telefoon} already exists (id: {existing.id}), updating address")
@@ -104,7 +107,7 @@ async def register_customer(
             )
         
         # Check if phone already exists
-        existing_phone = db.query(Customer).filter(Customer.telefoon == customer_data.telefoon).first()
+        existing_phone = db.query(Customer).filter(Customer.telefoon_norm == normalize_phone_key(customer_data.telefoon)).first()
         if existing_phone:
             logger.warning(f"Registration failed: Phone already exists - {customer_data.telefoon}")
             raise HTTPException(
@@ -121,7 +124,7 @@ async def register_customer(
         )
     
     # Hash password
-    password_hash = get_password_hash(customer_data.password)
+    password_hash = await get_password_hash_async(customer_data.password)
     
     # Check if email verification is required
     email_verification_required = settings.EMAIL_VERIFICATION_REQUIRED
@@ -205,7 +208,7 @@ async def login_customer(
         )
     
     # Verify password
-    if not customer.password_hash or not verify_password(login_data.password, customer.password_hash):
+    if not customer.password_hash or not await verify_password_async(login_data.password, customer.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Ongeldig e-mailadres of wachtwoord"
@@ -243,6 +246,19 @@ async def get_me(
     return CustomerResponse.model_validate(customer)
 
 
+@router.post("/customers/public/logout")
+async def logout_customer(
+    request: Request,
+    customer: Customer = Depends(get_current_customer)
+):
+    """
+    Logout (public endpoint): drop the token from the principal cache.
+    The JWT stays valid until it expires; the client discards it.
+    """
+    principal_cache.invalidate_token(get_customer_token(request))
+    return {"message": "Uitgelogd"}
+
+
 @router.get("/customers/public/verify-email")
 @limiter.limit("10/minute")
 async def verify_email(
@@ -271,6 +287,7 @@ async def verify_email(
             detail="Ongeldige of verlopen verificatielink"
         )
     
+    principal_cache.invalidate_customer(customer.id)
     logger.info(f"Email verified for customer {customer.id} ({customer.email})")
     
     return {
@@ -292,9 +309,8 @@ async def get_customer_by_phone_public(
     Returns null if not found (not 404).
     Used during checkout to check if customer exists.
     """
-    # Clean phone number
-    cleaned_phone = ''.join(c for c in phone if c.isdigit() or c == '+')
-    customer = db.query(Customer).filter(Customer.telefoon == cleaned_phone).first()
+    # One indexed probe on the normalized phone key (any input format)
+    customer = db.query(Customer).filter(Customer.telefoon_norm == normalize_phone_key(phone)).first()
     if not customer:
         return None
     return customer
@@ -346,6 +362,7 @@ async def update_customer_public(
     
     db.commit()
     db.refresh(customer)
+    principal_cache.invalidate_customer(customer_id)
     
     logger.info(f"Customer update completed (public): {customer_id} - Name: {customer.naam}, Phone: {customer.telefoon}")
     return customer
@@ -475,11 +492,11 @@ async def reset_password(
         )
     
     # Hash new password
-    from app.core.security import get_password_hash
-    customer.password_hash = get_password_hash(reset_request.new_password)
+    customer.password_hash = await get_password_hash_async(reset_request.new_password)
     
     # Clear reset token
     password_reset_service.clear_reset_token(customer, db)
+    principal_cache.invalidate_customer(customer.id)
     
     logger.info(f"Password reset successful for customer {customer.id} ({customer.email})")
     
@@ -500,18 +517,12 @@ async def get_customers(
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get list of customers with optional search.
+    Get list of customers with optional search (ranked via the FTS index).
     """
-    query = db.query(Customer)
-    
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Customer.naam.ilike(search_term)) |
-            (Customer.telefoon.ilike(search_term))
-        )
+    if search and search.strip():
+        return search_customers(db, search, skip=skip, limit=limit)
     
-    customers = query.offset(skip).limit(limit).all()
+    customers = db.query(Customer).offset(skip).limit(limit).all()
     return customers
 
 
@@ -545,7 +556,7 @@ async def create_customer(
     Create a new customer.
     """
     # Check if customer with phone already exists
-    existing = db.query(Customer).filter(Customer.telefoon == customer.telefoon).first()
+    existing = db.query(Customer).filter(Customer.telefoon_norm == normalize_phone_key(customer.telefoon)).first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -584,6 +595,7 @@ async def update_customer(
     
     db.commit()
     db.refresh(customer)
+    principal_cache.invalidate_customer(customer_id)
     
     logger.info(f"Customer updated: {customer_id}")
     return customer
@@ -599,9 +611,8 @@ async def get_customer_by_phone(
     Get customer by phone number (admin endpoint).
     Returns null if not found (not 404).
     """
-    # Clean phone number
-    cleaned_phone = ''.join(c for c in phone if c.isdigit() or c == '+')
-    customer = db.query(Customer).filter(Customer.telefoon == cleaned_phone).first()
+    # One indexed probe on the normalized phone key (any input format)
+    customer = db.query(Customer).filter(Customer.telefoon_norm == normalize_phone_key(phone)).first()
     if not customer:
         return None
     return customer
@@ -1,18 +1,21 @@
 """
 Menu API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core.dependencies import get_current_user, require_role
 from app.models.menu import MenuItem, MenuCategory
 from app.schemas.menu import (
     MenuItemCreate, MenuItemUpdate, MenuItemResponse,
     MenuCategoryCreate, MenuCategoryResponse, MenuResponse
 )
+from app.services.menu_snapshot import etag_matches, menu_snapshot
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,58 +28,35 @@ limiter = Limiter(key_func=get_remote_address)
 @router.get("/menu/public", response_model=MenuResponse)
 async def get_public_menu(
     request: Request,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get complete menu with categories and items (public endpoint, no authentication required).
     Only returns available items.
+    
+    Served from a precomputed snapshot (app.services.menu_snapshot) with a
+    strong ETag; a matching If-None-Match gets a 304 without a body.
     """
     try:
-        categories = db.query(MenuCategory).order_by(MenuCategory.volgorde, MenuCategory.naam).all()
-        items = db.query(MenuItem).filter(MenuItem.beschikbaar == 1).order_by(MenuItem.volgorde, MenuItem.naam).all()
-        
-        logger.info(f"Found {len(categories)} categories and {len(items)} items")
-        
-        # Convert to response format
-        categories_data = [
-            MenuCategoryResponse(
-                id=cat.id,
-                naam=cat.naam,
-                volgorde=cat.volgorde
-            )
-            for cat in categories
-        ]
-        
-        items_data = [
-            MenuItemResponse(
-                id=item.id,
-                naam=item.naam,
-                categorie=item.categorie,
-                prijs=float(item.prijs) if item.prijs is not None else 0.0,
-                beschrijving=item.beschrijving or "",
-                beschikbaar=1 if item.beschikbaar else 0,
-                volgorde=item.volgorde
-            )
-            for item in items
-        ]
-        
-        return MenuResponse(
-            categories=categories_data,
-            items=items_data
-        )
+        snapshot = await menu_snapshot.get_async()
     except Exception as e:
         logger.error(f"Error in get_public_menu: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Fout bij laden menu: {str(e)}"
         )
+    
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 
 # Menu endpoints (read-only for kassa, full CRUD for admin)
 @router.get("/menu", response_model=MenuResponse)
 async def get_menu(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
     include_unavailable: bool = False
 ):
@@ -84,14 +64,16 @@ async def get_menu(
     Get complete menu with categories and items.
     For admin users, can include unavailable items.
     """
-    categories = db.query(MenuCategory).order_by(MenuCategory.volgorde, MenuCategory.naam).all()
-    query = db.query(MenuItem)
+    categories = (await db.execute(
+        select(MenuCategory).order_by(MenuCategory.volgorde, MenuCategory.naam)
+    )).scalars().all()
+    query = select(MenuItem)
     
     # Only filter by beschikbaar if not admin or not including unavailable
     if not include_unavailable and current_user.get("role") != "admin":
-        query = query.filter(MenuItem.beschikbaar == 1)
+        query = query.where(MenuItem.beschikbaar == 1)
     
-    items = query.order_by(MenuItem.volgorde, MenuItem.naam).all()
+    items = (await db.execute(query.order_by(MenuItem.volgorde, MenuItem.naam))).scalars().all()
     
     return {
         "categories": [
@@ -121,31 +103,31 @@ async def get_menu(
 async def get_menu_items(
     request: Request,
     categorie: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get menu items, optionally filtered by category.
     """
-    query = db.query(MenuItem)
+    query = select(MenuItem)
     
     if categorie:
-        query = query.filter(MenuItem.categorie == categorie)
+        query = query.where(MenuItem.categorie == categorie)
     
-    items = query.order_by(MenuItem.volgorde, MenuItem.naam).all()
+    items = (await db.execute(query.order_by(MenuItem.volgorde, MenuItem.naam))).scalars().all()
     return items
 
 
 @router.get("/menu/items/{item_id}", response_model=MenuItemResponse)
 async def get_menu_item(
     item_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get a specific menu item.
     """
-    item = db.query(MenuItem).filter(MenuItem.id == item_id).first()
+    item = await db.get(MenuItem, item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -157,13 +139,15 @@ async def get_menu_item(
 @router.get("/menu/categories", response_model=List[MenuCategoryResponse])
 async def get_menu_categories(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get all menu categories.
     """
-    categories = db.query(MenuCategory).order_by(MenuCategory.volgorde, MenuCategory.naam).all()
+    categories = (await db.execute(
+        select(MenuCategory).order_by(MenuCategory.volgorde, MenuCategory.naam)
+    )).scalars().all()
     return categories
 
 
@@ -182,6 +166,7 @@ async def create_menu_item(
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    menu_snapshot.invalidate()
     
     logger.info(f"Menu item created: {db_item.id} - {db_item.naam}")
     return db_item
@@ -210,6 +195,7 @@ async def update_menu_item(
     
     db.commit()
     db.refresh(item)
+    menu_snapshot.invalidate()
     
     logger.info(f"Menu item updated: {item_id}")
     return item
@@ -233,6 +219,7 @@ async def delete_menu_item(
     
     db.delete(item)
     db.commit()
+    menu_snapshot.invalidate()
     
     logger.info(f"Menu item deleted: {item_id}")
     return None
@@ -260,6 +247,7 @@ async def create_menu_category(
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    menu_snapshot.invalidate()
     
     logger.info(f"Menu category created: {db_category.id} - {db_category.naam}")
     return db_category
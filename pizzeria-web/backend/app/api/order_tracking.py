@@ -3,10 +3,14 @@ Order tracking endpoints for customers (public, no authentication required).
 Allows customers to track orders using bonnummer + phone number or email.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.models.order import Order
 from app.models.customer import Customer
+from app.services import order_queries
+from app.services.tracking_cache import bonnummer_key, phone_key, tracking_cache
+from app.utils.phone_validator import normalize_phone_key
 from typing import Optional
 import logging
 
@@ -15,12 +19,57 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+@router.get("/orders/track/by-phone")
+async def track_orders_by_phone(
+    phone: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get all orders for a phone number (for customers who haven't verified email).
+    """
+    telefoon_norm = normalize_phone_key(phone)
+    cached = tracking_cache.get(phone_key(telefoon_norm))
+    if cached is not None:
+        return cached
+    
+    # Find customer by normalized phone key (unique index, no table scan)
+    customer_id = (await db.execute(
+        select(Customer.id).where(Customer.telefoon_norm == telefoon_norm)
+    )).scalar()
+    
+    if not customer_id:
+        return {"orders": []}
+    
+    # Get latest orders for this customer (idx_bestellingen_klant_id)
+    orders = (await db.execute(
+        select(Order).where(Order.klant_id == customer_id).order_by(Order.datum.desc(), Order.tijd.desc()).limit(10)
+    )).scalars().all()
+    
+    result = {
+        "orders": [
+            {
+                "id": order.id,
+                "bonnummer": order.bonnummer,
+                "datum": order.datum,
+                "tijd": order.tijd,
+                "totaal": order.totaal,
+                "status": order.status or "Nieuw",
+                "levertijd": order.levertijd
+            }
+            for order in orders
+        ]
+    }
+    tracking_cache.put(phone_key(telefoon_norm), result)
+    return result
+
+
+# Declared after /orders/track/by-phone, otherwise "by-phone" would match {bonnummer}
 @router.get("/orders/track/{bonnummer}")
 async def track_order_by_bonnummer(
     bonnummer: str,
     phone: Optional[str] = None,
     email: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Track order by bonnummer with REQUIRED phone or email verification.
@@ -35,18 +84,22 @@ async def track_order_by_bonnummer(
             detail="Telefoonnummer of e-mailadres is verplicht om je bestelling te volgen"
         )
     
-    order = db.query(Order).filter(Order.bonnummer == bonnummer).first()
-    
-    if not order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Bestelling niet gevonden"
-        )
+    # Cached for a few seconds: repeated refreshes of the tracking page cost no queries
+    tracked = tracking_cache.get(bonnummer_key(bonnummer))
+    if tracked is None:
+        # Order with customer and items eager-loaded (2 queries, idx_bestellingen_bonnummer)
+        order = await order_queries.get_order_by_bonnummer_async(db, bonnummer)
+        
+        if not order:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Bestelling niet gevonden"
+            )
+        tracked = _tracked_order(order)
+        tracking_cache.put(bonnummer_key(bonnummer), tracked)
     
     # Get customer for verification
-    customer = None
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
+    customer = tracked["customer"]
     
     if not customer:
         # If no customer linked, we can't verify - deny access for security
@@ -109,24 +162,24 @@ async def track_order_by_bonnummer(
     customer_phone_normalized = ''
     if phone:
         phone_normalized = normalize_phone(phone)
-        if customer.telefoon:
-            customer_phone_normalized = normalize_phone(customer.telefoon)
+        if customer["telefoon"]:
+            customer_phone_normalized = normalize_phone(customer["telefoon"])
     
     # Normalize emails for comparison
     email_normalized = None
     customer_email_normalized = ''
     if email:
         email_normalized = email.lower().strip()
-        if customer.email:
-            customer_email_normalized = customer.email.lower().strip()
+        if customer["email"]:
+            customer_email_normalized = customer["email"].lower().strip()
     
     # Verify phone or email matches
     phone_match = phone_normalized and customer_phone_normalized and phones_match(phone_normalized, customer_phone_normalized)
     email_match = email_normalized and customer_email_normalized and email_normalized == customer_email_normalized
     
     # Log for debugging
-    if phone and customer.telefoon:
-        logger.info(f"Phone verification: input='{phone}' (normalized: '{phone_normalized}'), db='{customer.telefoon}' (normalized: '{customer_phone_normalized}'), match={phone_match}")
+    if phone and customer["telefoon"]:
+        logger.info(f"Phone verification: input='{phone}' (normalized: '{phone_normalized}'), db='{customer['telefoon']}' (normalized: '{customer_phone_normalized}'), match={phone_match}")
     
     if not (phone_match or email_match):
         raise HTTPException(
@@ -134,70 +187,34 @@ async def track_order_by_bonnummer(
             detail="Telefoonnummer of e-mailadres komt niet overeen met deze bestelling. Je kunt alleen je eigen bestellingen volgen."
         )
     
-    # Get customer name if available
-    klant_naam = None
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-        if customer:
-            klant_naam = customer.naam
-    
     # Return order details
-    return {
-        "id": order.id,
-        "bonnummer": order.bonnummer,
-        "klant_naam": klant_naam,
-        "datum": order.datum,
-        "tijd": order.tijd,
-        "totaal": order.totaal,
-        "opmerking": order.opmerking,
-        "levertijd": order.levertijd,
-        "status": order.status or "Nieuw",
-        "betaalmethode": getattr(order, 'betaalmethode', 'cash'),
-        "items": [
-            {
-                "id": item.id,
-                "product_naam": item.product_naam,
-                "aantal": item.aantal,
-                "prijs": item.prijs
-            }
-            for item in order.items
-        ]
-    }
+    return tracked["response"]
 
 
-@router.get("/orders/track/by-phone")
-async def track_orders_by_phone(
-    phone: str,
-    db: Session = Depends(get_db)
-):
-    """
-    Get all orders for a phone number (for customers who haven't verified email).
-    """
-    # Normalize phone number
-    phone_normalized = phone.replace(' ', '').replace('-', '').replace('+', '')
-    
-    # Find customer by phone
-    customers = db.query(Customer).filter(Customer.telefoon.like(f'%{phone_normalized}%')).all()
-    
-    if not customers:
-        return {"orders": []}
-    
-    # Get all orders for matching customers
-    customer_ids = [c.id for c in customers]
-    orders = db.query(Order).filter(Order.klant_id.in_(customer_ids)).order_by(Order.datum.desc(), Order.tijd.desc()).limit(10).all()
-    
+def _tracked_order(order: Order) -> dict:
+    """Tracking response of an order plus the customer details needed to verify the requester."""
+    customer = order.klant
     return {
-        "orders": [
-            {
-                "id": order.id,
-                "bonnummer": order.bonnummer,
-                "datum": order.datum,
-                "tijd": order.tijd,
-                "totaal": order.totaal,
-                "status": order.status or "Nieuw",
-                "levertijd": order.levertijd
-            }
-            for order in orders
-        ]
+        "customer": {"telefoon": customer.telefoon, "email": customer.email} if customer else None,
+        "response": {
+            "id": order.id,
+            "bonnummer": order.bonnummer,
+            "klant_naam": customer.naam if customer else None,
+            "datum": order.datum,
+            "tijd": order.tijd,
+            "totaal": order.totaal,
+            "opmerking": order.opmerking,
+            "levertijd": order.levertijd,
+            "status": order.status or "Nieuw",
+            "betaalmethode": getattr(order, 'betaalmethode', 'cash'),
+            "items": [
+                {
+                    "id": item.id,
+                    "product_naam": item.product_naam,
+                    "aantal": item.aantal,
+                    "prijs": item.prijs
+                }
+                for item in order.items
+            ]
+        }
     }
-
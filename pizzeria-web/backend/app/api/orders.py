@@ -1,20 +1,28 @@
 """
 Order API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, Header
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import Dict, List, Optional
 from datetime import datetime, date
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db, allocate_bonnummers
+from app.services import order_changes, order_queries
+from app.services.printer import printer_service
+from app.services.tracking_cache import tracking_cache
 from app.core.dependencies import get_current_user
 from app.core.config import settings
 from app.models.order import Order, OrderItem
 from app.models.customer import Customer
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderItemResponse, OrderStatusUpdate
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderItemResponse, OrderStatusUpdate, OrderStatusBatchUpdate
+)
 import logging
 import json
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +30,29 @@ router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
 
 
+# Receipt number blocks reserved by this worker: (jaar, dag) -> [next, last]
+_bon_blocks: Dict[tuple, List[int]] = {}
+_bon_blocks_lock = threading.Lock()
+
+# Statuses shown in the kassa's online orders screen
+PENDING_ONLINE_STATUSES = ["Nieuw", "In de keuken", "Onderweg"]
+
+
 def generate_bonnummer(db: Session) -> str:
     """
     Generate receipt number in format YYYYNNNN.
     
+    Numbers come from the shared bon_teller counter through one atomic
+    upsert in the caller's transaction (see app.core.database.allocate_bonnummers),
+    the same allocator the kassa uses. Nothing is committed here; the number is
+    final when the order is committed with it.
+    
+    With BONNUMMER_BLOCK_SIZE > 1 a block is reserved per worker and handed out
+    from memory once the reserving transaction is committed (a rolled-back
+    block is not used).
+    
     Args:
-        db: Database session
+        db: Database session that will store the order
         
     Returns:
         Receipt number string
@@ -35,30 +60,32 @@ def generate_bonnummer(db: Session) -> str:
     now = datetime.now()
     jaar = now.year
     dag = now.timetuple().tm_yday  # Day of year (1-365/366)
+    key = (jaar, dag)
     
-    # Get or create bon_teller entry
-    from sqlalchemy import text
-    result = db.execute(text("""
-        SELECT laatste_nummer FROM bon_teller 
-        WHERE jaar = :jaar AND dag = :dag
-    """), {"jaar": jaar, "dag": dag})
-    
-    row = result.fetchone()
-    if row:
-        laatste_nummer = row[0] + 1
-        db.execute(text("""
-            UPDATE bon_teller 
-            SET laatste_nummer = :num 
-            WHERE jaar = :jaar AND dag = :dag
-        """), {"num": laatste_nummer, "jaar": jaar, "dag": dag})
-    else:
-        laatste_nummer = 1
-        db.execute(text("""
-            INSERT INTO bon_teller (jaar, dag, laatste_nummer) 
-            VALUES (:jaar, :dag, 1)
-        """), {"jaar": jaar, "dag": dag})
+    with _bon_blocks_lock:
+        block = _bon_blocks.get(key)
+        if block and block[0] <= block[1]:
+            laatste_nummer = block[0]
+            block[0] += 1
+            return f"{jaar}{laatste_nummer:04d}"
     
-    db.commit()
+    block_size = max(settings.BONNUMMER_BLOCK_SIZE, 1)
+    last = allocate_bonnummers(db, jaar, dag, block_size)
+    laatste_nummer = last - block_size + 1
+    if block_size > 1:
+        reserved = {"block": [laatste_nummer + 1, last]}
+        
+        def install_block(session):
+            if reserved["block"] is not None:
+                with _bon_blocks_lock:
+                    _bon_blocks.clear()
+                    _bon_blocks[key] = reserved["block"]
+        
+        def discard_block(session):
+            reserved["block"] = None
+        
+        event.listen(db, "after_commit", install_block, once=True)
+        event.listen(db, "after_rollback", discard_block, once=True)
     
     # Format: YYYYNNNN (e.g., 20240001)
     bonnummer = f"{jaar}{laatste_nummer:04d}"
@@ -162,16 +189,8 @@ async def create_public_order(
     for item in db_order.items:
         logger.info(f"  Saved item: {item.aantal}x {item.product_naam} - €{item.prijs:.2f} (subtotal: €{item.prijs * item.aantal:.2f})")
     
-    # Update customer statistics if customer exists
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-        if customer:
-            customer.totaal_bestellingen += 1
-            customer.totaal_besteed += order.totaal
-            customer.laatste_bestelling = f"{datum} {tijd}"
-            db.commit()
-            # Refresh to get latest data
-            db.refresh(customer)
+    # Customer statistics (totaal_bestellingen/totaal_besteed/laatste_bestelling)
+    # are kept up to date by the triggers on bestellingen
     
     logger.info(f"Public order created: {db_order.id} - Bonnummer: {bonnummer}")
     
@@ -239,14 +258,9 @@ async def create_public_order(
                     logger.error(f"Error sending verification email to {customer_email}: {e}")
                     logger.exception("Full error traceback:")
             
-            try:
-                import asyncio
-                # Create task in current event loop
-                asyncio.create_task(send_verification_email_task())
-                logger.info(f"Verification email task created for customer {customer_id} ({customer_email}) with bonnummer {bonnummer}")
-            except Exception as e:
-                logger.error(f"Error creating verification email task: {e}")
-                logger.exception("Full error traceback:")
+            # Only queues the mail in the email outbox (app.services.email_outbox), so it is
+            # awaited here: once the response is sent the mail survives a restart.
+            await send_verification_email_task()
     
     # Send notifications
     try:
@@ -310,13 +324,8 @@ async def create_public_order(
                 logger.error(f"Error in order confirmation email task: {e}")
                 logger.exception("Full error traceback:")
         
-        # Create task in current event loop
-        try:
-            asyncio.create_task(send_confirmation_task())
-            logger.info(f"Order confirmation email task created for order {bonnummer}")
-        except Exception as e:
-            logger.error(f"Error creating order confirmation email task: {e}")
-            logger.exception("Full error traceback:")
+        # Queued in the email outbox before the response is returned
+        await send_confirmation_task()
         
         # Send admin notification (async, don't wait)
         try:
@@ -344,6 +353,13 @@ async def create_public_order(
     except Exception as e:
         logger.warning(f"Could not broadcast new order: {e}")
     
+    # Queue the receipt for the kassa's print client (woken by its long-poll)
+    if settings.ONLINE_ORDER_PRINTER:
+        try:
+            printer_service.queue_order_receipt(db, db_order, printer=settings.ONLINE_ORDER_PRINTER)
+        except Exception as e:
+            logger.warning(f"Could not queue receipt for order {db_order.bonnummer}: {e}")
+    
     # Return order with items
     return {
         "id": db_order.id,
@@ -373,29 +389,22 @@ async def create_public_order(
 @router.get("/orders/public/{bonnummer}")
 async def get_order_by_bonnummer_public(
     bonnummer: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get order by bonnummer (public endpoint, no authentication required).
     """
-    order = db.query(Order).filter(Order.bonnummer == bonnummer).first()
+    order = await order_queries.get_order_by_bonnummer_async(db, bonnummer)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bestelling niet gevonden"
         )
     
-    # Get customer name if klant_id exists
-    klant_naam = None
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-        if customer:
-            klant_naam = customer.naam
-    
     return {
         "id": order.id,
         "klant_id": order.klant_id,
-        "klant_naam": klant_naam,
+        "klant_naam": order.klant.naam if order.klant else None,
         "koerier_id": order.koerier_id,
         "datum": order.datum,
         "tijd": order.tijd,
@@ -404,18 +413,7 @@ async def get_order_by_bonnummer_public(
         "bonnummer": order.bonnummer,
         "levertijd": order.levertijd,
         "status": order.status or "Nieuw",
-        "items": [
-            {
-                "id": item.id,
-                "bestelling_id": item.bestelling_id,
-                "product_naam": item.product_naam,
-                "aantal": item.aantal,
-                "prijs": item.prijs,
-                "opmerking": item.opmerking,
-                "extras": json.loads(item.extras) if item.extras else None
-            }
-            for item in order.items
-        ]
+        "items": order_queries.serialize_items(order)
     }
 
 
@@ -425,33 +423,28 @@ async def get_orders(
     skip: int = 0,
     limit: int = 100,
     customer_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get list of orders with optional filtering.
     """
-    query = db.query(Order)
+    # Orders with customer joined and items in one extra query (no per-order queries)
+    stmt = order_queries.order_select()
     
     if customer_id:
-        query = query.filter(Order.klant_id == customer_id)
+        stmt = stmt.where(Order.klant_id == customer_id)
     
-    orders = query.order_by(Order.datum.desc(), Order.tijd.desc()).offset(skip).limit(limit).all()
+    orders = await order_queries.fetch_orders(
+        db, stmt.order_by(Order.datum.desc(), Order.tijd.desc()).offset(skip).limit(limit)
+    )
     
-    # Load items for each order
     result = []
     for order in orders:
-        # Get customer name if klant_id exists
-        klant_naam = None
-        if order.klant_id:
-            customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-            if customer:
-                klant_naam = customer.naam
-        
         order_dict = {
             "id": order.id,
             "klant_id": order.klant_id,
-            "klant_naam": klant_naam,
+            "klant_naam": order.klant.naam if order.klant else None,
             "koerier_id": order.koerier_id,
             "datum": order.datum,
             "tijd": order.tijd,
@@ -460,17 +453,7 @@ async def get_orders(
             "bonnummer": order.bonnummer,
             "levertijd": order.levertijd,
             "status": order.status or "Nieuw",
-            "items": [
-                {
-                    "id": item.id,
-                    "bestelling_id": item.bestelling_id,
-                    "product_naam": item.product_naam,
-                    "aantal": item.aantal,
-                    "prijs": item.prijs,
-                    "opmerking": item.opmerking
-                }
-                for item in order.items
-            ]
+            "items": order_queries.serialize_items(order, include_extras=False)
         }
         result.append(order_dict)
     
@@ -480,30 +463,23 @@ async def get_orders(
 @router.get("/orders/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get a specific order by ID.
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = await order_queries.get_order_async(db, order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bestelling niet gevonden"
         )
     
-    # Get customer name if klant_id exists
-    klant_naam = None
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-        if customer:
-            klant_naam = customer.naam
-    
     return {
         "id": order.id,
         "klant_id": order.klant_id,
-        "klant_naam": klant_naam,
+        "klant_naam": order.klant.naam if order.klant else None,
         "koerier_id": order.koerier_id,
         "datum": order.datum,
         "tijd": order.tijd,
@@ -512,18 +488,7 @@ async def get_order(
         "bonnummer": order.bonnummer,
         "levertijd": order.levertijd,
         "status": order.status or "Nieuw",
-        "items": [
-            {
-                "id": item.id,
-                "bestelling_id": item.bestelling_id,
-                "product_naam": item.product_naam,
-                "aantal": item.aantal,
-                "prijs": item.prijs,
-                "opmerking": item.opmerking,
-                "extras": json.loads(item.extras) if item.extras else None
-            }
-            for item in order.items
-        ]
+        "items": order_queries.serialize_items(order)
     }
 
 
@@ -593,14 +558,7 @@ async def create_order(
     db.commit()
     db.refresh(db_order)
     
-    # Update customer statistics if customer exists
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-        if customer:
-            customer.totaal_bestellingen += 1
-            customer.totaal_besteed += order.totaal
-            customer.laatste_bestelling = f"{datum} {tijd}"
-            db.commit()
+    # Customer statistics are kept up to date by the triggers on bestellingen
     
     logger.info(f"Order created: {db_order.id} - Bonnummer: {bonnummer}")
     
@@ -664,7 +622,8 @@ async def update_order(
         order.status_updated_at = datetime.now()
     
     db.commit()
-    db.refresh(order)
+    # Reload with customer and items in two queries (instead of refresh + lazy loads)
+    order = order_queries.get_order(db, order_id)
     
     logger.info(f"Order updated: {order_id} - Status: {order.status}")
     
@@ -673,14 +632,8 @@ async def update_order(
         from app.services.notification import notification_service
         import asyncio
         
-        # Get customer contact info if available
-        customer_email = None
-        customer_phone = None
-        if order.klant_id:
-            customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-            if customer:
-                customer_email = customer.email  # FIX: Use actual email from Customer model
-                customer_phone = customer.telefoon
+        customer_email = order.klant.email if order.klant else None
+        customer_phone = order.klant.telefoon if order.klant else None
         
         status_update_data = {
             "id": order.id,
@@ -727,18 +680,7 @@ async def update_order(
         "bonnummer": order.bonnummer,
         "levertijd": order.levertijd,
         "status": order.status or "Nieuw",
-        "items": [
-            {
-                "id": item.id,
-                "bestelling_id": item.bestelling_id,
-                "product_naam": item.product_naam,
-                "aantal": item.aantal,
-                "prijs": item.prijs,
-                "opmerking": item.opmerking,
-                "extras": json.loads(item.extras) if item.extras else None
-            }
-            for item in order.items
-        ]
+        "items": order_queries.serialize_items(order)
     }
 
 
@@ -758,8 +700,10 @@ async def delete_order(
             detail="Bestelling niet gevonden"
         )
     
+    bonnummer = order.bonnummer
     db.delete(order)
     db.commit()
+    tracking_cache.invalidate([bonnummer] if bonnummer else None)
     
     logger.info(f"Order deleted: {order_id}")
     return None
@@ -782,13 +726,16 @@ async def delete_orders(
         if order_ids and len(order_ids) > 0:
             # Delete specific orders
             deleted_count = 0
+            bonnummers = []
             for order_id in order_ids:
                 order = db.query(Order).filter(Order.id == order_id).first()
                 if order:
+                    bonnummers.append(order.bonnummer)
                     db.delete(order)
                     deleted_count += 1
             
             db.commit()
+            tracking_cache.invalidate(bonnummers if all(bonnummers) else None)
             logger.info(f"Deleted {deleted_count} orders: {order_ids}")
             return {
                 "message": f"{deleted_count} bestelling(en) succesvol verwijderd",
@@ -808,6 +755,7 @@ async def delete_orders(
             # Delete all orders
             db.execute(text("DELETE FROM bestellingen"))
             db.commit()
+            tracking_cache.invalidate()
             
             logger.info(f"Deleted all orders ({total_count} orders)")
             return {
@@ -913,6 +861,7 @@ async def renumber_receipts(
                 logger.warning(f"Kon bon_teller niet updaten voor {date_str}: {e}")
         
         db.commit()
+        tracking_cache.invalidate()
         
         logger.info(f"Receipts renumbered: {updated_count} orders updated")
         return {
@@ -928,128 +877,91 @@ async def renumber_receipts(
         )
 
 
+def _pending_order_dict(order: Order) -> dict:
+    """Response dictionary of a pending online order (full customer details and items)."""
+    return {
+        "id": order.id,
+        "klant_id": order.klant_id,
+        **order_queries.customer_fields(order),
+        "koerier_id": order.koerier_id,
+        "datum": order.datum,
+        "tijd": order.tijd,
+        "totaal": float(order.totaal),
+        "opmerking": order.opmerking,
+        "bonnummer": order.bonnummer,
+        "levertijd": order.levertijd,
+        "status": order.status or "Nieuw",
+        "betaalmethode": getattr(order, 'betaalmethode', 'cash') or 'cash',
+        "afstand_km": float(getattr(order, 'afstand_km', 0)) if getattr(order, 'afstand_km', None) else None,
+        "online_bestelling": int(getattr(order, 'online_bestelling', 0)),
+        "items": order_queries.serialize_items(order, include_product_id=True)
+    }
+
+
+def _serialize_pending(orders: List[Order]) -> List[dict]:
+    result = []
+    for order in orders:
+        try:
+            result.append(_pending_order_dict(order))
+        except Exception as e:
+            logger.error(f"Error processing order {order.id}: {e}")
+    return result
+
+
 @router.get("/orders/online/pending")
 async def get_pending_online_orders(
-    db: Session = Depends(get_db),
+    response: Response,
+    since: Optional[int] = Query(None, ge=0, description="Cursor of the previous response; 0 = full sync"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get all pending online orders for the cash register system.
     Returns orders with status 'Nieuw', 'In de keuken', or 'Onderweg' that are online orders.
+    
+    Without `since` the full list is returned (as before). With `since` the
+    response is a delta: {"cursor", "full", "created", "changed", "removed"},
+    containing only the orders changed after that cursor (see
+    app.services.order_changes). Both forms carry an ETag for the cursor and
+    answer 304 when If-None-Match matches, i.e. when nothing changed.
     """
     try:
+        state = await order_changes.get_state_async(db)
+        etag = order_changes.get_etag(state)
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        
         # Get pending online orders (status: Nieuw, In de keuken, or Onderweg)
-        orders = db.query(Order).filter(
+        pending = order_queries.order_select().where(
             Order.online_bestelling == 1,
-            Order.status.in_(["Nieuw", "In de keuken", "Onderweg"])
-        ).order_by(Order.datum.desc(), Order.tijd.desc()).all()
+            Order.status.in_(PENDING_ONLINE_STATUSES)
+        )
+        newest_first = pending.order_by(Order.datum.desc(), Order.tijd.desc())
         
-        result = []
-        for order in orders:
-            try:
-                # Get customer details if klant_id exists
-                klant_naam = None
-                klant_adres = None
-                klant_telefoon = None
-                klant_email = None
-                klant_straat = None
-                klant_huisnummer = None
-                klant_postcode = None
-                klant_gemeente = None
-                
-                if order.klant_id:
-                    customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-                    if customer:
-                        klant_naam = customer.naam
-                        klant_straat = customer.straat
-                        klant_huisnummer = customer.huisnummer
-                        klant_telefoon = customer.telefoon
-                        klant_email = customer.email  # FIX: Use actual email from Customer model
-                        
-                        # Parse plaats (usually "Postcode Gemeente" format)
-                        if customer.plaats:
-                            import re
-                            plaats = customer.plaats.strip()
-                            # Try to extract postcode (4 digits) and gemeente
-                            postcode_match = re.match(r'^(\d{4})\s+(.+)$', plaats)
-                            if postcode_match:
-                                klant_postcode = postcode_match.group(1)
-                                klant_gemeente = postcode_match.group(2)
-                            else:
-                                # If no postcode pattern, assume it's just gemeente
-                                klant_gemeente = plaats
-                        
-                        # Build address string for backward compatibility
-                        adres_parts = []
-                        if customer.straat:
-                            adres_parts.append(customer.straat)
-                        if customer.huisnummer:
-                            adres_parts.append(str(customer.huisnummer))
-                        if adres_parts:
-                            adres_str = " ".join(adres_parts)
-                            if customer.plaats:
-                                klant_adres = f"{adres_str}, {customer.plaats}"
-                            else:
-                                klant_adres = adres_str
-                        else:
-                            klant_adres = customer.plaats if customer.plaats else None
-                
-                # Build items list
-                items_list = []
-                for item in order.items:
-                    try:
-                        extras_data = None
-                        if item.extras:
-                            try:
-                                extras_data = json.loads(item.extras) if isinstance(item.extras, str) else item.extras
-                            except json.JSONDecodeError:
-                                logger.warning(f"Could not parse extras JSON for item {item.id}: {item.extras}")
-                                extras_data = None
-                        
-                        items_list.append({
-                            "id": item.id,
-                            "bestelling_id": item.bestelling_id,
-                            "product_naam": item.product_naam,
-                            "product_id": item.product_id,  # Include product_id in response
-                            "aantal": item.aantal,
-                            "prijs": float(item.prijs),
-                            "opmerking": item.opmerking,
-                            "extras": extras_data
-                        })
-                    except Exception as e:
-                        logger.error(f"Error processing order item {item.id}: {e}")
-                        continue
-                
-                order_dict = {
-                    "id": order.id,
-                    "klant_id": order.klant_id,
-                    "klant_naam": klant_naam,
-                    "klant_adres": klant_adres,
-                    "klant_telefoon": klant_telefoon,
-                    "klant_email": klant_email,
-                    "klant_straat": klant_straat,
-                    "klant_huisnummer": klant_huisnummer,
-                    "klant_postcode": klant_postcode,
-                    "klant_gemeente": klant_gemeente,
-                    "koerier_id": order.koerier_id,
-                    "datum": order.datum,
-                    "tijd": order.tijd,
-                    "totaal": float(order.totaal),
-                    "opmerking": order.opmerking,
-                    "bonnummer": order.bonnummer,
-                    "levertijd": order.levertijd,
-                    "status": order.status or "Nieuw",
-                    "betaalmethode": getattr(order, 'betaalmethode', 'cash') or 'cash',
-                    "afstand_km": float(getattr(order, 'afstand_km', 0)) if getattr(order, 'afstand_km', None) else None,
-                    "online_bestelling": int(getattr(order, 'online_bestelling', 0)),
-                    "items": items_list
-                }
-                result.append(order_dict)
-            except Exception as e:
-                logger.error(f"Error processing order {order.id}: {e}")
-                continue
+        if since is None:
+            return _serialize_pending(await order_queries.fetch_orders(db, newest_first))
         
-        return result
+        if not order_changes.is_valid_cursor(since, state):
+            return {
+                "cursor": state.cursor,
+                "full": True,
+                "created": _serialize_pending(await order_queries.fetch_orders(db, newest_first)),
+                "changed": [],
+                "removed": [],
+            }
+        
+        changed = await order_changes.changed_order_ids_async(db, since, state.cursor)
+        orders = await order_queries.fetch_orders(db, pending.where(Order.id.in_(changed))) if changed else []
+        still_pending = {order.id for order in orders}
+        return {
+            "cursor": state.cursor,
+            "full": False,
+            "created": _serialize_pending([o for o in orders if changed[o.id]]),
+            "changed": _serialize_pending([o for o in orders if not changed[o.id]]),
+            "removed": sorted(order_id for order_id in changed if order_id not in still_pending),
+        }
     except Exception as e:
         logger.error(f"Error in get_pending_online_orders: {e}", exc_info=True)
         raise HTTPException(
@@ -1062,13 +974,13 @@ async def get_pending_online_orders(
 async def update_order_status(
     order_id: int,
     status_update: OrderStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Update order status and optionally delivery time and courier.
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = (await db.execute(select(Order).where(Order.id == order_id))).scalars().first()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1084,23 +996,32 @@ async def update_order_status(
     if status_update.koerier_id is not None:
         order.koerier_id = status_update.koerier_id
     
-    db.commit()
-    db.refresh(order)
+    await db.commit()
+    # Reload with customer and items in two queries (instead of refresh + lazy loads)
+    order = await order_queries.get_order_async(db, order_id)
     
     logger.info(f"Order status updated: {order_id} - Status: {status_update.new_status}")
     
+    # Live update for admins and the order's tracking page (also drops its tracking cache entry)
+    try:
+        from app.api.websocket import broadcast_status_change
+        broadcast_status_change({
+            "id": order.id,
+            "bonnummer": order.bonnummer,
+            "status": order.status or "Nieuw",
+            "levertijd": order.levertijd,
+            "koerier_id": order.koerier_id
+        })
+    except Exception as e:
+        logger.warning(f"Could not broadcast status change: {e}")
+    
     # Send status update notification
     try:
         from app.services.notification import notification_service
         import asyncio
         
-        customer_email = None
-        customer_phone = None
-        if order.klant_id:
-            customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-            if customer:
-                customer_email = customer.email  # FIX: Use actual email from Customer model
-                customer_phone = customer.telefoon
+        customer_email = order.klant.email if order.klant else None
+        customer_phone = order.klant.telefoon if order.klant else None
         
         status_update_data = {
             "id": order.id,
@@ -1122,40 +1043,15 @@ async def update_order_status(
     except Exception as e:
         logger.warning(f"Could not send status update notification: {e}")
     
-    # Get customer details for response
-    klant_naam = None
-    klant_adres = None
-    klant_telefoon = None
-    klant_email = None
-    
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-        if customer:
-            klant_naam = customer.naam
-            # Build address using correct field names
-            adres_parts = []
-            if customer.straat:
-                adres_parts.append(customer.straat)
-            if customer.huisnummer:
-                adres_parts.append(str(customer.huisnummer))
-            if adres_parts:
-                adres_str = " ".join(adres_parts)
-                if customer.plaats:
-                    klant_adres = f"{adres_str}, {customer.plaats}"
-                else:
-                    klant_adres = adres_str
-            else:
-                klant_adres = customer.plaats if customer.plaats else None
-            klant_telefoon = customer.telefoon
-            klant_email = customer.email  # FIX: Use actual email from Customer model
+    klant = order_queries.customer_fields(order)
     
     return {
         "id": order.id,
         "klant_id": order.klant_id,
-        "klant_naam": klant_naam,
-        "klant_adres": klant_adres,
-        "klant_telefoon": klant_telefoon,
-        "klant_email": klant_email,
+        "klant_naam": klant["klant_naam"],
+        "klant_adres": klant["klant_adres"],
+        "klant_telefoon": klant["klant_telefoon"],
+        "klant_email": klant["klant_email"],
         "koerier_id": order.koerier_id,
         "datum": order.datum,
         "tijd": order.tijd,
@@ -1167,17 +1063,86 @@ async def update_order_status(
         "betaalmethode": getattr(order, 'betaalmethode', 'cash'),
         "afstand_km": getattr(order, 'afstand_km', None),
         "online_bestelling": getattr(order, 'online_bestelling', 0),
-        "items": [
-            {
-                "id": item.id,
-                "bestelling_id": item.bestelling_id,
-                "product_naam": item.product_naam,
-                "aantal": item.aantal,
-                "prijs": item.prijs,
-                "opmerking": item.opmerking,
-                "extras": json.loads(item.extras) if item.extras else None
-            }
-            for item in order.items
-        ]
+        "items": order_queries.serialize_items(order)
     }
 
+
+@router.patch("/orders/status:batch")
+async def update_order_status_batch(
+    batch: OrderStatusBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Update status, delivery time and/or courier of many orders in one transaction.
+    
+    Used by the kassa's courier screen to assign (or unassign) a courier to a
+    selection of orders. Per order only the given fields change; an explicit
+    "koerier_id": null removes the courier. Unknown order ids are skipped and
+    returned in "missing". Sends one coalesced "order_status_batch" WebSocket
+    event; trackers of each order still get their own order_status_changed.
+    """
+    # Last update wins when an id occurs twice
+    updates = {update.id: update for update in batch.updates}
+    orders = (await db.execute(
+        select(Order).options(joinedload(Order.klant)).where(Order.id.in_(updates))
+    )).scalars().all()
+    
+    now = datetime.now()
+    status_changed = []
+    for order in orders:
+        update = updates[order.id]
+        if update.new_status is not None and update.new_status != order.status:
+            status_changed.append(order)
+        if update.new_status is not None:
+            order.status = update.new_status
+            order.status_updated_at = now
+        if update.levertijd:
+            order.levertijd = update.levertijd
+        if "koerier_id" in update.model_fields_set:
+            order.koerier_id = update.koerier_id
+    
+    await db.commit()
+    
+    updated = [
+        {
+            "id": order.id,
+            "bonnummer": order.bonnummer,
+            "status": order.status or "Nieuw",
+            "levertijd": order.levertijd,
+            "koerier_id": order.koerier_id,
+        }
+        for order in sorted(orders, key=lambda o: o.id)
+    ]
+    missing = sorted(set(updates) - {order.id for order in orders})
+    logger.info(f"Batch status update: {len(updated)} orders updated, {len(missing)} not found")
+    
+    if updated:
+        from app.api.websocket import broadcast_status_batch
+        broadcast_status_batch(updated)
+    
+    # Status notifications, as for PUT /orders/{id}/status
+    try:
+        from app.services.notification import notification_service
+        import asyncio
+        
+        for order in status_changed:
+            asyncio.create_task(
+                notification_service.send_status_update(
+                    {
+                        "id": order.id,
+                        "bonnummer": order.bonnummer,
+                        "status": order.status,
+                        "levertijd": order.levertijd,
+                        "totaal": order.totaal,
+                        "datum": order.datum,
+                        "tijd": order.tijd
+                    },
+                    order.klant.email if order.klant else None,
+                    order.klant.telefoon if order.klant else None
+                )
+            )
+    except Exception as e:
+        logger.warning(f"Could not send status update notifications: {e}")
+    
+    return {"updated": updated, "missing": missing}
@@ -1,17 +1,16 @@
 """
 API endpoints for printer management and print jobs.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
 from pydantic import BaseModel
 import logging
-import json
 
+from app.core.config import settings
 from app.core.dependencies import get_db, get_current_user, require_role
-from app.services.printer import printer_service
+from app.services.printer import DEFAULT_PRINTER, printer_service
 from sqlalchemy.orm import Session
 from app.models.order import Order
-from app.models.customer import Customer
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +21,7 @@ class PrintJobRequest(BaseModel):
     """Request model for print job."""
     order_id: int
     custom_footer: Optional[str] = None
+    printer: Optional[str] = None  # Print client route (default: "default")
 
 
 class PrintJobResponse(BaseModel):
@@ -46,7 +46,7 @@ async def get_printer_info(
 ):
     """Get printer information and status."""
     available_printers = printer_service.get_available_printers()
-    pending_jobs = len(printer_service.get_pending_jobs())
+    pending_jobs = printer_service.count_pending_jobs()
     
     return {
         "available_printers": available_printers,
@@ -75,52 +75,10 @@ async def print_order(
             detail="Order not found"
         )
     
-    # Get customer if available
-    customer_data = None
-    if order.klant_id:
-        customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
-        if customer:
-            customer_data = {
-                "naam": customer.naam,
-                "telefoon": customer.telefoon,
-                "straat": getattr(customer, 'straat', None),
-                "huisnummer": getattr(customer, 'huisnummer', None),
-                "postcode": getattr(customer, 'postcode', None),
-                "plaats": getattr(customer, 'plaats', None),
-            }
-    
-    # Prepare order data
-    order_data = {
-        "id": order.id,
-        "bonnummer": order.bonnummer,
-        "datum": order.datum,
-        "tijd": order.tijd,
-        "totaal": order.totaal,
-        "items": [
-            {
-                "product_naam": item.product_naam,
-                "aantal": item.aantal,
-                "prijs": item.prijs,
-                "opmerking": getattr(item, 'opmerking', None),
-                "extras": json.loads(item.extras) if getattr(item, 'extras', None) else None,
-            }
-            for item in order.items
-        ]
-    }
-    
-    # Format receipt
-    receipt_text = printer_service.format_receipt(
-        order_data,
-        customer_data,
-        request.custom_footer
+    job_id = printer_service.queue_order_receipt(
+        db, order, printer=request.printer, custom_footer=request.custom_footer
     )
     
-    # Generate QR data (optional)
-    qr_data = f"https://pitapizzanapoli.be/status?bonnummer={order.bonnummer}"
-    
-    # Queue print job
-    job_id = printer_service.queue_print_job(order_data, receipt_text, qr_data)
-    
     return {
         "job_id": job_id,
         "status": "queued",
@@ -130,20 +88,50 @@ async def print_order(
 
 @router.get("/jobs/pending")
 async def get_pending_jobs(
+    printer: Optional[str] = None,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all pending print jobs (admin only)."""
+    """Get all pending print jobs, optionally for one printer (admin only)."""
     # Check if user is admin
     if not current_user or current_user.get("role") != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    jobs = printer_service.get_pending_jobs()
+    jobs = printer_service.get_pending_jobs(printer)
     return {"jobs": jobs, "count": len(jobs)}
 
 
+@router.get("/jobs/wait")
+async def wait_for_print_jobs(
+    printer: str = Query(DEFAULT_PRINTER, description="Printer route of this print client"),
+    after: int = Query(0, ge=0, description="Highest job seq already received"),
+    timeout: Optional[float] = Query(None, ge=0),
+    current_user=Depends(get_current_user)
+):
+    """
+    Long-poll for print jobs (admin only).
+    
+    Returns the pending jobs for the printer as soon as there are any (with a
+    seq above `after`), or an empty list after the timeout (at most
+    PRINT_WAIT_SECONDS). The client prints them, marks them complete and
+    calls again with the highest seq as `after`.
+    """
+    if not current_user or current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    wait = settings.PRINT_WAIT_SECONDS if timeout is None else min(timeout, settings.PRINT_WAIT_SECONDS)
+    jobs = await printer_service.wait_for_jobs(printer, after=after, timeout=wait)
+    return {
+        "jobs": jobs,
+        "count": len(jobs),
+        "cursor": max([job["seq"] for job in jobs], default=after)
+    }
+
+
 @router.post("/jobs/{job_id}/complete")
 async def complete_print_job(
     job_id: str,
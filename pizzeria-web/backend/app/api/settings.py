@@ -3,67 +3,42 @@ Settings API endpoints for public information.
 """
 from fastapi import APIRouter, HTTPException, status
 from typing import Dict, Any
-import json
-import os
-from pathlib import Path
 import logging
+from app.services.config_files import settings_file
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+DEFAULT_CUSTOMER_INFO = {
+    "message": "Beste klanten,\n\nLevertijd in het weekend kan oplopen tot 75 minuten.\n\nMet vriendelijke groeten,\nPita Pizza Napoli"
+}
+
+
 def load_settings() -> Dict[str, Any]:
-    """Load settings from settings.json file."""
-    # Try multiple paths to find settings.json
-    # Backend is in pizzeria-web/backend, settings.json is in project root
-    current_file = Path(__file__).resolve()
-    # From backend/app/api/settings.py -> go up 4 levels to project root
-    # backend/app/api/settings.py -> backend/app/api -> backend/app -> backend -> project root
-    project_root = current_file.parent.parent.parent.parent
-    
-    possible_paths = [
-        project_root / "settings.json",  # Project root
-        project_root.parent / "settings.json",  # One level up from project root
-        Path("settings.json"),  # Current working directory
-        Path("../settings.json"),  # Parent of current working directory
-        Path("../../settings.json"),  # Two levels up
-        Path("../../../settings.json"),  # Three levels up
-        Path("../../../../settings.json"),  # Four levels up
-    ]
+    """
+    Load settings from settings.json (cached, reloaded when the file changes).
+
+    The returned dict is shared between requests and must not be modified.
+    """
+    return _as_settings(settings_file.data())
+
+
+def _as_settings(data: Any) -> Dict[str, Any]:
+    if isinstance(data, dict):
+        return data
+    return {"customer_info": DEFAULT_CUSTOMER_INFO}
+
+
+def _customer_info(settings: Dict[str, Any]) -> Dict[str, Any]:
+    customer_info = settings.get("customer_info", {})
     
-    for path in possible_paths:
-        try:
-            # Resolve relative paths
-            if not path.is_absolute():
-                path_resolved = path.resolve()
-            else:
-                path_resolved = path
-            
-            if path_resolved.exists() and path_resolved.is_file():
-                try:
-                    with open(path_resolved, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        logger.info(f"Successfully loaded settings from {path_resolved}")
-                        return data
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON in settings file {path_resolved}: {e}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error loading settings from {path_resolved}: {e}")
-                    continue
-        except Exception as e:
-            # Skip paths that can't be resolved
-            logger.debug(f"Could not resolve path {path}: {e}")
-            continue
+    # Default message if not found
+    if not customer_info or "message" not in customer_info:
+        customer_info = DEFAULT_CUSTOMER_INFO
     
-    # Return default if file not found
-    logger.warning(f"settings.json not found in any expected location. Searched: {[str(p) for p in possible_paths]}")
-    return {
-        "customer_info": {
-            "message": "Beste klanten,\n\nLevertijd in het weekend kan oplopen tot 75 minuten.\n\nMet vriendelijke groeten,\nPita Pizza Napoli"
-        }
-    }
+    return customer_info
 
 
 @router.get("/settings/customer-info")
@@ -72,22 +47,52 @@ async def get_customer_info() -> Dict[str, Any]:
     Get customer information message (public endpoint, no authentication required).
     """
     try:
-        settings = load_settings()
-        customer_info = settings.get("customer_info", {})
-        
-        # Default message if not found
-        if not customer_info or "message" not in customer_info:
-            customer_info = {
-                "message": "Beste klanten,\n\nLevertijd in het weekend kan oplopen tot 75 minuten.\n\nMet vriendelijke groeten,\nPita Pizza Napoli"
-            }
-        
-        return customer_info
+        return settings_file.json_response("customer_info", lambda data: _customer_info(_as_settings(data)))
     except Exception as e:
         logger.error(f"Error getting customer info: {str(e)}", exc_info=True)
         # Return default message on error
-        return {
-            "message": "Beste klanten,\n\nLevertijd in het weekend kan oplopen tot 75 minuten.\n\nMet vriendelijke groeten,\nPita Pizza Napoli"
-        }
+        return DEFAULT_CUSTOMER_INFO
+
+
+DEFAULT_DELIVERY_ZONES = {
+    "Zwijndrecht": 15.00,
+    "Nieuw-Namen": 15.00,
+    "Nieuwkerken-Waas": 15.00,
+    "Sint-Niklaas": 15.00,
+    "Beveren": 15.00,
+    "Vrasene": 15.00,
+    "Haasdonk": 15.00,
+    "Kallo": 15.00,
+    "Melsele": 15.00,
+    "Verrebroek": 15.00,
+    "Kieldrecht": 15.00,
+    "Doel": 15.00,
+    "Klein meerdonk": 15.00,
+    "Meerdonk": 15.00,
+    "Sint-Gillis-Waas": 15.00,
+    "De Klinge": 15.00,
+}
+
+
+def _delivery_zones(settings: Dict[str, Any]) -> Dict[str, float]:
+    # Get delivery zones from settings, or use defaults
+    delivery_zones = settings.get("delivery_zones", {})
+    
+    # If no delivery zones in settings, return default minimum amounts
+    if not delivery_zones or not isinstance(delivery_zones, dict):
+        logger.warning("No delivery zones found in settings, using defaults")
+        return DEFAULT_DELIVERY_ZONES
+    
+    # Ensure all values are floats
+    result = {}
+    for gemeente, amount in delivery_zones.items():
+        try:
+            result[gemeente] = float(amount)
+        except (ValueError, TypeError):
+            logger.warning(f"Invalid amount for {gemeente}: {amount}, using default 15.00")
+            result[gemeente] = 15.00
+    
+    return result
 
 
 @router.get("/settings/delivery-zones")
@@ -96,50 +101,48 @@ async def get_delivery_zones() -> Dict[str, float]:
     Get delivery zones with minimum delivery amounts per municipality (public endpoint).
     Returns a dictionary mapping municipality names to minimum delivery amounts.
     """
-    default_zones = {
-        "Zwijndrecht": 15.00,
-        "Nieuw-Namen": 15.00,
-        "Nieuwkerken-Waas": 15.00,
-        "Sint-Niklaas": 15.00,
-        "Beveren": 15.00,
-        "Vrasene": 15.00,
-        "Haasdonk": 15.00,
-        "Kallo": 15.00,
-        "Melsele": 15.00,
-        "Verrebroek": 15.00,
-        "Kieldrecht": 15.00,
-        "Doel": 15.00,
-        "Klein meerdonk": 15.00,
-        "Meerdonk": 15.00,
-        "Sint-Gillis-Waas": 15.00,
-        "De Klinge": 15.00,
-    }
-    
     try:
-        settings = load_settings()
-        
-        # Get delivery zones from settings, or use defaults
-        delivery_zones = settings.get("delivery_zones", {})
-        
-        # If no delivery zones in settings, return default minimum amounts
-        if not delivery_zones or not isinstance(delivery_zones, dict):
-            logger.warning("No delivery zones found in settings, using defaults")
-            return default_zones
-        
-        # Ensure all values are floats
-        result = {}
-        for gemeente, amount in delivery_zones.items():
-            try:
-                result[gemeente] = float(amount)
-            except (ValueError, TypeError):
-                logger.warning(f"Invalid amount for {gemeente}: {amount}, using default 15.00")
-                result[gemeente] = 15.00
-        
-        return result
+        return settings_file.json_response("delivery_zones", lambda data: _delivery_zones(_as_settings(data)))
     except Exception as e:
         logger.error(f"Error getting delivery zones: {str(e)}", exc_info=True)
         # Return default on error
-        return default_zones
+        return DEFAULT_DELIVERY_ZONES
+
+
+DEFAULT_OPENING_HOURS = {
+    "monday": {"open": False, "open_time": "17:00", "close_time": "20:30"},
+    "tuesday": {"open": True, "open_time": "17:00", "close_time": "20:30"},
+    "wednesday": {"open": True, "open_time": "17:00", "close_time": "20:30"},
+    "thursday": {"open": True, "open_time": "17:00", "close_time": "20:30"},
+    "friday": {"open": True, "open_time": "17:00", "close_time": "20:30"},
+    "saturday": {"open": True, "open_time": "17:00", "close_time": "20:30"},
+    "sunday": {"open": True, "open_time": "17:00", "close_time": "20:30"},
+}
+
+
+def _opening_hours(settings: Dict[str, Any]) -> Dict[str, Any]:
+    # Get opening hours from settings, or use defaults
+    opening_hours = settings.get("opening_hours", {})
+    
+    # If no opening hours in settings, return defaults
+    if not opening_hours or not isinstance(opening_hours, dict):
+        logger.warning("No opening hours found in settings, using defaults")
+        return DEFAULT_OPENING_HOURS
+    
+    # Validate and return opening hours
+    result = {}
+    for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
+        day_config = opening_hours.get(day)
+        if isinstance(day_config, dict):
+            result[day] = {
+                "open": day_config.get("open", False),
+                "open_time": day_config.get("open_time", "17:00"),
+                "close_time": day_config.get("close_time", "20:30")
+            }
+        else:
+            result[day] = DEFAULT_OPENING_HOURS[day]
+    
+    return result
 
 
 @router.get("/settings/opening-hours")
@@ -148,74 +151,9 @@ async def get_opening_hours() -> Dict[str, Any]:
     Get opening hours configuration (public endpoint).
     Returns opening hours for each day of the week.
     """
-    default_hours = {
-        "monday": {
-            "open": False,
-            "open_time": "17:00",
-            "close_time": "20:30"
-        },
-        "tuesday": {
-            "open": True,
-            "open_time": "17:00",
-            "close_time": "20:30"
-        },
-        "wednesday": {
-            "open": True,
-            "open_time": "17:00",
-            "close_time": "20:30"
-        },
-        "thursday": {
-            "open": True,
-            "open_time": "17:00",
-            "close_time": "20:30"
-        },
-        "friday": {
-            "open": True,
-            "open_time": "17:00",
-            "close_time": "20:30"
-        },
-        "saturday": {
-            "open": True,
-            "open_time": "17:00",
-            "close_time": "20:30"
-        },
-        "sunday": {
-            "open": True,
-            "open_time": "17:00",
-            "close_time": "20:30"
-        }
-    }
-    
     try:
-        settings = load_settings()
-        
-        # Get opening hours from settings, or use defaults
-        opening_hours = settings.get("opening_hours", {})
-        
-        # If no opening hours in settings, return defaults
-        if not opening_hours or not isinstance(opening_hours, dict):
-            logger.warning("No opening hours found in settings, using defaults")
-            return default_hours
-        
-        # Validate and return opening hours
-        result = {}
-        for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
-            if day in opening_hours:
-                day_config = opening_hours[day]
-                if isinstance(day_config, dict):
-                    result[day] = {
-                        "open": day_config.get("open", False),
-                        "open_time": day_config.get("open_time", "17:00"),
-                        "close_time": day_config.get("close_time", "20:30")
-                    }
-                else:
-                    result[day] = default_hours[day]
-            else:
-                result[day] = default_hours[day]
-        
-        return result
+        return settings_file.json_response("opening_hours", lambda data: _opening_hours(_as_settings(data)))
     except Exception as e:
         logger.error(f"Error getting opening hours: {str(e)}", exc_info=True)
         # Return default on error
-        return default_hours
-
+        return DEFAULT_OPENING_HOURS
@@ -1,63 +1,205 @@
 """
 WebSocket endpoints for real-time updates.
+
+Every connection gets a bounded send queue drained by its own writer task, so
+a broadcast never waits for a slow client: messages to a full queue are
+dropped, and a client that keeps falling behind (WS_MAX_DROPPED drops in a row
+or a send slower than WS_SEND_TIMEOUT) is disconnected. Messages are routed by
+topic ("admin", "order:<id>", "bonnummer:<nr>") and JSON-encoded once per
+broadcast. Order broadcasts go through app.services.event_bus so sockets on
+every uvicorn worker receive them.
 """
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List, Dict
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
 import json
 import logging
 from datetime import datetime
+from app.core.config import settings
+from app.core.dependencies import require_role
+from app.services.event_bus import event_bus
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+ADMIN_TOPIC = "admin"
+
+
+def order_topic(order_id) -> str:
+    return f"order:{order_id}"
+
+
+def bonnummer_topic(bonnummer) -> str:
+    return f"bonnummer:{bonnummer}"
+
+
+class ClientConnection:
+    """One WebSocket with its send queue, writer task and topics."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.topics: Set[str] = set()
+        self.dropped_in_row = 0
+        self.dropped_total = 0
+        self.writer: Optional[asyncio.Task] = None
+
+    def offer(self, text: str) -> bool:
+        """Queue an encoded message; False if the queue is full (message dropped)."""
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self.dropped_in_row += 1
+            self.dropped_total += 1
+            return False
+        self.dropped_in_row = 0
+        return True
+
+
 # Store active WebSocket connections
 class ConnectionManager:
-    """Manages WebSocket connections."""
-    
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.admin_connections: List[WebSocket] = []
-    
+    """Manages WebSocket connections, topic subscriptions and the per-connection writers."""
+
+    def __init__(self, queue_size: int = None, send_timeout: float = None, max_dropped: int = None):
+        self.queue_size = queue_size or settings.WS_QUEUE_SIZE
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT
+        self.max_dropped = max_dropped or settings.WS_MAX_DROPPED
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        self.topics: Dict[str, Set[ClientConnection]] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0, "slow_disconnects": 0}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.connections)
+
+    @property
+    def admin_connections(self) -> List[WebSocket]:
+        return [client.websocket for client in self.topics.get(ADMIN_TOPIC, ())]
+
     async def connect(self, websocket: WebSocket, is_admin: bool = False):
-        """Accept a new WebSocket connection."""
+        """Accept a new WebSocket connection and start its writer task."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.register(websocket)
         if is_admin:
-            self.admin_connections.append(websocket)
-        logger.info(f"WebSocket connected. Total: {len(self.active_connections)}, Admin: {len(self.admin_connections)}")
-    
+            self.subscribe(websocket, ADMIN_TOPIC)
+        logger.info(f"WebSocket connected. Total: {len(self.connections)}, Admin: {len(self.admin_connections)}")
+
+    def register(self, websocket: WebSocket) -> ClientConnection:
+        """Track an accepted WebSocket (must run on the event loop)."""
+        self.loop = asyncio.get_running_loop()
+        client = ClientConnection(websocket, self.queue_size)
+        client.writer = asyncio.create_task(self._writer(client))
+        self.connections[websocket] = client
+        return client
+
     def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if websocket in self.admin_connections:
-            self.admin_connections.remove(websocket)
-        logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}, Admin: {len(self.admin_connections)}")
-    
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """Send a message to a specific connection."""
+        """Remove a WebSocket connection and stop its writer."""
+        client = self.connections.pop(websocket, None)
+        if client is None:
+            return
+        for topic in client.topics:
+            subscribers = self.topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.topics[topic]
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        logger.info(f"WebSocket disconnected. Total: {len(self.connections)}, Admin: {len(self.admin_connections)}")
+
+    def subscribe(self, websocket: WebSocket, topic: str) -> None:
+        """Route messages for a topic to this connection."""
+        client = self.connections.get(websocket)
+        if client is None:
+            return
+        client.topics.add(topic)
+        self.topics.setdefault(topic, set()).add(client)
+
+    async def _writer(self, client: ClientConnection):
+        """Send queued messages to one client; a send that hangs disconnects it."""
         try:
-            await websocket.send_json(message)
+            while True:
+                text = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send_text(text), timeout=self.send_timeout)
+                self.stats["delivered"] += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"WebSocket send timed out after {self.send_timeout}s, disconnecting slow client")
+            self.stats["slow_disconnects"] += 1
+            await self._close(client)
         except Exception as e:
-            logger.error(f"Error sending personal message: {e}")
-            self.disconnect(websocket)
-    
+            logger.error(f"Error sending WebSocket message: {e}")
+            await self._close(client)
+
+    async def _close(self, client: ClientConnection, code: int = 1013):
+        self.disconnect(client.websocket)
+        try:
+            await client.websocket.close(code=code)
+        except Exception:
+            pass
+
+    def _deliver(self, text: str, clients: Iterable[ClientConnection]) -> int:
+        """Offer one encoded message to each client; disconnect clients that keep dropping."""
+        delivered = 0
+        for client in list(clients):
+            if client.offer(text):
+                delivered += 1
+                continue
+            self.stats["dropped"] += 1
+            if client.dropped_in_row >= self.max_dropped:
+                logger.warning(f"WebSocket client dropped {client.dropped_in_row} messages in a row, disconnecting")
+                self.stats["slow_disconnects"] += 1
+                self.disconnect(client.websocket)
+                asyncio.get_running_loop().create_task(self._close(client))
+        return delivered
+
+    def publish(self, message: dict, topics: Iterable[str]) -> int:
+        """
+        Queue a message for every connection subscribed to one of the topics.
+
+        Never waits for a client. Must run on the event loop (see
+        broadcast_order_update for calls from other threads).
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        recipients: Set[ClientConnection] = set()
+        for topic in topics:
+            recipients.update(self.topics.get(topic, ()))
+        self.stats["published"] += 1
+        if not recipients:
+            return 0
+        return self._deliver(json.dumps(message), recipients)
+
+    async def send_personal_message(self, message: dict, websocket: WebSocket):
+        """Send a message to a specific connection."""
+        client = self.connections.get(websocket)
+        if client is not None:
+            self._deliver(json.dumps(message), [client])
+
     async def broadcast(self, message: dict, admin_only: bool = False):
         """Broadcast a message to all connections (or admin only)."""
-        connections = self.admin_connections if admin_only else self.active_connections
-        disconnected = []
-        
-        for connection in connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting message: {e}")
-                disconnected.append(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            self.disconnect(conn)
+        if admin_only:
+            self.publish(message, [ADMIN_TOPIC])
+        else:
+            self.stats["published"] += 1
+            self._deliver(json.dumps(message), self.connections.values())
+
+    def metrics(self) -> dict:
+        """Connection, topic and queue-depth figures."""
+        depths = [client.queue.qsize() for client in self.connections.values()]
+        return {
+            "connections": len(self.connections),
+            "admin_connections": len(self.topics.get(ADMIN_TOPIC, ())),
+            "topics": len(self.topics),
+            "queue_depth_max": max(depths, default=0),
+            "queue_depth_total": sum(depths),
+            "queue_size": self.queue_size,
+            **self.stats,
+        }
 
 # Global connection manager instance
 manager = ConnectionManager()
@@ -76,24 +218,29 @@ async def websocket_endpoint(websocket: WebSocket):
             try:
                 message = json.loads(data)
                 message_type = message.get("type")
-                
+
                 if message_type == "ping":
                     # Respond to ping with pong
                     await manager.send_personal_message({"type": "pong"}, websocket)
                 elif message_type == "subscribe_admin":
                     # Client wants admin updates
-                    if websocket not in manager.admin_connections:
-                        manager.admin_connections.append(websocket)
+                    manager.subscribe(websocket, ADMIN_TOPIC)
                     await manager.send_personal_message({
                         "type": "subscribed",
                         "role": "admin"
                     }, websocket)
                 elif message_type == "subscribe_order":
-                    # Client wants updates for specific order
+                    # Client wants updates for a specific order (by id and/or bonnummer)
                     order_id = message.get("order_id")
+                    bonnummer = message.get("bonnummer")
+                    if order_id is not None:
+                        manager.subscribe(websocket, order_topic(order_id))
+                    if bonnummer:
+                        manager.subscribe(websocket, bonnummer_topic(bonnummer))
                     await manager.send_personal_message({
                         "type": "subscribed",
-                        "order_id": order_id
+                        "order_id": order_id,
+                        "bonnummer": bonnummer
                     }, websocket)
             except json.JSONDecodeError:
                 logger.warning(f"Invalid JSON received: {data}")
@@ -105,40 +252,92 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 
+@router.get("/ws/metrics")
+async def websocket_metrics(current_user: dict = Depends(require_role("admin"))):
+    """WebSocket connection and queue-depth metrics."""
+    return manager.metrics()
+
+
+def _order_topics(order_data: dict, event_type: str) -> List[str]:
+    """Admins get every order event; status changes also go to that order's trackers."""
+    topics = [ADMIN_TOPIC]
+    if event_type == "order_status_changed":
+        if order_data.get("id") is not None:
+            topics.append(order_topic(order_data["id"]))
+        if order_data.get("bonnummer"):
+            topics.append(bonnummer_topic(order_data["bonnummer"]))
+    return topics
+
+
 async def broadcast_order_update_async(order_data: dict, event_type: str = "order_updated"):
     """
-    Broadcast an order update to all connected clients (async version).
-    
+    Broadcast an order update to the subscribed clients (async version).
+
     Args:
         order_data: Order data to broadcast
         event_type: Type of event (order_created, order_updated, order_deleted)
     """
-    message = {
-        "type": event_type,
-        "timestamp": datetime.now().isoformat(),
-        "data": order_data
-    }
-    await manager.broadcast(message, admin_only=(event_type != "order_status_changed"))
+    broadcast_order_update(order_data, event_type)
 
 
 def broadcast_order_update(order_data: dict, event_type: str = "order_updated"):
     """
-    Broadcast an order update to all connected clients (sync wrapper).
-    
+    Broadcast an order update to the subscribed clients of every worker.
+
+    The event goes through the event bus (app.services.event_bus), which
+    hands it to deliver_order_event in this and all other worker processes.
+
     Args:
         order_data: Order data to broadcast
         event_type: Type of event (order_created, order_updated, order_deleted)
     """
-    import asyncio
+    event_bus.publish({
+        "type": event_type,
+        "timestamp": datetime.now().isoformat(),
+        "data": order_data
+    })
+
+
+def deliver_order_event(message: dict) -> None:
+    """
+    Event bus handler: queue an order event for this worker's sockets.
+
+    Queuing never blocks, so on the event loop the message is published
+    directly; from other threads (bus poller) it is handed to the loop.
+    Other events on the bus (e.g. print jobs) are ignored.
+    """
+    if not str(message.get("type", "")).startswith("order_"):
+        return
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            asyncio.create_task(broadcast_order_update_async(order_data, event_type))
-        else:
-            loop.run_until_complete(broadcast_order_update_async(order_data, event_type))
+        asyncio.get_running_loop()
     except RuntimeError:
-        # No event loop running, create a new one
-        asyncio.run(broadcast_order_update_async(order_data, event_type))
+        if manager.loop is not None and manager.loop.is_running():
+            manager.loop.call_soon_threadsafe(_publish_order_event, message)
+        return
+    _publish_order_event(message)
+
+
+def _publish_order_event(message: dict) -> None:
+    if message.get("type") == "order_status_batch":
+        _publish_status_batch(message)
+        return
+    manager.publish(message, _order_topics(message.get("data") or {}, message.get("type")))
+
+
+def _publish_status_batch(message: dict) -> None:
+    """Admins get the batch as one message; each order's trackers get their own status change."""
+    manager.publish(message, [ADMIN_TOPIC])
+    for order_data in (message.get("data") or {}).get("orders", []):
+        tracker_topics = _order_topics(order_data, "order_status_changed")[1:]
+        if tracker_topics:
+            manager.publish({
+                "type": "order_status_changed",
+                "timestamp": message.get("timestamp"),
+                "data": order_data
+            }, tracker_topics)
+
+
+event_bus.subscribe(deliver_order_event)
 
 
 def broadcast_new_order(order_data: dict):
@@ -147,6 +346,10 @@ def broadcast_new_order(order_data: dict):
 
 
 def broadcast_status_change(order_data: dict):
-    """Broadcast a status change to relevant clients."""
+    """Broadcast a status change to admin clients and the order's trackers."""
     broadcast_order_update(order_data, "order_status_changed")
 
+
+def broadcast_status_batch(orders: List[dict]):
+    """Broadcast the status changes of many orders as one event (see _publish_status_batch)."""
+    broadcast_order_update({"orders": orders}, "order_status_batch")
@@ -59,6 +59,44 @@ class Settings(BaseSettings):
         "DATABASE_URL",
         f"sqlite:///{_default_db_path}"  # Point to project root to share with Tkinter app
     )
+    # Async driver URL; derived from DATABASE_URL when empty (sqlite -> sqlite+aiosqlite)
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL") or None
+    # Connections per engine (sync and async each have their own pool)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    
+    # Password hashing: bcrypt cost factor and threads for hashing/verifying
+    # (0 = on the event loop, only for benchmarks)
+    PASSWORD_HASH_ROUNDS: int = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+    PASSWORD_WORKERS: int = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+    
+    # Authenticated tokens: keep decoded claims and the user/customer this long (0 = off)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+    
+    # Receipt numbers: reserve this many per worker process (1 = gap-free, one write per order)
+    BONNUMMER_BLOCK_SIZE: int = int(os.getenv("BONNUMMER_BLOCK_SIZE", "1"))
+    
+    # WebSocket fan-out: per-connection send queue, send timeout and drops before a slow client is disconnected
+    WS_QUEUE_SIZE: int = int(os.getenv("WS_QUEUE_SIZE", "100"))
+    WS_SEND_TIMEOUT: float = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+    WS_MAX_DROPPED: int = int(os.getenv("WS_MAX_DROPPED", "20"))
+    
+    # Uvicorn worker processes (run.py); more than one needs EVENT_BUS=sqlite
+    WEB_WORKERS: int = int(os.getenv("WEB_WORKERS", "1"))
+    
+    # Event bus for WebSocket broadcasts: "local" (one worker) or "sqlite" (several uvicorn workers)
+    EVENT_BUS: str = os.getenv("EVENT_BUS", "local")
+    EVENT_BUS_POLL_SECONDS: float = float(os.getenv("EVENT_BUS_POLL_SECONDS", "0.1"))
+    
+    # Public menu snapshot: seconds between checks of menu_versie for changes made by other processes
+    MENU_SNAPSHOT_CHECK_SECONDS: float = float(os.getenv("MENU_SNAPSHOT_CHECK_SECONDS", "5"))
+    
+    # Public order tracking: serve repeated lookups from memory this long (0 = off)
+    TRACKING_CACHE_SECONDS: float = float(os.getenv("TRACKING_CACHE_SECONDS", "5"))
     
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
@@ -67,6 +105,11 @@ class Settings(BaseSettings):
     # Printer
     PRINTER_ENABLED: bool = os.getenv("PRINTER_ENABLED", "false").lower() == "true"
     PRINTER_NAME: Optional[str] = os.getenv("PRINTER_NAME", "EPSON TM-T20II Receipt5")
+    # Print job queue: route for online order receipts (None = not printed automatically),
+    # longest long-poll wait and how long printed jobs are kept
+    ONLINE_ORDER_PRINTER: Optional[str] = os.getenv("ONLINE_ORDER_PRINTER", None)
+    PRINT_WAIT_SECONDS: int = int(os.getenv("PRINT_WAIT_SECONDS", "25"))
+    PRINT_JOB_RETENTION_HOURS: int = int(os.getenv("PRINT_JOB_RETENTION_HOURS", "48"))
     
     # Email (SMTP)
     SMTP_HOST: Optional[str] = os.getenv("SMTP_HOST", None)
@@ -75,6 +118,15 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = os.getenv("SMTP_PASSWORD", None)
     SMTP_FROM_EMAIL: Optional[str] = os.getenv("SMTP_FROM_EMAIL", "noreply@pitapizzanapoli.be")
     SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+    SMTP_TIMEOUT: int = int(os.getenv("SMTP_TIMEOUT", "30"))
+    SMTP_IDLE_SECONDS: int = int(os.getenv("SMTP_IDLE_SECONDS", "60"))  # Close a reused SMTP session after this idle time
+    
+    # Email outbox: worker threads and retries with exponential backoff
+    EMAIL_WORKERS: int = int(os.getenv("EMAIL_WORKERS", "2"))
+    EMAIL_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+    EMAIL_RETRY_BASE_SECONDS: int = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+    # A mail still 'sending' after this long is taken over by another worker (its sender is presumed dead)
+    EMAIL_CLAIM_LEASE_SECONDS: int = int(os.getenv("EMAIL_CLAIM_LEASE_SECONDS", "300"))
     
     # Email Verification
     EMAIL_VERIFICATION_REQUIRED: bool = os.getenv("EMAIL_VERIFICATION_REQUIRED", "true").lower() == "true"
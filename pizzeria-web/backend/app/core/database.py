@@ -1,7 +1,15 @@
 """
 Database configuration and session management.
+
+Two engines on the same database:
+- engine / SessionLocal / get_db: synchronous, for the scripts, the
+  background services and the endpoints that were not migrated.
+- async_engine / AsyncSessionLocal / get_async_db: aiosqlite, for the hot
+  endpoints (orders, pending online orders, menu, tracking), so their
+  queries don't block the event loop.
 """
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -9,30 +17,76 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+
+
+def async_database_url(url: str) -> str:
+    """Async driver URL for a database URL (sqlite:/// -> sqlite+aiosqlite:///)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+
+def _is_memory_url(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _pool_args(url: str) -> dict:
+    """Explicit pool sizing; in-memory SQLite keeps SQLAlchemy's single-connection pool."""
+    if _is_memory_url(url):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def set_sqlite_pragmas(dbapi_conn, connection_record=None) -> None:
+    """
+    Per-connection SQLite settings.
+    
+    - foreign_keys OFF: the kassa tables have references to rows that may be gone.
+    - journal_mode WAL: readers don't block the writer and vice versa
+      (persistent in the database file, the kassa uses it too).
+    - busy_timeout: wait for a lock instead of failing with "database is locked".
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
 # Create database engine
-connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-if "sqlite" in settings.DATABASE_URL:
-    # Disable foreign key constraints for SQLite to avoid issues with missing tables
-    connect_args["check_same_thread"] = False
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args=connect_args,
     echo=settings.DEBUG,
     pool_pre_ping=True,
+    **_pool_args(settings.DATABASE_URL),
 )
 
-# For SQLite, disable foreign key enforcement at connection level
-if "sqlite" in settings.DATABASE_URL:
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
-        """Disable foreign key constraints for SQLite."""
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=OFF")
-        cursor.close()
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
 
-# Create session factory
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.DEBUG,
+    **_pool_args(settings.DATABASE_URL),
+)
+
+if IS_SQLITE:
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: attributes are not reloaded lazily (no implicit IO in async code)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -49,13 +103,431 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Async database session dependency for FastAPI (see AsyncSessionLocal).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Same definitions as the kassa's KLANT_STATISTIEKEN_TRIGGERS (tests/test_kassa_schema.py)
+KLANT_STATISTIEKEN_TRIGGERS = {
+    "trg_bestellingen_stats_insert": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_stats_insert
+        AFTER INSERT ON bestellingen
+        WHEN NEW.klant_id IS NOT NULL
+        BEGIN
+            UPDATE klanten
+            SET totaal_bestellingen = COALESCE(totaal_bestellingen, 0) + 1,
+                totaal_besteed      = COALESCE(totaal_besteed, 0) + COALESCE(NEW.totaal, 0),
+                laatste_bestelling  = CASE
+                    WHEN laatste_bestelling IS NULL OR laatste_bestelling < NEW.datum || ' ' || NEW.tijd
+                    THEN NEW.datum || ' ' || NEW.tijd
+                    ELSE laatste_bestelling END
+            WHERE id = NEW.klant_id;
+        END
+    """,
+    "trg_bestellingen_stats_delete": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_stats_delete
+        AFTER DELETE ON bestellingen
+        WHEN OLD.klant_id IS NOT NULL
+        BEGIN
+            UPDATE klanten
+            SET totaal_bestellingen = MAX(COALESCE(totaal_bestellingen, 0) - 1, 0),
+                totaal_besteed      = COALESCE(totaal_besteed, 0) - COALESCE(OLD.totaal, 0),
+                laatste_bestelling  = CASE
+                    WHEN laatste_bestelling = OLD.datum || ' ' || OLD.tijd
+                    THEN (SELECT MAX(datum || ' ' || tijd) FROM bestellingen WHERE klant_id = OLD.klant_id)
+                    ELSE laatste_bestelling END
+            WHERE id = OLD.klant_id;
+        END
+    """,
+    "trg_bestellingen_stats_update": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_stats_update
+        AFTER UPDATE OF klant_id, totaal, datum, tijd ON bestellingen
+        WHEN OLD.klant_id IS NOT NEW.klant_id OR OLD.totaal IS NOT NEW.totaal
+          OR OLD.datum IS NOT NEW.datum OR OLD.tijd IS NOT NEW.tijd
+        BEGIN
+            UPDATE klanten
+            SET totaal_bestellingen = MAX(COALESCE(totaal_bestellingen, 0) - 1, 0),
+                totaal_besteed      = COALESCE(totaal_besteed, 0) - COALESCE(OLD.totaal, 0),
+                laatste_bestelling  = (SELECT MAX(datum || ' ' || tijd) FROM bestellingen WHERE klant_id = OLD.klant_id)
+            WHERE id = OLD.klant_id;
+            UPDATE klanten
+            SET totaal_bestellingen = COALESCE(totaal_bestellingen, 0) + 1,
+                totaal_besteed      = COALESCE(totaal_besteed, 0) + COALESCE(NEW.totaal, 0),
+                laatste_bestelling  = (SELECT MAX(datum || ' ' || tijd) FROM bestellingen WHERE klant_id = NEW.klant_id)
+            WHERE id = NEW.klant_id;
+        END
+    """,
+}
+
+
+def install_klant_statistieken_triggers(conn) -> None:
+    """
+    Install the triggers that keep customer statistics up to date with deltas.
+    
+    On first install the statistics of all customers are rebuilt once,
+    so the triggers start from correct values.
+    """
+    from sqlalchemy import text
+    existing = conn.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_bestellingen_stats_%'"
+    )).fetchall()
+    already_installed = len(existing) == len(KLANT_STATISTIEKEN_TRIGGERS)
+    for sql in KLANT_STATISTIEKEN_TRIGGERS.values():
+        conn.execute(text(sql))
+    if already_installed:
+        return
+    conn.execute(text("""
+        UPDATE klanten
+        SET totaal_bestellingen = s.aantal_bestellingen,
+            totaal_besteed      = s.totaal_besteed,
+            laatste_bestelling  = s.laatste_bestelling
+        FROM (SELECT klant_id,
+                     COUNT(*)                  AS aantal_bestellingen,
+                     COALESCE(SUM(totaal), 0)  AS totaal_besteed,
+                     MAX(datum || ' ' || tijd) AS laatste_bestelling
+              FROM bestellingen
+              WHERE klant_id IS NOT NULL
+              GROUP BY klant_id) AS s
+        WHERE klanten.id = s.klant_id
+    """))
+    # Customers without (remaining) orders
+    conn.execute(text("""
+        UPDATE klanten
+        SET totaal_bestellingen = 0,
+            totaal_besteed      = 0.0,
+            laatste_bestelling  = NULL
+        WHERE (COALESCE(totaal_bestellingen, 0) != 0
+               OR COALESCE(totaal_besteed, 0) != 0
+               OR laatste_bestelling IS NOT NULL)
+          AND NOT EXISTS (SELECT 1 FROM bestellingen b WHERE b.klant_id = klanten.id)
+    """))
+    logger.info("Installed customer statistics triggers")
+
+
+# Atomic receipt number allocation; same statement as allocate_bonnummers() in the kassa database.py
+BON_ALLOCATE_SQL = """
+    INSERT INTO bon_teller (jaar, dag, laatste_nummer)
+    VALUES (?, ?, ?)
+    ON CONFLICT (jaar, dag) DO UPDATE SET laatste_nummer = laatste_nummer + excluded.laatste_nummer
+    RETURNING laatste_nummer
+"""
+
+
+def allocate_bonnummers(db, jaar: int, dag: int, aantal: int = 1) -> int:
+    """
+    Reserve `aantal` receipt numbers for a day in one atomic upsert.
+    
+    Runs in the session's own transaction, like the kassa inside a unit of
+    work: the numbers are stored together with the order, and an order that is
+    rolled back does not use up a number. The write lock is held from this
+    statement until the order is committed.
+    
+    Args:
+        db: Session of the request that creates the order
+        
+    Returns:
+        The last reserved number; the block is [result - aantal + 1, result]
+    """
+    return db.connection().exec_driver_sql(BON_ALLOCATE_SQL, (jaar, dag, aantal)).fetchall()[0][0]
+
+
+def _rollup_uur_sql(expr: str) -> str:
+    """SQL expression for the hour (0-23) of a tijd value ('HH:MM' from the kassa, 'HH:MM:SS' from the web)."""
+    return f"COALESCE(CAST(strftime('%H', {expr}) AS INTEGER), 0)"
+
+
+# Sales per day, hour and courier (koerier_id 0 = not assigned); same definitions as the kassa app
+# (tests/test_kassa_schema.py checks they match)
+VERKOOP_ROLLUP_TABLE = """
+    CREATE TABLE IF NOT EXISTS verkoop_rollup (
+        datum      TEXT    NOT NULL,
+        uur        INTEGER NOT NULL,
+        koerier_id INTEGER NOT NULL DEFAULT 0,
+        aantal     INTEGER NOT NULL DEFAULT 0,
+        omzet      REAL    NOT NULL DEFAULT 0,
+        PRIMARY KEY (datum, uur, koerier_id)
+    ) WITHOUT ROWID
+"""
+
+_ROLLUP_PLUS = f"""
+            INSERT INTO verkoop_rollup (datum, uur, koerier_id, aantal, omzet)
+            VALUES (NEW.datum, {_rollup_uur_sql("NEW.tijd")}, COALESCE(NEW.koerier_id, 0), 1, COALESCE(NEW.totaal, 0))
+            ON CONFLICT (datum, uur, koerier_id)
+            DO UPDATE SET aantal = aantal + 1, omzet = omzet + excluded.omzet;"""
+
+_ROLLUP_MIN = f"""
+            UPDATE verkoop_rollup
+            SET aantal = aantal - 1, omzet = omzet - COALESCE(OLD.totaal, 0)
+            WHERE datum = OLD.datum AND uur = {_rollup_uur_sql("OLD.tijd")} AND koerier_id = COALESCE(OLD.koerier_id, 0);
+            DELETE FROM verkoop_rollup
+            WHERE datum = OLD.datum AND uur = {_rollup_uur_sql("OLD.tijd")} AND koerier_id = COALESCE(OLD.koerier_id, 0)
+              AND aantal <= 0;"""
+
+VERKOOP_ROLLUP_TRIGGERS = {
+    "trg_bestellingen_rollup_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_rollup_insert
+        AFTER INSERT ON bestellingen
+        BEGIN{_ROLLUP_PLUS}
+        END
+    """,
+    "trg_bestellingen_rollup_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_rollup_delete
+        AFTER DELETE ON bestellingen
+        BEGIN{_ROLLUP_MIN}
+        END
+    """,
+    "trg_bestellingen_rollup_update": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_rollup_update
+        AFTER UPDATE OF datum, tijd, koerier_id, totaal ON bestellingen
+        WHEN OLD.datum IS NOT NEW.datum OR OLD.tijd IS NOT NEW.tijd
+          OR OLD.koerier_id IS NOT NEW.koerier_id OR OLD.totaal IS NOT NEW.totaal
+        BEGIN{_ROLLUP_MIN}{_ROLLUP_PLUS}
+        END
+    """,
+}
+
+
+def install_verkoop_rollup(conn) -> None:
+    """
+    Create the verkoop_rollup table and the triggers that maintain it.
+    
+    On first install the rollup is rebuilt once from bestellingen.
+    """
+    from sqlalchemy import text
+    conn.execute(text(VERKOOP_ROLLUP_TABLE))
+    existing = conn.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_bestellingen_rollup_%'"
+    )).fetchall()
+    already_installed = len(existing) == len(VERKOOP_ROLLUP_TRIGGERS)
+    for sql in VERKOOP_ROLLUP_TRIGGERS.values():
+        conn.execute(text(sql))
+    if already_installed:
+        return
+    conn.execute(text("DELETE FROM verkoop_rollup"))
+    conn.execute(text(f"""
+        INSERT INTO verkoop_rollup (datum, uur, koerier_id, aantal, omzet)
+        SELECT datum, {_rollup_uur_sql("tijd")}, COALESCE(koerier_id, 0), COUNT(*), COALESCE(SUM(totaal), 0)
+        FROM bestellingen
+        GROUP BY 1, 2, 3
+    """))
+    logger.info("Installed sales rollup table and triggers")
+
+
+# Indexes for the report range queries and the order lookups by receipt number
+# and customer (same names as the kassa's add_database_indexes)
+REPORT_INDEXES = {
+    "idx_bestellingen_datum": "CREATE INDEX IF NOT EXISTS idx_bestellingen_datum ON bestellingen(datum)",
+    "idx_bestelregels_bestelling_id":
+        "CREATE INDEX IF NOT EXISTS idx_bestelregels_bestelling_id ON bestelregels(bestelling_id)",
+    "idx_bestellingen_bonnummer":
+        "CREATE INDEX IF NOT EXISTS idx_bestellingen_bonnummer ON bestellingen(bonnummer)",
+    "idx_bestellingen_klant_id": "CREATE INDEX IF NOT EXISTS idx_bestellingen_klant_id ON bestellingen(klant_id)",
+}
+
+
+def install_report_indexes(conn) -> None:
+    """Create the report and order lookup indexes (no-op if the kassa already did)."""
+    from sqlalchemy import text
+    for sql in REPORT_INDEXES.values():
+        conn.execute(text(sql))
+
+
+# Change log of online orders (same definitions as the kassa app in database.py,
+# checked by tests/test_kassa_schema.py).
+# Every insert/update/delete of an online order or one of its items gets an
+# increasing seq; GET /orders/online/pending?since=<seq> returns only those orders.
+ORDER_CHANGE_LOG_TABLE = """
+    CREATE TABLE IF NOT EXISTS bestelling_wijzigingen (
+        seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+        bestelling_id INTEGER NOT NULL,
+        actie         TEXT    NOT NULL
+    )
+"""
+
+# Log entries kept; clients with an older cursor get a full sync
+ORDER_CHANGE_LOG_KEEP = 10000
+
+_ONLINE_ITEM = "EXISTS (SELECT 1 FROM bestellingen WHERE id = {}.bestelling_id AND online_bestelling = 1)"
+
+ORDER_CHANGE_LOG_TRIGGERS = {
+    "trg_bestellingen_log_insert": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_log_insert
+        AFTER INSERT ON bestellingen
+        WHEN NEW.online_bestelling = 1
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.id, 'I');
+        END
+    """,
+    "trg_bestellingen_log_update": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_log_update
+        AFTER UPDATE ON bestellingen
+        WHEN NEW.online_bestelling = 1 OR OLD.online_bestelling = 1
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.id, 'U');
+        END
+    """,
+    "trg_bestellingen_log_delete": """
+        CREATE TRIGGER IF NOT EXISTS trg_bestellingen_log_delete
+        AFTER DELETE ON bestellingen
+        WHEN OLD.online_bestelling = 1
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (OLD.id, 'D');
+        END
+    """,
+    "trg_bestelregels_log_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelregels_log_insert
+        AFTER INSERT ON bestelregels
+        WHEN {_ONLINE_ITEM.format("NEW")}
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.bestelling_id, 'U');
+        END
+    """,
+    "trg_bestelregels_log_update": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelregels_log_update
+        AFTER UPDATE ON bestelregels
+        WHEN {_ONLINE_ITEM.format("NEW")}
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (NEW.bestelling_id, 'U');
+        END
+    """,
+    "trg_bestelregels_log_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelregels_log_delete
+        AFTER DELETE ON bestelregels
+        WHEN {_ONLINE_ITEM.format("OLD")}
+        BEGIN
+            INSERT INTO bestelling_wijzigingen (bestelling_id, actie) VALUES (OLD.bestelling_id, 'U');
+        END
+    """,
+    "trg_bestelling_wijzigingen_opruimen": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bestelling_wijzigingen_opruimen
+        AFTER INSERT ON bestelling_wijzigingen
+        WHEN NEW.seq % 1000 = 0
+        BEGIN
+            DELETE FROM bestelling_wijzigingen WHERE seq <= NEW.seq - {ORDER_CHANGE_LOG_KEEP};
+        END
+    """,
+}
+
+
+def install_order_change_log(conn) -> None:
+    """Create the bestelling_wijzigingen change log and the triggers that fill it."""
+    from sqlalchemy import text
+    conn.execute(text(ORDER_CHANGE_LOG_TABLE))
+    for sql in ORDER_CHANGE_LOG_TRIGGERS.values():
+        conn.execute(text(sql))
+
+
+MENU_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS menu_versie (
+        id     INTEGER PRIMARY KEY CHECK (id = 1),
+        versie INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+# Every change to the menu (API, import_menu.py, other workers) bumps menu_versie
+MENU_VERSION_TRIGGERS = {
+    f"trg_{table}_versie_{event.lower()}": f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_versie_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            UPDATE menu_versie SET versie = versie + 1 WHERE id = 1;
+        END
+    """
+    for table in ("menu_items", "menu_categories")
+    for event in ("INSERT", "UPDATE", "DELETE")
+}
+
+
+def install_menu_version(conn) -> None:
+    """Create the menu_versie counter used by app.services.menu_snapshot and its triggers."""
+    from sqlalchemy import text
+    conn.execute(text(MENU_VERSION_TABLE))
+    conn.execute(text("INSERT OR IGNORE INTO menu_versie (id, versie) VALUES (1, 0)"))
+    for sql in MENU_VERSION_TRIGGERS.values():
+        conn.execute(text(sql))
+
+
+def telefoon_norm_sql(expr: str) -> str:
+    """
+    SQL expression for the telefoon_norm key, generated from the rules of
+    app.utils.phone_validator.normalize_phone_key (same text as the kassa's telefoon_norm_sql).
+    """
+    from app.utils.phone_validator import PHONE_KEY_RULES, PHONE_KEY_STRIP_CHARS
+    cleaned = expr
+    for char in PHONE_KEY_STRIP_CHARS:
+        literal = f"'{char}'" if char.isprintable() else f"char({ord(char)})"
+        cleaned = f"replace({cleaned}, {literal}, '')"
+    whens = []
+    for prefix, lengths, drop, new_prefix in PHONE_KEY_RULES:
+        condition = f"substr({cleaned}, 1, {len(prefix)}) = '{prefix}'"
+        if lengths:
+            condition += f" AND length({cleaned}) IN ({', '.join(str(n) for n in lengths)})"
+        value = f"substr({cleaned}, {drop + 1})" if drop else cleaned
+        if new_prefix:
+            value = f"'{new_prefix}' || {value}"
+        whens.append(f"WHEN {condition} THEN {value}")
+    return "(CASE " + " ".join(whens) + f" ELSE {cleaned} END)"
+
+
+TELEFOON_NORM_TRIGGERS = ("trg_klanten_telefoon_norm_insert", "trg_klanten_telefoon_norm_update")
+
+
+def install_telefoon_norm(conn) -> None:
+    """
+    Backfill klanten.telefoon_norm and install its unique index and sync triggers.
+    
+    Duplicates (same normalized number) keep NULL for all but the oldest customer.
+    Skipped when the triggers already exist with the current rules (the kassa
+    migration or an earlier start). Triggers from older rules are replaced and
+    the keys that changed are rebuilt.
+    """
+    from sqlalchemy import text
+    norm = telefoon_norm_sql("telefoon")
+    installed = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_klanten_telefoon_norm_insert'"
+    )).fetchone()
+    if installed and telefoon_norm_sql("NEW.telefoon") in installed[0]:
+        return
+    if installed:
+        for trigger in TELEFOON_NORM_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text(f"UPDATE klanten SET telefoon_norm = NULL WHERE telefoon_norm IS NOT {norm}"))
+        logger.info("Rebuilding telefoon_norm keys for the current normalization rules")
+    conn.execute(text(f"""
+        UPDATE klanten
+        SET telefoon_norm = {norm}
+        WHERE telefoon_norm IS NULL
+          AND id IN (SELECT MIN(id) FROM klanten GROUP BY {norm})
+          AND {norm} NOT IN (SELECT telefoon_norm FROM klanten WHERE telefoon_norm IS NOT NULL)
+    """))
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_klanten_telefoon_norm ON klanten(telefoon_norm)"))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_klanten_telefoon_norm_insert
+        AFTER INSERT ON klanten
+        BEGIN
+            UPDATE klanten SET telefoon_norm = {telefoon_norm_sql("NEW.telefoon")} WHERE id = NEW.id;
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_klanten_telefoon_norm_update
+        AFTER UPDATE OF telefoon ON klanten
+        BEGIN
+            UPDATE klanten SET telefoon_norm = {telefoon_norm_sql("NEW.telefoon")} WHERE id = NEW.id;
+        END
+    """))
+
+
 def init_db():
     """
     Initialize database tables.
     """
     try:
         # Import all models here so they are registered
-        from app.models import customer, order, menu  # noqa
+        from app.models import customer, order, menu, email_outbox, print_job  # noqa
         
         Base.metadata.create_all(bind=engine)
         
@@ -161,6 +633,20 @@ def init_db():
                         except Exception as e:
                             logger.warning(f"Could not add verification_token column: {e}")
                     
+                    if 'telefoon_norm' not in klanten_columns:
+                        try:
+                            conn.execute(text("""
+                                ALTER TABLE klanten ADD COLUMN telefoon_norm TEXT
+                            """))
+                            logger.info("Added telefoon_norm column to klanten table")
+                        except Exception as e:
+                            logger.warning(f"Could not add telefoon_norm column: {e}")
+                    
+                    try:
+                        install_telefoon_norm(conn)
+                    except Exception as e:
+                        logger.warning(f"Could not install telefoon_norm index/triggers: {e}")
+                    
                     if 'verification_token_expires' not in klanten_columns:
                         try:
                             conn.execute(text("""
@@ -192,6 +678,45 @@ def init_db():
                 except Exception as e:
                     logger.warning(f"Could not check foreign keys: {e}")
             
+            # Customer statistics triggers (same definitions as the kassa app in database.py)
+            if 'bestellingen' in inspector.get_table_names() and 'klanten' in inspector.get_table_names():
+                try:
+                    install_klant_statistieken_triggers(conn)
+                except Exception as e:
+                    logger.warning(f"Could not install customer statistics triggers: {e}")
+                try:
+                    install_verkoop_rollup(conn)
+                except Exception as e:
+                    logger.warning(f"Could not install sales rollup: {e}")
+            
+            # Order change log for the pending-orders delta sync (needs bestelregels as well)
+            if 'bestellingen' in inspector.get_table_names() and 'bestelregels' in inspector.get_table_names():
+                try:
+                    install_order_change_log(conn)
+                except Exception as e:
+                    logger.warning(f"Could not install order change log: {e}")
+                try:
+                    install_report_indexes(conn)
+                except Exception as e:
+                    logger.warning(f"Could not create report indexes: {e}")
+            
+            # Claim owner and time for the email outbox lease (app.services.email_outbox)
+            if 'email_outbox' in inspector.get_table_names():
+                outbox_columns = [col['name'] for col in inspector.get_columns('email_outbox')]
+                for column, column_type in (("claimed_by", "TEXT"), ("claimed_at", "REAL")):
+                    if column not in outbox_columns:
+                        try:
+                            conn.execute(text(f"ALTER TABLE email_outbox ADD COLUMN {column} {column_type}"))
+                            logger.info(f"Added {column} column to email_outbox table")
+                        except Exception as e:
+                            logger.warning(f"Could not add {column} column: {e}")
+            
+            # Version counter for the cached public menu
+            try:
+                install_menu_version(conn)
+            except Exception as e:
+                logger.warning(f"Could not install menu version counter: {e}")
+            
             # Check if bestelregels table exists and add missing columns
             if 'bestelregels' in inspector.get_table_names():
                 columns = [col['name'] for col in inspector.get_columns('bestelregels')]
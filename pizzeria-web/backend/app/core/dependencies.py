@@ -6,6 +6,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import decode_access_token
+from app.services.principal_cache import principal_cache
 from typing import Optional
 from fastapi import Request
 import logging
@@ -33,6 +34,10 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
+    cached = principal_cache.get(token)
+    if cached is not None and cached.customer_id is None:
+        return dict(cached.principal)
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -55,7 +60,8 @@ async def get_current_user(
         "id": payload.get("id", 1)
     }
     
-    return user_data
+    principal_cache.put(token, payload, user_data)
+    return dict(user_data)
 
 
 def require_role(required_role: str):
@@ -79,6 +85,14 @@ def require_role(required_role: str):
     return role_checker
 
 
+def get_customer_token(request: Request) -> Optional[str]:
+    """Customer token from the Authorization header or the token query parameter."""
+    authorization = request.headers.get("Authorization")
+    if authorization and authorization.startswith("Bearer "):
+        return authorization.split("Bearer ")[1]
+    return request.query_params.get("token")
+
+
 async def get_current_customer(
     request: Request,
     db: Session = Depends(get_db)
@@ -86,25 +100,23 @@ async def get_current_customer(
     """
     Get current authenticated customer from JWT token (for public customer endpoints).
     Token can be in Authorization header or as query parameter.
+    
+    The returned Customer is detached from the session (it may come from the
+    principal cache); load it again with db.get() before modifying it.
     """
     from app.models.customer import Customer
     
-    # Try to get token from Authorization header
-    authorization = request.headers.get("Authorization")
-    token = None
-    
-    if authorization and authorization.startswith("Bearer "):
-        token = authorization.split("Bearer ")[1]
-    else:
-        # Try query parameter
-        token = request.query_params.get("token")
-    
+    token = get_customer_token(request)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token vereist"
         )
     
+    cached = principal_cache.get(token)
+    if cached is not None and cached.customer_id is not None:
+        return cached.principal
+    
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(
@@ -133,5 +145,8 @@ async def get_current_customer(
             detail="Klant niet gevonden"
         )
     
+    # Detach, so later commits in this request don't expire the cached instance
+    db.expunge(customer)
+    principal_cache.put(token, payload, customer, customer_id=customer.id)
     return customer
 
@@ -106,6 +106,35 @@ async def startup_event():
         logger.info("Database initialized")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
+    
+    # Resolve and parse settings.json, extras.json and straatnamen.json once
+    from app.services.config_files import preload
+    preload()
+    
+    from app.services.event_bus import event_bus
+    if settings.WEB_WORKERS > 1 and settings.EVENT_BUS == "local":
+        logger.warning("WEB_WORKERS > 1 with EVENT_BUS=local: WebSocket clients only see events of their own worker")
+    try:
+        event_bus.start()
+    except Exception as e:
+        logger.error(f"Error starting event bus: {e}")
+    
+    from app.services.email_service import email_service
+    if email_service.enabled:
+        try:
+            from app.services.email_outbox import email_outbox
+            email_outbox.start()
+        except Exception as e:
+            logger.error(f"Error starting email outbox: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers (queued emails stay in the outbox)."""
+    from app.services.email_outbox import email_outbox
+    from app.services.event_bus import event_bus
+    email_outbox.stop()
+    event_bus.stop()
 
 
 @app.get("/")
@@ -20,6 +20,7 @@ class Customer(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     telefoon = Column(String, unique=True, nullable=False, index=True)
+    telefoon_norm = Column(String, unique=True, nullable=True)  # Canonical E.164 lookup key, kept in sync by triggers
     email = Column(String, unique=True, nullable=True, index=True)
     password_hash = Column(String, nullable=True)
     email_verified = Column(Integer, default=0, nullable=False)
@@ -4,7 +4,9 @@ Database models.
 from app.models.customer import Customer
 from app.models.order import Order, OrderItem
 from app.models.menu import MenuItem, MenuCategory
+from app.models.email_outbox import OutboxEmail
+from app.models.print_job import PrintJob
 
-__all__ = ["Customer", "Order", "OrderItem", "MenuItem", "MenuCategory"]
+__all__ = ["Customer", "Order", "OrderItem", "MenuItem", "MenuCategory", "OutboxEmail", "PrintJob"]
 
 
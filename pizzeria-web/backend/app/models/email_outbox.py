@@ -0,0 +1,32 @@
+"""
+Email outbox model.
+"""
+from sqlalchemy import Column, Integer, String, Float, Text, Index
+from app.core.database import Base
+
+
+class OutboxEmail(Base):
+    """Queued email, sent by app.services.email_outbox."""
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    html_body = Column(Text, nullable=True)
+    logo_path = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="pending")  # pending, sending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(Float, nullable=False, default=0)  # Unix timestamp
+    claimed_by = Column(String, nullable=True)  # Outbox instance (host:pid:id) sending it
+    claimed_at = Column(Float, nullable=True)  # Unix timestamp of the claim (lease start)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(Float, nullable=False)  # Unix timestamp
+    sent_at = Column(Float, nullable=True)  # Unix timestamp
+    
+    __table_args__ = (
+        Index("idx_email_outbox_due", "status", "next_attempt_at"),
+    )
+    
+    def __repr__(self):
+        return f"<OutboxEmail(id={self.id}, to={self.to_email}, status={self.status})>"
@@ -28,6 +28,7 @@ class Order(Base):
     
     # Relationships
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    klant = relationship("Customer", viewonly=True)  # Eager-load with app.services.order_queries
     
     def __repr__(self):
         return f"<Order(id={self.id}, bonnummer={self.bonnummer}, totaal={self.totaal})>"
@@ -0,0 +1,28 @@
+"""
+Print job model.
+"""
+from sqlalchemy import Column, Integer, String, Float, Text, Index
+from app.core.database import Base
+
+
+class PrintJob(Base):
+    """Receipt waiting for (or printed by) a print client, see app.services.printer."""
+    __tablename__ = "print_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)  # Also the long-poll cursor
+    job_id = Column(String, unique=True, nullable=False)
+    printer = Column(String, nullable=False, default="default")  # Route: print client that prints it
+    order_id = Column(Integer, nullable=True)
+    bonnummer = Column(String, nullable=True)
+    receipt_text = Column(Text, nullable=False)
+    qr_data = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="pending")  # pending, printed
+    created_at = Column(Float, nullable=False)  # Unix timestamp
+    printed_at = Column(Float, nullable=True)  # Unix timestamp
+    
+    __table_args__ = (
+        Index("idx_print_jobs_pending", "status", "printer", "created_at"),
+    )
+    
+    def __repr__(self):
+        return f"<PrintJob(id={self.job_id}, printer={self.printer}, status={self.status})>"
@@ -64,6 +64,19 @@ class OrderStatusUpdate(BaseModel):
     koerier_id: Optional[int] = None
 
 
+class OrderStatusBatchItem(BaseModel):
+    """One order in a batch status update; omitted fields are left unchanged."""
+    id: int
+    new_status: Optional[str] = None
+    levertijd: Optional[str] = None
+    koerier_id: Optional[int] = None  # Explicit null removes the courier
+
+
+class OrderStatusBatchUpdate(BaseModel):
+    """Schema for updating the status/courier of many orders at once."""
+    updates: List[OrderStatusBatchItem] = Field(..., min_length=1, max_length=500)
+
+
 class OrderResponse(OrderBase):
     """Schema for order response."""
     id: int
@@ -0,0 +1,166 @@
+"""
+Cached access to the shared JSON configuration files of the desktop app.
+
+settings.json, extras.json and straatnamen.json live in the project root next
+to the desktop application. Their location is resolved once (the first
+existing candidate path) and the parsed content is kept in memory; every
+access only does an os.stat and re-reads the file when its mtime or size
+changed. Values derived from a file (e.g. a pre-serialized JSON response) are
+memoized per file version with ConfigFile.view.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Response
+
+logger = logging.getLogger(__name__)
+
+# backend/app/services/config_files.py -> project root (map boven pizzeria-web)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = BACKEND_DIR.parent.parent
+
+# Seconds between new searches for a file that was not found
+MISSING_RETRY_SECONDS = 30.0
+
+
+def candidate_paths(filename: str) -> List[Path]:
+    """Locations searched for a config file, in order of preference."""
+    return [
+        PROJECT_ROOT / filename,  # Project root
+        PROJECT_ROOT.parent / filename,  # One level up from project root
+        BACKEND_DIR.parent / filename,  # pizzeria-web
+        BACKEND_DIR / filename,  # backend
+        Path(filename),  # Current working directory
+        Path("..") / filename,  # Parent of current working directory
+        Path("../..") / filename,  # Two levels up
+        Path("../../..") / filename,  # Three levels up
+    ]
+
+
+class ConfigFile:
+    """One JSON file: resolved path, parsed content and derived values, reloaded on change."""
+
+    def __init__(self, filename: str, candidates: Optional[List[Path]] = None):
+        self.filename = filename
+        self.candidates = candidates if candidates is not None else candidate_paths(filename)
+        self._path: Optional[Path] = None
+        self._searched_at: Optional[float] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._data: Any = None
+        self._views: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.loads = 0  # Number of times the file was parsed, for logging and tests
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Resolved location of the file, or None if it does not exist."""
+        with self._lock:
+            self._refresh()
+            return self._path
+
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the loaded file; changes whenever the file is reloaded."""
+        with self._lock:
+            self._refresh()
+            return self._signature
+
+    def data(self) -> Any:
+        """Parsed content of the file (None if missing or never valid). Do not modify it."""
+        with self._lock:
+            self._refresh()
+            return self._data
+
+    def view(self, key: str, build: Callable[[Any], Any]) -> Any:
+        """
+        Value derived from the content, built once per file version.
+
+        Args:
+            key: Name of the derived value
+            build: Called with the parsed content (None if missing); must not
+                access this ConfigFile again (the lock is held)
+        """
+        with self._lock:
+            self._refresh()
+            if key not in self._views:
+                self._views[key] = build(self._data)
+            return self._views[key]
+
+    def json_response(self, key: str = "raw", build: Optional[Callable[[Any], Any]] = None) -> Response:
+        """JSON response with the body serialized once per file version."""
+        body = self.view(f"json:{key}", lambda data: json.dumps(
+            build(data) if build is not None else data, ensure_ascii=False
+        ).encode("utf-8"))
+        return Response(content=body, media_type="application/json")
+
+    def invalidate(self) -> None:
+        """Forget the cached content, e.g. after writing the file."""
+        with self._lock:
+            self._signature = None
+            self._searched_at = None
+            self._views = {}
+
+    def _resolve(self) -> Optional[Path]:
+        for candidate in self.candidates:
+            try:
+                path = candidate.resolve()
+                if path.is_file():
+                    return path
+            except OSError as e:
+                logger.debug(f"Could not resolve path {candidate}: {e}")
+        return None
+
+    def _refresh(self) -> None:
+        """Stat the file and reload it if it changed (caller holds the lock)."""
+        now = time.monotonic()
+        stat = None
+        if self._path is not None:
+            try:
+                stat = os.stat(self._path)
+            except OSError:
+                logger.warning(f"{self.filename} disappeared from {self._path}")
+                self._path = None
+        if self._path is None:
+            if self._searched_at is not None and now - self._searched_at < MISSING_RETRY_SECONDS:
+                return
+            self._searched_at = now
+            self._path = self._resolve()
+            if self._path is None:
+                if self._signature != (0, 0):
+                    logger.warning(f"{self.filename} not found. Searched: {[str(p) for p in self.candidates]}")
+                    self._signature, self._data, self._views = (0, 0), None, {}
+                return
+            try:
+                stat = os.stat(self._path)
+            except OSError:
+                return
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        self._signature = signature
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+            self.loads += 1
+            logger.info(f"Loaded {self.filename} from {self._path}")
+        except (OSError, ValueError) as e:
+            # Keep the last valid content until the file is fixed
+            logger.error(f"Error loading {self.filename} from {self._path}: {e}")
+        self._views = {}
+
+
+settings_file = ConfigFile("settings.json")
+extras_file = ConfigFile("extras.json")
+streets_file = ConfigFile("straatnamen.json")
+
+
+def preload() -> None:
+    """Resolve and parse all config files (called at startup)."""
+    for config_file in (settings_file, extras_file, streets_file):
+        config_file.data()
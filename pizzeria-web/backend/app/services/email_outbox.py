@@ -0,0 +1,236 @@
+"""
+Durable email outbox.
+
+EmailService.send_email only inserts a row into email_outbox; a small pool of
+worker threads claims due rows and sends them. smtplib is blocking, so it
+never runs on the event loop. Each worker keeps its SMTP session open between
+mails (one TCP+TLS+login per burst instead of per mail) and closes it after
+SMTP_IDLE_SECONDS. Failed sends are retried with exponential backoff up to
+EMAIL_MAX_ATTEMPTS.
+
+Every claim records its owner (host:pid:id of the outbox instance) and time.
+A row left in 'sending' by a crashed process is claimed again once its claim
+is older than EMAIL_CLAIM_LEASE_SECONDS, so with several web workers a mail
+that another live worker is sending is never picked up twice.
+"""
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Claim the oldest due email, or one whose claim lease expired (its sender died);
+# the status check in the UPDATE makes the claim atomic across worker threads and processes.
+CLAIM_SQL = """
+    UPDATE email_outbox
+    SET status = 'sending', attempts = attempts + 1, claimed_by = :owner, claimed_at = :now
+    WHERE id = (
+        SELECT id FROM email_outbox
+        WHERE (status = 'pending' AND next_attempt_at <= :now)
+           OR (status = 'sending' AND COALESCE(claimed_at, 0) <= :lease_expired)
+        ORDER BY next_attempt_at, id
+        LIMIT 1
+    ) AND (status = 'pending' OR COALESCE(claimed_at, 0) <= :lease_expired)
+    RETURNING id, to_email, subject, body, html_body, logo_path, attempts
+"""
+
+
+class SMTPSession:
+    """One reusable SMTP connection (used by a single worker thread)."""
+
+    def __init__(self, mailer, idle_seconds: float):
+        self.mailer = mailer
+        self.idle_seconds = idle_seconds
+        self.server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+        self.connections = 0  # Number of logins, for logging and tests
+
+    def send(self, msg) -> None:
+        """Send a message, reconnecting once if the server dropped the idle session."""
+        if self.server is not None:
+            try:
+                self.server.send_message(msg)
+                self.last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                self.close()
+        self.server = self.mailer.connect()
+        self.connections += 1
+        self.server.send_message(msg)
+        self.last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        if self.server is not None and time.monotonic() - self.last_used >= self.idle_seconds:
+            self.close()
+
+    def close(self) -> None:
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+        self.server = None
+
+
+class EmailOutbox:
+    """Outbox queue plus the worker threads that drain it."""
+
+    def __init__(self, engine=None, mailer=None, workers: Optional[int] = None):
+        self._engine = engine
+        self._mailer = mailer
+        self.workers = workers if workers is not None else settings.EMAIL_WORKERS
+        self.max_attempts = settings.EMAIL_MAX_ATTEMPTS
+        self.retry_base_seconds = settings.EMAIL_RETRY_BASE_SECONDS
+        self.lease_seconds = settings.EMAIL_CLAIM_LEASE_SECONDS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.idle_seconds = settings.SMTP_IDLE_SECONDS
+        self.poll_seconds = 5.0  # Fallback poll for retries that become due
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.core.database import engine
+            self._engine = engine
+        return self._engine
+
+    @property
+    def mailer(self):
+        if self._mailer is None:
+            from app.services.email_service import email_service
+            self._mailer = email_service
+        return self._mailer
+
+    def enqueue(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        logo_path: Optional[str] = None
+    ) -> int:
+        """
+        Store an email in the outbox and wake a worker.
+
+        Returns:
+            Outbox id of the email
+        """
+        now = time.time()
+        with self.engine.begin() as conn:
+            email_id = conn.execute(text("""
+                INSERT INTO email_outbox (to_email, subject, body, html_body, logo_path,
+                                          status, attempts, next_attempt_at, created_at)
+                VALUES (:to_email, :subject, :body, :html_body, :logo_path, 'pending', 0, :now, :now)
+                RETURNING id
+            """), {
+                "to_email": to_email, "subject": subject, "body": body,
+                "html_body": html_body, "logo_path": logo_path, "now": now,
+            }).scalar_one()
+        logger.info(f"Email {email_id} to {to_email} queued")
+        self._wakeup.set()
+        return email_id
+
+    def start(self) -> None:
+        """Start the worker threads (interrupted sends are reclaimed once their lease expires)."""
+        if self._threads:
+            return
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"email-outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Email outbox started with {self.workers} worker(s)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker threads (mails still queued stay in the outbox)."""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _claim(self):
+        now = time.time()
+        with self.engine.begin() as conn:
+            return conn.execute(text(CLAIM_SQL), {
+                "now": now, "owner": self.owner, "lease_expired": now - self.lease_seconds,
+            }).mappings().first()
+
+    def _finish(self, email_id: int, **values) -> None:
+        """Record the outcome, unless another worker took the mail over after our lease expired."""
+        assignments = ", ".join(f"{column} = :{column}" for column in values)
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                text(f"UPDATE email_outbox SET {assignments} WHERE id = :id AND claimed_by = :owner"),
+                {"id": email_id, "owner": self.owner, **values},
+            ).rowcount
+        if not updated:
+            logger.warning(f"Email {email_id} was claimed by another worker; outcome not recorded")
+
+    def _deliver(self, session: SMTPSession, email) -> None:
+        try:
+            msg = self.mailer.build_message(
+                email["to_email"], email["subject"], email["body"],
+                html_body=email["html_body"], logo_path=email["logo_path"]
+            )
+            session.send(msg)
+        except Exception as e:
+            session.close()
+            # 5xx answers (bad recipient, rejected content) will not succeed on a retry;
+            # a failed login is a configuration problem and is retried
+            permanent = isinstance(e, smtplib.SMTPRecipientsRefused) or (
+                isinstance(e, smtplib.SMTPResponseException) and e.smtp_code >= 500
+                and not isinstance(e, smtplib.SMTPAuthenticationError)
+            )
+            if permanent or email["attempts"] >= self.max_attempts:
+                logger.error(f"Email {email['id']} to {email['to_email']} failed after "
+                             f"{email['attempts']} attempt(s): {e}")
+                self._finish(email["id"], status="failed", last_error=str(e))
+            else:
+                delay = self.retry_base_seconds * 2 ** (email["attempts"] - 1)
+                logger.warning(f"Email {email['id']} to {email['to_email']} failed ({e}), retry in {delay}s")
+                self._finish(email["id"], status="pending", last_error=str(e),
+                             next_attempt_at=time.time() + delay)
+            return
+        self._finish(email["id"], status="sent", sent_at=time.time(), last_error=None)
+        logger.info(f"Email {email['id']} sent to {email['to_email']}")
+
+    def _run(self) -> None:
+        session = SMTPSession(self.mailer, self.idle_seconds)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    email = self._claim()
+                except Exception as e:
+                    logger.error(f"Email outbox claim failed: {e}")
+                    email = None
+                if email is not None:
+                    try:
+                        self._deliver(session, email)
+                    except Exception as e:
+                        logger.error(f"Email outbox could not update email {email['id']}: {e}")
+                    continue
+                session.close_if_idle()
+                self._wakeup.wait(timeout=min(self.poll_seconds, self.idle_seconds))
+                self._wakeup.clear()
+        finally:
+            session.close()
+
+
+# Global outbox instance, started and stopped with the app
+email_outbox = EmailOutbox()
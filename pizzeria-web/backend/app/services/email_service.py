@@ -4,6 +4,8 @@ Email service for sending emails via SMTP.
 import smtplib
 import logging
 import os
+import re
+import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
@@ -41,16 +43,21 @@ class EmailService:
         logo_path: Optional[str] = None
     ) -> bool:
         """
-        Send an email via SMTP.
+        Queue an email for delivery.
+        
+        The email is stored in the email_outbox table and sent by the outbox
+        worker threads (app.services.email_outbox), so the caller returns as
+        soon as it is queued and the mail survives a restart.
         
         Args:
             to_email: Recipient email address
             subject: Email subject
             body: Plain text email body
             html_body: Optional HTML email body
+            logo_path: Optional logo file, attached inline as cid:logo
             
         Returns:
-            True if email was sent successfully, False otherwise
+            True if the email was queued, False otherwise
         """
         if not self.enabled:
             # Log the email instead of sending
@@ -62,92 +69,121 @@ class EmailService:
             logger.error("SMTP is not configured. Set SMTP_HOST, SMTP_USER, SMTP_PASSWORD, and SMTP_FROM_EMAIL environment variables.")
             return False
         
+        from app.services.email_outbox import email_outbox
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.smtp_from_email
-            msg['To'] = to_email
-            
-            # Add plain text part
-            text_part = MIMEText(body, 'plain', 'utf-8')
-            msg.attach(text_part)
-            
-            # Add HTML part if provided
-            if html_body:
-                # If logo_path is provided, attach it as CID
-                if logo_path and os.path.exists(logo_path):
-                    try:
-                        with open(logo_path, 'rb') as logo_file:
-                            logo_data = logo_file.read()
-                            logo_image = MIMEImage(logo_data)
-                            logo_image.add_header('Content-ID', '<logo>')
-                            logo_image.add_header('Content-Disposition', 'inline', filename='logo.jpg')
-                            msg.attach(logo_image)
-                            # Replace data URI or URL with CID in HTML
-                            import re
-                            html_body = re.sub(r'src=["\']data:image/[^"\']+["\']', 'src="cid:logo"', html_body)
-                            html_body = re.sub(r'src=["\'][^"\']*LOGO-MAGNEET\.jpg[^"\']*["\']', 'src="cid:logo"', html_body)
-                            logger.info(f"Logo attached as CID from {logo_path}")
-                    except Exception as e:
-                        logger.warning(f"Could not attach logo: {e}")
-                
-                html_part = MIMEText(html_body, 'html', 'utf-8')
-                msg.attach(html_part)
-            
-            # Send email via SMTP
-            # Try SMTP_SSL first if port is 465, otherwise use regular SMTP with TLS
-            if self.smtp_port == 465:
-                # Port 465 requires SSL from the start
-                import ssl
-                # Create SSL context that doesn't verify certificate (for development)
-                # In production, you should use proper certificate verification
-                context = ssl.create_default_context()
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-                
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=60, context=context) as server:
-                    # Enable debug output in development
-                    if hasattr(settings, 'DEBUG') and settings.DEBUG:
-                        server.set_debuglevel(1)
-                    
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                # Port 587 or 25 uses STARTTLS
-                with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=60) as server:
-                    # Enable debug output in development
-                    if hasattr(settings, 'DEBUG') and settings.DEBUG:
-                        server.set_debuglevel(1)
-                    
-                    if self.smtp_use_tls:
-                        server.starttls()
-                    
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
+            email_outbox.enqueue(to_email, subject, body, html_body=html_body, logo_path=logo_path)
+            return True
+        except Exception as e:
+            logger.error(f"Could not queue email to {to_email}: {e}")
+            logger.exception("Full error traceback:")
+            return False
+    
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        logo_path: Optional[str] = None
+    ) -> MIMEMultipart:
+        """Build the MIME message (plain text, optional HTML with inline logo)."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.smtp_from_email
+        msg['To'] = to_email
+        
+        # Add plain text part
+        text_part = MIMEText(body, 'plain', 'utf-8')
+        msg.attach(text_part)
+        
+        # Add HTML part if provided
+        if html_body:
+            # If logo_path is provided, attach it as CID
+            if logo_path and os.path.exists(logo_path):
+                try:
+                    with open(logo_path, 'rb') as logo_file:
+                        logo_data = logo_file.read()
+                        logo_image = MIMEImage(logo_data)
+                        logo_image.add_header('Content-ID', '<logo>')
+                        logo_image.add_header('Content-Disposition', 'inline', filename='logo.jpg')
+                        msg.attach(logo_image)
+                        # Replace data URI or URL with CID in HTML
+                        html_body = re.sub(r'src=["\']data:image/[^"\']+["\']', 'src="cid:logo"', html_body)
+                        html_body = re.sub(r'src=["\'][^"\']*LOGO-MAGNEET\.jpg[^"\']*["\']', 'src="cid:logo"', html_body)
+                        logger.info(f"Logo attached as CID from {logo_path}")
+                except Exception as e:
+                    logger.warning(f"Could not attach logo: {e}")
             
+            html_part = MIMEText(html_body, 'html', 'utf-8')
+            msg.attach(html_part)
+        
+        return msg
+    
+    def connect(self) -> smtplib.SMTP:
+        """
+        Open and log in an SMTP session (blocking; called from the outbox worker threads).
+        
+        Port 465 uses SMTP_SSL from the start, other ports use STARTTLS when
+        SMTP_USE_TLS is set.
+        """
+        if self.smtp_port == 465:
+            # Create SSL context that doesn't verify certificate (for development)
+            # In production, you should use proper certificate verification
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=settings.SMTP_TIMEOUT, context=context)
+        else:
+            # Port 587 or 25 uses STARTTLS
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=settings.SMTP_TIMEOUT)
+        try:
+            # Enable debug output in development
+            if hasattr(settings, 'DEBUG') and settings.DEBUG:
+                server.set_debuglevel(1)
+            if self.smtp_port != 465 and self.smtp_use_tls:
+                server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def send_direct(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        logo_path: Optional[str] = None
+    ) -> bool:
+        """
+        Send one email right away, bypassing the outbox (blocking).
+        
+        Only for the SMTP diagnostic scripts; the app uses send_email.
+        
+        Returns:
+            True if email was sent successfully, False otherwise
+        """
+        if not self.enabled:
+            logger.error("SMTP is not configured. Set SMTP_HOST, SMTP_USER, SMTP_PASSWORD, and SMTP_FROM_EMAIL environment variables.")
+            return False
+        try:
+            msg = self.build_message(to_email, subject, body, html_body=html_body, logo_path=logo_path)
+            server = self.connect()
+            try:
+                server.send_message(msg)
+            finally:
+                server.quit()
             logger.info(f"Email sent successfully to {to_email}")
             return True
-            
         except smtplib.SMTPException as e:
-            error_msg = f"SMTP error sending email to {to_email}: {e}"
-            logger.error(error_msg)
+            logger.error(f"SMTP error sending email to {to_email}: {e}")
             logger.error(f"SMTP Host: {self.smtp_host}, Port: {self.smtp_port}")
-            print(f"ERROR: {error_msg}")
             return False
         except OSError as e:
-            error_msg = f"Network/DNS error sending email to {to_email}: {e}"
-            logger.error(error_msg)
+            logger.error(f"Network/DNS error sending email to {to_email}: {e}")
             logger.error(f"SMTP Host: {self.smtp_host}, Port: {self.smtp_port}")
             logger.error("Controleer of de SMTP hostnaam correct is en of je internetverbinding werkt.")
-            print(f"ERROR: {error_msg}")
-            print(f"Controleer of '{self.smtp_host}' de juiste SMTP hostnaam is voor one.com")
-            return False
-        except Exception as e:
-            error_msg = f"Error sending email to {to_email}: {e}"
-            logger.error(error_msg)
-            logger.exception("Full error traceback:")
-            print(f"ERROR: {error_msg}")
             return False
     
     async def send_verification_email(
@@ -0,0 +1,168 @@
+"""
+Publish/subscribe bus for events that every worker process must see.
+
+WebSocket clients are connected to one uvicorn worker, but orders are created
+and updated in any of them. Events (currently the order broadcasts of
+app.api.websocket) therefore go through a bus:
+
+- "local" (default): in-process, for a single worker.
+- "sqlite": events are also written to an event_bus table in the shared
+  database. Every worker polls the cheap PRAGMA data_version (it only changes
+  when another connection commits) and reads the new rows when it does. Works
+  on Windows as well, unlike Unix domain sockets.
+
+Events are delivered to the local subscribers right away by the publishing
+worker; other workers receive them within EVENT_BUS_POLL_SECONDS.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[dict], None]
+
+
+class InProcessEventBus:
+    """Delivers events to the subscribers of this process only."""
+
+    def __init__(self):
+        self._handlers: List[EventHandler] = []
+
+    def subscribe(self, handler: EventHandler) -> None:
+        """Register a handler; it is called with every published event (from any thread)."""
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def publish(self, event: dict) -> None:
+        self._dispatch(event)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def _dispatch(self, event: dict) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Event handler {getattr(handler, '__name__', handler)} failed: {e}")
+
+
+class SQLiteEventBus(InProcessEventBus):
+    """Shares events between worker processes through an event_bus table."""
+
+    def __init__(self, engine=None, poll_seconds: float = None, retention_seconds: float = None):
+        super().__init__()
+        self._engine = engine
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.EVENT_BUS_POLL_SECONDS
+        self.retention_seconds = retention_seconds if retention_seconds is not None else 300.0
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._last_seq = 0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.core.database import engine
+            self._engine = engine
+        return self._engine
+
+    def publish(self, event: dict) -> None:
+        """Deliver locally, then store the event for the other workers."""
+        self._dispatch(event)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("""
+                    INSERT INTO event_bus (origin, payload, created_at) VALUES (:origin, :payload, :now)
+                """), {"origin": self.origin, "payload": json.dumps(event), "now": time.time()})
+        except Exception as e:
+            logger.error(f"Could not publish event to other workers: {e}")
+
+    def start(self) -> None:
+        """Create the table if needed and start following it from the current end."""
+        if self._thread is not None:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS event_bus (
+                    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+                    origin     TEXT NOT NULL,
+                    payload    TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """))
+            self._last_seq = conn.execute(text("SELECT COALESCE(MAX(seq), 0) FROM event_bus")).scalar()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="event-bus", daemon=True)
+        self._thread.start()
+        logger.info(f"SQLite event bus started (worker {self.origin})")
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self) -> None:
+        last_prune = 0.0
+        data_version = None
+        with self.engine.connect() as conn:
+            while not self._stopping.is_set():
+                try:
+                    # data_version is per connection, so this connection stays open
+                    current = conn.exec_driver_sql("PRAGMA data_version").scalar()
+                    if current != data_version:
+                        data_version = current
+                        self._read_new(conn)
+                    conn.commit()
+                    if time.monotonic() - last_prune >= self.retention_seconds:
+                        last_prune = time.monotonic()
+                        self._prune()
+                except Exception as e:
+                    logger.error(f"Event bus poll failed: {e}")
+                    conn.rollback()
+                self._stopping.wait(self.poll_seconds)
+
+    def _read_new(self, conn) -> None:
+        rows = conn.execute(text("""
+            SELECT seq, origin, payload FROM event_bus WHERE seq > :last ORDER BY seq
+        """), {"last": self._last_seq}).fetchall()
+        for seq, origin, payload in rows:
+            self._last_seq = seq
+            if origin == self.origin:
+                continue
+            try:
+                self._dispatch(json.loads(payload))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed event {seq}")
+
+    def _prune(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM event_bus WHERE created_at < :cutoff"),
+                         {"cutoff": time.time() - self.retention_seconds})
+
+
+def create_event_bus(backend: str = None) -> InProcessEventBus:
+    """Event bus for the configured EVENT_BUS backend ("local" or "sqlite")."""
+    backend = (backend or settings.EVENT_BUS).lower()
+    if backend == "sqlite":
+        return SQLiteEventBus()
+    if backend != "local":
+        logger.warning(f"Unknown EVENT_BUS '{backend}', using the in-process bus")
+    return InProcessEventBus()
+
+
+# Global event bus, started and stopped with the app
+event_bus = create_event_bus()
@@ -0,0 +1,152 @@
+"""
+Precomputed public menu.
+
+GET /menu/public serves a snapshot: the serialized JSON body plus a strong
+ETag (hash of the body). The snapshot is rebuilt only when the menu changed.
+Menu changes bump menu_versie through triggers (see
+app.core.database.install_menu_version), so edits by import_menu.py, the
+other workers or the kassa are noticed too. The version is read at most once
+per MENU_SNAPSHOT_CHECK_SECONDS; in between page loads do no database work.
+The menu CRUD endpoints call invalidate() so their own changes show up on the
+next request. Async handlers use get_async(), which runs the version check
+and rebuild in a worker thread.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.menu import MenuCategory, MenuItem
+from app.schemas.menu import MenuCategoryResponse, MenuItemResponse, MenuResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    version: int
+    body: bytes
+    etag: str
+
+
+def build_public_menu(db: Session) -> bytes:
+    """Serialized public menu: all categories and the available items."""
+    categories = db.query(MenuCategory).order_by(MenuCategory.volgorde, MenuCategory.naam).all()
+    items = db.query(MenuItem).filter(MenuItem.beschikbaar == 1).order_by(MenuItem.volgorde, MenuItem.naam).all()
+
+    logger.info(f"Menu snapshot: {len(categories)} categories and {len(items)} items")
+
+    menu = MenuResponse(
+        categories=[
+            MenuCategoryResponse(id=cat.id, naam=cat.naam, volgorde=cat.volgorde)
+            for cat in categories
+        ],
+        items=[
+            MenuItemResponse(
+                id=item.id,
+                naam=item.naam,
+                categorie=item.categorie,
+                prijs=float(item.prijs) if item.prijs is not None else 0.0,
+                beschrijving=item.beschrijving or "",
+                beschikbaar=1 if item.beschikbaar else 0,
+                volgorde=item.volgorde
+            )
+            for item in items
+        ]
+    )
+    return menu.model_dump_json().encode("utf-8")
+
+
+def read_version(db: Session) -> int:
+    """Current menu_versie (0 if the counter is not installed)."""
+    try:
+        return db.execute(text("SELECT versie FROM menu_versie WHERE id = 1")).scalar() or 0
+    except Exception as e:
+        logger.warning(f"Could not read menu_versie: {e}")
+        return 0
+
+
+class MenuSnapshotCache:
+    """Holds the current public menu snapshot and rebuilds it when the menu version changes."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None, check_seconds: float = None):
+        self._session_factory = session_factory
+        self.check_seconds = check_seconds if check_seconds is not None else settings.MENU_SNAPSHOT_CHECK_SECONDS
+        self._snapshot: Optional[MenuSnapshot] = None
+        self._checked_at = 0.0
+        self._generation = 0  # Bumped by invalidate(); a snapshot of an older generation is rebuilt
+        self._built_generation = -1
+        self._lock = threading.Lock()
+        self.builds = 0  # Number of rebuilds, for logging and tests
+
+    @property
+    def session_factory(self) -> Callable[[], Session]:
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    def get(self) -> MenuSnapshot:
+        """Current snapshot; checks the menu version when the check interval has passed."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_seconds:
+            return snapshot
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_seconds:
+                return self._snapshot
+            return self._refresh()
+
+    async def get_async(self) -> MenuSnapshot:
+        """get() without blocking the event loop: database work runs in a worker thread."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_seconds:
+            return snapshot
+        return await asyncio.to_thread(self.get)
+
+    def invalidate(self) -> None:
+        """Rebuild the snapshot on the next request (call after changing the menu)."""
+        self._generation += 1
+        self._checked_at = 0.0
+
+    def _refresh(self) -> MenuSnapshot:
+        generation = self._generation
+        db = self.session_factory()
+        try:
+            version = read_version(db)
+            if (self._snapshot is None or self._snapshot.version != version
+                    or self._built_generation != generation):
+                try:
+                    body = build_public_menu(db)
+                except Exception:
+                    if self._snapshot is None:
+                        raise
+                    logger.error("Could not rebuild menu snapshot, serving the previous one", exc_info=True)
+                    return self._snapshot
+                etag = '"menu-' + hashlib.sha256(body).hexdigest()[:32] + '"'
+                self._snapshot = MenuSnapshot(version=version, body=body, etag=etag)
+                self._built_generation = generation
+                self.builds += 1
+            if generation == self._generation:
+                self._checked_at = time.monotonic()
+            return self._snapshot
+        finally:
+            db.close()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value covers the given ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# Global snapshot cache for GET /menu/public
+menu_snapshot = MenuSnapshotCache()
@@ -0,0 +1,80 @@
+"""
+Delta sync of pending online orders.
+
+The bestelling_wijzigingen table (filled by triggers, see
+app.core.database.ORDER_CHANGE_LOG_TRIGGERS) gives every change to an online
+order an increasing seq. The latest seq is the sync cursor: a client that
+sends its last cursor only gets the orders touched since then, so a poll
+costs O(changed orders) instead of O(open orders).
+"""
+from typing import Dict, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+STATE_SQL = text("""
+    SELECT (SELECT seq FROM sqlite_sequence WHERE name = 'bestelling_wijzigingen'),
+           (SELECT MIN(seq) FROM bestelling_wijzigingen)
+""")
+
+CHANGED_ORDERS_SQL = text("""
+    SELECT bestelling_id, MAX(actie = 'I')
+    FROM bestelling_wijzigingen
+    WHERE seq > :since AND seq <= :cursor
+    GROUP BY bestelling_id
+""")
+
+
+class ChangeLogState(NamedTuple):
+    """Current cursor (0 = nothing logged yet) and the oldest seq still in the log."""
+    cursor: int
+    oldest: int
+
+
+def _state(row) -> ChangeLogState:
+    cursor = row[0] or 0
+    oldest = row[1] if row[1] is not None else cursor + 1
+    return ChangeLogState(cursor, oldest)
+
+
+def get_state(db: Session) -> ChangeLogState:
+    """Read the current cursor and the oldest retained seq in one query."""
+    return _state(db.execute(STATE_SQL).first())
+
+
+async def get_state_async(db: AsyncSession) -> ChangeLogState:
+    """get_state() on an async session."""
+    return _state((await db.execute(STATE_SQL)).first())
+
+
+def is_valid_cursor(since: int, state: ChangeLogState) -> bool:
+    """
+    True if the changes after `since` are all still in the log.
+
+    0 (no state yet), cursors from before pruning and cursors beyond the
+    current one (database replaced) require a full sync.
+    """
+    return 0 < since <= state.cursor and since >= state.oldest - 1
+
+
+def get_etag(state: ChangeLogState) -> str:
+    """Weak ETag for the pending-orders state at this cursor."""
+    return f'W/"orders-{state.cursor}"'
+
+
+def changed_order_ids(db: Session, since: int, cursor: int) -> Dict[int, bool]:
+    """
+    Orders changed in (since, cursor].
+
+    Returns:
+        Dict of order id -> True if the order was created in that range
+    """
+    rows = db.execute(CHANGED_ORDERS_SQL, {"since": since, "cursor": cursor}).fetchall()
+    return {row[0]: bool(row[1]) for row in rows}
+
+
+async def changed_order_ids_async(db: AsyncSession, since: int, cursor: int) -> Dict[int, bool]:
+    """changed_order_ids() on an async session."""
+    rows = (await db.execute(CHANGED_ORDERS_SQL, {"since": since, "cursor": cursor})).fetchall()
+    return {row[0]: bool(row[1]) for row in rows}
@@ -0,0 +1,146 @@
+"""
+Shared order queries and serializers.
+
+Orders are always loaded together with their customer (joined) and items
+(one extra SELECT ... IN for the whole page), so a list endpoint costs two
+queries regardless of the page size instead of 1 + 2 per order.
+
+order_select() and the *_async helpers are the same queries for an
+AsyncSession (app.core.database.get_async_db).
+"""
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import re
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+
+from app.models.order import Order
+
+logger = logging.getLogger(__name__)
+
+
+def order_query(db: Session) -> Query:
+    """Order query with customer and items eager-loaded."""
+    return db.query(Order).options(
+        joinedload(Order.klant),
+        selectinload(Order.items),
+    )
+
+
+def get_order(db: Session, order_id: int) -> Optional[Order]:
+    """Load one order by id (customer and items included)."""
+    return order_query(db).filter(Order.id == order_id).first()
+
+
+def get_order_by_bonnummer(db: Session, bonnummer: str) -> Optional[Order]:
+    """Load one order by receipt number (customer and items included)."""
+    return order_query(db).filter(Order.bonnummer == bonnummer).first()
+
+
+def order_select() -> Select:
+    """order_query() as a select() statement, for async sessions."""
+    return select(Order).options(
+        joinedload(Order.klant),
+        selectinload(Order.items),
+    )
+
+
+async def fetch_orders(db: AsyncSession, stmt: Select) -> List[Order]:
+    """Run an order_select() statement and return the orders."""
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def get_order_async(db: AsyncSession, order_id: int) -> Optional[Order]:
+    """get_order() on an async session."""
+    return (await db.execute(order_select().where(Order.id == order_id))).scalars().first()
+
+
+async def get_order_by_bonnummer_async(db: AsyncSession, bonnummer: str) -> Optional[Order]:
+    """get_order_by_bonnummer() on an async session."""
+    return (await db.execute(order_select().where(Order.bonnummer == bonnummer))).scalars().first()
+
+
+def _parse_extras(item) -> Any:
+    if not item.extras:
+        return None
+    if not isinstance(item.extras, str):
+        return item.extras
+    try:
+        return json.loads(item.extras)
+    except json.JSONDecodeError:
+        logger.warning(f"Could not parse extras JSON for item {item.id}: {item.extras}")
+        return None
+
+
+def serialize_items(order: Order, include_extras: bool = True, include_product_id: bool = False) -> List[Dict[str, Any]]:
+    """Order items as response dictionaries."""
+    items = []
+    for item in order.items:
+        data = {
+            "id": item.id,
+            "bestelling_id": item.bestelling_id,
+            "product_naam": item.product_naam,
+            "aantal": item.aantal,
+            "prijs": item.prijs,
+            "opmerking": item.opmerking,
+        }
+        if include_product_id:
+            data["product_id"] = item.product_id
+        if include_extras:
+            data["extras"] = _parse_extras(item)
+        items.append(data)
+    return items
+
+
+def customer_fields(order: Order) -> Dict[str, Any]:
+    """
+    Customer details of an order for responses.
+
+    klant_adres is "straat huisnummer, plaats"; plaats is split into postcode
+    and gemeente when it starts with a 4-digit postcode.
+    """
+    customer = order.klant
+    fields = {
+        "klant_naam": None,
+        "klant_adres": None,
+        "klant_telefoon": None,
+        "klant_email": None,
+        "klant_straat": None,
+        "klant_huisnummer": None,
+        "klant_postcode": None,
+        "klant_gemeente": None,
+    }
+    if customer is None:
+        return fields
+
+    fields.update({
+        "klant_naam": customer.naam,
+        "klant_telefoon": customer.telefoon,
+        "klant_email": customer.email,
+        "klant_straat": customer.straat,
+        "klant_huisnummer": customer.huisnummer,
+    })
+
+    if customer.plaats:
+        plaats = customer.plaats.strip()
+        postcode_match = re.match(r'^(\d{4})\s+(.+)$', plaats)
+        if postcode_match:
+            fields["klant_postcode"] = postcode_match.group(1)
+            fields["klant_gemeente"] = postcode_match.group(2)
+        else:
+            fields["klant_gemeente"] = plaats
+
+    adres_parts = []
+    if customer.straat:
+        adres_parts.append(customer.straat)
+    if customer.huisnummer:
+        adres_parts.append(str(customer.huisnummer))
+    if adres_parts:
+        adres_str = " ".join(adres_parts)
+        fields["klant_adres"] = f"{adres_str}, {customer.plaats}" if customer.plaats else adres_str
+    else:
+        fields["klant_adres"] = customer.plaats if customer.plaats else None
+    return fields
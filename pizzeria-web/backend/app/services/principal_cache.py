@@ -0,0 +1,130 @@
+"""
+Cache of authenticated principals, keyed by token hash.
+
+The kassa screens (koeriers, online bestellingen) call the admin endpoints
+every few seconds with the same token, and the customer pages do the same
+with /customers/public/me. get_current_user / get_current_customer look the
+token up here first and only decode the JWT (and load the customer) on a
+miss. Entries live for PRINCIPAL_CACHE_TTL_SECONDS, never past the token's
+own exp claim, and the cache holds at most PRINCIPAL_CACHE_SIZE tokens (least
+recently used are dropped first).
+
+Customer updates, password resets and logouts call invalidate_customer /
+invalidate_token. Invalidations go through the event bus, so with
+EVENT_BUS=sqlite the other workers drop their copy as well.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+from app.services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_EVENT = "principal_invalidated"
+
+
+@dataclass
+class CachedPrincipal:
+    claims: dict
+    principal: Any
+    customer_id: Optional[int]
+    expires_at: float
+
+
+def token_key(token: str) -> str:
+    """Cache key for a token; the token itself is not kept in memory or sent over the bus."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """LRU/TTL cache of decoded claims plus the resolved user dict or Customer."""
+
+    def __init__(self, ttl_seconds: float = None, max_entries: int = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.PRINCIPAL_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else settings.PRINCIPAL_CACHE_SIZE
+        self._entries: "OrderedDict[str, CachedPrincipal]" = OrderedDict()
+        self._by_customer: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        event_bus.subscribe(self._on_event)
+
+    def get(self, token: str) -> Optional[CachedPrincipal]:
+        """Cached entry for this token, or None (expired entries are dropped)."""
+        if self.ttl_seconds <= 0:
+            return None
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, claims: dict, principal: Any, customer_id: Optional[int] = None) -> None:
+        """Store a successfully authenticated token."""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        key = token_key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CachedPrincipal(claims, principal, customer_id, expires_at)
+            if customer_id is not None:
+                self._by_customer.setdefault(customer_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_token(self, token: str) -> None:
+        """Forget one token (logout)."""
+        event_bus.publish({"type": INVALIDATE_EVENT, "token_key": token_key(token)})
+
+    def invalidate_customer(self, customer_id: int) -> None:
+        """Forget every token of a customer (profile update, email verified, password reset)."""
+        event_bus.publish({"type": INVALIDATE_EVENT, "customer_id": int(customer_id)})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_customer.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _on_event(self, event: dict) -> None:
+        if event.get("type") != INVALIDATE_EVENT:
+            return
+        with self._lock:
+            if event.get("token_key"):
+                self._remove(event["token_key"])
+            if event.get("customer_id") is not None:
+                for key in list(self._by_customer.get(event["customer_id"], ())):
+                    self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry.customer_id is None:
+            return
+        keys = self._by_customer.get(entry.customer_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_customer[entry.customer_id]
+
+
+# Global cache used by app.core.dependencies
+principal_cache = PrincipalCache()
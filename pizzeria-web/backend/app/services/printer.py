@@ -2,12 +2,21 @@
 Printer service for handling receipt printing.
 Supports both direct printing (Windows) and print job queue for desktop client.
 """
+import asyncio
 import logging
 import platform
-from typing import Optional, Dict, Any, List
+import threading
+import time
+import uuid
+from typing import Optional, Dict, Any, List, Set, Tuple
 from datetime import datetime
 import json
 
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services.event_bus import event_bus
+
 logger = logging.getLogger(__name__)
 
 # Windows print support
@@ -20,13 +29,41 @@ if platform.system() == "Windows":
         pass
 
 
+# Route for jobs that do not name a printer
+DEFAULT_PRINTER = "default"
+
+# Seconds between prunes of printed jobs
+PRUNE_INTERVAL_SECONDS = 3600
+
+
 class PrinterService:
-    """Service for handling receipt printing."""
+    """
+    Service for handling receipt printing.
+    
+    Print jobs are stored in the print_jobs table, so they survive a restart.
+    Every job is routed to a printer (the name a print client polls with);
+    clients long-poll wait_for_jobs and are woken as soon as a job for their
+    printer is queued, also when it was queued by another worker (through
+    app.services.event_bus). Printed jobs are pruned after
+    PRINT_JOB_RETENTION_HOURS.
+    """
     
-    def __init__(self):
-        self.print_queue: List[Dict[str, Any]] = []
+    def __init__(self, engine=None):
+        self._engine = engine
         self.printer_name: Optional[str] = None
         self.direct_print_enabled = WIN32PRINT_AVAILABLE
+        self.retention_seconds = settings.PRINT_JOB_RETENTION_HOURS * 3600
+        self._last_prune = 0.0
+        self._waiters: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._waiters_lock = threading.Lock()
+        event_bus.subscribe(self._on_event)
+    
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.core.database import engine
+            self._engine = engine
+        return self._engine
     
     def set_printer_name(self, printer_name: str) -> None:
         """Set the printer name for direct printing."""
@@ -52,7 +89,8 @@ class PrinterService:
         self,
         order_data: Dict[str, Any],
         receipt_text: str,
-        qr_data: Optional[str] = None
+        qr_data: Optional[str] = None,
+        printer: Optional[str] = None
     ) -> str:
         """
         Queue a print job for desktop client.
@@ -61,49 +99,144 @@ class PrinterService:
             order_data: Order information
             receipt_text: Formatted receipt text
             qr_data: Optional QR code data
+            printer: Print client that should print it (default: DEFAULT_PRINTER)
             
         Returns:
             Job ID
         """
-        job_id = f"print_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{order_data.get('id', 'unknown')}"
-        
-        job = {
-            "id": job_id,
-            "order_id": order_data.get("id"),
-            "bonnummer": order_data.get("bonnummer"),
-            "receipt_text": receipt_text,
-            "qr_data": qr_data,
-            "created_at": datetime.now().isoformat(),
-            "status": "pending"
-        }
-        
-        self.print_queue.append(job)
-        logger.info(f"Print job queued: {job_id} for order {order_data.get('bonnummer')}")
+        printer = printer or DEFAULT_PRINTER
+        job_id = f"print_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{order_data.get('id', 'unknown')}_{uuid.uuid4().hex[:6]}"
+        now = time.time()
         
         # Try direct print if enabled
+        status = "pending"
         if self.direct_print_enabled and self.printer_name:
             try:
-                success = self._print_direct(receipt_text, qr_data)
-                if success:
-                    job["status"] = "printed"
+                if self._print_direct(receipt_text, qr_data):
+                    status = "printed"
                     logger.info(f"Print job {job_id} printed directly")
             except Exception as e:
                 logger.warning(f"Direct print failed, job remains in queue: {e}")
         
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO print_jobs (job_id, printer, order_id, bonnummer, receipt_text, qr_data,
+                                        status, created_at, printed_at)
+                VALUES (:job_id, :printer, :order_id, :bonnummer, :receipt_text, :qr_data,
+                        :status, :now, :printed_at)
+            """), {
+                "job_id": job_id, "printer": printer, "order_id": order_data.get("id"),
+                "bonnummer": order_data.get("bonnummer"), "receipt_text": receipt_text, "qr_data": qr_data,
+                "status": status, "now": now, "printed_at": now if status == "printed" else None,
+            })
+        logger.info(f"Print job queued: {job_id} for order {order_data.get('bonnummer')} on {printer}")
+        
+        if status == "pending":
+            event_bus.publish({"type": "print_job_queued", "printer": printer})
+        if now - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+            self.prune_jobs()
         return job_id
     
-    def get_pending_jobs(self) -> List[Dict[str, Any]]:
-        """Get all pending print jobs."""
-        return [job for job in self.print_queue if job["status"] == "pending"]
+    def get_pending_jobs(self, printer: Optional[str] = None, after: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get pending print jobs, oldest first.
+        
+        Args:
+            printer: Only jobs routed to this printer (None = all printers)
+            after: Only jobs with a seq above this cursor
+            limit: Maximum number of jobs
+        """
+        sql = "SELECT * FROM print_jobs WHERE status = 'pending'"
+        params: Dict[str, Any] = {"after": after, "limit": limit}
+        if printer is not None:
+            sql += " AND printer = :printer"
+            params["printer"] = printer
+        sql += " AND id > :after ORDER BY created_at, id LIMIT :limit"
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(sql), params).mappings().all()
+        return [self._job_dict(row) for row in rows]
+    
+    def count_pending_jobs(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM print_jobs WHERE status = 'pending'")).scalar()
     
     def mark_job_printed(self, job_id: str) -> bool:
         """Mark a print job as printed."""
-        for job in self.print_queue:
-            if job["id"] == job_id:
-                job["status"] = "printed"
-                logger.info(f"Print job {job_id} marked as printed")
-                return True
-        return False
+        with self.engine.begin() as conn:
+            found = conn.execute(text("""
+                UPDATE print_jobs SET status = 'printed', printed_at = COALESCE(printed_at, :now)
+                WHERE job_id = :job_id
+            """), {"job_id": job_id, "now": time.time()}).rowcount
+        if found:
+            logger.info(f"Print job {job_id} marked as printed")
+        return bool(found)
+    
+    def prune_jobs(self) -> int:
+        """Delete printed jobs older than the retention period."""
+        self._last_prune = time.time()
+        with self.engine.begin() as conn:
+            deleted = conn.execute(text("""
+                DELETE FROM print_jobs WHERE status = 'printed' AND printed_at < :cutoff
+            """), {"cutoff": time.time() - self.retention_seconds}).rowcount
+        if deleted:
+            logger.info(f"Pruned {deleted} printed job(s)")
+        return deleted
+    
+    async def wait_for_jobs(self, printer: str, after: int = 0, timeout: float = 25.0) -> List[Dict[str, Any]]:
+        """
+        Long-poll: pending jobs for a printer, waiting up to timeout seconds for one to arrive.
+        
+        Returns an empty list on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            # Register before querying so a job queued in between still wakes us
+            waiter = (loop, asyncio.Event())
+            with self._waiters_lock:
+                self._waiters.setdefault(printer, set()).add(waiter)
+            try:
+                jobs = self.get_pending_jobs(printer, after=after)
+                remaining = deadline - loop.time()
+                if jobs or remaining <= 0:
+                    return jobs
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                with self._waiters_lock:
+                    waiters = self._waiters.get(printer)
+                    if waiters is not None:
+                        waiters.discard(waiter)
+                        if not waiters:
+                            del self._waiters[printer]
+    
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        """Event bus handler: wake the clients waiting for the printer of a new job (any thread)."""
+        if event.get("type") != "print_job_queued":
+            return
+        with self._waiters_lock:
+            waiters = list(self._waiters.get(event.get("printer"), ()))
+        for loop, wakeup in waiters:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass  # Loop already closed
+    
+    @staticmethod
+    def _job_dict(row) -> Dict[str, Any]:
+        return {
+            "id": row["job_id"],
+            "seq": row["id"],
+            "printer": row["printer"],
+            "order_id": row["order_id"],
+            "bonnummer": row["bonnummer"],
+            "receipt_text": row["receipt_text"],
+            "qr_data": row["qr_data"],
+            "created_at": datetime.fromtimestamp(row["created_at"]).isoformat(),
+            "status": row["status"]
+        }
     
     def _print_direct(self, receipt_text: str, qr_data: Optional[str] = None) -> bool:
         """
@@ -313,6 +446,65 @@ class PrinterService:
         return "\n".join(lines)
 
 
+    def queue_order_receipt(
+        self,
+        db,
+        order,
+        printer: Optional[str] = None,
+        custom_footer: Optional[str] = None
+    ) -> str:
+        """
+        Format the receipt of an order and queue it.
+        
+        Args:
+            db: Database session
+            order: Order model instance
+            printer: Print client that should print it
+            custom_footer: Custom footer text
+            
+        Returns:
+            Job ID
+        """
+        from app.models.customer import Customer
+        
+        # Get customer if available
+        customer_data = None
+        if order.klant_id:
+            customer = db.query(Customer).filter(Customer.id == order.klant_id).first()
+            if customer:
+                customer_data = {
+                    "naam": customer.naam,
+                    "telefoon": customer.telefoon,
+                    "straat": getattr(customer, 'straat', None),
+                    "huisnummer": getattr(customer, 'huisnummer', None),
+                    "postcode": getattr(customer, 'postcode', None),
+                    "plaats": getattr(customer, 'plaats', None),
+                }
+        
+        # Prepare order data
+        order_data = {
+            "id": order.id,
+            "bonnummer": order.bonnummer,
+            "datum": order.datum,
+            "tijd": order.tijd,
+            "totaal": order.totaal,
+            "items": [
+                {
+                    "product_naam": item.product_naam,
+                    "aantal": item.aantal,
+                    "prijs": item.prijs,
+                    "opmerking": getattr(item, 'opmerking', None),
+                    "extras": json.loads(item.extras) if getattr(item, 'extras', None) else None,
+                }
+                for item in order.items
+            ]
+        }
+        
+        receipt_text = self.format_receipt(order_data, customer_data, custom_footer)
+        qr_data = f"https://pitapizzanapoli.be/status?bonnummer={order.bonnummer}"
+        return self.queue_print_job(order_data, receipt_text, qr_data, printer=printer)
+
+
 # Global printer service instance
 printer_service = PrinterService()
 
@@ -0,0 +1,81 @@
+"""
+Reporting queries.
+
+Every report figure is aggregated in SQL and returned as compact rows (plain
+dicts), never as Order/OrderItem objects. Totals per day, hour and courier
+come from verkoop_rollup; product figures join bestelregels to bestellingen
+on a plain `datum BETWEEN` range, so idx_bestellingen_datum is used (no
+date() around the column). Dates are 'YYYY-MM-DD' strings, ranges inclusive.
+"""
+from typing import Any, Dict, List
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderItem
+
+
+def totals(db: Session, start: str, end: str) -> Dict[str, Any]:
+    """Order count and revenue for a date range."""
+    row = db.execute(text("""
+        SELECT COALESCE(SUM(aantal), 0) AS orders, COALESCE(SUM(omzet), 0) AS revenue
+        FROM verkoop_rollup
+        WHERE datum BETWEEN :start AND :end
+    """), {"start": start, "end": end}).one()
+    return {"orders": int(row.orders), "revenue": round(float(row.revenue), 2)}
+
+
+def per_day(db: Session, start: str, end: str) -> List[Dict[str, Any]]:
+    """Orders and revenue per day, in date order."""
+    rows = db.execute(text("""
+        SELECT datum, SUM(aantal) AS orders, SUM(omzet) AS revenue
+        FROM verkoop_rollup
+        WHERE datum BETWEEN :start AND :end
+        GROUP BY datum
+        ORDER BY datum
+    """), {"start": start, "end": end}).all()
+    return [{"date": row.datum, "orders": row.orders, "revenue": round(float(row.revenue), 2)} for row in rows]
+
+
+def per_hour(db: Session, start: str, end: str) -> List[Dict[str, Any]]:
+    """Orders and revenue per hour of the day (0-23)."""
+    rows = db.execute(text("""
+        SELECT uur, SUM(aantal) AS orders, SUM(omzet) AS revenue
+        FROM verkoop_rollup
+        WHERE datum BETWEEN :start AND :end
+        GROUP BY uur
+        ORDER BY uur
+    """), {"start": start, "end": end}).all()
+    return [{"hour": row.uur, "orders": row.orders, "revenue": round(float(row.revenue), 2)} for row in rows]
+
+
+def per_courier(db: Session, start: str, end: str) -> List[Dict[str, Any]]:
+    """Orders and revenue per assigned courier (orders without courier are left out)."""
+    rows = db.execute(text("""
+        SELECT koerier_id, SUM(aantal) AS orders, SUM(omzet) AS revenue
+        FROM verkoop_rollup
+        WHERE datum BETWEEN :start AND :end AND koerier_id != 0
+        GROUP BY koerier_id
+        ORDER BY koerier_id
+    """), {"start": start, "end": end}).all()
+    return [
+        {"koerier_id": row.koerier_id, "orders": row.orders, "revenue": round(float(row.revenue), 2)}
+        for row in rows
+    ]
+
+
+def per_product(db: Session, start: str, end: str) -> List[Dict[str, Any]]:
+    """Quantity sold and revenue per product, best sellers first."""
+    omzet = func.sum(OrderItem.prijs * OrderItem.aantal)
+    rows = (
+        db.query(OrderItem.product_naam, func.sum(OrderItem.aantal), omzet)
+        .join(Order, Order.id == OrderItem.bestelling_id)
+        .filter(Order.datum.between(start, end))
+        .group_by(OrderItem.product_naam)
+        .order_by(omzet.desc())
+        .all()
+    )
+    return [
+        {"naam": naam, "aantal": int(aantal or 0), "omzet": round(float(revenue or 0), 2)}
+        for naam, aantal, revenue in rows
+    ]
@@ -0,0 +1,77 @@
+"""
+Street autocomplete index for /addresses/suggestions.
+
+Built from straatnamen.json plus the known (straat, postcode, gemeente)
+combinations in the adressen table, and rebuilt when straatnamen.json changes
+on disk (the kassa adds new streets there). Streets added through
+POST /addresses/streets are added to the index directly.
+"""
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.config_files import ConfigFile, streets_file
+from app.utils.address_index import AddressIndex, normalize_street
+
+logger = logging.getLogger(__name__)
+
+
+class StreetIndex:
+    """AddressIndex over the street names plus the postcodes known per street."""
+
+    def __init__(self, config_file: Optional[ConfigFile] = None):
+        self._config_file = config_file
+        self._index: Optional[AddressIndex] = None
+        self._places: Dict[str, List[Tuple[str, str]]] = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    @property
+    def config_file(self) -> ConfigFile:
+        return self._config_file or streets_file
+
+    def get(self, db: Session) -> AddressIndex:
+        """Current index; (re)built on first use and after straatnamen.json changed."""
+        version = self.config_file.version
+        with self._lock:
+            if self._index is None or version != self._version:
+                self._build(db, version)
+            return self._index
+
+    def places(self, naam: str) -> List[Tuple[str, str]]:
+        """Known (postcode, gemeente) pairs for a street."""
+        return self._places.get(normalize_street(naam), [])
+
+    def add(self, naam: str) -> None:
+        """Add a street written to straatnamen.json by this process (no rebuild needed)."""
+        with self._lock:
+            if self._index is None:
+                return
+            self._index.add(naam)
+            self._version = self.config_file.version
+
+    def _build(self, db: Session, version) -> None:
+        streets = self.config_file.data()
+        names = [naam for naam in streets if isinstance(naam, str)] if isinstance(streets, list) else []
+        places: Dict[str, List[Tuple[str, str]]] = {}
+        try:
+            rows = db.execute(text("SELECT DISTINCT straat, postcode, gemeente FROM adressen")).fetchall()
+        except Exception as e:
+            logger.debug(f"Could not read adressen table (might not exist): {e}")
+            rows = []
+        for straat, postcode, gemeente in rows:
+            if not straat:
+                continue
+            names.append(straat)
+            places.setdefault(normalize_street(straat), []).append((postcode or "", gemeente or ""))
+        self._index = AddressIndex(names)
+        self._places = places
+        self._version = version
+        logger.info(f"Street index built with {len(self._index)} streets")
+
+
+# Global index used by app.api.addresses
+street_index = StreetIndex()
@@ -0,0 +1,107 @@
+"""
+Short-lived cache for the public order tracking endpoints.
+
+Customers keep the tracking page open and refresh it during the dinner rush.
+The lookup behind GET /orders/track/{bonnummer} and /orders/track/by-phone is
+kept for TRACKING_CACHE_SECONDS, so repeated refreshes cost no queries.
+
+Order events on the event bus (status changes, batch updates, edits, from
+any worker) drop the affected entries right away. Deletes and renumbering
+publish invalidate() on the bus, so every worker drops its copy. Changes
+made directly in the database by the kassa show up once the entry expires.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_EVENT = "tracking_invalidated"
+
+
+def bonnummer_key(bonnummer: str) -> Tuple[str, str]:
+    return ("bonnummer", bonnummer)
+
+
+def phone_key(telefoon_norm: str) -> Tuple[str, str]:
+    return ("phone", telefoon_norm)
+
+
+class TrackingCache:
+    """TTL cache of tracking lookups, keyed by bonnummer_key() / phone_key()."""
+
+    def __init__(self, ttl_seconds: float = None, max_entries: int = 2048):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.TRACKING_CACHE_SECONDS
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        event_bus.subscribe(self._on_event)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_bonnummers(self, bonnummers: Iterable[str]) -> None:
+        """Drop these orders and every by-phone list (which may contain them)."""
+        with self._lock:
+            for bonnummer in bonnummers:
+                self._entries.pop(bonnummer_key(bonnummer), None)
+            for key in [key for key in self._entries if key[0] == "phone"]:
+                del self._entries[key]
+
+    def invalidate(self, bonnummers: Optional[Iterable[str]] = None) -> None:
+        """Drop these orders (or everything when None) in every worker."""
+        event_bus.publish({
+            "type": INVALIDATE_EVENT,
+            "bonnummers": list(bonnummers) if bonnummers is not None else None,
+        })
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _on_event(self, event: dict) -> None:
+        event_type = str(event.get("type", ""))
+        if event_type == INVALIDATE_EVENT:
+            if event.get("bonnummers") is None:
+                self.clear()
+            else:
+                self.invalidate_bonnummers(event["bonnummers"])
+            return
+        if not event_type.startswith("order_") or event_type == "order_created":
+            return
+        data = event.get("data") or {}
+        orders = data.get("orders") if event_type == "order_status_batch" else [data]
+        bonnummers = [order.get("bonnummer") for order in orders or []]
+        if bonnummers and all(bonnummers):
+            self.invalidate_bonnummers(bonnummers)
+        else:
+            self.clear()
+
+
+# Global cache used by app.api.order_tracking
+tracking_cache = TrackingCache()
@@ -0,0 +1,100 @@
+"""
+Customer search on the shared klanten_fts (FTS5 trigram) index.
+
+The index and its sync triggers are created by the desktop schema migrations;
+when it is missing (or no word is long enough for trigrams) the search falls
+back to ILIKE. Shorter words are applied as LIKE filters on top of the match.
+"""
+from typing import List, Optional, Tuple
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.customer import Customer
+
+logger = logging.getLogger(__name__)
+
+
+def build_match_query(search: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Build the FTS5 search; same rules and output as build_zoek_query in the desktop
+    repository (tests/test_kassa_schema.py checks they agree).
+
+    Phone-like input becomes one digit string; other input is split into words
+    that must all match. Words shorter than 3 characters cannot be matched by
+    the trigram index and are returned separately, to be applied as LIKE filters.
+
+    Returns:
+        (MATCH expression or None if no word of 3+ characters remains, short words)
+    """
+    if not search or not search.strip():
+        return None, []
+
+    digits = re.sub(r'[\s\-\(\)\.\/\+]', '', search)
+    tokens = [digits] if digits.isdigit() else search.split()
+    long_tokens = [token for token in tokens if len(token) >= 3]
+    short_tokens = [token for token in tokens if len(token) < 3]
+    if not long_tokens:
+        return None, short_tokens
+    return " AND ".join('"' + token.replace('"', '""') + '"' for token in long_tokens), short_tokens
+
+
+def has_search_index(db: Session) -> bool:
+    """Check whether the klanten_fts index exists in this database."""
+    row = db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'klanten_fts'")
+    ).first()
+    return row is not None
+
+
+def search_customers(db: Session, search: str, skip: int = 0, limit: int = 100) -> List[Customer]:
+    """
+    Search customers on name, phone, street and place, best match first.
+
+    Args:
+        db: Database session
+        search: Raw search input
+        skip: Number of results to skip
+        limit: Maximum number of results
+
+    Returns:
+        List of Customer objects
+    """
+    match, short_tokens = build_match_query(search)
+    if match and db.bind.dialect.name == "sqlite" and has_search_index(db):
+        params = {"match": match, "limit": limit, "skip": skip}
+        filters = ""
+        for i, token in enumerate(short_tokens):
+            filters += (f" AND (k.naam LIKE :kort{i} OR k.telefoon LIKE :kort{i}"
+                        f" OR k.straat LIKE :kort{i} OR k.plaats LIKE :kort{i})")
+            params[f"kort{i}"] = f"%{token}%"
+        rows = db.execute(
+            text(
+                "SELECT f.rowid FROM klanten_fts f JOIN klanten k ON k.id = f.rowid "
+                f"WHERE klanten_fts MATCH :match{filters} "
+                "ORDER BY f.rank LIMIT :limit OFFSET :skip"
+            ),
+            params,
+        ).all()
+        ids = [row[0] for row in rows]
+        if not ids:
+            return []
+        by_id = {c.id: c for c in db.query(Customer).filter(Customer.id.in_(ids)).all()}
+        return [by_id[i] for i in ids if i in by_id]
+
+    search_term = f"%{search.strip()}%"
+    return (
+        db.query(Customer)
+        .filter(
+            (Customer.naam.ilike(search_term)) |
+            (Customer.telefoon.ilike(search_term)) |
+            (Customer.straat.ilike(search_term)) |
+            (Customer.plaats.ilike(search_term))
+        )
+        .order_by(Customer.naam)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
@@ -89,6 +89,49 @@ def validate_phone_number(phone: str, default_region: str = 'BE') -> Tuple[bool,
     return True, normalized, None
 
 
+# Characters removed for the telefoon_norm key
+PHONE_KEY_STRIP_CHARS = (" ", "\t", "\n", "\r", "-", "(", ")", ".")
+
+# telefoon_norm rules: (prefix, allowed lengths or None, characters to drop, new prefix).
+# The first matching rule wins; 0 + 8 digits (landline) or 9 digits (mobile) is a
+# Belgian national number. Same table as TELEFOON_NORM_REGELS in the kassa database.py
+# (tests/test_kassa_schema.py checks they match); app.core.database.telefoon_norm_sql
+# generates the trigger expression from it.
+PHONE_KEY_RULES = (
+    ("+32", None, 0, ""),
+    ("0032", None, 4, "+32"),
+    ("32", (10, 11), 0, "+"),
+    ("0", (9, 10), 1, "+32"),
+)
+
+
+def normalize_phone_key(phone: str) -> str:
+    """
+    Normalize phone number to the klanten.telefoon_norm lookup key.
+    
+    Same rules as the kassa app (repositories.customer_repository.normalize_phone_for_search)
+    and the telefoon_norm triggers, so every format hits the same unique index entry.
+    
+    Args:
+        phone: Phone number in any format (+32..., 0..., 0032..., with spaces/dashes)
+        
+    Returns:
+        Normalized key (E.164 for Belgian numbers, cleaned input otherwise)
+    """
+    if not phone:
+        return phone
+    
+    cleaned = phone
+    for char in PHONE_KEY_STRIP_CHARS:
+        cleaned = cleaned.replace(char, '')
+    
+    for prefix, lengths, drop, new_prefix in PHONE_KEY_RULES:
+        if cleaned.startswith(prefix) and (not lengths or len(cleaned) in lengths):
+            return new_prefix + cleaned[drop:]
+    
+    return cleaned
+
+
 def format_phone_number(phone: str, region: str = 'BE') -> Optional[str]:
     """
     Format phone number to E.164 format.
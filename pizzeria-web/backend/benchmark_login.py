@@ -0,0 +1,118 @@
+"""
+Benchmark: login throughput and latency of an unrelated endpoint during a login burst.
+
+Runs the real app in-process (httpx ASGI transport) against a temporary
+database with one customer, fires logins at /api/v1/customers/public/login and
+meanwhile polls /api/health. With bcrypt on the event loop every login stalls
+the health checks; with the password pool they keep answering.
+
+Gebruik:
+    python benchmark_login.py                      # password pool (PASSWORD_WORKERS)
+    python benchmark_login.py --workers 0          # bcrypt on the event loop (old behaviour)
+    python benchmark_login.py --logins 64 --concurrency 16 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="Number of logins")
+    parser.add_argument("--concurrency", type=int, default=8, help="Simultaneous logins")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=None, help="Password pool threads (0 = event loop)")
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+    from app.api import auth, customers
+    from app.core.database import SessionLocal, init_db
+    from app.core.security import get_password_hash
+    from app.models.customer import Customer
+    import app.main as main_module
+
+    init_db()
+    db = SessionLocal()
+    db.add(Customer(naam="Bench", telefoon="0470000000", email="bench@example.com",
+                    password_hash=get_password_hash("Geheim123!"), email_verified=1))
+    db.commit()
+    db.close()
+
+    for limiter in (main_module.limiter, auth.limiter, customers.limiter):
+        limiter.enabled = False
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        health_latencies = []
+        done = asyncio.Event()
+
+        async def probe():
+            # One health check every 10 ms; latency counts from the planned send time,
+            # so a stalled event loop shows up even while no request is in flight
+            interval = 0.01
+            planned = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(0.0, planned - time.perf_counter()))
+                response = await client.get("/api/health")
+                health_latencies.append(time.perf_counter() - planned)
+                assert response.status_code == 200
+                planned += interval
+
+        remaining = list(range(args.logins))
+        failures = 0
+
+        async def login_worker():
+            nonlocal failures
+            while remaining:
+                remaining.pop()
+                response = await client.post("/api/v1/customers/public/login",
+                                             json={"email": "bench@example.com", "password": "Geheim123!"})
+                if response.status_code != 200:
+                    failures += 1
+
+        probe_task = asyncio.create_task(probe())
+        await asyncio.sleep(0.1)  # Baseline health checks before the burst
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    print(f"bcrypt rounds {args.rounds}, password workers {os.environ['PASSWORD_WORKERS']}, "
+          f"{args.logins} logins with concurrency {args.concurrency}")
+    print(f"  logins:  {args.logins / elapsed:.1f}/s ({failures} failed) in {elapsed:.2f}s")
+    print(f"  /health: {len(health_latencies)} requests, "
+          f"p50 {statistics.median(health_latencies) * 1000:.1f} ms, "
+          f"p99 {percentile(health_latencies, 99) * 1000:.1f} ms, "
+          f"max {max(health_latencies) * 1000:.1f} ms")
+
+
+def main():
+    args = parse_args()
+    tmpdir = tempfile.mkdtemp(prefix="login-bench-")
+    # Settings are read at import time, so configure them before importing the app
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ["PASSWORD_HASH_ROUNDS"] = str(args.rounds)
+    if args.workers is not None:
+        os.environ["PASSWORD_WORKERS"] = str(args.workers)
+    os.environ.setdefault("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1)))
+    os.environ["EMAIL_VERIFICATION_REQUIRED"] = "false"
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
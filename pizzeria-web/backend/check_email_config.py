@@ -51,7 +51,7 @@ async def check_email_config():
         
         print(f"\n   Verzenden naar: {test_email}...")
         
-        success = await email_service.send_email(
+        success = email_service.send_direct(
             to_email=test_email,
             subject="Test Email - Pita Pizza Napoli",
             body="Dit is een test email om te controleren of de SMTP configuratie correct werkt.",
@@ -8,6 +8,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core.config import settings
 from app.core.database import SessionLocal, init_db
 from app.models.menu import MenuCategory, MenuItem
 from sqlalchemy.exc import IntegrityError
@@ -115,6 +116,8 @@ def import_menu():
         print(f"\n✅ Import complete!")
         print(f"   Categories: {category_count} created")
         print(f"   Items: {item_count} added")
+        # The menu_versie triggers (installed by init_db) mark the change for the running API
+        print(f"   Website menu refreshes within {settings.MENU_SNAPSHOT_CHECK_SECONDS:g}s")
         
     except Exception as e:
         db.rollback()
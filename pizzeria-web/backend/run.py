@@ -10,6 +10,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
+        workers=1 if settings.DEBUG else settings.WEB_WORKERS,  # reload only works with one worker
         log_level="info"
     )
 
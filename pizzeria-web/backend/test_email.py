@@ -50,7 +50,7 @@ SMTP_USE_TLS=true
     
     print(f"   Verzenden naar: {test_email}...")
     
-    success = await email_service.send_email(
+    success = email_service.send_direct(
         to_email=test_email,
         subject="Test E-mail - Pita Pizza Napoli",
         body="Dit is een test e-mail om te controleren of de SMTP configuratie correct werkt.",
@@ -147,7 +147,7 @@ async def test_direct_email_sending():
         
         print(f"\nVerzenden naar: {test_email}...")
         
-        success = await email_service.send_email(
+        success = email_service.send_direct(
             to_email=test_email,
             subject="Directe Test Email - Pita Pizza Napoli",
             body="Dit is een directe test email om te controleren of SMTP werkt.",
@@ -0,0 +1,99 @@
+"""Shared pytest fixtures for the backend tests."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.core.database import (
+    Base, async_database_url, install_menu_version, install_order_change_log, install_report_indexes,
+    install_verkoop_rollup, set_sqlite_pragmas
+)
+from app.models import customer, order, menu  # noqa: F401  (register models)
+from app.services.principal_cache import principal_cache
+from app.services.tracking_cache import tracking_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_request_caches():
+    """The process-wide principal and tracking caches must not leak entries between tests."""
+    principal_cache.clear()
+    tracking_cache.clear()
+    yield
+    principal_cache.clear()
+    tracking_cache.clear()
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """
+    SQLite engine with all model tables, triggers, report indexes and the menu version.
+
+    The database is a file, so the async engine (async_engine fixture) sees the same data.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        install_order_change_log(conn)
+        install_verkoop_rollup(conn)
+        install_report_indexes(conn)
+        install_menu_version(conn)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    """Database session on the test engine."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def async_engine(db_engine):
+    """aiosqlite engine on the test database (NullPool: every asyncio.run gets its own connection)."""
+    engine = create_async_engine(async_database_url(str(db_engine.url)), poolclass=NullPool)
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def run_async_db(async_engine):
+    """Call an async endpoint with db=<AsyncSession> in a fresh event loop: run_async_db(endpoint, **kwargs)."""
+    session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def run(endpoint, **kwargs):
+        async def call():
+            async with session_factory() as session:
+                return await endpoint(db=session, **kwargs)
+        return asyncio.run(call())
+
+    return run
+
+
+@pytest.fixture
+def query_counter(db_engine, request):
+    """Count the SQL statements executed on the engine(s) (reset with .clear())."""
+    statements = []
+    engines = [db_engine]
+    if "async_engine" in request.fixturenames:
+        engines.append(request.getfixturevalue("async_engine").sync_engine)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
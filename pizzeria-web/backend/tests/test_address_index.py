@@ -0,0 +1,89 @@
+"""Tests for the street autocomplete index and /addresses/suggestions."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.api import addresses
+from app.services import street_index as street_index_module
+from app.services.config_files import ConfigFile
+from app.services.street_index import StreetIndex
+from app.utils.address_index import AddressIndex
+
+STREETS = ["Kerkstraat", "Grote Kerkstraat", "Kerkplein", "Dorpstraat", "Adolf Van Bourgondiëlaan", "Kapelstraat"]
+
+
+def test_prefix_matches_rank_before_word_and_fuzzy_matches():
+    index = AddressIndex(STREETS)
+
+    assert index.suggest("kerk") == ["Kerkplein", "Kerkstraat", "Grote Kerkstraat"]
+    assert index.suggest("kerk", limit=1) == ["Kerkplein"]
+    assert index.suggest("Kerkstraat")[0] == "Kerkstraat"
+
+
+def test_typos_accents_and_infix_terms_are_found():
+    index = AddressIndex(STREETS)
+
+    assert index.suggest("kerkstrat")[:2] == ["Kerkstraat", "Grote Kerkstraat"]
+    assert index.suggest("bourgondie") == ["Adolf Van Bourgondiëlaan"]
+    assert "Dorpstraat" in index.suggest("straat")
+    assert index.suggest("xyz") == []
+
+
+def test_added_names_are_indexed_once():
+    index = AddressIndex(STREETS)
+
+    assert index.add("Nieuwe  Baan") is True
+    assert index.add("nieuwe baan") is False
+    assert index.suggest("nieuwe") == ["Nieuwe Baan"]
+    assert index.suggest("baan") == ["Nieuwe Baan"]
+
+
+def test_lookup_is_fast_on_a_large_list():
+    index = AddressIndex(f"{prefix}straat {i}" for i in range(2000) for prefix in ("Kerk", "Dorp"))
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.suggest("dorpstrat 19")
+    assert (time.perf_counter() - start) / 100 < 0.01
+
+
+@pytest.fixture
+def streets(tmp_path, db, monkeypatch):
+    path = tmp_path / "straatnamen.json"
+    path.write_text(json.dumps(STREETS), encoding="utf-8")
+    config_file = ConfigFile("straatnamen.json", candidates=[path])
+    index = StreetIndex(config_file)
+    monkeypatch.setattr(addresses, "streets_file", config_file)
+    monkeypatch.setattr(addresses, "street_index", index)
+    monkeypatch.setattr(street_index_module, "street_index", index)
+    db.execute(text("CREATE TABLE adressen (id INTEGER PRIMARY KEY, straat TEXT, postcode TEXT, gemeente TEXT)"))
+    db.execute(text("INSERT INTO adressen (straat, postcode, gemeente) VALUES ('Kerkstraat', '9120', 'Vrasene')"))
+    db.commit()
+    return index
+
+
+def _suggest(db, term, limit=10):
+    return asyncio.run(addresses.get_address_suggestions(straat=term, limit=limit, db=db))["suggestions"]
+
+
+def test_suggestions_endpoint_ranks_and_adds_known_postcodes(streets, db):
+    suggestions = _suggest(db, "kerkstr", limit=2)
+
+    assert suggestions == [
+        {"straat": "Kerkstraat", "postcode": "9120", "gemeente": "Vrasene"},
+        {"straat": "Grote Kerkstraat", "postcode": "", "gemeente": ""},
+    ]
+
+
+def test_added_street_is_suggested_without_rebuild(streets, db):
+    _suggest(db, "kerk")
+    index = streets.get(db)
+
+    asyncio.run(addresses.add_street_name("Molenstraat"))
+
+    assert streets.get(db) is index
+    assert _suggest(db, "molen")[0]["straat"] == "Molenstraat"
@@ -0,0 +1,50 @@
+"""Tests for the async database session (get_async_db) and the SQLite pragmas."""
+
+import asyncio
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+def test_connections_use_wal_and_busy_timeout(async_engine):
+    async def pragmas():
+        async with async_engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+            return journal_mode, busy_timeout
+
+    assert asyncio.run(pragmas()) == ("wal", settings.SQLITE_BUSY_TIMEOUT_MS)
+
+
+def test_slow_query_does_not_block_event_loop(async_engine):
+    """While a query runs on the async session the event loop keeps serving other work."""
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def add_sleep_function(dbapi_conn, connection_record):
+        dbapi_conn.create_function("sleep_seconds", 1, lambda seconds: time.sleep(seconds) or seconds)
+
+    async def scenario():
+        gaps = []
+        running = True
+
+        async def ticker():
+            last = time.perf_counter()
+            while running:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick_task = asyncio.create_task(ticker())
+        async with AsyncSession(async_engine) as session:
+            result = (await session.execute(text("SELECT sleep_seconds(0.3)"))).scalar()
+        running = False
+        await tick_task
+        return result, max(gaps)
+
+    result, longest_gap = asyncio.run(scenario())
+
+    assert result == 0.3
+    assert longest_gap < 0.1
@@ -0,0 +1,50 @@
+"""Tests for receipt number allocation in the request's transaction."""
+
+import pytest
+from sqlalchemy import text
+
+from app.api import orders
+from app.core.config import settings
+from app.models.customer import Customer
+
+
+@pytest.fixture
+def bon_teller(db, monkeypatch):
+    db.execute(text(
+        "CREATE TABLE IF NOT EXISTS bon_teller (jaar INTEGER NOT NULL, dag INTEGER NOT NULL, "
+        "laatste_nummer INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (jaar, dag))"
+    ))
+    db.commit()
+    monkeypatch.setattr(orders, "_bon_blocks", {})
+    return lambda: db.execute(text("SELECT COALESCE(SUM(laatste_nummer), 0) FROM bon_teller")).scalar()
+
+
+def test_allocation_commits_nothing_and_rolls_back_with_the_order(db, bon_teller):
+    db.add(Customer(telefoon="0471000000", naam="Niet bewaren", email_verified=0))
+    db.flush()
+
+    first = orders.generate_bonnummer(db)
+    db.rollback()
+
+    assert db.query(Customer).count() == 0
+    assert bon_teller() == 0
+    assert orders.generate_bonnummer(db) == first
+    db.commit()
+    assert bon_teller() == 1
+    assert int(orders.generate_bonnummer(db)) == int(first) + 1
+
+
+def test_block_is_only_used_after_commit(db, bon_teller, monkeypatch):
+    monkeypatch.setattr(settings, "BONNUMMER_BLOCK_SIZE", 3)
+
+    first = orders.generate_bonnummer(db)
+    db.rollback()
+    assert orders._bon_blocks == {}
+
+    assert orders.generate_bonnummer(db) == first
+    db.commit()
+    numbers = [first] + [orders.generate_bonnummer(db) for _ in range(3)]
+
+    assert [int(n) - int(first) for n in numbers] == [0, 1, 2, 3]
+    db.commit()
+    assert bon_teller() == 6
@@ -0,0 +1,94 @@
+"""Tests for the cached JSON config files and the endpoints that serve them."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.api import addresses, settings as settings_api
+from app.services import config_files
+from app.services.config_files import ConfigFile
+
+
+def _write(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def settings_json(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    _write(path, {"customer_info": {"message": "Welkom"}}, mtime_ns=1_000_000_000)
+    config_file = ConfigFile("settings.json", candidates=[tmp_path / "missing.json", path])
+    monkeypatch.setattr(settings_api, "settings_file", config_file)
+    return path, config_file
+
+
+def test_file_is_parsed_once_until_it_changes(settings_json):
+    """Repeated reads only stat the file; a new mtime or size triggers one reload."""
+    path, config_file = settings_json
+
+    assert config_file.path == path
+    for _ in range(5):
+        assert config_file.data()["customer_info"]["message"] == "Welkom"
+    assert config_file.loads == 1
+
+    _write(path, {"customer_info": {"message": "Gesloten"}}, mtime_ns=2_000_000_000)
+
+    assert config_file.data()["customer_info"]["message"] == "Gesloten"
+    assert config_file.loads == 2
+
+
+def test_invalid_json_keeps_last_valid_content(settings_json):
+    path, config_file = settings_json
+    config_file.data()
+
+    path.write_text("{kapot", encoding="utf-8")
+
+    assert config_file.data()["customer_info"]["message"] == "Welkom"
+
+
+def test_endpoint_serves_pre_serialized_body(settings_json):
+    """The response body is built once per file version."""
+    path, config_file = settings_json
+
+    first = asyncio.run(settings_api.get_customer_info())
+    second = asyncio.run(settings_api.get_customer_info())
+    assert json.loads(first.body) == {"message": "Welkom"}
+    assert first.body is second.body
+
+    _write(path, {"customer_info": {"message": "Gesloten"}}, mtime_ns=2_000_000_000)
+
+    assert json.loads(asyncio.run(settings_api.get_customer_info()).body) == {"message": "Gesloten"}
+
+
+def test_missing_file_uses_defaults(tmp_path, monkeypatch):
+    config_file = ConfigFile("settings.json", candidates=[tmp_path / "settings.json"])
+    monkeypatch.setattr(settings_api, "settings_file", config_file)
+
+    hours = json.loads(asyncio.run(settings_api.get_opening_hours()).body)
+
+    assert config_file.path is None
+    assert hours == settings_api.DEFAULT_OPENING_HOURS
+
+
+def test_added_street_is_served_right_away(tmp_path, monkeypatch):
+    """Writing straatnamen.json through the API invalidates the cached list."""
+    path = tmp_path / "straatnamen.json"
+    _write(path, ["Kerkstraat"], mtime_ns=1_000_000_000)
+    config_file = ConfigFile("straatnamen.json", candidates=[path])
+    monkeypatch.setattr(addresses, "streets_file", config_file)
+    assert json.loads(asyncio.run(addresses.get_street_names()).body) == {"streets": ["Kerkstraat"]}
+
+    result = asyncio.run(addresses.add_street_name("Dorpstraat"))
+
+    assert result["added"] is True
+    assert json.loads(asyncio.run(addresses.get_street_names()).body) == {"streets": ["Dorpstraat", "Kerkstraat"]}
+
+
+def test_default_candidates_find_project_files():
+    """The project root next to pizzeria-web holds the shared config files."""
+    assert config_files.candidate_paths("settings.json")[0] == config_files.PROJECT_ROOT / "settings.json"
+    assert (config_files.BACKEND_DIR / "app").is_dir()
@@ -0,0 +1,203 @@
+"""Tests for the email outbox against a local debugging SMTP server."""
+
+import asyncio
+import base64
+import socketserver
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.database import Base
+from app.models import email_outbox as email_outbox_model  # noqa: F401  (register model)
+from app.services.email_outbox import EmailOutbox
+from app.services.email_service import EmailService
+
+
+class DebugSMTPServer(socketserver.ThreadingTCPServer):
+    """Minimal SMTP server: AUTH PLAIN, keeps every message, can answer a scripted error to DATA."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DebugSMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.data_replies = []  # Replies to use instead of "250 OK" for the next DATA commands
+
+
+class DebugSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost debug SMTP")
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command == "EHLO":
+                self.reply("250-localhost")
+                self.reply("250 AUTH PLAIN")
+            elif command == "AUTH":
+                user = base64.b64decode(line.split()[-1]).split(b"\0")[1]
+                self.reply("235 OK" if user == b"pizzeria" else "535 Bad credentials")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data_line = self.rfile.readline().decode()
+                    if data_line in (".\r\n", ""):
+                        break
+                    lines.append(data_line)
+                if self.server.data_replies:
+                    self.reply(self.server.data_replies.pop(0))
+                else:
+                    self.server.messages.append("".join(lines))
+                    self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+@pytest.fixture
+def smtp_server():
+    server = DebugSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mailer(smtp_server):
+    service = EmailService()
+    service.smtp_host, service.smtp_port = smtp_server.server_address
+    service.smtp_user = "pizzeria"
+    service.smtp_password = "secret"
+    service.smtp_from_email = "noreply@example.com"
+    service.smtp_use_tls = False
+    service.enabled = True
+    return service
+
+
+@pytest.fixture
+def outbox(tmp_path, mailer):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    box = EmailOutbox(engine=engine, mailer=mailer, workers=1)
+    box.retry_base_seconds = 0
+    box.poll_seconds = 0.05
+    yield box
+    box.stop()
+    engine.dispose()
+
+
+def _rows(box):
+    with box.engine.connect() as conn:
+        return conn.execute(text("SELECT id, status, attempts FROM email_outbox ORDER BY id")).fetchall()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_send_email_only_enqueues(outbox, mailer, monkeypatch):
+    """send_email returns once the mail is in the outbox; nothing is sent on the caller's side."""
+    monkeypatch.setattr("app.services.email_outbox.email_outbox", outbox)
+
+    queued = asyncio.run(mailer.send_email("klant@example.com", "Bevestiging", "Bedankt!"))
+
+    assert queued is True
+    assert [tuple(row) for row in _rows(outbox)] == [(1, "pending", 0)]
+
+
+def test_worker_reuses_one_smtp_session(outbox, smtp_server):
+    """A burst of mails is delivered over one connection and login."""
+    for i in range(3):
+        outbox.enqueue(f"klant{i}@example.com", f"Bestelling {i}", "Bedankt!", html_body="<p>Bedankt!</p>")
+    outbox.start()
+
+    assert _wait_for(lambda: all(row.status == "sent" for row in _rows(outbox)))
+    assert len(smtp_server.messages) == 3
+    assert "Subject: Bestelling 0" in smtp_server.messages[0]
+    assert smtp_server.connections == 1
+
+
+def test_temporary_failure_is_retried(outbox, smtp_server):
+    """A 4xx answer puts the mail back in the queue; the next attempt delivers it."""
+    smtp_server.data_replies = ["451 Try again later"]
+    outbox.enqueue("klant@example.com", "Bevestiging", "Bedankt!")
+    outbox.start()
+
+    assert _wait_for(lambda: _rows(outbox)[0].status == "sent")
+    assert _rows(outbox)[0].attempts == 2
+    assert len(smtp_server.messages) == 1
+
+
+def test_permanent_failure_is_not_retried(outbox, smtp_server):
+    """A 5xx answer marks the mail failed with the server's error."""
+    smtp_server.data_replies = ["550 Mailbox unavailable"]
+    outbox.enqueue("onbekend@example.com", "Bevestiging", "Bedankt!")
+    outbox.start()
+
+    assert _wait_for(lambda: _rows(outbox)[0].status == "failed")
+    with outbox.engine.connect() as conn:
+        error = conn.execute(text("SELECT last_error FROM email_outbox")).scalar_one()
+    assert "Mailbox unavailable" in error
+
+
+def test_interrupted_send_is_requeued_on_start(outbox, smtp_server):
+    """Mails left in 'sending' by a crash (before claims were recorded) are sent after the next start."""
+    email_id = outbox.enqueue("klant@example.com", "Bevestiging", "Bedankt!")
+    with outbox.engine.begin() as conn:
+        conn.execute(text("UPDATE email_outbox SET status = 'sending', attempts = 1 WHERE id = :id"), {"id": email_id})
+
+    outbox.start()
+
+    assert _wait_for(lambda: _rows(outbox)[0].status == "sent")
+
+
+def test_only_expired_claims_are_taken_over(outbox, smtp_server):
+    """A mail another live worker is sending stays with it; one whose lease expired is sent again."""
+    outbox.lease_seconds = 60
+    live = outbox.enqueue("live@example.com", "Bevestiging", "Bedankt!")
+    dead = outbox.enqueue("dead@example.com", "Bevestiging", "Bedankt!")
+    with outbox.engine.begin() as conn:
+        for email_id, claimed_at in ((live, time.time()), (dead, time.time() - 61)):
+            conn.execute(text(
+                "UPDATE email_outbox SET status = 'sending', attempts = 1, claimed_by = 'other-worker', "
+                "claimed_at = :claimed_at WHERE id = :id"
+            ), {"id": email_id, "claimed_at": claimed_at})
+
+    outbox.start()
+
+    assert _wait_for(lambda: _rows(outbox)[1].status == "sent")
+    time.sleep(0.2)
+    assert [tuple(row) for row in _rows(outbox)] == [(live, "sending", 1), (dead, "sent", 2)]
+    assert len(smtp_server.messages) == 1
+    assert "dead@example.com" in smtp_server.messages[0]
+
+
+def test_outcome_of_a_taken_over_mail_is_not_overwritten(outbox):
+    email_id = outbox.enqueue("klant@example.com", "Bevestiging", "Bedankt!")
+    assert outbox._claim()["id"] == email_id
+    with outbox.engine.begin() as conn:
+        conn.execute(text("UPDATE email_outbox SET claimed_by = 'other-worker' WHERE id = :id"), {"id": email_id})
+
+    outbox._finish(email_id, status="sent", sent_at=time.time(), last_error=None)
+
+    assert [tuple(row) for row in _rows(outbox)] == [(email_id, "sending", 1)]
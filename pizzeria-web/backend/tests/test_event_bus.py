@@ -0,0 +1,99 @@
+"""Tests for the cross-worker event bus."""
+
+import multiprocessing
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.services.event_bus import InProcessEventBus, SQLiteEventBus, create_event_bus
+
+
+def _engine(path):
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+class Collector:
+    def __init__(self):
+        self.events = []
+        self.received = threading.Event()
+
+    def __call__(self, event):
+        self.events.append(event)
+        self.received.set()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "bus.db"
+
+
+def _start_bus(path):
+    bus = SQLiteEventBus(engine=_engine(path), poll_seconds=0.01)
+    collector = Collector()
+    bus.subscribe(collector)
+    bus.start()
+    return bus, collector
+
+
+def test_in_process_bus_delivers_to_subscribers():
+    bus = InProcessEventBus()
+    collector = Collector()
+    bus.subscribe(collector)
+
+    bus.publish({"type": "order_created", "data": {"id": 1}})
+
+    assert collector.events == [{"type": "order_created", "data": {"id": 1}}]
+
+
+def test_sqlite_bus_delivers_to_every_worker_once(db_path):
+    """Each worker sees every event exactly once, its own included."""
+    worker_a, events_a = _start_bus(db_path)
+    worker_b, events_b = _start_bus(db_path)
+    try:
+        worker_a.publish({"type": "order_created", "data": {"id": 1}})
+        worker_b.publish({"type": "order_status_changed", "data": {"id": 1}})
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and (len(events_a.events) < 2 or len(events_b.events) < 2):
+            time.sleep(0.01)
+        time.sleep(0.05)
+    finally:
+        worker_a.stop()
+        worker_b.stop()
+
+    assert sorted(e["type"] for e in events_a.events) == ["order_created", "order_status_changed"]
+    assert sorted(e["type"] for e in events_b.events) == ["order_created", "order_status_changed"]
+
+
+def _publish_from_child(path):
+    bus = SQLiteEventBus(engine=_engine(path), poll_seconds=0.01)
+    bus.start()
+    bus.publish({"type": "order_created", "data": {"id": 42}})
+    bus.stop()
+
+
+def test_sqlite_bus_across_processes(db_path):
+    """An event published in another process reaches this process's subscribers."""
+    bus, collector = _start_bus(db_path)
+    child = None
+    try:
+        # spawn, not fork: a forked child inherits locks held by threads of earlier tests
+        child = multiprocessing.get_context("spawn").Process(target=_publish_from_child, args=(db_path,))
+        child.start()
+        child.join(timeout=30)
+        assert child.exitcode == 0
+        assert collector.received.wait(timeout=5)
+    finally:
+        if child is not None and child.is_alive():
+            child.kill()
+        bus.stop()
+
+    assert collector.events == [{"type": "order_created", "data": {"id": 42}}]
+
+
+def test_create_event_bus_backends():
+    assert type(create_event_bus("local")) is InProcessEventBus
+    assert type(create_event_bus("sqlite")) is SQLiteEventBus
+    assert type(create_event_bus("redis")) is InProcessEventBus
@@ -0,0 +1,140 @@
+"""
+The backend and the kassa app (database.py in the repository root) share one
+SQLite database. Both install the same triggers and normalization rules; these
+tests check that the two copies are identical, so a change in one that is not
+made in the other fails here instead of silently diverging in production.
+"""
+
+import importlib
+import re
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.core import database as backend_db
+from app.models.customer import Customer
+from app.utils import customer_search, phone_validator
+
+KASSA_DIR = Path(__file__).resolve().parents[3]
+
+
+@pytest.fixture(scope="module")
+def kassa_db():
+    """The kassa's database module (imported from the repository root)."""
+    if not (KASSA_DIR / "database.py").exists():
+        pytest.skip("kassa database.py not available")
+    if str(KASSA_DIR) not in sys.path:
+        sys.path.append(str(KASSA_DIR))
+    return importlib.import_module("database")
+
+
+def _sql(statement: str) -> str:
+    """Statement without comments and with normalized whitespace."""
+    return " ".join(re.sub(r"--[^\n]*", "", statement).split())
+
+
+def _ddl(statements: dict) -> dict:
+    return {name: _sql(statement) for name, statement in statements.items()}
+
+
+PHONE_NUMBERS = [
+    "0471123456", "+32471123456", "0032471123456", "32471123456", "0471 12 34 56",
+    "091234567", "09/123.45.67", "+32 9 123 45 67", "0032 9 1234567", "3291234567",
+    "0 9-(123).45\t67", "+31612345678", "0031612345678", "0612", "12345",
+]
+
+
+def test_phone_key_rules_match_kassa(kassa_db):
+    assert phone_validator.PHONE_KEY_RULES == kassa_db.TELEFOON_NORM_REGELS
+    assert phone_validator.PHONE_KEY_STRIP_CHARS == kassa_db.TELEFOON_NORM_TEKENS
+    assert backend_db.telefoon_norm_sql("NEW.telefoon") == kassa_db.telefoon_norm_sql("NEW.telefoon")
+
+
+@pytest.mark.parametrize("phone", PHONE_NUMBERS)
+def test_phone_key_is_the_same_in_python_sql_and_kassa(kassa_db, db_engine, phone):
+    normalize_phone_for_search = importlib.import_module("repositories.customer_repository").normalize_phone_for_search
+    with db_engine.connect() as conn:
+        sql_key = conn.execute(text(f"SELECT {backend_db.telefoon_norm_sql(':phone')}"), {"phone": phone}).scalar()
+    assert phone_validator.normalize_phone_key(phone) == sql_key == normalize_phone_for_search(phone)
+
+
+def test_landline_key_and_stale_triggers_are_rebuilt(db_engine):
+    with db_engine.begin() as conn:
+        # Trigger van een oudere regelset: sleutel = nummer zoals ingegeven
+        conn.execute(text("""
+            CREATE TRIGGER trg_klanten_telefoon_norm_insert AFTER INSERT ON klanten
+            BEGIN UPDATE klanten SET telefoon_norm = NEW.telefoon WHERE id = NEW.id; END
+        """))
+        conn.execute(text("INSERT INTO klanten (telefoon, naam, email_verified) VALUES ('091234567', 'Vast', 0)"))
+        backend_db.install_telefoon_norm(conn)
+        conn.execute(text("INSERT INTO klanten (telefoon, naam, email_verified) VALUES ('0471 12 34 56', 'Gsm', 0)"))
+        keys = dict(conn.execute(text("SELECT naam, telefoon_norm FROM klanten")).fetchall())
+
+    assert keys == {"Vast": "+3291234567", "Gsm": "+32471123456"}
+    assert phone_validator.normalize_phone_key("+32 9 123 45 67") == "+3291234567"
+
+
+def test_customer_statistics_triggers_match_kassa(kassa_db):
+    assert _ddl(backend_db.KLANT_STATISTIEKEN_TRIGGERS) == _ddl(kassa_db.KLANT_STATISTIEKEN_TRIGGERS)
+
+
+def test_statistics_install_resets_customers_without_orders(db_engine):
+    with db_engine.begin() as conn:
+        for name in backend_db.KLANT_STATISTIEKEN_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        conn.execute(text("""
+            INSERT INTO klanten (id, telefoon, naam, email_verified, totaal_bestellingen, totaal_besteed,
+                                 laatste_bestelling)
+            VALUES (1, '0471000001', 'Vaste klant', 0, 9, 99.0, '2024-01-01 18:00'),
+                   (2, '0471000002', 'Oude klant', 0, 3, 30.0, '2023-01-01 18:00')
+        """))
+        conn.execute(text(
+            "INSERT INTO bestellingen (klant_id, datum, tijd, totaal, status) "
+            "VALUES (1, '2024-02-01', '19:00', 12.5, 'Nieuw')"
+        ))
+
+        backend_db.install_klant_statistieken_triggers(conn)
+        stats = conn.execute(text(
+            "SELECT id, totaal_bestellingen, totaal_besteed, laatste_bestelling FROM klanten ORDER BY id"
+        )).fetchall()
+
+    assert [tuple(row) for row in stats] == [(1, 1, 12.5, "2024-02-01 19:00"), (2, 0, 0.0, None)]
+
+
+def test_sales_rollup_matches_kassa(kassa_db):
+    assert _sql(backend_db.VERKOOP_ROLLUP_TABLE) == _sql(kassa_db.VERKOOP_ROLLUP_TABLE)
+    assert _ddl(backend_db.VERKOOP_ROLLUP_TRIGGERS) == _ddl(kassa_db.VERKOOP_ROLLUP_TRIGGERS)
+    assert backend_db._rollup_uur_sql("tijd") == kassa_db._rollup_uur_sql("tijd")
+
+
+def test_order_change_log_matches_kassa(kassa_db):
+    assert _sql(backend_db.ORDER_CHANGE_LOG_TABLE) == _sql(kassa_db.BESTELLING_WIJZIGINGEN_TABLE)
+    assert _ddl(backend_db.ORDER_CHANGE_LOG_TRIGGERS) == _ddl(kassa_db.BESTELLING_WIJZIGINGEN_TRIGGERS)
+    assert backend_db.ORDER_CHANGE_LOG_KEEP == kassa_db.BESTELLING_WIJZIGINGEN_BEWAREN
+
+
+@pytest.mark.parametrize("search", [
+    "Jan de Smet", "jansen", "Jo", "0471 12", "+32 471 123", "a b", "Kerk \"straat\"", "", "  ",
+])
+def test_search_query_matches_kassa(kassa_db, search):
+    build_zoek_query = importlib.import_module("repositories.customer_repository").build_zoek_query
+    assert customer_search.build_match_query(search) == build_zoek_query(search)
+
+
+def test_search_applies_short_words(kassa_db, db_engine, db):
+    raw = db_engine.raw_connection()
+    try:
+        kassa_db.create_klanten_zoekindex(raw.cursor())
+        raw.commit()
+    finally:
+        raw.close()
+    db.add_all([
+        Customer(telefoon="0471000001", naam="Jan de Smet", plaats="Gent", email_verified=0),
+        Customer(telefoon="0471000002", naam="Jan Smet", plaats="Gent", email_verified=0),
+    ])
+    db.commit()
+
+    assert [c.naam for c in customer_search.search_customers(db, "Jan de Smet")] == ["Jan de Smet"]
+    assert len(customer_search.search_customers(db, "jan smet")) == 2
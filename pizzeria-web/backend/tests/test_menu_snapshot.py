@@ -0,0 +1,90 @@
+"""Tests for the precomputed public menu snapshot."""
+
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.api import menu as menu_api
+from app.models.menu import MenuCategory, MenuItem
+from app.schemas.menu import MenuItemUpdate
+from app.services.menu_snapshot import MenuSnapshotCache, etag_matches
+
+ADMIN = {"username": "admin", "role": "admin"}
+
+
+@pytest.fixture
+def snapshot(db_engine, db, monkeypatch):
+    db.add(MenuCategory(naam="Pizza", volgorde=1))
+    db.add_all([
+        MenuItem(naam="Margherita", categorie="Pizza", prijs=10.0, beschikbaar=1, volgorde=1),
+        MenuItem(naam="Hawaii", categorie="Pizza", prijs=12.0, beschikbaar=0, volgorde=2),
+    ])
+    db.commit()
+    cache = MenuSnapshotCache(session_factory=sessionmaker(bind=db_engine), check_seconds=60)
+    monkeypatch.setattr(menu_api, "menu_snapshot", cache)
+    return cache
+
+
+def _get(if_none_match=None):
+    return asyncio.run(menu_api.get_public_menu(request=None, if_none_match=if_none_match))
+
+
+def test_menu_is_served_from_snapshot(snapshot, query_counter):
+    """Only the first request queries the database; the body is the same bytes every time."""
+    first = _get()
+    query_counter.clear()
+    second = _get()
+
+    menu = json.loads(first.body)
+    assert [item["naam"] for item in menu["items"]] == ["Margherita"]
+    assert menu["categories"][0]["naam"] == "Pizza"
+    assert second.body is first.body
+    assert query_counter == []
+    assert snapshot.builds == 1
+
+
+def test_if_none_match_gets_304(snapshot):
+    etag = _get().headers["etag"]
+
+    response = _get(if_none_match=etag)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+
+
+def test_menu_update_rebuilds_snapshot(snapshot, db):
+    """An admin change makes the next request serve a new body and ETag."""
+    old_etag = _get().headers["etag"]
+    hawaii = db.query(MenuItem).filter(MenuItem.naam == "Hawaii").one()
+
+    asyncio.run(menu_api.update_menu_item(hawaii.id, MenuItemUpdate(beschikbaar=1), db=db, current_user=ADMIN))
+    response = _get(if_none_match=old_etag)
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != old_etag
+    assert len(json.loads(response.body)["items"]) == 2
+
+
+def test_change_by_other_process_is_seen_after_check_interval(snapshot, db):
+    """Writes outside the API (import_menu.py, other workers) bump menu_versie through triggers."""
+    _get()
+    db.add(MenuItem(naam="Calzone", categorie="Pizza", prijs=13.0, beschikbaar=1, volgorde=3))
+    db.commit()
+
+    assert len(json.loads(_get().body)["items"]) == 1  # still within the check interval
+
+    snapshot.check_seconds = 0
+    assert len(json.loads(_get().body)["items"]) == 2
+    assert snapshot.builds == 2
+
+
+def test_etag_matches_lists_and_weak_tags():
+    etag = '"menu-abc"'
+    assert etag_matches('"other", "menu-abc"', etag)
+    assert etag_matches('W/"menu-abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"menu-def"', etag)
@@ -0,0 +1,62 @@
+"""Tests for PATCH /orders/status:batch (courier assignment from the kassa)."""
+
+import pytest
+
+from app.api import orders, websocket
+from app.models.order import Order
+from app.schemas.order import OrderStatusBatchUpdate
+
+
+@pytest.fixture
+def order_ids(db):
+    ids = []
+    for i in range(10):
+        order = Order(datum="2024-01-01", tijd=f"18:{i:02d}:00", totaal=20.0, bonnummer=f"2024{i + 1:04d}",
+                      status="In de keuken", online_bestelling=1, koerier_id=1 if i == 0 else None)
+        db.add(order)
+        db.commit()
+        ids.append(order.id)
+    return ids
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(websocket.event_bus, "publish", events.append)
+    return events
+
+
+def _batch(run_async_db, updates):
+    return run_async_db(orders.update_order_status_batch, batch=OrderStatusBatchUpdate(updates=updates),
+                        current_user={})
+
+
+def test_assigns_courier_to_all_orders_in_one_transaction(db, run_async_db, order_ids, published, query_counter):
+    query_counter.clear()
+
+    result = _batch(run_async_db, [{"id": order_id, "new_status": "Onderweg", "koerier_id": 3}
+                                   for order_id in order_ids])
+
+    # SELECT the orders, one executemany UPDATE
+    assert len(query_counter) == 2
+    assert [order["id"] for order in result["updated"]] == order_ids
+    assert result["missing"] == []
+    assert {(o.status, o.koerier_id) for o in db.query(Order).all()} == {("Onderweg", 3)}
+    assert [event["type"] for event in published] == ["order_status_batch"]
+    assert len(published[0]["data"]["orders"]) == 10
+
+
+def test_only_given_fields_change_and_null_removes_courier(db, run_async_db, order_ids, published):
+    result = _batch(run_async_db, [{"id": order_ids[0], "koerier_id": None}, {"id": 999, "koerier_id": None}])
+
+    order = db.get(Order, order_ids[0])
+    assert (order.status, order.koerier_id) == ("In de keuken", None)
+    assert [o["id"] for o in result["updated"]] == [order_ids[0]]
+    assert result["missing"] == [999]
+
+
+def test_unknown_orders_publish_nothing(run_async_db, order_ids, published):
+    result = _batch(run_async_db, [{"id": 999, "new_status": "Onderweg"}])
+
+    assert result == {"updated": [], "missing": [999]}
+    assert published == []
@@ -0,0 +1,76 @@
+"""Query-count tests for the order endpoints (no N+1 over customers or items)."""
+
+import pytest
+from fastapi import Response
+
+from app.api import order_tracking, orders
+from app.models.customer import Customer
+from app.models.order import Order, OrderItem
+
+
+@pytest.fixture
+def order_rows(db):
+    """Twenty online orders, each with its own customer and two items."""
+    for i in range(20):
+        klant = Customer(telefoon=f"04710000{i:02d}", naam=f"Klant {i}", straat="Kerkstraat",
+                         huisnummer=str(i), plaats="9000 Gent")
+        db.add(klant)
+        db.flush()
+        order = Order(klant_id=klant.id, datum="2024-01-01", tijd=f"18:{i:02d}:00", totaal=20.0,
+                      bonnummer=f"2024{i + 1:04d}", status="Nieuw", online_bestelling=1)
+        order.items = [
+            OrderItem(product_naam="Margherita", aantal=1, prijs=10.0),
+            OrderItem(product_naam="Cola", aantal=2, prijs=5.0),
+        ]
+        db.add(order)
+    db.commit()
+    db.expire_all()
+
+
+def test_list_orders_uses_fixed_number_of_queries(run_async_db, order_rows, query_counter):
+    """GET /orders: one query for orders+customers, one for all items."""
+    result = run_async_db(orders.get_orders, request=None, skip=0, limit=100, customer_id=None, current_user={})
+    
+    assert len(result) == 20
+    assert result[0]["klant_naam"].startswith("Klant")
+    assert len(result[0]["items"]) == 2
+    assert len(query_counter) == 2
+
+
+def test_pending_online_orders_uses_fixed_number_of_queries(run_async_db, order_rows, query_counter):
+    """GET /orders/online/pending: the same two queries plus one for the sync cursor."""
+    result = run_async_db(orders.get_pending_online_orders, response=Response(), since=None, if_none_match=None,
+                          current_user={})
+    
+    assert len(result) == 20
+    assert result[0]["klant_postcode"] == "9000"
+    assert len(query_counter) == 3
+
+
+def test_single_order_endpoints_use_two_queries(run_async_db, order_rows, query_counter):
+    """GET /orders/{id}, public lookup and tracking load order, customer and items together."""
+    run_async_db(orders.get_order, order_id=1, current_user={})
+    assert len(query_counter) == 2
+    
+    query_counter.clear()
+    run_async_db(orders.get_order_by_bonnummer_public, bonnummer="20240001")
+    assert len(query_counter) == 2
+    
+    query_counter.clear()
+    result = run_async_db(order_tracking.track_order_by_bonnummer, bonnummer="20240001", phone="0471000000",
+                          email=None)
+    assert result["klant_naam"] == "Klant 0"
+    assert len(query_counter) == 2
+
+
+def test_update_order_status_reloads_in_fixed_queries(run_async_db, order_rows, query_counter):
+    """PUT /orders/{id}/status: load, update, reload with customer and items."""
+    from app.schemas.order import OrderStatusUpdate
+    
+    result = run_async_db(orders.update_order_status, order_id=1,
+                          status_update=OrderStatusUpdate(new_status="In de keuken"), current_user={})
+    
+    assert result["status"] == "In de keuken"
+    assert result["klant_naam"] == "Klant 0"
+    # SELECT order, UPDATE, reload (order+customer, items)
+    assert len(query_counter) <= 4
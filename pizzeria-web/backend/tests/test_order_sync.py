@@ -0,0 +1,101 @@
+"""Tests for the delta sync of GET /orders/online/pending."""
+
+import pytest
+from fastapi import Response
+
+from app.api import orders
+from app.models.order import Order, OrderItem
+
+
+def _add_order(db, bonnummer, status="Nieuw", online=1):
+    order = Order(datum="2024-01-01", tijd="18:00:00", totaal=10.0, bonnummer=bonnummer,
+                  status=status, online_bestelling=online)
+    order.items = [OrderItem(product_naam="Margherita", aantal=1, prijs=10.0)]
+    db.add(order)
+    db.commit()
+    return order.id
+
+
+@pytest.fixture
+def pending(run_async_db):
+    """GET /orders/online/pending on the async session: pending(since, if_none_match) -> (result, etag)."""
+    def call(since=None, if_none_match=None):
+        response = Response()
+        result = run_async_db(orders.get_pending_online_orders, response=response, since=since,
+                              if_none_match=if_none_match, current_user={})
+        if isinstance(result, Response):
+            return result, result.headers["ETag"]
+        return result, response.headers["ETag"]
+    return call
+
+
+@pytest.fixture
+def synced(db, pending):
+    """Three pending online orders and a client that did a full sync."""
+    ids = [_add_order(db, f"2024000{i}") for i in range(1, 4)]
+    result, etag = pending(since=0)
+    return ids, result, etag
+
+
+def test_full_sync_returns_all_pending_orders(db, synced):
+    """since=0 returns every pending order plus the cursor."""
+    ids, result, _ = synced
+    
+    assert result["full"] is True
+    assert sorted(o["id"] for o in result["created"]) == ids
+    assert result["cursor"] > 0
+
+
+def test_unchanged_state_answers_304(db, synced, pending):
+    """The ETag of the last response gives 304 while nothing changed."""
+    _, result, etag = synced
+    _add_order(db, "20240009", online=0)  # kassa order: not part of the feed
+    
+    response, same_etag = pending(since=result["cursor"], if_none_match=etag)
+    
+    assert response.status_code == 304
+    assert same_etag == etag
+
+
+def test_delta_contains_only_changed_orders(db, synced, pending, query_counter):
+    """A delta lists created, changed and removed orders and loads only those."""
+    ids, result, etag = synced
+    new_id = _add_order(db, "20240004")
+    db.query(Order).filter(Order.id == ids[0]).update({"status": "Onderweg"})
+    db.query(Order).filter(Order.id == ids[1]).update({"status": "Afgeleverd"})
+    db.commit()
+    query_counter.clear()
+    
+    delta, new_etag = pending(since=result["cursor"], if_none_match=etag)
+    
+    assert delta["full"] is False
+    assert [o["id"] for o in delta["created"]] == [new_id]
+    assert [(o["id"], o["status"]) for o in delta["changed"]] == [(ids[0], "Onderweg")]
+    assert delta["removed"] == [ids[1]]
+    assert delta["cursor"] > result["cursor"]
+    assert new_etag != etag
+    assert len(query_counter) == 4  # cursor, change log, orders, items
+
+
+def test_item_changes_and_deletes_are_reported(db, synced, pending):
+    """Changing an item marks its order changed; deleting an order removes it."""
+    ids, result, _ = synced
+    db.add(OrderItem(bestelling_id=ids[2], product_naam="Cola", aantal=1, prijs=2.5))
+    db.query(Order).filter(Order.id == ids[0]).delete()
+    db.commit()
+    
+    delta, _ = pending(since=result["cursor"])
+    
+    assert [o["id"] for o in delta["changed"]] == [ids[2]]
+    assert len(delta["changed"][0]["items"]) == 2
+    assert delta["removed"] == [ids[0]]
+
+
+def test_unknown_cursor_falls_back_to_full_sync(db, synced, pending):
+    """A cursor beyond the log (e.g. after a database swap) gets a full sync."""
+    _, result, _ = synced
+    
+    delta, _ = pending(since=result["cursor"] + 100)
+    
+    assert delta["full"] is True
+    assert len(delta["created"]) == 3
@@ -0,0 +1,100 @@
+"""Tests for the authenticated-principal cache behind get_current_user / get_current_customer."""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from starlette.requests import Request
+
+from app.api import auth, customers
+from app.core import dependencies
+from app.core.security import create_access_token
+from app.models.customer import Customer
+from app.schemas.customer import CustomerUpdate
+from app.services.principal_cache import PrincipalCache
+
+ADMIN = {"username": "admin", "role": "admin"}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PrincipalCache(ttl_seconds=60, max_entries=100)
+    for module in (dependencies, auth, customers):
+        monkeypatch.setattr(module, "principal_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def customer(db):
+    customer = Customer(naam="Jan", telefoon="0470123456", email="jan@example.com", email_verified=1)
+    db.add(customer)
+    db.commit()
+    return customer
+
+
+def _customer_token(customer_id):
+    return create_access_token({"sub": str(customer_id), "type": "customer"})
+
+
+def _request(token):
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())],
+                    "query_string": b""})
+
+
+def _current_customer(token, db):
+    return asyncio.run(dependencies.get_current_customer(_request(token), db=db))
+
+
+def test_customer_is_resolved_once_per_token(cache, customer, db, query_counter):
+    token = _customer_token(customer.id)
+    query_counter.clear()
+
+    first = _current_customer(token, db)
+    second = _current_customer(token, db)
+
+    assert first.naam == second.naam == "Jan"
+    assert len(query_counter) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_customer_update_invalidates_cached_customer(cache, customer, db):
+    token = _customer_token(customer.id)
+    _current_customer(token, db)
+
+    asyncio.run(customers.update_customer(customer.id, CustomerUpdate(naam="Jan Peeters"), db=db, current_user=ADMIN))
+
+    assert len(cache) == 0
+    assert _current_customer(token, db).naam == "Jan Peeters"
+
+
+def test_user_token_is_decoded_once_until_logout(cache, monkeypatch):
+    decoded = []
+    decode = dependencies.decode_access_token
+    monkeypatch.setattr(dependencies, "decode_access_token", lambda token: decoded.append(token) or decode(token))
+    token = create_access_token({"sub": "admin", "role": "admin"})
+
+    for _ in range(3):
+        user = asyncio.run(dependencies.get_current_user(None, token=token, db=None))
+    assert user["role"] == "admin"
+    assert len(decoded) == 1
+
+    asyncio.run(auth.logout(token=token, current_user=user))
+    asyncio.run(dependencies.get_current_user(None, token=token, db=None))
+    assert len(decoded) == 2
+
+
+def test_entries_expire_with_token_and_least_recently_used_are_dropped():
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", {"exp": time.time() - 1}, {"username": "a"})
+    assert cache.get("a") is None
+
+    expiring = create_access_token({"sub": "b"}, expires_delta=timedelta(seconds=5))
+    cache.put(expiring, {"exp": time.time() + 5}, {"username": "b"})
+    assert cache.get(expiring).expires_at <= time.time() + 5
+
+    cache.put("c", {}, {"username": "c"})
+    cache.get(expiring)
+    cache.put("d", {}, {"username": "d"})
+    assert cache.get("c") is None
+    assert cache.get(expiring) is not None
@@ -0,0 +1,97 @@
+"""Tests for the persistent print-job queue and its long-poll endpoint."""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.api import printer as printer_api
+from app.services.printer import PrinterService
+
+ADMIN = {"username": "admin", "role": "admin"}
+
+
+@pytest.fixture
+def service(db_engine, monkeypatch):
+    service = PrinterService(engine=db_engine)
+    service.direct_print_enabled = False
+    monkeypatch.setattr(printer_api, "printer_service", service)
+    return service
+
+
+def _queue(service, order_id, printer=None):
+    return service.queue_print_job({"id": order_id, "bonnummer": f"2024{order_id:04d}"}, "BON", printer=printer)
+
+
+def test_jobs_survive_restart_and_are_routed_per_printer(service, db_engine):
+    keuken = _queue(service, 1, printer="keuken")
+    kassa = _queue(service, 2)
+
+    restarted = PrinterService(engine=db_engine)
+
+    assert [job["id"] for job in restarted.get_pending_jobs("keuken")] == [keuken]
+    assert [job["id"] for job in restarted.get_pending_jobs("default")] == [kassa]
+    assert restarted.count_pending_jobs() == 2
+
+    assert restarted.mark_job_printed(keuken) is True
+    assert restarted.get_pending_jobs("keuken") == []
+    assert restarted.mark_job_printed("print_onbekend") is False
+
+
+def test_pending_query_uses_index(service, db_engine):
+    with db_engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM print_jobs WHERE status = 'pending' AND printer = 'x' "
+            "AND id > 0 ORDER BY created_at, id"
+        )).fetchall()
+    assert "idx_print_jobs_pending" in " ".join(str(row) for row in plan)
+
+
+def test_long_poll_wakes_when_job_is_queued(service):
+    """A waiting client gets a new job right away instead of at its next poll."""
+    async def scenario():
+        waiter = asyncio.create_task(printer_api.wait_for_print_jobs(
+            printer="keuken", after=0, timeout=5, current_user=ADMIN
+        ))
+        await asyncio.sleep(0.05)
+        _queue(service, 1, printer="default")  # other printer: keeps waiting
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        started = time.monotonic()
+        job_id = _queue(service, 2, printer="keuken")
+        result = await waiter
+        return job_id, result, time.monotonic() - started
+
+    job_id, result, elapsed = asyncio.run(scenario())
+
+    assert [job["id"] for job in result["jobs"]] == [job_id]
+    assert result["cursor"] == result["jobs"][0]["seq"]
+    assert elapsed < 1.0
+
+
+def test_long_poll_times_out_and_skips_received_jobs(service):
+    _queue(service, 1)
+    cursor = service.get_pending_jobs("default")[0]["seq"]
+
+    result = asyncio.run(printer_api.wait_for_print_jobs(
+        printer="default", after=cursor, timeout=0.1, current_user=ADMIN
+    ))
+
+    assert result == {"jobs": [], "count": 0, "cursor": cursor}
+
+
+def test_printed_jobs_are_pruned_after_retention(service, db_engine):
+    old = _queue(service, 1)
+    recent = _queue(service, 2)
+    pending = _queue(service, 3)
+    service.mark_job_printed(old)
+    service.mark_job_printed(recent)
+    with db_engine.begin() as conn:
+        conn.execute(text("UPDATE print_jobs SET printed_at = printed_at - :age WHERE job_id = :id"),
+                     {"age": service.retention_seconds + 60, "id": old})
+
+    assert service.prune_jobs() == 1
+    with db_engine.connect() as conn:
+        remaining = {row[0] for row in conn.execute(text("SELECT job_id FROM print_jobs"))}
+    assert remaining == {recent, pending}
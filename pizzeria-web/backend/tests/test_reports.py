@@ -0,0 +1,70 @@
+"""Tests for the SQL-side report queries and endpoints."""
+
+import asyncio
+import pytest
+from sqlalchemy import text
+
+from app.api import reports
+from app.models.order import Order, OrderItem
+from app.services import report_queries
+
+
+@pytest.fixture
+def report_rows(db):
+    """Orders on two days of January, one of them delivered by courier 2."""
+    for datum, tijd, koerier_id, items in [
+        ("2024-01-05", "18:10:00", None, [("Margherita", 2, 10.0)]),
+        ("2024-01-05", "19:20", 2, [("Margherita", 1, 10.0), ("Cola", 2, 2.5)]),
+        ("2024-01-06", "12:00:00", None, [("Hawaii", 1, 12.0)]),
+        ("2024-02-01", "18:00:00", None, [("Cola", 1, 2.5)]),
+    ]:
+        order = Order(datum=datum, tijd=tijd, koerier_id=koerier_id, status="Afgeleverd",
+                      totaal=sum(aantal * prijs for _, aantal, prijs in items))
+        order.items = [OrderItem(product_naam=naam, aantal=aantal, prijs=prijs) for naam, aantal, prijs in items]
+        db.add(order)
+    db.commit()
+
+
+def test_per_product_groups_in_sql(db, report_rows, query_counter):
+    """Product figures for a range come from one grouped query."""
+    rows = report_queries.per_product(db, "2024-01-01", "2024-01-31")
+    
+    assert rows == [
+        {"naam": "Margherita", "aantal": 3, "omzet": 30.0},
+        {"naam": "Hawaii", "aantal": 1, "omzet": 12.0},
+        {"naam": "Cola", "aantal": 2, "omzet": 5.0},
+    ]
+    assert len(query_counter) == 1
+
+
+def test_product_range_uses_datum_index(db):
+    """The datum range predicate is sargable: the plan searches idx_bestellingen_datum."""
+    plan = db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT r.product_naam, SUM(r.aantal) FROM bestelregels r "
+        "JOIN bestellingen b ON b.id = r.bestelling_id WHERE b.datum BETWEEN '2024-01-01' AND '2024-01-31' "
+        "GROUP BY r.product_naam"
+    )).fetchall()
+    
+    assert any("idx_bestellingen_datum" in row[-1] for row in plan)
+
+
+def test_daily_and_z_report(db, report_rows):
+    """Daily and Z-report combine totals, hours, products and couriers."""
+    daily = asyncio.run(reports.get_daily_report(request=None, report_date="2024-01-05", db=db, current_user={}))
+    z_report = asyncio.run(reports.get_z_report(request=None, report_date="2024-01-05", db=db, current_user={}))
+    
+    assert daily["total_orders"] == 2
+    assert daily["total_revenue"] == 35.0
+    assert [row["hour"] for row in daily["hourly_stats"]] == [18, 19]
+    assert daily["product_stats"][0] == {"naam": "Margherita", "aantal": 3, "omzet": 30.0}
+    assert z_report["courier_breakdown"] == [{"koerier_id": 2, "orders": 1, "revenue": 15.0}]
+
+
+def test_monthly_report(db, report_rows, query_counter):
+    """The monthly report is one grouped query over the rollup."""
+    result = asyncio.run(reports.get_monthly_report(request=None, year=2024, month=1, db=db, current_user={}))
+    
+    assert result["total_orders"] == 3
+    assert result["total_revenue"] == 47.0
+    assert [row["date"] for row in result["daily_stats"]] == ["2024-01-05", "2024-01-06"]
+    assert len(query_counter) == 1
@@ -0,0 +1,56 @@
+"""Tests for password hashing on the password pool."""
+
+import asyncio
+import time
+
+import bcrypt
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_hash_uses_configured_cost_and_verifies(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_ROUNDS", 5)
+
+    async def scenario():
+        hashed = await security.get_password_hash_async("Geheim123!")
+        return (hashed,
+                await security.verify_password_async("Geheim123!", hashed),
+                await security.verify_password_async("fout", hashed))
+
+    hashed, correct, wrong = asyncio.run(scenario())
+
+    assert hashed.startswith("$2b$05$")
+    assert correct is True
+    assert wrong is False
+
+
+def test_password_work_does_not_block_event_loop():
+    """While several bcrypt calls run, the event loop keeps serving other work."""
+    hashed = bcrypt.hashpw(b"Geheim123!", bcrypt.gensalt(rounds=11)).decode()
+    started = time.perf_counter()
+    security.verify_password("Geheim123!", hashed)
+    one_verify = time.perf_counter() - started
+
+    async def scenario():
+        gaps = []
+        running = True
+
+        async def ticker():
+            last = time.perf_counter()
+            while running:
+                await asyncio.sleep(0.002)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(security.verify_password_async("Geheim123!", hashed) for _ in range(3)))
+        running = False
+        await tick_task
+        return results, max(gaps)
+
+    results, longest_gap = asyncio.run(scenario())
+
+    assert results == [True, True, True]
+    assert longest_gap < one_verify / 2
@@ -0,0 +1,101 @@
+"""Tests for the indexed, cached public order tracking endpoints."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.api import order_tracking, orders
+from app.models.customer import Customer
+from app.models.order import Order, OrderItem
+from app.schemas.order import OrderStatusBatchUpdate, OrderStatusUpdate
+from app.services.tracking_cache import TrackingCache, bonnummer_key
+from app.utils.phone_validator import normalize_phone_key
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = TrackingCache(ttl_seconds=60)
+    monkeypatch.setattr(order_tracking, "tracking_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def tracked_order(db):
+    klant = Customer(telefoon="0471000000", telefoon_norm=normalize_phone_key("0471000000"), naam="Jan",
+                     email="jan@example.com")
+    db.add(klant)
+    db.flush()
+    order = Order(klant_id=klant.id, datum="2024-01-01", tijd="18:00:00", totaal=10.0, bonnummer="20240001",
+                  status="Nieuw", online_bestelling=1)
+    order.items = [OrderItem(product_naam="Margherita", aantal=1, prijs=10.0)]
+    db.add(order)
+    db.commit()
+    return order.id
+
+
+def _track(run_async_db, phone="0471000000"):
+    return run_async_db(order_tracking.track_order_by_bonnummer, bonnummer="20240001", phone=phone, email=None)
+
+
+def test_lookups_use_indexes(db_engine):
+    with db_engine.connect() as conn:
+        by_bonnummer = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM bestellingen WHERE bonnummer = '20240001'")).fetchall()
+        by_phone = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM klanten WHERE telefoon_norm = '+32471000000'")).fetchall()
+    assert "idx_bestellingen_bonnummer" in str(by_bonnummer)
+    assert "INDEX" in str(by_phone) and "telefoon_norm" in str(by_phone)
+
+
+def test_refreshes_are_served_from_cache_but_still_verified(cache, run_async_db, tracked_order, query_counter):
+    first = _track(run_async_db)
+    query_counter.clear()
+
+    second = _track(run_async_db)
+
+    assert second == first
+    assert second["status"] == "Nieuw"
+    assert query_counter == []
+    with pytest.raises(Exception) as forbidden:
+        _track(run_async_db, phone="0499999999")
+    assert forbidden.value.status_code == 403
+
+
+def test_status_change_drops_cached_entry(cache, run_async_db, tracked_order):
+    _track(run_async_db)
+
+    run_async_db(orders.update_order_status, order_id=tracked_order,
+                 status_update=OrderStatusUpdate(new_status="In de keuken"), current_user={})
+    assert _track(run_async_db)["status"] == "In de keuken"
+
+    run_async_db(orders.update_order_status_batch, current_user={},
+                 batch=OrderStatusBatchUpdate(updates=[{"id": tracked_order, "new_status": "Onderweg"}]))
+    assert _track(run_async_db)["status"] == "Onderweg"
+
+
+def test_by_phone_route_is_reachable_and_cached(cache, run_async_db, tracked_order, query_counter):
+    paths = [route.path for route in order_tracking.router.routes]
+    assert paths.index("/orders/track/by-phone") < paths.index("/orders/track/{bonnummer}")
+
+    result = run_async_db(order_tracking.track_orders_by_phone, phone="+32 471 00 00 00")
+    query_counter.clear()
+    again = run_async_db(order_tracking.track_orders_by_phone, phone="0471000000")
+
+    assert [order["bonnummer"] for order in result["orders"]] == ["20240001"]
+    assert again == result
+    assert query_counter == []
+
+
+@pytest.mark.parametrize("order_ids", [None, "tracked"])
+def test_deleted_orders_are_dropped_from_every_worker(cache, db, run_async_db, tracked_order, order_ids):
+    other_worker = TrackingCache(ttl_seconds=60)
+    _track(run_async_db)
+    other_worker.put(bonnummer_key("20240001"), {"cached": True})
+
+    asyncio.run(orders.delete_orders(order_ids=[tracked_order] if order_ids else None, db=db, current_user={}))
+
+    assert len(cache) == 0 and len(other_worker) == 0
+    with pytest.raises(Exception) as not_found:
+        _track(run_async_db)
+    assert not_found.value.status_code == 404
@@ -0,0 +1,144 @@
+"""Tests for WebSocket topic routing and per-connection send queues."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import websocket
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    fresh = websocket.ConnectionManager(queue_size=4, send_timeout=0.2, max_dropped=3)
+    monkeypatch.setattr(websocket, "manager", fresh)
+    return fresh
+
+
+@pytest.fixture
+def client(manager):
+    app = FastAPI()
+    app.include_router(websocket.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _subscribe(ws, message):
+    ws.send_json(message)
+    assert ws.receive_json()["type"] == "subscribed"
+
+
+def _assert_nothing_queued(ws):
+    """The next message after a ping is the pong, so nothing else was routed here."""
+    ws.send_json({"type": "ping"})
+    assert ws.receive_json() == {"type": "pong"}
+
+
+def test_status_changes_are_routed_to_order_subscribers(client, manager):
+    """Status changes reach admins and that order's trackers; new orders reach admins only."""
+    with client.websocket_connect("/ws") as admin, \
+            client.websocket_connect("/ws") as tracker, \
+            client.websocket_connect("/ws") as by_bonnummer, \
+            client.websocket_connect("/ws") as other:
+        _subscribe(admin, {"type": "subscribe_admin"})
+        _subscribe(tracker, {"type": "subscribe_order", "order_id": 7})
+        _subscribe(by_bonnummer, {"type": "subscribe_order", "bonnummer": "20240007"})
+        _subscribe(other, {"type": "subscribe_order", "order_id": 8})
+
+        websocket.broadcast_status_change({"id": 7, "bonnummer": "20240007", "status": "Onderweg"})
+        websocket.broadcast_new_order({"id": 9, "bonnummer": "20240009", "status": "Nieuw"})
+
+        assert admin.receive_json()["type"] == "order_status_changed"
+        assert admin.receive_json()["type"] == "order_created"
+        assert tracker.receive_json()["data"]["status"] == "Onderweg"
+        assert by_bonnummer.receive_json()["data"]["id"] == 7
+        for ws in (tracker, by_bonnummer, other):
+            _assert_nothing_queued(ws)
+
+        metrics = manager.metrics()
+        assert metrics["connections"] == 4
+        assert metrics["admin_connections"] == 1
+
+
+def test_status_batch_is_one_admin_message_and_per_order_tracker_messages(client, manager):
+    """A batch reaches admins as one event and each tracker as its own order's status change."""
+    with client.websocket_connect("/ws") as admin, \
+            client.websocket_connect("/ws") as tracker, \
+            client.websocket_connect("/ws") as other:
+        _subscribe(admin, {"type": "subscribe_admin"})
+        _subscribe(tracker, {"type": "subscribe_order", "bonnummer": "20240007"})
+        _subscribe(other, {"type": "subscribe_order", "order_id": 99})
+
+        websocket.broadcast_status_batch([
+            {"id": 7, "bonnummer": "20240007", "status": "Onderweg", "koerier_id": 2},
+            {"id": 8, "bonnummer": "20240008", "status": "Onderweg", "koerier_id": 2},
+        ])
+
+        batch = admin.receive_json()
+        assert batch["type"] == "order_status_batch"
+        assert [order["id"] for order in batch["data"]["orders"]] == [7, 8]
+        status_change = tracker.receive_json()
+        assert status_change["type"] == "order_status_changed"
+        assert status_change["data"]["id"] == 7
+        for ws in (admin, tracker, other):
+            _assert_nothing_queued(ws)
+
+
+class FakeWebSocket:
+    """Records sent text; a stalled socket never completes a send."""
+
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.stalled = stalled
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_broadcast_encodes_once_and_does_not_wait_for_slow_clients(manager):
+    """One slow client is dropped and disconnected; the others get every message, encoded once."""
+    async def scenario():
+        fast = [FakeWebSocket() for _ in range(3)]
+        slow = FakeWebSocket(stalled=True)
+        for ws in fast + [slow]:
+            await manager.connect(ws, is_admin=True)
+
+        for i in range(8):
+            manager.publish({"type": "order_created", "data": {"id": i}}, [websocket.ADMIN_TOPIC])
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        return fast, slow
+
+    fast, slow = asyncio.run(scenario())
+
+    assert all(len(ws.sent) == 8 for ws in fast)
+    assert fast[0].sent[0] is fast[1].sent[0]  # same encoded string for every socket
+    assert slow.closed_with == 1013
+    assert slow not in manager.connections
+    assert manager.stats["slow_disconnects"] == 1
+    assert manager.metrics()["connections"] == 3
+
+
+def test_send_timeout_disconnects_client(manager):
+    """A send that hangs longer than the timeout closes that connection."""
+    async def scenario():
+        slow = FakeWebSocket(stalled=True)
+        await manager.connect(slow, is_admin=True)
+        manager.publish({"type": "order_created"}, [websocket.ADMIN_TOPIC])
+        await asyncio.sleep(0.4)
+        return slow
+
+    slow = asyncio.run(scenario())
+
+    assert slow.closed_with == 1013
+    assert manager.metrics()["connections"] == 0
@@ -16,6 +16,7 @@ import { brandColors } from '../theme/colors'
 import { useLanguage } from '../contexts/LanguageContext'
 import CustomerAuth from './CustomerAuth'
 import { Language } from '../i18n/translations'
+import { customerAPI } from '../services/api'
 
 const PublicHeader = () => {
   const navigate = useNavigate()
@@ -52,6 +53,7 @@ const PublicHeader = () => {
   }, [])
 
   const handleLogout = () => {
+    customerAPI.logout().catch(() => {})
     localStorage.removeItem('customer_token')
     localStorage.removeItem('customer_data')
     setIsLoggedIn(false)
@@ -115,7 +115,7 @@ const OrdersOverview = () => {
     autoConnect: !!wsUrl, // Only auto-connect if we have a valid URL
     reconnectInterval: 30000, // Try every 30 seconds (much less aggressive)
     onMessage: (message) => {
-      if (message.type === 'order_created' || message.type === 'order_updated') {
+      if (message.type === 'order_created' || message.type === 'order_updated' || message.type === 'order_status_batch') {
         // Reload orders when a new order is created or updated
         loadOrders()
       }
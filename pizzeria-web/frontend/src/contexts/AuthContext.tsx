@@ -56,6 +56,7 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
   }
 
   const logout = () => {
+    authAPI.logout().catch(() => {})
     localStorage.removeItem('token')
     localStorage.removeItem('user')
     setUser(null)
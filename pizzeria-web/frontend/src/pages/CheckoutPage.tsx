@@ -899,6 +899,7 @@ const CheckoutPage = () => {
                   variant="outlined"
                   size="small"
                   onClick={() => {
+                    customerAPI.logout().catch(() => {})
                     localStorage.removeItem('customer_token')
                     localStorage.removeItem('customer_data')
                     setIsLoggedIn(false)
@@ -78,7 +78,7 @@ const OrderStatusPage = () => {
       setIsConnected(true)
       // Subscribe to order updates if we have an order
       if (order?.bonnummer) {
-        sendMessage({ type: 'subscribe_order', order_id: order.id })
+        sendMessage({ type: 'subscribe_order', order_id: order.id, bonnummer: order.bonnummer })
       }
     },
     onClose: () => {
@@ -103,7 +103,7 @@ const OrderStatusPage = () => {
       // Connect WebSocket and subscribe to updates for this order
       wsConnect()
       setTimeout(() => {
-        sendMessage({ type: 'subscribe_order', order_id: orderDetails.id })
+        sendMessage({ type: 'subscribe_order', order_id: orderDetails.id, bonnummer: orderDetails.bonnummer })
       }, 500)
     } catch (err: any) {
       console.error('Error searching order:', err)
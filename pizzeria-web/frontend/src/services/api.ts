@@ -60,6 +60,10 @@ export const authAPI = {
     const response = await api.get('/auth/me')
     return response.data
   },
+  logout: async () => {
+    // Drops the token from the server's principal cache; the token itself stays valid until it expires
+    await api.post('/auth/logout')
+  },
 }
 
 // Customer API
@@ -149,6 +153,17 @@ export const customerAPI = {
     })
     return response.data
   },
+  logout: async () => {
+    const token = localStorage.getItem('customer_token')
+    if (!token) {
+      return
+    }
+    await axios.post(`${API_BASE_URL}/customers/public/logout`, null, {
+      headers: {
+        Authorization: `Bearer ${token}`,
+      },
+    })
+  },
   verifyEmail: async (token: string) => {
     // URL encode the token to handle special characters
     const encodedToken = encodeURIComponent(token)
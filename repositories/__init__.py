@@ -2,8 +2,9 @@
 
 from .customer_repository import CustomerRepository
 from .order_repository import OrderRepository
+from .report_repository import ReportRepository
 
-__all__ = ['CustomerRepository', 'OrderRepository']
+__all__ = ['CustomerRepository', 'OrderRepository', 'ReportRepository']
 
 
 
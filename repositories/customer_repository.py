@@ -1,8 +1,8 @@
 """Repository for customer data access operations."""
 
 import re
-from typing import Optional, Dict, Any, List
-from database import DatabaseContext
+from typing import Optional, Dict, Any, List, Sequence, Set, Tuple
+from database import DatabaseContext, UnitOfWork, TELEFOON_NORM_REGELS, TELEFOON_NORM_TEKENS
 from logging_config import get_logger
 
 logger = get_logger("pizzeria.repositories.customer")
@@ -29,7 +29,11 @@ def normalize_customer_name(naam: str) -> str:
 def normalize_phone_for_search(telefoon: str) -> str:
     """
     Normalize phone number for database search.
-    Handles different formats: +32123456789, 0123456789, 0032123456789
+    Handles different formats: +32123456789, 0123456789, 0032123456789,
+    and 9-digit landlines (091234567 -> +3291234567).
+    
+    Follows database.TELEFOON_NORM_REGELS, the table the telefoon_norm
+    triggers are generated from.
     
     Args:
         telefoon: Phone number to normalize
@@ -40,36 +44,102 @@ def normalize_phone_for_search(telefoon: str) -> str:
     if not telefoon:
         return telefoon
     
-    telefoon = telefoon.strip()
-    
-    # Remove all spaces, dashes, parentheses, dots
-    cleaned = re.sub(r'[\s\-\(\)\-\.]', '', telefoon)
+    cleaned = telefoon
+    for char in TELEFOON_NORM_TEKENS:
+        cleaned = cleaned.replace(char, '')
     
-    # Convert to E.164 format
-    if cleaned.startswith('+32'):
-        return cleaned
-    elif cleaned.startswith('0032'):
-        return '+32' + cleaned[4:]
-    elif cleaned.startswith('32') and len(cleaned) == 11:
-        return '+' + cleaned
-    elif cleaned.startswith('0') and len(cleaned) == 10:
-        return '+32' + cleaned[1:]
+    for prefix, lengtes, schrappen, nieuw in TELEFOON_NORM_REGELS:
+        if cleaned.startswith(prefix) and (not lengtes or len(cleaned) in lengtes):
+            return nieuw + cleaned[schrappen:]
     
     # Return as-is if already in E.164 or unknown format
     return cleaned
 
 
+def build_zoek_query(zoekterm: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Build the search for the klanten_fts trigram index.
+    
+    Phone-like input (digits with spaces, dashes, dots or a leading +) becomes one
+    digit string; other input is split into words that must all match. The
+    trigram tokenizer cannot match fragments shorter than 3 characters, so those
+    are returned separately and must be applied as LIKE filters
+    (zoek_like_filter) on top of the MATCH.
+    
+    Args:
+        zoekterm: Raw search input
+        
+    Returns:
+        (MATCH expression, short words). The MATCH expression is None if no word
+        of 3 characters or more remains (search the whole term with LIKE instead).
+    """
+    if not zoekterm or not zoekterm.strip():
+        return None, []
+    
+    cijfers = re.sub(r'[\s\-\(\)\.\/\+]', '', zoekterm)
+    if cijfers.isdigit():
+        tokens = [cijfers]
+    else:
+        tokens = zoekterm.split()
+    
+    lang = [token for token in tokens if len(token) >= 3]
+    kort = [token for token in tokens if len(token) < 3]
+    if not lang:
+        return None, kort
+    return " AND ".join('"' + token.replace('"', '""') + '"' for token in lang), kort
+
+
+def zoek_like_filter(woorden: List[str], kolommen: Sequence[str]) -> Tuple[str, List[str]]:
+    """
+    SQL conditions (each preceded by AND) requiring every word in one of the columns.
+    
+    Args:
+        woorden: Short words from build_zoek_query
+        kolommen: Columns to search, e.g. ("k.naam", "k.telefoon")
+        
+    Returns:
+        (SQL fragment, parameters); empty when there are no words
+    """
+    sql = ""
+    params: List[str] = []
+    for woord in woorden:
+        sql += " AND (" + " OR ".join(f"{kolom} LIKE ?" for kolom in kolommen) + ")"
+        params.extend([f"%{woord}%"] * len(kolommen))
+    return sql, params
+
+
+# Databasebestanden waarvan bekend is dat de klanten_fts index bestaat. Alleen een
+# positief resultaat wordt onthouden: de index kan later door een migratie bijkomen.
+_zoekindex_cache: Set[str] = set()
+
+
+def has_zoekindex(conn) -> bool:
+    """Check whether the klanten_fts index exists (cached per database file once found)."""
+    import database
+    if database.DB_FILE in _zoekindex_cache:
+        return True
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'klanten_fts'"
+    ).fetchone()
+    if row is None:
+        return False
+    _zoekindex_cache.add(database.DB_FILE)
+    return True
+
+
 class CustomerRepository:
     """Repository for customer-related database operations."""
     
     @staticmethod
-    def find_by_phone(telefoon: str) -> Optional[Dict[str, Any]]:
+    def find_by_phone(telefoon: str, uow: Optional[UnitOfWork] = None) -> Optional[Dict[str, Any]]:
         """
         Find customer by phone number.
-        Tries multiple formats to handle different phone number formats in database.
+        All formats (+32..., 0..., 0032...) map to the same telefoon_norm key,
+        so this is a single probe on the unique idx_klanten_telefoon_norm index.
         
         Args:
             telefoon: Phone number to search for
+            uow: Optional unit of work to run inside
             
         Returns:
             Customer data as dict or None if not found
@@ -77,44 +147,14 @@ class CustomerRepository:
         if not telefoon:
             return None
         
-        normalized = normalize_phone_for_search(telefoon)
-        
-        with DatabaseContext() as conn:
+        with DatabaseContext(uow) as conn:
             cursor = conn.cursor()
-            
-            # Try exact match first (normalized format)
             cursor.execute(
-                "SELECT * FROM klanten WHERE telefoon = ?",
-                (normalized,)
+                "SELECT * FROM klanten WHERE telefoon_norm = ?",
+                (normalize_phone_for_search(telefoon),)
             )
             row = cursor.fetchone()
-            if row:
-                return dict(row)
-            
-            # Try alternative formats if normalized doesn't match
-            # Convert +32 to 0 format
-            if normalized.startswith('+32'):
-                alt_format = '0' + normalized[3:]
-                cursor.execute(
-                    "SELECT * FROM klanten WHERE telefoon = ?",
-                    (alt_format,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return dict(row)
-            
-            # Try 0032 format
-            if normalized.startswith('+32'):
-                alt_format = '0032' + normalized[3:]
-                cursor.execute(
-                    "SELECT * FROM klanten WHERE telefoon = ?",
-                    (alt_format,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return dict(row)
-            
-            return None
+            return dict(row) if row else None
     
     @staticmethod
     def find_by_phone_like(telefoon_pattern: str) -> List[Dict[str, Any]]:
@@ -135,6 +175,50 @@ class CustomerRepository:
             )
             return [dict(row) for row in cursor.fetchall()]
     
+    @staticmethod
+    def search(zoekterm: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Search customers on name, phone, street and place.
+        
+        Uses the klanten_fts trigram index (ranked by relevance); words shorter than
+        a trigram are added as LIKE filters. Input without any word of 3 characters
+        or databases without the index fall back to a LIKE scan ordered by name.
+        
+        Args:
+            zoekterm: Search input (part of a name, phone number, street or place)
+            limit: Maximum number of results
+            
+        Returns:
+            List of customer data dictionaries, best match first
+        """
+        with DatabaseContext() as conn:
+            match, kort = build_zoek_query(zoekterm)
+            if match and has_zoekindex(conn):
+                like_sql, like_params = zoek_like_filter(kort, ("k.naam", "k.telefoon", "k.straat", "k.plaats"))
+                cursor = conn.execute(
+                    f"""
+                    SELECT k.*
+                    FROM klanten_fts f
+                    JOIN klanten k ON k.id = f.rowid
+                    WHERE klanten_fts MATCH ?{like_sql}
+                    ORDER BY f.rank
+                    LIMIT ?
+                    """,
+                    (match, *like_params, limit)
+                )
+            else:
+                like = f"%{(zoekterm or '').strip()}%"
+                cursor = conn.execute(
+                    """
+                    SELECT * FROM klanten
+                    WHERE telefoon LIKE ? OR naam LIKE ? OR straat LIKE ? OR plaats LIKE ?
+                    ORDER BY naam
+                    LIMIT ?
+                    """,
+                    (like, like, like, like, limit)
+                )
+            return [dict(row) for row in cursor.fetchall()]
+    
     @staticmethod
     def create_or_update(telefoon: str, straat: str, huisnummer: str, plaats: str, naam: str) -> int:
         """
@@ -159,27 +243,10 @@ class CustomerRepository:
         
         with DatabaseContext() as conn:
             cursor = conn.cursor()
-            # Check if customer exists (try multiple formats)
-            existing = None
-            existing_id = None
-            
-            # Try normalized format first
-            cursor.execute("SELECT id FROM klanten WHERE telefoon = ?", (normalized_telefoon,))
-            row = cursor.fetchone()
-            if row:
-                existing = row
-                existing_id = row['id']
-            else:
-                # Try alternative formats
-                if normalized_telefoon.startswith('+32'):
-                    alt_format = '0' + normalized_telefoon[3:]
-                    cursor.execute("SELECT id FROM klanten WHERE telefoon = ?", (alt_format,))
-                    row = cursor.fetchone()
-                    if row:
-                        existing = row
-                        existing_id = row['id']
-                        # Update to normalized format
-                        cursor.execute("UPDATE klanten SET telefoon = ? WHERE id = ?", (normalized_telefoon, existing_id))
+            # Check if customer exists (one indexed probe on the normalized key)
+            cursor.execute("SELECT id FROM klanten WHERE telefoon_norm = ?", (normalized_telefoon,))
+            existing = cursor.fetchone()
+            existing_id = existing['id'] if existing else None
             
             if existing:
                 # Update existing customer - always update address when provided
@@ -3,7 +3,7 @@
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import json
-from database import DatabaseContext
+from database import DatabaseContext, UnitOfWork
 from logging_config import get_logger
 
 logger = get_logger("pizzeria.repositories.order")
@@ -22,7 +22,8 @@ class OrderRepository:
         bonnummer: str,
         koerier_id: Optional[int] = None,
         levertijd: Optional[str] = None,
-        afhaal: bool = False
+        afhaal: bool = False,
+        uow: Optional[UnitOfWork] = None
     ) -> int:
         """
         Create a new order.
@@ -37,11 +38,12 @@ class OrderRepository:
             koerier_id: Optional courier ID
             levertijd: Optional delivery time (e.g., "19:30")
             afhaal: Whether this is a pickup order (default: False)
+            uow: Optional unit of work to run inside (no separate commit)
             
         Returns:
             Order ID
         """
-        with DatabaseContext() as conn:
+        with DatabaseContext(uow) as conn:
             cursor = conn.cursor()
             # Check if afhaal and status columns exist (cached check)
             from modules.courier_service import CourierService
@@ -79,7 +81,8 @@ class OrderRepository:
         product: str,
         aantal: int,
         prijs: float,
-        extras: Optional[Dict[str, Any]] = None
+        extras: Optional[Dict[str, Any]] = None,
+        uow: Optional[UnitOfWork] = None
     ) -> int:
         """
         Add an item to an order.
@@ -91,11 +94,12 @@ class OrderRepository:
             aantal: Quantity
             prijs: Price per unit
             extras: Optional extras dictionary
+            uow: Optional unit of work to run inside (no separate commit)
             
         Returns:
             Order item ID
         """
-        with DatabaseContext() as conn:
+        with DatabaseContext(uow) as conn:
             cursor = conn.cursor()
             extras_json = json.dumps(extras) if extras else None
             cursor.execute(
@@ -105,6 +109,44 @@ class OrderRepository:
             )
             return cursor.lastrowid
     
+    @staticmethod
+    def add_order_items(
+        bestelling_id: int,
+        items: List[Dict[str, Any]],
+        uow: Optional[UnitOfWork] = None
+    ) -> int:
+        """
+        Add all items of an order with a single executemany.
+        
+        Args:
+            bestelling_id: Order ID
+            items: Order item dicts (categorie, product, aantal, prijs, extras)
+            uow: Optional unit of work to run inside (no separate commit)
+            
+        Returns:
+            Number of items inserted
+        """
+        rows = [
+            (
+                bestelling_id,
+                item.get('categorie', ''),
+                item.get('product', ''),
+                item.get('aantal', 1),
+                item.get('prijs', 0),
+                json.dumps(item['extras']) if item.get('extras') else None
+            )
+            for item in items
+        ]
+        if not rows:
+            return 0
+        with DatabaseContext(uow) as conn:
+            conn.executemany(
+                "INSERT INTO bestelregels (bestelling_id, categorie, product, aantal, prijs, extras) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+    
     @staticmethod
     def get_by_id(bestelling_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -0,0 +1,132 @@
+"""Repository for sales report queries on the verkoop_rollup table."""
+
+from typing import Dict, Any, List
+from database import DatabaseContext
+from logging_config import get_logger
+
+logger = get_logger("pizzeria.repositories.report")
+
+
+class ReportRepository:
+    """
+    Read-only report queries.
+
+    All totals come from verkoop_rollup (one row per day, hour and courier),
+    so a report over a year reads a few thousand pre-aggregated rows instead
+    of every order. Dates are 'YYYY-MM-DD' strings, ranges are inclusive.
+    """
+
+    @staticmethod
+    def get_totalen(van: str, tot: str) -> Dict[str, Any]:
+        """
+        Get order count and revenue for a date range.
+
+        Args:
+            van: First date (YYYY-MM-DD)
+            tot: Last date (YYYY-MM-DD)
+
+        Returns:
+            Dictionary with aantal and omzet
+        """
+        with DatabaseContext() as conn:
+            row = conn.execute("""
+                               SELECT COALESCE(SUM(aantal), 0) AS aantal,
+                                      COALESCE(SUM(omzet), 0)  AS omzet
+                               FROM verkoop_rollup
+                               WHERE datum BETWEEN ? AND ?
+                               """, (van, tot)).fetchone()
+            return {'aantal': row['aantal'], 'omzet': round(float(row['omzet']), 2)}
+
+    @staticmethod
+    def get_omzet_per_periode(van: str, tot: str, periode: str = "dag") -> List[Dict[str, Any]]:
+        """
+        Get order count and revenue grouped per day, week or month.
+
+        Args:
+            van: First date (YYYY-MM-DD)
+            tot: Last date (YYYY-MM-DD)
+            periode: 'dag' (YYYY-MM-DD), 'week' (YYYY-WW) or 'maand' (YYYY-MM)
+
+        Returns:
+            List of dictionaries with periode, orders and omzet, in date order
+        """
+        groepering = {
+            "dag": "datum",
+            "week": "strftime('%Y-%W', datum)",
+            "maand": "strftime('%Y-%m', datum)",
+        }
+        if periode not in groepering:
+            raise ValueError(f"Onbekende periode: {periode}")
+
+        with DatabaseContext() as conn:
+            cursor = conn.execute(f"""
+                                  SELECT {groepering[periode]} AS periode,
+                                         SUM(aantal)           AS orders,
+                                         SUM(omzet)            AS omzet
+                                  FROM verkoop_rollup
+                                  WHERE datum BETWEEN ? AND ?
+                                  GROUP BY 1
+                                  ORDER BY 1
+                                  """, (van, tot))
+            return [
+                {'periode': row['periode'], 'orders': row['orders'], 'omzet': round(float(row['omzet']), 2)}
+                for row in cursor.fetchall()
+            ]
+
+    @staticmethod
+    def get_omzet_per_uur(datum: str) -> List[Dict[str, Any]]:
+        """
+        Get order count and revenue per hour for one day.
+
+        Args:
+            datum: Date (YYYY-MM-DD)
+
+        Returns:
+            List of dictionaries with uur (0-23), aantal and omzet
+        """
+        with DatabaseContext() as conn:
+            cursor = conn.execute("""
+                                  SELECT uur, SUM(aantal) AS aantal, SUM(omzet) AS omzet
+                                  FROM verkoop_rollup
+                                  WHERE datum = ?
+                                  GROUP BY uur
+                                  ORDER BY uur
+                                  """, (datum,))
+            return [
+                {'uur': row['uur'], 'aantal': row['aantal'], 'omzet': round(float(row['omzet']), 2)}
+                for row in cursor.fetchall()
+            ]
+
+    @staticmethod
+    def get_omzet_per_koerier(datum: str) -> List[Dict[str, Any]]:
+        """
+        Get order count and revenue per courier for one day.
+
+        Args:
+            datum: Date (YYYY-MM-DD)
+
+        Returns:
+            List of dictionaries with koerier_id (0 = not assigned), koerier, aantal
+            and omzet, highest revenue first
+        """
+        with DatabaseContext() as conn:
+            cursor = conn.execute("""
+                                  SELECT r.koerier_id,
+                                         COALESCE(ko.naam, 'Niet toegewezen') AS koerier,
+                                         SUM(r.aantal)                         AS aantal,
+                                         SUM(r.omzet)                          AS omzet
+                                  FROM verkoop_rollup r
+                                  LEFT JOIN koeriers ko ON ko.id = r.koerier_id
+                                  WHERE r.datum = ?
+                                  GROUP BY r.koerier_id
+                                  ORDER BY omzet DESC
+                                  """, (datum,))
+            return [
+                {
+                    'koerier_id': row['koerier_id'],
+                    'koerier': row['koerier'],
+                    'aantal': row['aantal'],
+                    'omzet': round(float(row['omzet']), 2)
+                }
+                for row in cursor.fetchall()
+            ]
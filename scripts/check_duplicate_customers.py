@@ -5,35 +5,20 @@ of verschillende adressen (thuis vs afhaal).
 
 import sys
 import os
-import re
 
 # Voeg de root directory toe aan het pad
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import DatabaseContext
+from repositories import customer_repository
 from logging_config import get_logger
 
 logger = get_logger("check_duplicates")
 
 
 def normalize_phone_for_search(telefoon: str) -> str:
-    """Normalize phone number to E.164 format."""
-    if not telefoon:
-        return telefoon
-    
-    telefoon = telefoon.strip()
-    cleaned = re.sub(r'[\s\-\(\)\-\.]', '', telefoon)
-    
-    if cleaned.startswith('+32'):
-        return cleaned
-    elif cleaned.startswith('0032'):
-        return '+32' + cleaned[4:]
-    elif cleaned.startswith('32') and len(cleaned) == 11:
-        return '+' + cleaned
-    elif cleaned.startswith('0') and len(cleaned) == 10:
-        return '+32' + cleaned[1:]
-    
-    return cleaned
+    """Normalize phone number to E.164 format (the telefoon_norm key rules)."""
+    return customer_repository.normalize_phone_for_search(telefoon)
 
 
 def check_duplicates():
@@ -0,0 +1,40 @@
+"""
+Script om de verkoop-rollup (omzet per dag, uur en koerier) opnieuw op te bouwen.
+
+Dit script:
+- Leegt de tabel verkoop_rollup
+- Vult ze opnieuw met één GROUP BY over alle bestellingen
+
+Normaal houden de triggers op 'bestellingen' de rollup bij. Gebruik dit script
+na handmatige wijzigingen of imports die de database rechtstreeks aanpasten.
+"""
+
+import sys
+import os
+import time
+
+# Voeg de root directory toe aan het pad
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import rebuild_verkoop_rollup
+from logging_config import get_logger
+
+logger = get_logger("rebuild_verkoop_rollup")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Verkoop-rollup opnieuw opbouwen")
+    print("=" * 60)
+    
+    try:
+        start = time.perf_counter()
+        rijen = rebuild_verkoop_rollup()
+        duur = time.perf_counter() - start
+        print(f"- {rijen} rollup-rijen geschreven in {duur:.2f}s")
+        print("=" * 60)
+    except Exception as e:
+        logger.exception(f"Fout tijdens opbouwen: {e}")
+        print(f"Fout tijdens opbouwen: {e}")
+        print("=" * 60)
+        sys.exit(1)
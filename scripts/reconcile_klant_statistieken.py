@@ -0,0 +1,41 @@
+"""
+Script om de klantstatistieken in één keer opnieuw op te bouwen.
+
+Dit script:
+- Herberekent totaal_bestellingen, totaal_besteed en laatste_bestelling voor alle klanten
+  in één set-gebaseerde UPDATE ... FROM
+- Zet klanten zonder bestellingen terug op 0
+
+Normaal houden de triggers op 'bestellingen' de statistieken bij. Gebruik dit script
+na handmatige wijzigingen of imports die de database rechtstreeks aanpasten.
+"""
+
+import sys
+import os
+import time
+
+# Voeg de root directory toe aan het pad
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import reconcile_klant_statistieken
+from logging_config import get_logger
+
+logger = get_logger("reconcile_klant_statistieken")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Klantstatistieken herberekenen")
+    print("=" * 60)
+    
+    try:
+        start = time.perf_counter()
+        updated = reconcile_klant_statistieken()
+        duur = time.perf_counter() - start
+        print(f"- {updated} klanten bijgewerkt in {duur:.2f}s")
+        print("=" * 60)
+    except Exception as e:
+        logger.exception(f"Fout tijdens herberekenen: {e}")
+        print(f"Fout tijdens herberekenen: {e}")
+        print("=" * 60)
+        sys.exit(1)
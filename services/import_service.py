@@ -0,0 +1,356 @@
+"""
+Service for bulk imports of legacy data files (klanten.csv, klanten.json, bestellingen.csv).
+
+Files are streamed and written in chunked executemany batches inside one
+transaction. Every imported file is recorded with a fingerprint (size, mtime,
+sha256) in import_bestanden, so an unchanged file is skipped at startup
+instead of being parsed again.
+"""
+
+import csv
+import datetime
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database import DatabaseContext, UnitOfWork
+from logging_config import get_logger
+from repositories.customer_repository import normalize_phone_for_search
+
+logger = get_logger("pizzeria.services.import")
+
+# Rijen per executemany-batch
+CHUNK_SIZE = 1000
+
+# progress(verwerkte_rijen, verstreken_seconden)
+ProgressCallback = Callable[[int, float], None]
+
+
+def bestand_fingerprint(pad: str, met_hash: bool = True) -> Dict[str, Any]:
+    """
+    Fingerprint of a file: size, mtime and (optionally) its sha256.
+
+    Args:
+        pad: Path to the file
+        met_hash: Also hash the contents (streamed in 1 MB blocks)
+
+    Returns:
+        Dictionary with grootte, mtime and sha256 (None without hash)
+    """
+    stat = os.stat(pad)
+    sha256 = None
+    if met_hash:
+        digest = hashlib.sha256()
+        with open(pad, 'rb') as f:
+            for blok in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(blok)
+        sha256 = digest.hexdigest()
+    return {'grootte': stat.st_size, 'mtime': stat.st_mtime, 'sha256': sha256}
+
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Een nummer dat in een andere notatie al bestaat (zelfde telefoon_norm) wordt
+# overgeslagen. Alleen OR IGNORE volstaat niet: dat geldt ook voor de UPDATE in
+# de telefoon_norm trigger, zodat de dubbele klant zonder sleutel zou blijven staan.
+KLANT_INSERT_SQL = """
+    INSERT OR IGNORE INTO klanten (telefoon, straat, huisnummer, plaats, naam)
+    SELECT ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (SELECT 1 FROM klanten WHERE telefoon_norm = ?)
+"""
+
+
+def _klant_tuple(klant: Dict[str, Any], telefoon: Any) -> tuple:
+    """Parameters for KLANT_INSERT_SQL."""
+    return (
+        str(telefoon).strip(),
+        (klant.get('straat') or klant.get('Straat') or klant.get('adres') or klant.get('Adres') or '').strip(),
+        (klant.get('huisnummer') or klant.get('Huisnummer') or klant.get('nr') or klant.get('Nr') or '').strip(),
+        (klant.get('plaats') or klant.get('Plaats') or klant.get('postcode_gemeente') or klant.get('gemeente') or '').strip(),
+        (klant.get('naam') or klant.get('Naam') or klant.get('name') or '').strip(),
+        normalize_phone_for_search(str(telefoon).strip())
+    )
+
+
+class ImportService:
+    """Streaming bulk importer for legacy data files."""
+
+    @staticmethod
+    def is_ongewijzigd(pad: str) -> bool:
+        """
+        Check whether a file was already imported in exactly this version.
+
+        Size and mtime are compared first; only when the mtime changed (e.g. the
+        file was copied) is the content hash computed to decide.
+
+        Args:
+            pad: Path to the import file
+
+        Returns:
+            True if the recorded fingerprint matches the file
+        """
+        sleutel = os.path.abspath(pad)
+        with DatabaseContext() as conn:
+            vorige = conn.execute(
+                "SELECT grootte, mtime, sha256 FROM import_bestanden WHERE pad = ?", (sleutel,)
+            ).fetchone()
+            if vorige is None:
+                return False
+
+            huidig = bestand_fingerprint(pad, met_hash=False)
+            if huidig['grootte'] != vorige['grootte']:
+                return False
+            if huidig['mtime'] == vorige['mtime']:
+                return True
+
+            if bestand_fingerprint(pad)['sha256'] != vorige['sha256']:
+                return False
+            # Zelfde inhoud, nieuwe mtime: volgende keer volstaat de snelle controle
+            conn.execute("UPDATE import_bestanden SET mtime = ? WHERE pad = ?", (huidig['mtime'], sleutel))
+            return True
+
+    @staticmethod
+    def _registreer(cursor, pad: str, fingerprint: Dict[str, Any], rijen: int) -> None:
+        cursor.execute("""
+                       INSERT INTO import_bestanden (pad, grootte, mtime, sha256, rijen, geimporteerd_op)
+                       VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (pad) DO UPDATE SET grootte         = excluded.grootte,
+                                                       mtime           = excluded.mtime,
+                                                       sha256          = excluded.sha256,
+                                                       rijen           = excluded.rijen,
+                                                       geimporteerd_op = excluded.geimporteerd_op
+                       """, (os.path.abspath(pad), fingerprint['grootte'], fingerprint['mtime'],
+                             fingerprint['sha256'], rijen, datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+    @staticmethod
+    def _schrijf_in_batches(
+        cursor,
+        sql: str,
+        rows: Iterable[tuple],
+        omschrijving: str,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[int, int]:
+        """Write rows with one executemany per CHUNK_SIZE rows; returns (processed, written)."""
+        start = time.perf_counter()
+        verwerkt = 0
+        geschreven = 0
+        for chunk in _chunks(rows, CHUNK_SIZE):
+            cursor.executemany(sql, chunk)
+            verwerkt += len(chunk)
+            geschreven += max(cursor.rowcount, 0)
+            verstreken = time.perf_counter() - start
+            logger.debug(f"{omschrijving}: {verwerkt} rijen ({verwerkt / verstreken if verstreken else 0:.0f} rijen/s)")
+            if progress:
+                progress(verwerkt, verstreken)
+        return verwerkt, geschreven
+
+    @staticmethod
+    def _importeer(
+        pad: str,
+        omschrijving: str,
+        schrijf: Callable[[Any], Tuple[int, int]],
+        force: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Shared flow: skip unchanged files, import in one transaction, record the fingerprint."""
+        if not os.path.exists(pad):
+            logger.info(f"{pad} niet gevonden. Import overgeslagen.")
+            return None
+        if not force and ImportService.is_ongewijzigd(pad):
+            logger.info(f"{pad} is ongewijzigd sinds de vorige import. Overgeslagen.")
+            return None
+
+        fingerprint = bestand_fingerprint(pad)
+        start = time.perf_counter()
+        with UnitOfWork() as uow:
+            cursor = uow.cursor()
+            verwerkt, geschreven = schrijf(cursor)
+            ImportService._registreer(cursor, pad, fingerprint, verwerkt)
+        duur = time.perf_counter() - start
+        logger.info(
+            f"{omschrijving}: {verwerkt} rijen gelezen, {geschreven} nieuw in {duur:.2f}s "
+            f"({verwerkt / duur if duur else 0:.0f} rijen/s)"
+        )
+        return {'rijen': verwerkt, 'nieuw': geschreven, 'seconden': round(duur, 3)}
+
+    @staticmethod
+    def import_klanten_csv(
+        pad: str = "klanten.csv",
+        progress: Optional[ProgressCallback] = None,
+        force: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Import customers from a legacy klanten.csv (';'-separated, latin-1).
+
+        Existing phone numbers, in any notation, are left untouched.
+
+        Args:
+            pad: Path to the CSV file
+            progress: Optional callback(processed_rows, elapsed_seconds) per chunk
+            force: Import even when the file is unchanged
+
+        Returns:
+            Dictionary with rijen, nieuw and seconden, or None if skipped
+        """
+        def rows():
+            with open(pad, 'r', encoding='latin-1', newline='') as f:
+                for row in csv.DictReader(f, delimiter=';'):
+                    telefoon = (row.get('Telefoonnummer') or '').strip()
+                    if telefoon:
+                        yield _klant_tuple(row, telefoon)
+
+        return ImportService._importeer(
+            pad, "Klanten uit CSV",
+            lambda cursor: ImportService._schrijf_in_batches(
+                cursor, KLANT_INSERT_SQL, rows(), "Klanten uit CSV", progress
+            ),
+            force
+        )
+
+    @staticmethod
+    def import_klanten_json(
+        pad: str = "klanten.json",
+        progress: Optional[ProgressCallback] = None,
+        force: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Import customers from a legacy klanten.json (list of objects or phone-keyed dict).
+
+        Args:
+            pad: Path to the JSON file
+            progress: Optional callback(processed_rows, elapsed_seconds) per chunk
+            force: Import even when the file is unchanged
+
+        Returns:
+            Dictionary with rijen, nieuw and seconden, or None if skipped
+        """
+        def rows():
+            with open(pad, 'r', encoding='utf-8') as f:
+                klanten_data = json.load(f)
+            if isinstance(klanten_data, list):
+                for klant in klanten_data:
+                    if isinstance(klant, dict):
+                        telefoon = klant.get('telefoon') or klant.get('Telefoonnummer') or klant.get('phone')
+                        if telefoon and str(telefoon).strip():
+                            yield _klant_tuple(klant, telefoon)
+            elif isinstance(klanten_data, dict):
+                for key, klant in klanten_data.items():
+                    if isinstance(klant, dict):
+                        telefoon = klant.get('telefoon') or klant.get('Telefoonnummer') or klant.get('phone') or key
+                        if telefoon and str(telefoon).strip():
+                            yield _klant_tuple(klant, telefoon)
+
+        return ImportService._importeer(
+            pad, "Klanten uit JSON",
+            lambda cursor: ImportService._schrijf_in_batches(
+                cursor, KLANT_INSERT_SQL, rows(), "Klanten uit JSON", progress
+            ),
+            force
+        )
+
+    @staticmethod
+    def import_bestellingen_csv(
+        pad: str = "bestellingen.csv",
+        progress: Optional[ProgressCallback] = None,
+        force: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Import the legacy order history from bestellingen.csv.
+
+        Customers are resolved through a phone->id map loaded once (exact number
+        or normalized key); rows of unknown customers are skipped. Orders get
+        their ids assigned up front so order lines can be batched as well.
+
+        Args:
+            pad: Path to the CSV file
+            progress: Optional callback(processed_rows, elapsed_seconds) per chunk
+            force: Import even when the file is unchanged
+
+        Returns:
+            Dictionary with rijen, nieuw and seconden, or None if skipped
+        """
+        def schrijf(cursor) -> Tuple[int, int]:
+            telefoon_map: Dict[str, int] = {}
+            for row in cursor.execute("SELECT id, telefoon, telefoon_norm FROM klanten"):
+                if row['telefoon_norm']:
+                    telefoon_map[row['telefoon_norm']] = row['id']
+                telefoon_map.setdefault(row['telefoon'], row['id'])
+
+            # Binnen BEGIN IMMEDIATE is dit proces de enige schrijver: ids vooraf toekennen
+            cursor.execute("""
+                           SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'bestellingen'), 0),
+                                      COALESCE((SELECT MAX(id) FROM bestellingen), 0))
+                           """)
+            volgend_id = cursor.fetchone()[0] + 1
+
+            start = time.perf_counter()
+            verwerkt = 0
+            geschreven = 0
+            bestellingen: List[tuple] = []
+            regels: List[tuple] = []
+
+            def flush():
+                cursor.executemany(
+                    "INSERT INTO bestellingen (id, klant_id, datum, tijd, totaal, opmerking) VALUES (?, ?, ?, ?, ?, ?)",
+                    bestellingen
+                )
+                cursor.executemany(
+                    "INSERT INTO bestelregels (bestelling_id, categorie, product, aantal, prijs, extras) VALUES (?, ?, ?, ?, ?, ?)",
+                    regels
+                )
+                bestellingen.clear()
+                regels.clear()
+                verstreken = time.perf_counter() - start
+                logger.debug(f"Bestellingen uit CSV: {verwerkt} rijen ({verwerkt / verstreken if verstreken else 0:.0f} rijen/s)")
+                if progress:
+                    progress(verwerkt, verstreken)
+
+            with open(pad, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.reader(f, delimiter=';'):
+                    if len(row) < 8:
+                        continue  # Onvolledige rij
+                    verwerkt += 1
+
+                    order_datum, order_tijd, tel, straat, nr, plaats, totaal_str, bestelregels_json, *rest = row
+                    opmerking = rest[0] if rest else ""
+                    tel = tel.strip()
+                    klant_id = telefoon_map.get(tel) or telefoon_map.get(normalize_phone_for_search(tel))
+                    if not klant_id:
+                        continue  # Klant bestaat niet in database
+
+                    bestelling_id = volgend_id
+                    volgend_id += 1
+                    geschreven += 1
+                    bestellingen.append((bestelling_id, klant_id, order_datum, order_tijd, float(totaal_str), opmerking))
+
+                    try:
+                        bestelregels_data = json.loads(bestelregels_json)
+                    except Exception:
+                        bestelregels_data = []
+                    for regel in bestelregels_data:
+                        regels.append((
+                            bestelling_id,
+                            regel.get('categorie', ''),
+                            regel.get('product', ''),
+                            int(regel.get('aantal', 1)),
+                            float(regel.get('prijs', 0)),
+                            json.dumps(regel.get('extras', {}))
+                        ))
+
+                    if len(bestellingen) >= CHUNK_SIZE:
+                        flush()
+            if bestellingen:
+                flush()
+            return verwerkt, geschreven
+
+        return ImportService._importeer(pad, "Bestellingen uit CSV", schrijf, force)
@@ -4,7 +4,7 @@ from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from repositories.order_repository import OrderRepository
 from repositories.customer_repository import CustomerRepository
-from database import get_next_bonnummer, update_klant_statistieken, boek_voorraad_verbruik
+from database import UnitOfWork, get_next_bonnummer, boek_voorraad_verbruik
 from exceptions import ValidationError, DatabaseError
 from logging_config import get_logger
 
@@ -77,46 +77,40 @@ class OrderService:
             korting_bedrag = round(subtotaal * (korting_percentage / 100), 2)
             totaal = subtotaal - korting_bedrag
         
-        # Get or create customer
-        klant = self.customer_repository.find_by_phone(klant_telefoon)
-        if not klant:
-            raise ValidationError(f"Klant met telefoonnummer {klant_telefoon} niet gevonden")
-        
-        klant_id = klant['id']
-        
-        # Get receipt number
-        bonnummer = get_next_bonnummer()
-        
-        # Create order
-        nu = datetime.now()
-        bestelling_id = self.order_repository.create(
-            klant_id=klant_id,
-            datum=nu.strftime('%Y-%m-%d'),
-            tijd=nu.strftime('%H:%M'),
-            totaal=totaal,
-            opmerking=opmerking,
-            bonnummer=bonnummer,
-            koerier_id=koerier_id,
-            levertijd=levertijd,
-            afhaal=afhaal
-        )
-        
-        # Add order items
-        for item in order_items:
-            self.order_repository.add_order_item(
-                bestelling_id=bestelling_id,
-                categorie=item.get('categorie', ''),
-                product=item.get('product', ''),
-                aantal=item.get('aantal', 1),
-                prijs=item.get('prijs', 0),
-                extras=item.get('extras')
+        # Everything below runs in one transaction: either the whole order
+        # (receipt number, lines, statistics, stock) is stored or nothing is.
+        with UnitOfWork() as uow:
+            # Get or create customer
+            klant = self.customer_repository.find_by_phone(klant_telefoon, uow=uow)
+            if not klant:
+                raise ValidationError(f"Klant met telefoonnummer {klant_telefoon} niet gevonden")
+            
+            klant_id = klant['id']
+            
+            # Get receipt number
+            bonnummer = get_next_bonnummer(uow=uow)
+            
+            # Create order
+            nu = datetime.now()
+            bestelling_id = self.order_repository.create(
+                klant_id=klant_id,
+                datum=nu.strftime('%Y-%m-%d'),
+                tijd=nu.strftime('%H:%M'),
+                totaal=totaal,
+                opmerking=opmerking,
+                bonnummer=bonnummer,
+                koerier_id=koerier_id,
+                levertijd=levertijd,
+                afhaal=afhaal,
+                uow=uow
             )
-        
-        # Update customer statistics
-        update_klant_statistieken(klant_id)
-        
-        # Book inventory usage
-        boek_voorraad_verbruik(bestelling_id)
+            
+            # Add order items
+            # (customer statistics are updated by the bestellingen triggers)
+            self.order_repository.add_order_items(bestelling_id, order_items, uow=uow)
+            
+            # Book inventory usage
+            boek_voorraad_verbruik(bestelling_id, uow=uow)
         
         logger.info(f"Order created: {bestelling_id}, bonnummer: {bonnummer}")
         return True, bonnummer
@@ -178,13 +172,10 @@ class OrderService:
         Args:
             bestelling_id: Order ID to delete
         """
-        # Get order to find customer for statistics update
+        # Customer statistics are corrected by the bestellingen delete trigger
         order = self.order_repository.get_by_id(bestelling_id)
         if order:
-            klant_id = order.get('klant_id')
             self.order_repository.delete(bestelling_id)
-            if klant_id:
-                update_klant_statistieken(klant_id)
             logger.info(f"Order deleted: {bestelling_id}")
         else:
             raise ValidationError(f"Order {bestelling_id} niet gevonden")
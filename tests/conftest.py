@@ -4,7 +4,18 @@ import pytest
 import sqlite3
 import os
 import tempfile
-from database import DatabaseContext, create_tables, add_database_indexes
+from database import (
+    DatabaseContext,
+    create_tables,
+    add_database_indexes,
+    add_telefoon_norm_column,
+    create_klant_statistieken_triggers,
+    create_klanten_zoekindex,
+    create_verkoop_rollup,
+    create_import_register,
+    create_bestelling_wijzigingen,
+    add_bonnummer_index,
+)
 from repositories.customer_repository import CustomerRepository
 from repositories.order_repository import OrderRepository
 from services.customer_service import CustomerService
@@ -86,10 +97,19 @@ def temp_db():
             )
         ''')
         add_database_indexes(cursor)
+        create_klant_statistieken_triggers(cursor)
+        add_telefoon_norm_column(cursor)
+        create_klanten_zoekindex(cursor)
+        create_verkoop_rollup(cursor)
+        create_import_register(cursor)
+        create_bestelling_wijzigingen(cursor)
+        add_bonnummer_index(cursor)
     
     yield temp_path
     
     # Cleanup
+    database.close_connection_pool()
+    database.invalidate_recepturen_cache()
     database.DB_FILE = original_db
     if os.path.exists(temp_path):
         os.unlink(temp_path)
@@ -0,0 +1,68 @@
+"""Tests for the bestelling_wijzigingen change log triggers."""
+
+from database import DatabaseContext
+
+
+def _insert_order(cursor, online=1):
+    cursor.execute(
+        "INSERT INTO bestellingen (datum, tijd, totaal, online_bestelling) VALUES ('2024-01-01', '18:00', 10.0, ?)",
+        (online,)
+    )
+    return cursor.lastrowid
+
+
+def _log():
+    with DatabaseContext() as conn:
+        rows = conn.execute("SELECT seq, bestelling_id, actie FROM bestelling_wijzigingen ORDER BY seq").fetchall()
+        return [tuple(row) for row in rows]
+
+
+def test_online_order_changes_are_logged(temp_db):
+    """Test that insert, item changes, updates and delete of an online order get increasing seqs."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        order_id = _insert_order(cursor)
+        cursor.execute("INSERT INTO bestelregels (bestelling_id, product, aantal, prijs) VALUES (?, 'Cola', 1, 2.5)",
+                       (order_id,))
+        cursor.execute("UPDATE bestellingen SET status = 'In de keuken' WHERE id = ?", (order_id,))
+        cursor.execute("DELETE FROM bestelregels WHERE bestelling_id = ?", (order_id,))
+        cursor.execute("DELETE FROM bestellingen WHERE id = ?", (order_id,))
+    
+    assert _log() == [
+        (1, order_id, 'I'),
+        (2, order_id, 'U'),
+        (3, order_id, 'U'),
+        (4, order_id, 'U'),
+        (5, order_id, 'D'),
+    ]
+
+
+def test_kassa_orders_are_not_logged(temp_db):
+    """Test that counter orders (online_bestelling = 0) do not grow the log."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        order_id = _insert_order(cursor, online=0)
+        cursor.execute("INSERT INTO bestelregels (bestelling_id, product, aantal, prijs) VALUES (?, 'Cola', 1, 2.5)",
+                       (order_id,))
+        cursor.execute("UPDATE bestellingen SET status = 'Afgeleverd' WHERE id = ?", (order_id,))
+    
+    assert _log() == []
+
+
+def test_log_is_pruned(temp_db):
+    """Test that the log keeps only the most recent entries."""
+    import database
+    
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        order_id = _insert_order(cursor)
+        cursor.executemany("UPDATE bestellingen SET totaal = ? WHERE id = ?",
+                           [(float(i), order_id) for i in range(database.BESTELLING_WIJZIGINGEN_BEWAREN + 1000)])
+    
+    with DatabaseContext() as conn:
+        oldest, newest, count = conn.execute(
+            "SELECT MIN(seq), MAX(seq), COUNT(*) FROM bestelling_wijzigingen"
+        ).fetchone()
+    assert newest == database.BESTELLING_WIJZIGINGEN_BEWAREN + 1001
+    assert count <= database.BESTELLING_WIJZIGINGEN_BEWAREN + 1
+    assert oldest > 1
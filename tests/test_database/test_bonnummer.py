@@ -0,0 +1,120 @@
+"""Tests for the atomic receipt number allocator."""
+
+import datetime
+import multiprocessing
+import threading
+import pytest
+import database
+from database import DatabaseContext, UnitOfWork, get_next_bonnummer, set_bonnummer_block_size
+
+
+@pytest.fixture
+def bon_db(temp_db):
+    """Temp database with block reservation reset to the default afterwards."""
+    yield temp_db
+    set_bonnummer_block_size(1)
+
+
+def _laatste_nummer():
+    vandaag = datetime.datetime.now()
+    with DatabaseContext() as conn:
+        row = conn.execute(
+            "SELECT laatste_nummer FROM bon_teller WHERE jaar = ? AND dag = ?",
+            (vandaag.year, vandaag.timetuple().tm_yday)
+        ).fetchone()
+        return row[0] if row else 0
+
+
+def _volgnummer(bonnummer):
+    return int(bonnummer[4:])
+
+
+def test_sequential_allocation_and_peek(bon_db):
+    """Test that numbers increase by one and peeking does not consume."""
+    assert _volgnummer(get_next_bonnummer(peek_only=True)) == 1
+    assert [_volgnummer(get_next_bonnummer()) for _ in range(3)] == [1, 2, 3]
+    assert _volgnummer(get_next_bonnummer(peek_only=True)) == 4
+    assert _laatste_nummer() == 3
+
+
+def test_rolled_back_order_does_not_consume_number(bon_db):
+    """Test that an allocation inside a failed unit of work is undone."""
+    with pytest.raises(RuntimeError):
+        with UnitOfWork() as uow:
+            get_next_bonnummer(uow=uow)
+            raise RuntimeError("bestelling mislukt")
+    
+    assert _volgnummer(get_next_bonnummer()) == 1
+
+
+def test_block_reservation_skips_database(bon_db):
+    """Test that a reserved block is handed out from memory."""
+    set_bonnummer_block_size(10)
+    
+    assert [_volgnummer(get_next_bonnummer()) for _ in range(10)] == list(range(1, 11))
+    assert _laatste_nummer() == 10
+    assert _volgnummer(get_next_bonnummer()) == 11
+    assert _laatste_nummer() == 20
+
+
+def test_block_is_not_kept_after_rollback(bon_db):
+    """Test that a block reserved in a rolled-back unit of work is never handed out."""
+    set_bonnummer_block_size(10)
+    with pytest.raises(RuntimeError):
+        with UnitOfWork() as uow:
+            assert _volgnummer(get_next_bonnummer(uow=uow)) == 1
+            raise RuntimeError("bestelling mislukt")
+    
+    assert _laatste_nummer() == 0
+    assert _volgnummer(get_next_bonnummer()) == 1
+
+
+@pytest.mark.parametrize("block_size", [1, 7])
+def test_concurrent_allocation_has_no_duplicates(bon_db, block_size):
+    """Stress test: many threads allocating at once never get the same number."""
+    set_bonnummer_block_size(block_size)
+    results = []
+    errors = []
+    lock = threading.Lock()
+    
+    def worker():
+        try:
+            for _ in range(40):
+                with UnitOfWork() as uow:
+                    bonnummer = get_next_bonnummer(uow=uow)
+                with lock:
+                    results.append(bonnummer)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert not errors
+    assert len(results) == 320
+    assert len(set(results)) == len(results)
+    if block_size == 1:
+        assert sorted(_volgnummer(b) for b in results) == list(range(1, 321))
+
+
+def _allocate_in_process(count, queue):
+    queue.put([get_next_bonnummer() for _ in range(count)])
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_processes_have_no_duplicates(bon_db):
+    """Stress test: separate processes (terminals) sharing one database file."""
+    database.close_connection_pool()  # children open their own connections
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    processes = [ctx.Process(target=_allocate_in_process, args=(50, queue)) for _ in range(4)]
+    for p in processes:
+        p.start()
+    results = [b for _ in processes for b in queue.get(timeout=60)]
+    for p in processes:
+        p.join()
+    
+    assert sorted(_volgnummer(b) for b in results) == list(range(1, 201))
@@ -1,7 +1,13 @@
 """Tests for DatabaseContext."""
 
 import pytest
-from database import DatabaseContext, DatabaseError
+from database import (
+    DatabaseContext,
+    DatabaseError,
+    get_db_connection,
+    get_connection_pool_stats,
+    reset_connection_pool_stats,
+)
 
 
 def test_database_context_commit(temp_db):
@@ -47,3 +53,76 @@ def test_database_context_closes_connection(temp_db):
 
 
 
+
+
+def test_database_context_reuses_pooled_connection(temp_db):
+    """Test that consecutive contexts reuse the same warm connection."""
+    with DatabaseContext() as conn:
+        first = conn
+    with DatabaseContext() as conn:
+        assert conn is first
+    
+    stats = get_connection_pool_stats()
+    assert stats["hits"] >= 1
+    assert stats["in_use"] == 0
+
+
+def test_nested_contexts_get_separate_connections(temp_db):
+    """Test that a nested context does not share (and commit) the outer transaction."""
+    with DatabaseContext() as outer:
+        with DatabaseContext() as inner:
+            assert inner is not outer
+
+
+def test_released_connection_has_no_open_transaction(temp_db):
+    """Test that uncommitted work is rolled back when a raw connection is closed."""
+    conn = get_db_connection()
+    conn.execute("INSERT INTO klanten (telefoon, naam) VALUES (?, ?)", ("1234567890", "Test"))
+    conn.close()
+    
+    with DatabaseContext() as conn:
+        assert not conn.in_transaction
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM klanten WHERE telefoon = ?", ("1234567890",))
+        assert cursor.fetchone() is None
+
+
+def test_pool_exhaustion_falls_back_to_overflow(temp_db, monkeypatch):
+    """Test that an exhausted pool hands out an overflow connection instead of blocking forever."""
+    import database
+    monkeypatch.setattr(database, "_pool_wait_timeout", 0.01)
+    reset_connection_pool_stats()
+    
+    held = [get_db_connection() for _ in range(database._max_pool_size)]
+    extra = get_db_connection()
+    assert get_connection_pool_stats()["overflow"] == 1
+    assert get_connection_pool_stats()["waits"] == 1
+    
+    extra.close()
+    for conn in held:
+        conn.close()
+    assert get_connection_pool_stats()["pool_size"] == database._max_pool_size
+
+
+def test_leaked_connection_frees_its_pool_slot(temp_db):
+    """Test that connections dropped without close() do not make later checkouts wait."""
+    import gc
+    import database
+    # Fresh connections: the temp_db fixture still references the one it used for setup
+    database.close_connection_pool()
+    reset_connection_pool_stats()
+    
+    leaked = [get_db_connection() for _ in range(database._max_pool_size)]
+    leaked[0].execute("INSERT INTO klanten (telefoon, naam) VALUES (?, ?)", ("1234567890", "Test"))
+    del leaked
+    gc.collect()
+    assert get_connection_pool_stats()["in_use"] == 0
+    
+    conn = get_db_connection()
+    try:
+        stats = get_connection_pool_stats()
+        assert stats["waits"] == 0
+        assert stats["overflow"] == 0
+        assert stats["leaked"] == database._max_pool_size
+    finally:
+        conn.close()
@@ -0,0 +1,67 @@
+"""Tests for the incremental customer statistics."""
+
+import pytest
+from database import DatabaseContext, reconcile_klant_statistieken
+
+
+def _create_klant(cursor, telefoon="0123456789"):
+    cursor.execute("INSERT INTO klanten (telefoon, naam) VALUES (?, ?)", (telefoon, "Test"))
+    return cursor.lastrowid
+
+
+def _stats(klant_id):
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT totaal_bestellingen, totaal_besteed, laatste_bestelling FROM klanten WHERE id = ?",
+            (klant_id,)
+        )
+        return tuple(cursor.fetchone())
+
+
+def test_insert_updates_statistics(temp_db):
+    """Test that inserting orders adds deltas to the customer statistics."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        klant_id = _create_klant(cursor)
+        cursor.execute("INSERT INTO bestellingen (klant_id, datum, tijd, totaal) VALUES (?, ?, ?, ?)",
+                       (klant_id, "2024-01-02", "18:00", 20.0))
+        cursor.execute("INSERT INTO bestellingen (klant_id, datum, tijd, totaal) VALUES (?, ?, ?, ?)",
+                       (klant_id, "2024-01-01", "19:00", 12.5))
+    
+    assert _stats(klant_id) == (2, 32.5, "2024-01-02 18:00")
+
+
+def test_delete_updates_statistics(temp_db):
+    """Test that deleting the latest order rolls back count, total and last order."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        klant_id = _create_klant(cursor)
+        cursor.execute("INSERT INTO bestellingen (klant_id, datum, tijd, totaal) VALUES (?, ?, ?, ?)",
+                       (klant_id, "2024-01-01", "19:00", 12.5))
+        cursor.execute("INSERT INTO bestellingen (klant_id, datum, tijd, totaal) VALUES (?, ?, ?, ?)",
+                       (klant_id, "2024-01-02", "18:00", 20.0))
+        latest_id = cursor.lastrowid
+    
+    with DatabaseContext() as conn:
+        conn.execute("DELETE FROM bestellingen WHERE id = ?", (latest_id,))
+    assert _stats(klant_id) == (1, 12.5, "2024-01-01 19:00")
+    
+    with DatabaseContext() as conn:
+        conn.execute("DELETE FROM bestellingen")
+    assert _stats(klant_id) == (0, 0.0, None)
+
+
+def test_reconcile_rebuilds_all_customers(temp_db):
+    """Test that the batch reconcile repairs statistics that drifted."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        klant_id = _create_klant(cursor)
+        leeg_id = _create_klant(cursor, "0499999999")
+        cursor.execute("INSERT INTO bestellingen (klant_id, datum, tijd, totaal) VALUES (?, ?, ?, ?)",
+                       (klant_id, "2024-01-01", "19:00", 12.5))
+        cursor.execute("UPDATE klanten SET totaal_bestellingen = 99, totaal_besteed = 1.0, laatste_bestelling = 'x'")
+    
+    assert reconcile_klant_statistieken() == 2
+    assert _stats(klant_id) == (1, 12.5, "2024-01-01 19:00")
+    assert _stats(leeg_id) == (0, 0.0, None)
@@ -0,0 +1,88 @@
+"""Tests for the versioned schema migrations."""
+
+import pytest
+import database
+from database import DatabaseContext, run_migrations, get_schema_version, SCHEMA_VERSION
+
+
+@pytest.fixture
+def empty_db(tmp_path, monkeypatch):
+    """Point the database module at an empty database file."""
+    monkeypatch.setattr(database, "DB_FILE", str(tmp_path / "migraties.db"))
+    yield database.DB_FILE
+    database.close_connection_pool()
+
+
+def test_run_migrations_on_empty_database(empty_db):
+    """Test that all migrations run once and record the schema version."""
+    applied = run_migrations()
+    
+    assert applied == [versie for versie, _, _ in database.MIGRATIONS]
+    with DatabaseContext() as conn:
+        assert get_schema_version(conn) == SCHEMA_VERSION
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"klanten", "bestellingen", "bestelregels", "bon_teller", "recepturen"} <= tables
+
+
+def test_run_migrations_is_noop_when_up_to_date(empty_db):
+    """Test that a second run applies nothing."""
+    run_migrations()
+    assert run_migrations() == []
+
+
+def test_legacy_database_gets_missing_columns(empty_db):
+    """Test that a pre-migration database (user_version 0) is upgraded in place."""
+    with DatabaseContext() as conn:
+        conn.execute(
+            "CREATE TABLE klanten (id INTEGER PRIMARY KEY AUTOINCREMENT, telefoon TEXT UNIQUE NOT NULL, "
+            "straat TEXT, huisnummer TEXT, plaats TEXT, naam TEXT)"
+        )
+        conn.execute("INSERT INTO klanten (telefoon, naam) VALUES ('0123456789', 'Oud')")
+    
+    run_migrations()
+    
+    with DatabaseContext() as conn:
+        cols = [row[1] for row in conn.execute("PRAGMA table_info(klanten)")]
+        klant = conn.execute("SELECT * FROM klanten").fetchone()
+    assert "totaal_bestellingen" in cols and "is_actief" in cols
+    assert klant["naam"] == "Oud"
+    assert klant["totaal_bestellingen"] == 0
+
+
+def test_database_at_version_8_gets_bonnummer_index(empty_db):
+    """Test that an existing database only runs the new migrations and gets the bonnummer index."""
+    run_migrations()
+    with DatabaseContext() as conn:
+        conn.execute("DROP INDEX idx_bestellingen_bonnummer")
+        conn.execute("PRAGMA user_version = 8")
+    
+    assert run_migrations() == [versie for versie, _, _ in database.MIGRATIONS if versie > 8]
+    
+    with DatabaseContext() as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(bestellingen)")}
+        plan = " ".join(str(row[-1]) for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM bestellingen WHERE bonnummer = '20260001'"
+        ))
+    assert "idx_bestellingen_bonnummer" in indexes
+    assert "idx_bestellingen_bonnummer" in plan
+
+
+def test_landline_keys_are_rekeyed(empty_db):
+    """Test that migration 10 gives 9-digit landlines stored under the old rules their E.164 key."""
+    run_migrations()
+    with DatabaseContext() as conn:
+        # Sleutels zoals de regels vóór versie 10 ze gaven
+        conn.execute("DROP TRIGGER trg_klanten_telefoon_norm_insert")
+        conn.execute("INSERT INTO klanten (telefoon, naam) VALUES ('091234567', 'Vast')")
+        conn.execute("INSERT INTO klanten (telefoon, naam) VALUES ('+3292222222', 'Nieuw')")
+        conn.execute("INSERT INTO klanten (telefoon, naam) VALUES ('092222222', 'Dubbel')")
+        conn.execute("UPDATE klanten SET telefoon_norm = telefoon")
+        conn.execute("PRAGMA user_version = 9")
+    
+    assert run_migrations() == [10]
+    
+    with DatabaseContext() as conn:
+        keys = dict(conn.execute("SELECT naam, telefoon_norm FROM klanten").fetchall())
+        fts = conn.execute("SELECT rowid FROM klanten_fts WHERE klanten_fts MATCH '\"3291234\"'").fetchall()
+    assert keys == {"Vast": "+3291234567", "Nieuw": "+3292222222", "Dubbel": None}
+    assert len(fts) == 1
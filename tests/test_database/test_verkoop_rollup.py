@@ -0,0 +1,66 @@
+"""Tests for the verkoop_rollup table and its triggers."""
+
+import pytest
+from database import DatabaseContext, rebuild_verkoop_rollup
+
+
+def _insert_order(cursor, datum, tijd, totaal, koerier_id=None):
+    cursor.execute("INSERT INTO bestellingen (datum, tijd, totaal, koerier_id) VALUES (?, ?, ?, ?)",
+                   (datum, tijd, totaal, koerier_id))
+    return cursor.lastrowid
+
+
+def _rollup():
+    with DatabaseContext() as conn:
+        rows = conn.execute(
+            "SELECT datum, uur, koerier_id, aantal, ROUND(omzet, 2) FROM verkoop_rollup ORDER BY 1, 2, 3"
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+
+def test_insert_updates_rollup(temp_db):
+    """Test that orders are added to their day/hour/courier bucket."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        _insert_order(cursor, "2024-01-01", "18:05", 20.0)
+        _insert_order(cursor, "2024-01-01", "18:45:10", 10.0)
+        _insert_order(cursor, "2024-01-01", "19:00", 5.0, koerier_id=3)
+    
+    assert _rollup() == [
+        ("2024-01-01", 18, 0, 2, 30.0),
+        ("2024-01-01", 19, 3, 1, 5.0),
+    ]
+
+
+def test_update_and_delete_move_rollup(temp_db):
+    """Test that courier changes and deletes move or remove the order's contribution."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        order_id = _insert_order(cursor, "2024-01-01", "18:05", 20.0)
+        _insert_order(cursor, "2024-01-01", "18:30", 10.0)
+    
+    with DatabaseContext() as conn:
+        conn.execute("UPDATE bestellingen SET koerier_id = 2, totaal = 25.0 WHERE id = ?", (order_id,))
+    assert _rollup() == [
+        ("2024-01-01", 18, 0, 1, 10.0),
+        ("2024-01-01", 18, 2, 1, 25.0),
+    ]
+    
+    with DatabaseContext() as conn:
+        conn.execute("DELETE FROM bestellingen WHERE id = ?", (order_id,))
+    assert _rollup() == [("2024-01-01", 18, 0, 1, 10.0)]
+
+
+def test_rebuild_matches_triggers(temp_db):
+    """Test that a rebuild from scratch gives the same rollup as the triggers."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        for dag in range(1, 4):
+            for uur in (12, 18, 19):
+                _insert_order(cursor, f"2024-02-0{dag}", f"{uur}:15", 10.0 + dag, koerier_id=dag % 2 or None)
+    via_triggers = _rollup()
+    
+    with DatabaseContext() as conn:
+        conn.execute("DELETE FROM verkoop_rollup")
+    assert rebuild_verkoop_rollup() == len(via_triggers)
+    assert _rollup() == via_triggers
@@ -0,0 +1,85 @@
+"""Tests for inventory booking via the cached recipe index."""
+
+import pytest
+from database import DatabaseContext, boek_voorraad_verbruik, invalidate_recepturen_cache
+
+
+@pytest.fixture
+def voorraad_db(temp_db):
+    """Add the inventory tables with two ingredients and one recipe."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE ingredienten (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                naam TEXT UNIQUE NOT NULL,
+                eenheid TEXT NOT NULL,
+                minimum REAL DEFAULT 0,
+                huidige_voorraad REAL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE recepturen (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                categorie TEXT NOT NULL,
+                product TEXT NOT NULL,
+                ingredient_id INTEGER NOT NULL,
+                hoeveelheid_per_stuk REAL NOT NULL,
+                UNIQUE (categorie, product, ingredient_id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE voorraad_mutaties (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ingredient_id INTEGER NOT NULL,
+                mutatie REAL NOT NULL,
+                reden TEXT,
+                datumtijd TEXT NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT INTO ingredienten (naam, eenheid, huidige_voorraad) VALUES ('Deeg', 'st', 100)")
+        cursor.execute("INSERT INTO ingredienten (naam, eenheid, huidige_voorraad) VALUES ('Kaas', 'kg', 10)")
+        cursor.execute("INSERT INTO recepturen (categorie, product, ingredient_id, hoeveelheid_per_stuk) VALUES ('Pizza''s', 'Margherita', 1, 1)")
+        cursor.execute("INSERT INTO recepturen (categorie, product, ingredient_id, hoeveelheid_per_stuk) VALUES ('Pizza''s', 'Margherita', 2, 0.1)")
+        cursor.execute("INSERT INTO klanten (telefoon) VALUES ('0123456789')")
+        cursor.execute("INSERT INTO bestellingen (klant_id, datum, tijd, totaal) VALUES (1, '2024-01-01', '18:00', 30)")
+        cursor.executemany(
+            "INSERT INTO bestelregels (bestelling_id, categorie, product, aantal, prijs) VALUES (1, ?, ?, ?, 10)",
+            [("pizza's", "Margherita", 2), ("Pizza's", " margherita ", 1), ("Dranken", "Cola", 3)]
+        )
+    invalidate_recepturen_cache()
+    return temp_db
+
+
+def _voorraad():
+    with DatabaseContext() as conn:
+        return {row["naam"]: row["huidige_voorraad"] for row in conn.execute("SELECT naam, huidige_voorraad FROM ingredienten")}
+
+
+def test_boek_voorraad_verbruik_books_all_lines(voorraad_db):
+    """Test that all matching lines are booked with one mutation per ingredient."""
+    boek_voorraad_verbruik(1)
+    
+    voorraad = _voorraad()
+    assert voorraad["Deeg"] == pytest.approx(97)
+    assert voorraad["Kaas"] == pytest.approx(9.7)
+    with DatabaseContext() as conn:
+        mutaties = conn.execute("SELECT ingredient_id, mutatie, reden FROM voorraad_mutaties ORDER BY ingredient_id").fetchall()
+    assert [(m["ingredient_id"], round(m["mutatie"], 3), m["reden"]) for m in mutaties] == [
+        (1, -3.0, "Bestelling #1"),
+        (2, -0.3, "Bestelling #1"),
+    ]
+
+
+def test_recipe_index_is_invalidated(voorraad_db):
+    """Test that recipe changes are picked up after invalidating the cache."""
+    boek_voorraad_verbruik(1)
+    with DatabaseContext() as conn:
+        conn.execute("DELETE FROM recepturen WHERE ingredient_id = 2")
+    invalidate_recepturen_cache()
+    
+    boek_voorraad_verbruik(1)
+    
+    voorraad = _voorraad()
+    assert voorraad["Deeg"] == pytest.approx(94)
+    assert voorraad["Kaas"] == pytest.approx(9.7)
@@ -97,3 +97,104 @@ def test_find_by_phone_like(customer_repo, sample_customer_data):
 
 
 
+
+
+@pytest.mark.parametrize("lookup", ["0123456789", "+32123456789", "0032123456789", "012 34 56 789"])
+def test_find_by_phone_any_format(customer_repo, sample_customer_data, lookup):
+    """Test that every phone format resolves through the normalized key."""
+    klant_id = customer_repo.create_or_update(**sample_customer_data)
+    
+    result = customer_repo.find_by_phone(lookup)
+    assert result is not None
+    assert result["id"] == klant_id
+    assert result["telefoon_norm"] == "+32123456789"
+
+
+@pytest.mark.parametrize("stored, lookup", [
+    ("091234567", "+3291234567"),
+    ("+32 9 123 45 67", "09 123 45 67"),
+    ("0032 9 1234567", "3291234567"),
+])
+def test_find_landline_by_phone_any_format(customer_repo, stored, lookup):
+    """Test that 9-digit landlines get the same key in national and international notation."""
+    klant_id = customer_repo.create_or_update(stored, "Kerkstraat", "1", "Gent", "Vast")
+    
+    result = customer_repo.find_by_phone(lookup)
+    assert result is not None
+    assert result["id"] == klant_id
+    assert result["telefoon_norm"] == "+3291234567"
+
+
+@pytest.mark.parametrize("telefoon", [
+    "0471123456", "+32471123456", "0032471123456", "32471123456", "091234567", "3291234567",
+    "0 9-(123).45\t67", "+31612345678", "0612", "12345", "",
+])
+def test_telefoon_norm_sql_matches_python(temp_db, telefoon):
+    """Test that the trigger expression and normalize_phone_for_search agree on every format."""
+    from database import DatabaseContext, telefoon_norm_sql
+    from repositories.customer_repository import normalize_phone_for_search
+    with DatabaseContext() as conn:
+        sql_key = conn.execute(f"SELECT {telefoon_norm_sql(':t')}", {"t": telefoon}).fetchone()[0]
+    assert sql_key == normalize_phone_for_search(telefoon)
+
+
+def test_telefoon_norm_follows_legacy_writes(customer_repo, temp_db):
+    """Test that rows written outside the repository get a telefoon_norm via the triggers."""
+    from database import DatabaseContext
+    with DatabaseContext() as conn:
+        conn.execute("INSERT INTO klanten (telefoon, naam) VALUES ('0471 12 34 56', 'Legacy')")
+    assert customer_repo.find_by_phone("+32471123456")["naam"] == "Legacy"
+    
+    with DatabaseContext() as conn:
+        conn.execute("UPDATE klanten SET telefoon = '0032471654321' WHERE naam = 'Legacy'")
+    assert customer_repo.find_by_phone("0471654321")["naam"] == "Legacy"
+    assert customer_repo.find_by_phone("+32471123456") is None
+
+
+def test_search_uses_index_and_ranks(customer_repo):
+    """Test that search matches name, street and place and respects the limit."""
+    customer_repo.create_or_update("0471123456", "Kerkstraat", "1", "Gent", "Jansen")
+    customer_repo.create_or_update("0471654321", "Molenweg", "2", "Brugge", "Peeters")
+    customer_repo.create_or_update("0471999999", "Kerkplein", "3", "Gent", "Janssens")
+    
+    assert {r["naam"] for r in customer_repo.search("Jans")} == {"Jansen", "Janssens"}
+    assert [r["naam"] for r in customer_repo.search("molenweg")] == ["Peeters"]
+    assert [r["naam"] for r in customer_repo.search("kerk gent")] != []
+    assert len(customer_repo.search("Gent", limit=1)) == 1
+
+
+@pytest.mark.parametrize("zoekterm", ["0471 12", "471123", "+32 471 123", "32471123"])
+def test_search_phone_digits(customer_repo, zoekterm):
+    """Test that phone fragments match in national and international notation."""
+    customer_repo.create_or_update("+32 471 12 34 56", "Kerkstraat", "1", "Gent", "Jansen")
+    
+    results = customer_repo.search(zoekterm)
+    assert [r["naam"] for r in results] == ["Jansen"]
+
+
+def test_search_short_term_falls_back_to_like(customer_repo):
+    """Test that terms shorter than a trigram still find customers."""
+    customer_repo.create_or_update("0471123456", "Kerkstraat", "1", "Gent", "Jo")
+    
+    assert [r["naam"] for r in customer_repo.search("Jo")] == ["Jo"]
+
+
+def test_search_short_words_still_filter(customer_repo):
+    """Test that words shorter than a trigram narrow the result instead of being dropped."""
+    customer_repo.create_or_update("0471123456", "Kerkstraat", "1", "Gent", "Jan de Smet")
+    customer_repo.create_or_update("0471654321", "Molenweg", "2", "Brugge", "Jan Smet")
+    
+    assert [r["naam"] for r in customer_repo.search("Jan de Smet")] == ["Jan de smet"]
+    assert {r["naam"] for r in customer_repo.search("Jan Smet")} == {"Jan de smet", "Jan smet"}
+
+
+def test_search_index_created_later_is_picked_up(temp_db):
+    """Test that a missing index is not remembered once it exists."""
+    from database import DatabaseContext
+    from repositories import customer_repository
+    customer_repository._zoekindex_cache.clear()
+    with DatabaseContext() as conn:
+        conn.execute("ALTER TABLE klanten_fts RENAME TO klanten_fts_later")
+        assert customer_repository.has_zoekindex(conn) is False
+        conn.execute("ALTER TABLE klanten_fts_later RENAME TO klanten_fts")
+        assert customer_repository.has_zoekindex(conn) is True
@@ -157,3 +157,25 @@ def test_delete_order(order_repo, customer_repo, sample_customer_data):
 
 
 
+
+
+def test_add_order_items_in_unit_of_work(order_repo, customer_repo, sample_customer_data):
+    """Test adding several items in one batch inside a unit of work."""
+    from database import UnitOfWork
+    
+    klant_id = customer_repo.create_or_update(**sample_customer_data)
+    nu = datetime.now()
+    
+    with UnitOfWork() as uow:
+        bestelling_id = order_repo.create(
+            klant_id, nu.strftime('%Y-%m-%d'), nu.strftime('%H:%M'), 31.50, None, "20240001", uow=uow
+        )
+        inserted = order_repo.add_order_items(bestelling_id, [
+            {"categorie": "Pizza's", "product": "Margherita", "aantal": 2, "prijs": 10.50, "extras": {"kaas": "extra"}},
+            {"categorie": "Pasta's", "product": "Carbonara", "aantal": 1, "prijs": 10.50},
+        ], uow=uow)
+    
+    assert inserted == 2
+    items = order_repo.get_order_items(bestelling_id)
+    assert [item["product"] for item in items] == ["Margherita", "Carbonara"]
+    assert items[0]["extras"] == {"kaas": "extra"}
@@ -0,0 +1,50 @@
+"""Tests for ReportRepository."""
+
+import pytest
+from database import DatabaseContext
+from repositories.report_repository import ReportRepository
+
+
+@pytest.fixture
+def orders(temp_db):
+    """Orders over two months, one assigned to a courier."""
+    with DatabaseContext() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO koeriers (naam) VALUES ('Ali')")
+        koerier_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO bestellingen (datum, tijd, totaal, koerier_id) VALUES (?, ?, ?, ?)",
+            [
+                ("2024-01-30", "18:00", 20.0, koerier_id),
+                ("2024-01-30", "19:10", 10.0, None),
+                ("2024-01-31", "18:30", 15.0, None),
+                ("2024-02-01", "12:00", 7.5, None),
+            ]
+        )
+    return temp_db
+
+
+def test_get_totalen(orders):
+    """Test totals over an inclusive date range."""
+    assert ReportRepository.get_totalen("2024-01-30", "2024-01-31") == {'aantal': 3, 'omzet': 45.0}
+    assert ReportRepository.get_totalen("2023-01-01", "2023-12-31") == {'aantal': 0, 'omzet': 0.0}
+
+
+def test_get_omzet_per_periode(orders):
+    """Test grouping per day and per month."""
+    dagen = ReportRepository.get_omzet_per_periode("2024-01-01", "2024-12-31", "dag")
+    assert [(r['periode'], r['orders'], r['omzet']) for r in dagen] == [
+        ("2024-01-30", 2, 30.0), ("2024-01-31", 1, 15.0), ("2024-02-01", 1, 7.5)
+    ]
+    maanden = ReportRepository.get_omzet_per_periode("2024-01-01", "2024-12-31", "maand")
+    assert [(r['periode'], r['orders']) for r in maanden] == [("2024-01", 3), ("2024-02", 1)]
+    
+    with pytest.raises(ValueError):
+        ReportRepository.get_omzet_per_periode("2024-01-01", "2024-12-31", "jaar")
+
+
+def test_get_omzet_per_uur_en_koerier(orders):
+    """Test the per-hour and per-courier breakdown of one day."""
+    assert [(r['uur'], r['aantal']) for r in ReportRepository.get_omzet_per_uur("2024-01-30")] == [(18, 1), (19, 1)]
+    per_koerier = ReportRepository.get_omzet_per_koerier("2024-01-30")
+    assert [(r['koerier'], r['omzet']) for r in per_koerier] == [("Ali", 20.0), ("Niet toegewezen", 10.0)]
@@ -0,0 +1,104 @@
+"""Tests for the streaming legacy importer."""
+
+import csv
+import json
+import os
+import pytest
+from database import DatabaseContext
+from services import import_service
+from services.import_service import ImportService
+
+
+def _count(table):
+    with DatabaseContext() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+@pytest.fixture
+def klanten_csv(tmp_path):
+    pad = tmp_path / "klanten.csv"
+    regels = ["Telefoonnummer;Straat;Huisnummer;Plaats;Naam"]
+    regels += [f"04710000{i:02d};Kerkstraat;{i};Gent;Klant {i}" for i in range(25)]
+    pad.write_text("\n".join(regels) + "\n", encoding="latin-1")
+    return str(pad)
+
+
+def test_import_klanten_csv_in_chunks_with_progress(temp_db, klanten_csv, monkeypatch):
+    """Test that rows are written per chunk and progress is reported."""
+    monkeypatch.setattr(import_service, "CHUNK_SIZE", 10)
+    progress = []
+    
+    result = ImportService.import_klanten_csv(klanten_csv, progress=lambda n, s: progress.append(n))
+    
+    assert result["rijen"] == 25 and result["nieuw"] == 25
+    assert progress == [10, 20, 25]
+    assert _count("klanten") == 25
+
+
+def test_unchanged_file_is_skipped(temp_db, klanten_csv):
+    """Test that a second run on the same file does not parse it again."""
+    assert ImportService.import_klanten_csv(klanten_csv) is not None
+    assert ImportService.import_klanten_csv(klanten_csv) is None
+    
+    # Zelfde inhoud met nieuwe mtime: hash beslist, nog steeds overgeslagen
+    stat = os.stat(klanten_csv)
+    os.utime(klanten_csv, (stat.st_atime, stat.st_mtime + 60))
+    assert ImportService.import_klanten_csv(klanten_csv) is None
+    
+    # Gewijzigde inhoud wordt opnieuw ingelezen
+    with open(klanten_csv, "a", encoding="latin-1") as f:
+        f.write("0471999999;Molenweg;1;Brugge;Nieuw\n")
+    result = ImportService.import_klanten_csv(klanten_csv)
+    assert result["nieuw"] == 1
+    assert _count("klanten") == 26
+
+
+def test_import_klanten_json_dict(temp_db, tmp_path):
+    """Test the phone-keyed JSON layout."""
+    pad = tmp_path / "klanten.json"
+    pad.write_text(json.dumps({"0471123456": {"naam": "Jansen", "straat": "Kerkstraat"}}), encoding="utf-8")
+    
+    assert ImportService.import_klanten_json(str(pad))["nieuw"] == 1
+    with DatabaseContext() as conn:
+        assert conn.execute("SELECT naam FROM klanten WHERE telefoon = '0471123456'").fetchone()[0] == "Jansen"
+
+
+def test_import_skips_numbers_known_in_another_notation(temp_db, tmp_path, customer_repo):
+    """Test that mixed phone formats don't create a second customer without telefoon_norm."""
+    klant_id = customer_repo.create_or_update("0471123456", "Kerkstraat", "1", "Gent", "Jansen")
+    pad = tmp_path / "klanten.csv"
+    pad.write_text(
+        "Telefoonnummer;Straat;Huisnummer;Plaats;Naam\n"
+        "+32471123456;Molenweg;2;Brugge;Dubbel\n"
+        "0032 9 1234567;Markt;3;Gent;Vast\n"
+        "091234567;Markt;3;Gent;Vast dubbel\n",
+        encoding="latin-1"
+    )
+    
+    assert ImportService.import_klanten_csv(str(pad))["nieuw"] == 1
+    with DatabaseContext() as conn:
+        klanten = conn.execute("SELECT naam, telefoon_norm FROM klanten ORDER BY id").fetchall()
+    assert [tuple(k) for k in klanten] == [("Jansen", "+32471123456"), ("Vast", "+3291234567")]
+    assert customer_repo.find_by_phone("+32471123456")["id"] == klant_id
+
+
+def test_import_bestellingen_csv(temp_db, tmp_path, customer_repo):
+    """Test that orders resolve customers via the phone map and get their lines."""
+    klant_id = customer_repo.create_or_update("0471123456", "Kerkstraat", "1", "Gent", "Jansen")
+    regels = json.dumps([{"categorie": "Pizza", "product": "Margherita", "aantal": 2, "prijs": 10.0}])
+    pad = tmp_path / "bestellingen.csv"
+    with open(pad, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["2024-01-01", "18:00", "0471 12 34 56", "Kerkstraat", "1", "Gent", "20.0", regels, ""])
+        writer.writerow(["2024-01-02", "19:00", "0499000000", "Onbekend", "1", "Gent", "5.0", "[]", ""])
+        writer.writerow(["2024-01-03", "19:30", "0471123456", "Kerkstraat", "1", "Gent", "7.5", "[]", "bel aan"])
+    
+    result = ImportService.import_bestellingen_csv(str(pad))
+    
+    assert result == {"rijen": 3, "nieuw": 2, "seconden": result["seconden"]}
+    with DatabaseContext() as conn:
+        orders = conn.execute("SELECT id, klant_id, totaal FROM bestellingen ORDER BY id").fetchall()
+        assert [(o["klant_id"], o["totaal"]) for o in orders] == [(klant_id, 20.0), (klant_id, 7.5)]
+        regel = conn.execute("SELECT bestelling_id, product, aantal FROM bestelregels").fetchall()
+        assert [tuple(r) for r in regel] == [(orders[0]["id"], "Margherita", 2)]
+        assert conn.execute("SELECT totaal_bestellingen FROM klanten WHERE id = ?", (klant_id,)).fetchone()[0] == 2
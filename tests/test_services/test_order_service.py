@@ -65,3 +65,40 @@ def test_create_order_customer_not_found(order_service, sample_order_items):
 
 
 
+
+
+@patch('services.order_service.boek_voorraad_verbruik')
+def test_create_order_stores_all_lines(mock_boek_voorraad, order_service, customer_service, order_repo, sample_customer_data):
+    """Test that an order with several lines is stored together with its statistics."""
+    klant_id = customer_service.create_or_update_customer(**sample_customer_data)
+    items = [
+        {"categorie": "Pizza's", "product": f"Pizza {i}", "aantal": 1, "prijs": 10.0, "extras": {}}
+        for i in range(6)
+    ]
+    
+    success, bonnummer = order_service.create_order(
+        klant_telefoon=sample_customer_data["telefoon"],
+        order_items=items
+    )
+    
+    assert success is True
+    orders = order_repo.get_by_customer(klant_id)
+    assert len(orders) == 1
+    assert orders[0]["bonnummer"] == bonnummer
+    assert len(order_repo.get_order_items(orders[0]["id"])) == 6
+    assert customer_service.get_customer(klant_id)["totaal_bestellingen"] == 1
+
+
+@patch('services.order_service.boek_voorraad_verbruik', side_effect=RuntimeError("voorraad"))
+def test_create_order_rolls_back_on_failure(mock_boek_voorraad, order_service, customer_service, order_repo, sample_customer_data, sample_order_items):
+    """Test that a failing step leaves no half-written order behind."""
+    klant_id = customer_service.create_or_update_customer(**sample_customer_data)
+    
+    with pytest.raises(RuntimeError):
+        order_service.create_order(
+            klant_telefoon=sample_customer_data["telefoon"],
+            order_items=sample_order_items
+        )
+    
+    assert order_repo.get_by_customer(klant_id) == []
+    assert customer_service.get_customer(klant_id)["totaal_bestellingen"] == 0
@@ -605,7 +605,7 @@ class EnhancedCustomerForm:
     
     def _on_address_key_release(self, event: tk.Event) -> None:
         """Handle address entry key release - show suggestions."""
-        # Reload street names in case new ones were added
+        # Pick up streets added elsewhere (only a stat unless straatnamen.json changed)
         reload_straatnamen()
         on_adres_entry(event, self.adres_entry, self.lb_suggesties)
     
@@ -0,0 +1,122 @@
+"""
+In-memory index for street name autocomplete.
+
+Names are normalized (lowercase, no accents, single spaces) and kept in a
+sorted list of word-start keys, so "kerk" finds "Kerkstraat" and "Grote
+Kerkstraat" with a bisect instead of a scan. A trigram index ranks the
+remaining names for typo-tolerant matches ("kerkstrat" -> "Kerkstraat").
+The same module exists in the web backend (app/utils/address_index.py).
+"""
+import bisect
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Minimum share of the query's trigrams a name must contain to be a fuzzy match
+MIN_SIMILARITY = 0.6
+
+
+def normalize_street(naam: str) -> str:
+    """Search key for a street name: lowercase, accents removed, single spaces."""
+    decomposed = unicodedata.normalize("NFKD", naam.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+def _trigrams(key: str, complete: bool = True) -> Set[str]:
+    """Trigrams of every word; a query that is still being typed has no end padding."""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} " if complete else f"  {word}"
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class AddressIndex:
+    """Prefix and trigram index over a set of street names (thread-safe)."""
+
+    def __init__(self, namen: Iterable[str] = ()):
+        self._namen: List[str] = []  # Display name per id
+        self._keys: List[str] = []  # Normalized name per id
+        self._ids: Dict[str, int] = {}  # Normalized name -> id
+        self._prefixes: List[Tuple[str, int]] = []  # Sorted (word-start suffix of key, id)
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+        for naam in namen:
+            self._add(naam, sort=False)
+        self._prefixes.sort()
+
+    def __len__(self) -> int:
+        return len(self._namen)
+
+    def __contains__(self, naam: str) -> bool:
+        return normalize_street(naam) in self._ids
+
+    def add(self, naam: str) -> bool:
+        """Add a street name; False if it (or a case/accent variant) was already present."""
+        with self._lock:
+            return self._add(naam, sort=True)
+
+    def _add(self, naam: str, sort: bool) -> bool:
+        naam = " ".join(naam.split())
+        key = normalize_street(naam)
+        if not key or key in self._ids:
+            return False
+        street_id = len(self._namen)
+        self._namen.append(naam)
+        self._keys.append(key)
+        self._ids[key] = street_id
+        words = key.split(" ")
+        for i in range(len(words)):
+            entry = (" ".join(words[i:]), street_id)
+            if sort:
+                bisect.insort(self._prefixes, entry)
+            else:
+                self._prefixes.append(entry)
+        for gram in _trigrams(key):
+            self._trigrams.setdefault(gram, set()).add(street_id)
+        return True
+
+    def suggest(self, zoekterm: str, limit: int = 10) -> List[str]:
+        """
+        Ranked street names for a (partial) search term.
+
+        Order: exact match, names starting with the term, names with a word
+        starting with the term, names containing the term, then fuzzy
+        matches by trigram similarity. Ties are broken by length and name.
+        """
+        query = normalize_street(zoekterm)
+        if not query or limit <= 0:
+            return []
+        with self._lock:
+            ranked: Dict[int, Tuple] = {}
+
+            i = bisect.bisect_left(self._prefixes, (query, -1))
+            while i < len(self._prefixes) and self._prefixes[i][0].startswith(query):
+                street_id = self._prefixes[i][1]
+                i += 1
+                key = self._keys[street_id]
+                tier = 0 if key == query else 1 if key.startswith(query) else 2
+                rank = (tier, 0.0, len(key), key)
+                if street_id not in ranked or rank < ranked[street_id]:
+                    ranked[street_id] = rank
+
+            if len(ranked) < limit and len(query) >= 3:
+                grams = _trigrams(query, complete=False)
+                shared = Counter()
+                for gram in grams:
+                    shared.update(self._trigrams.get(gram, ()))
+                for street_id, count in shared.items():
+                    if street_id in ranked:
+                        continue
+                    similarity = count / len(grams)
+                    key = self._keys[street_id]
+                    if query in key:
+                        ranked[street_id] = (3, 0.0, len(key), key)
+                    elif similarity >= MIN_SIMILARITY:
+                        ranked[street_id] = (4, -similarity, len(key), key)
+
+            best = heapq.nsmallest(limit, ranked.items(), key=lambda item: item[1])
+            return [self._namen[street_id] for street_id, _ in best]
@@ -1,27 +1,45 @@
 """Address and postcode utility functions."""
 
 import json
+import os
 import tkinter as tk
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from tkinter import Entry, Listbox, StringVar
 from database import DatabaseContext
+from utils.address_index import AddressIndex
+
+STRAATNAMEN_JSON = "straatnamen.json"
+
+# (mtime_ns, size) of straatnamen.json when it was last loaded
+_straatnamen_signature: Optional[Tuple[int, int]] = None
+
+
+def _file_signature(json_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(json_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 # Load street names once at module level
 def _load_straatnamen() -> List[str]:
     """Load street names from JSON file."""
+    global _straatnamen_signature
+    _straatnamen_signature = _file_signature(STRAATNAMEN_JSON)
     try:
-        with open("straatnamen.json", "r", encoding="utf-8") as f:
+        with open(STRAATNAMEN_JSON, "r", encoding="utf-8") as f:
             return json.load(f)
     except FileNotFoundError:
         return []
 
 straatnamen = _load_straatnamen()
+straatnamen_index = AddressIndex(straatnamen)
 
 
-def suggest_straat(zoekterm: str) -> List[str]:
-    """Suggest street names based on search term."""
-    zoekterm = zoekterm.lower().strip()
-    return [naam for naam in straatnamen if zoekterm in naam.lower()]
+def suggest_straat(zoekterm: str, limit: int = 10) -> List[str]:
+    """Suggest street names based on search term (ranked, at most `limit`)."""
+    return straatnamen_index.suggest(zoekterm, limit=limit)
 
 
 def suggest_postcode(zoekterm: str, postcodes: List[str]) -> List[str]:
@@ -60,7 +78,7 @@ def update_straatnamen_json(nieuwe_straat: str, json_path: str = "straatnamen.js
     Returns:
         True if street was added, False if it already existed
     """
-    global straatnamen
+    global straatnamen, _straatnamen_signature
     
     # Normalize street name (strip and capitalize first letter)
     nieuwe_straat = nieuwe_straat.strip()
@@ -88,15 +106,21 @@ def update_straatnamen_json(nieuwe_straat: str, json_path: str = "straatnamen.js
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     
-    # Update module-level variable
+    # Update module-level variable and index (no reload needed for our own write)
     straatnamen = data
+    straatnamen_index.add(nieuwe_straat)
+    if os.path.abspath(json_path) == os.path.abspath(STRAATNAMEN_JSON):
+        _straatnamen_signature = _file_signature(json_path)
     return True
 
 
 def reload_straatnamen() -> None:
-    """Reload street names from JSON file."""
-    global straatnamen
+    """Reload street names from JSON file if it changed on disk (e.g. a street added via the website)."""
+    global straatnamen, straatnamen_index
+    if _file_signature(STRAATNAMEN_JSON) == _straatnamen_signature:
+        return
     straatnamen = _load_straatnamen()
+    straatnamen_index = AddressIndex(straatnamen)
 
 
 def on_adres_entry(